@@ -32,11 +32,8 @@ from flaskr.common.config import (
     get_explicit_env_override,
     parse_llm_model_max_output_tokens,
 )
-from flaskr.service.billing.consts import (
-    BILLING_METRIC_LLM_OUTPUT_TOKENS,
-    CREDIT_USAGE_RATE_STATUS_ACTIVE,
-)
-from flaskr.service.billing.models import CreditUsageRate
+from flaskr.service.billing.consts import BILLING_METRIC_LLM_OUTPUT_TOKENS
+from flaskr.service.billing.rate_index import UsageRateSnapshot, list_usage_rates
 from flaskr.service.billing.rate_references import (
     format_credit_multiplier,
     load_llm_credit_1x_unit_cost,
@@ -125,6 +122,8 @@ MODEL_ALIAS_MAP: dict[str, tuple[str, str]] = {}
 PROVIDER_STATES: dict[str, ProviderState] = {}
 MODEL_MAX_OUTPUT_TOKENS: dict[str, int] = {}
 _USAGE_OUTPUT_TEXT_MAX_LENGTH = 12000
+# Full responses are kept in Langfuse; log lines only carry a short preview.
+_RESPONSE_LOG_PREVIEW_LENGTH = 500
 
 
 def _log(level: str, message: str) -> None:
@@ -190,6 +189,14 @@ def _attach_usage_output_text(
     return next_metadata
 
 
+def _preview_response_for_log(response_text: str) -> str:
+    """Return a bounded excerpt of an LLM response for log lines."""
+    if len(response_text) <= _RESPONSE_LOG_PREVIEW_LENGTH:
+        return response_text
+    omitted = len(response_text) - _RESPONSE_LOG_PREVIEW_LENGTH
+    return f"{response_text[:_RESPONSE_LOG_PREVIEW_LENGTH]}... [{omitted} more chars]"
+
+
 def _extract_reasoning_delta(delta: Any) -> str:
     """Return provider reasoning from a normalized LiteLLM stream delta."""
 
@@ -1051,8 +1058,8 @@ def invoke_llm(
         generation_name,
         model,
     )
-    response_text = ""
-    reasoning_text = ""
+    response_chunks: list[str] = []
+    reasoning_chunks: list[str] = []
     usage = None
     input_cache_tokens = 0
     provider_name = ""
@@ -1093,9 +1100,9 @@ def invoke_llm(
             if start_completion_time is None:
                 start_completion_time = now_utc()
             if len(res.choices):
-                reasoning_text += _extract_reasoning_delta(res.choices[0].delta)
+                reasoning_chunks.append(_extract_reasoning_delta(res.choices[0].delta))
             if len(res.choices) and res.choices[0].delta.content:
-                response_text += res.choices[0].delta.content
+                response_chunks.append(res.choices[0].delta.content)
                 yield LLMStreamResponse(
                     res.id,
                     bool(res.choices[0].finish_reason),
@@ -1118,7 +1125,14 @@ def invoke_llm(
             model=model,
         )
 
-    app.logger.info("invoke_llm response: %s ", response_text)
+    response_text = "".join(response_chunks)
+    reasoning_text = "".join(reasoning_chunks)
+    app.logger.info(
+        "invoke_llm response: chars=%s reasoning_chars=%s preview=%s",
+        len(response_text),
+        len(reasoning_text),
+        _preview_response_for_log(response_text),
+    )
     if usage is None:
         app.logger.info("invoke_llm usage: None")
     else:
@@ -1235,8 +1249,8 @@ def chat_llm(
         generation_name,
         model,
     )
-    response_text = ""
-    reasoning_text = ""
+    response_chunks: list[str] = []
+    reasoning_chunks: list[str] = []
     usage = None
     input_cache_tokens = 0
     provider_name = ""
@@ -1271,9 +1285,11 @@ def chat_llm(
                 if start_completion_time is None:
                     start_completion_time = now_utc()
                 if len(res.choices):
-                    reasoning_text += _extract_reasoning_delta(res.choices[0].delta)
+                    reasoning_chunks.append(
+                        _extract_reasoning_delta(res.choices[0].delta)
+                    )
                 if len(res.choices) and res.choices[0].delta.content:
-                    response_text += res.choices[0].delta.content
+                    response_chunks.append(res.choices[0].delta.content)
                     yield LLMStreamResponse(
                         res.id,
                         bool(res.choices[0].finish_reason),
@@ -1291,12 +1307,12 @@ def chat_llm(
                         "total": res_usage.total_tokens,
                     }
         except Exception as exc:
-            if not (_is_litellm_repeated_stream_chunk_error(exc) and response_text):
+            if not (_is_litellm_repeated_stream_chunk_error(exc) and response_chunks):
                 raise
             app.logger.warning(
                 "LiteLLM repeated streaming chunk detected; ending stream with partial response | model=%s | response_chars=%s | error=%s",
                 invoke_model,
-                len(response_text),
+                sum(len(chunk) for chunk in response_chunks),
                 exc,
             )
     else:
@@ -1305,7 +1321,14 @@ def chat_llm(
             model=model,
         )
 
-    app.logger.info("chat_llm response: %s ", response_text)
+    response_text = "".join(response_chunks)
+    reasoning_text = "".join(reasoning_chunks)
+    app.logger.info(
+        "chat_llm response: chars=%s reasoning_chars=%s preview=%s",
+        len(response_text),
+        len(reasoning_text),
+        _preview_response_for_log(response_text),
+    )
     if usage is None:
         app.logger.info("chat_llm usage: None")
     else:
@@ -1428,7 +1451,7 @@ def _resolve_billing_rate_identity(model: str) -> tuple[str, list[str]]:
     return provider or "", candidates
 
 
-def _rate_per_token(rate: CreditUsageRate | None) -> Decimal | None:
+def _rate_per_token(rate: UsageRateSnapshot | None) -> Decimal | None:
     if rate is None:
         return None
     try:
@@ -1439,12 +1462,12 @@ def _rate_per_token(rate: CreditUsageRate | None) -> Decimal | None:
 
 
 def _select_credit_usage_rate(
-    rows: list[CreditUsageRate],
+    rows: list[UsageRateSnapshot],
     *,
     provider: str,
     model_candidates: list[str],
     now: datetime,
-) -> CreditUsageRate | None:
+) -> UsageRateSnapshot | None:
     normalized_provider = str(provider or "").strip()
     normalized_models = [
         str(model or "").strip() for model in model_candidates if model
@@ -1479,18 +1502,12 @@ def _select_credit_usage_rate(
     return candidates[0]
 
 
-def _load_llm_output_rate_rows(app: Flask) -> list[CreditUsageRate]:
+def _load_llm_output_rate_rows(app: Flask) -> list[UsageRateSnapshot]:
     with app.app_context():
-        return (
-            CreditUsageRate.query.filter(
-                CreditUsageRate.deleted == 0,
-                CreditUsageRate.status == CREDIT_USAGE_RATE_STATUS_ACTIVE,
-                CreditUsageRate.usage_type == BILL_USAGE_TYPE_LLM,
-                CreditUsageRate.usage_scene == BILL_USAGE_SCENE_PROD,
-                CreditUsageRate.billing_metric == BILLING_METRIC_LLM_OUTPUT_TOKENS,
-            )
-            .order_by(CreditUsageRate.effective_from.desc(), CreditUsageRate.id.desc())
-            .all()
+        return list_usage_rates(
+            usage_type=BILL_USAGE_TYPE_LLM,
+            usage_scene=BILL_USAGE_SCENE_PROD,
+            billing_metric=BILLING_METRIC_LLM_OUTPUT_TOKENS,
         )
 
 
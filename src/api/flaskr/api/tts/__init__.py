@@ -16,7 +16,7 @@ import json
 import logging
 from decimal import Decimal, InvalidOperation
 
-from flask import has_request_context, request
+from flask import current_app, has_app_context, has_request_context, request
 
 from flaskr.api.tts.aliyun_nls_token import is_aliyun_nls_token_configured
 from flaskr.api.tts.aliyun_provider import AliyunTTSProvider
@@ -174,6 +174,7 @@ def synthesize_text(
     audio_settings: AudioSettings | None = None,
     model: str | None = None,
     provider_name: str = "",
+    use_cache: bool = True,
 ) -> TTSResult:
     """Synthesize text to speech.
 
@@ -183,6 +184,7 @@ def synthesize_text(
         audio_settings: Audio settings (optional)
         model: TTS model name (optional, provider-specific)
         provider_name: Provider name (optional, uses config if empty)
+        use_cache: Serve repeated requests from the synthesized audio cache
 
     Returns:
         TTSResult with audio data and metadata
@@ -192,6 +194,17 @@ def synthesize_text(
 
     """
     provider = get_tts_provider(provider_name)
+    if use_cache and has_app_context():
+        from flaskr.service.tts.audio_cache import synthesize_with_audio_cache
+
+        return synthesize_with_audio_cache(
+            current_app,
+            provider,
+            text=text,
+            voice_settings=voice_settings,
+            audio_settings=audio_settings,
+            model=model,
+        )
     return provider.synthesize(
         text=text,
         voice_settings=voice_settings,
@@ -27,9 +27,11 @@ import requests
 
 from flaskr.common.cache_provider import cache
 from flaskr.common.config import get_config
+from flaskr.common.http_client import PooledHTTPClient
 from flaskr.common.log import AppLoggerProxy
 
 logger = AppLoggerProxy(logging.getLogger(__name__))
+_http_client = PooledHTTPClient("aliyun")
 
 
 NLS_META_ENDPOINT = "https://nls-meta.cn-shanghai.aliyuncs.com/"
@@ -179,7 +181,7 @@ def _request_new_token(access_key_id: str, access_key_secret: str) -> AliyunNlsT
     url = f"{NLS_META_ENDPOINT}?Signature={signature}&{canonical_query}"
 
     try:
-        resp = requests.get(url, headers={"Accept": "application/json"}, timeout=10)
+        resp = _http_client.get(url, headers={"Accept": "application/json"}, timeout=10)
     except requests.RequestException as exc:
         message = f"Aliyun NLS token request failed: {exc}"
         raise ValueError(message) from exc
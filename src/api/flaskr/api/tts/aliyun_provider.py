@@ -25,9 +25,11 @@ from flaskr.api.tts.base import (
     VoiceSettings,
 )
 from flaskr.common.config import get_config
+from flaskr.common.http_client import PooledHTTPClient
 from flaskr.common.log import AppLoggerProxy
 
 logger = AppLoggerProxy(logging.getLogger(__name__))
+_http_client = PooledHTTPClient("aliyun")
 
 # Aliyun TTS API endpoints by region
 ALIYUN_TTS_ENDPOINTS = {
@@ -1336,7 +1338,7 @@ class AliyunTTSProvider(BaseTTSProvider):
         )
 
         try:
-            response = requests.post(
+            response = _http_client.post(
                 endpoint,
                 json=payload,
                 headers=headers,
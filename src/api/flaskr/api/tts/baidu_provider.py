@@ -22,9 +22,11 @@ from flaskr.api.tts.base import (
     VoiceSettings,
 )
 from flaskr.common.config import get_config
+from flaskr.common.http_client import PooledHTTPClient
 from flaskr.common.log import AppLoggerProxy
 
 logger = AppLoggerProxy(logging.getLogger(__name__))
+_http_client = PooledHTTPClient("baidu")
 
 # Baidu TTS API endpoints
 BAIDU_TTS_API_URL = "https://tsn.baidu.com/text2audio"
@@ -681,7 +683,7 @@ def _get_access_token(api_key: str, secret_key: str) -> str:
     }
 
     try:
-        response = requests.post(BAIDU_TOKEN_URL, params=params, timeout=30)
+        response = _http_client.post(BAIDU_TOKEN_URL, params=params, timeout=30)
         response.raise_for_status()
         result = response.json()
 
@@ -885,7 +887,7 @@ class BaiduTTSProvider(BaseTTSProvider):
         )
 
         try:
-            response = requests.post(
+            response = _http_client.post(
                 BAIDU_TTS_API_URL,
                 params=params,
                 timeout=60,
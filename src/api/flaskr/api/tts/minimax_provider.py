@@ -10,8 +10,6 @@ from dataclasses import dataclass, field
 from typing import Any
 from urllib.parse import urlencode
 
-import requests
-
 from flaskr.api.tts.base import (
     AudioSettings,
     BaseTTSProvider,
@@ -21,10 +19,12 @@ from flaskr.api.tts.base import (
     VoiceSettings,
 )
 from flaskr.common.config import get_config
+from flaskr.common.http_client import PooledHTTPClient
 from flaskr.common.log import AppLoggerProxy
-from flaskr.service.tts.rpm_gate import acquire_tts_rpm_slot
+from flaskr.service.tts.rpm_gate import TTS_RPM_LANE_STANDARD, acquire_tts_rpm_slot
 
 logger = AppLoggerProxy(logging.getLogger(__name__))
+_http_client = PooledHTTPClient("minimax")
 
 # Minimax TTS API endpoint
 MINIMAX_TTS_API_URL = "https://api.minimaxi.com/v1/t2a_v2"
@@ -236,7 +236,7 @@ def _fetch_minimax_subtitle_file(url: str) -> list[dict[str, Any]]:
     if not url:
         return []
     try:
-        response = requests.get(url, timeout=20)
+        response = _http_client.get(url, timeout=20)
         response.raise_for_status()
         payload = response.json()
     except Exception:
@@ -431,12 +431,14 @@ class MinimaxTTSProvider(BaseTTSProvider):
         voice_settings: VoiceSettings | None = None,
         audio_settings: AudioSettings | None = None,
         model: str | None = None,
+        rpm_lane: str = TTS_RPM_LANE_STANDARD,
     ) -> Iterator[MinimaxHTTPStreamChunk]:
         """Synthesize text with MiniMax HTTP streaming.
 
         The returned audio chunks are raw MiniMax MP3 stream bytes. Callers that
         expose chunks to browser playback must repackage them into independently
         decodable audio segments before sending them to the frontend.
+        ``rpm_lane`` selects the RPM gate lane the request queues in.
         """
         if not text or not text.strip():
             error_message = "Text cannot be empty"
@@ -480,6 +482,7 @@ class MinimaxTTSProvider(BaseTTSProvider):
                 "MINIMAX_TTS_QUEUE_MAX_WAIT_SECONDS", 10.0
             ),
             model=tts_model,
+            lane=rpm_lane,
         )
 
         logger.debug(
@@ -487,7 +490,7 @@ class MinimaxTTSProvider(BaseTTSProvider):
             tts_model,
             len(text),
         )
-        response = requests.post(
+        response = _http_client.post(
             _build_minimax_tts_url(),
             json=payload,
             headers=headers,
@@ -496,52 +499,61 @@ class MinimaxTTSProvider(BaseTTSProvider):
         )
         response.raise_for_status()
 
-        for raw_line in response.iter_lines(decode_unicode=True):
-            line = str(raw_line or "").strip()
-            if not line:
-                continue
-            if line.startswith("data:"):
-                line = line[5:].strip()
-            if line == "[DONE]":
-                break
-
-            try:
-                message = json.loads(line)
-            except json.JSONDecodeError as exc:
-                error_message = "Invalid MiniMax HTTP streaming JSON response"
-                raise ValueError(error_message) from exc
-
-            _ensure_minimax_base_resp(message, "MiniMax HTTP streaming error")
-            data = message.get("data") or {}
-            extra_info = message.get("extra_info") or {}
-            audio_hex = data.get("audio") or ""
-            try:
-                audio_data = bytes.fromhex(audio_hex) if audio_hex else b""
-            except ValueError as exc:
-                error_message = "Invalid MiniMax HTTP streaming audio hex"
-                raise ValueError(error_message) from exc
-
-            status = int(data.get("status") or 0)
-            is_final = status == 2 or bool(extra_info) or bool(message.get("is_final"))
-            subtitles = _extract_minimax_subtitles(message)
-            yield MinimaxHTTPStreamChunk(
-                audio_data=audio_data,
-                is_final=is_final,
-                duration_ms=int(extra_info.get("audio_length") or 0),
-                sample_rate=int(
-                    extra_info.get("audio_sample_rate")
-                    or audio_settings.sample_rate
-                    or 24000
-                ),
-                format=str(
-                    extra_info.get("audio_format") or audio_settings.format or "mp3"
-                ),
-                word_count=int(extra_info.get("word_count") or 0),
-                usage_characters=int(extra_info.get("usage_characters") or 0),
-                subtitles=subtitles,
-                extra_info=extra_info,
-                trace_id=str(message.get("trace_id") or ""),
-            )
+        try:
+            for raw_line in response.iter_lines(decode_unicode=True):
+                line = str(raw_line or "").strip()
+                if not line:
+                    continue
+                if line.startswith("data:"):
+                    line = line[5:].strip()
+                if line == "[DONE]":
+                    break
+
+                try:
+                    message = json.loads(line)
+                except json.JSONDecodeError as exc:
+                    error_message = "Invalid MiniMax HTTP streaming JSON response"
+                    raise ValueError(error_message) from exc
+
+                _ensure_minimax_base_resp(message, "MiniMax HTTP streaming error")
+                data = message.get("data") or {}
+                extra_info = message.get("extra_info") or {}
+                audio_hex = data.get("audio") or ""
+                try:
+                    audio_data = bytes.fromhex(audio_hex) if audio_hex else b""
+                except ValueError as exc:
+                    error_message = "Invalid MiniMax HTTP streaming audio hex"
+                    raise ValueError(error_message) from exc
+
+                status = int(data.get("status") or 0)
+                is_final = (
+                    status == 2 or bool(extra_info) or bool(message.get("is_final"))
+                )
+                subtitles = _extract_minimax_subtitles(message)
+                yield MinimaxHTTPStreamChunk(
+                    audio_data=audio_data,
+                    is_final=is_final,
+                    duration_ms=int(extra_info.get("audio_length") or 0),
+                    sample_rate=int(
+                        extra_info.get("audio_sample_rate")
+                        or audio_settings.sample_rate
+                        or 24000
+                    ),
+                    format=str(
+                        extra_info.get("audio_format") or audio_settings.format or "mp3"
+                    ),
+                    word_count=int(extra_info.get("word_count") or 0),
+                    usage_characters=int(extra_info.get("usage_characters") or 0),
+                    subtitles=subtitles,
+                    extra_info=extra_info,
+                    trace_id=str(message.get("trace_id") or ""),
+                )
+        finally:
+            # Return the connection to the pooled client even when the
+            # caller stops consuming the stream early.
+            close = getattr(response, "close", None)
+            if callable(close):
+                close()
 
     def _call_api(
         self,
@@ -610,7 +622,7 @@ class MinimaxTTSProvider(BaseTTSProvider):
             len(text),
         )
 
-        response = requests.post(
+        response = _http_client.post(
             _build_minimax_tts_url(), json=payload, headers=headers, timeout=60
         )
         response.raise_for_status()
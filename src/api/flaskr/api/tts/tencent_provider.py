@@ -18,8 +18,6 @@ import unicodedata
 from dataclasses import dataclass, field
 from typing import Any
 
-import requests
-
 try:
     from pydub import AudioSegment as PydubAudioSegment
 except ImportError:  # pragma: no cover - exercised only in minimal deployments
@@ -34,6 +32,7 @@ from flaskr.api.tts.base import (
     VoiceSettings,
 )
 from flaskr.common.config import get_config
+from flaskr.common.http_client import PooledHTTPClient
 from flaskr.common.log import AppLoggerProxy
 from flaskr.service.tts import resolve_tts_billable_chars
 from flaskr.service.tts.audio_utils import (
@@ -43,6 +42,7 @@ from flaskr.service.tts.audio_utils import (
 from flaskr.service.tts.subtitle_utils import normalize_subtitle_cues
 
 logger = AppLoggerProxy(logging.getLogger(__name__))
+_http_client = PooledHTTPClient("tencent")
 
 TENCENT_TTS_HOST = "trtc.ai.tencentcloudapi.com"
 TENCENT_TTS_ENDPOINT = f"https://{TENCENT_TTS_HOST}"
@@ -1274,7 +1274,7 @@ class TencentTTSProvider(BaseTTSProvider):
             len(request_text),
             payload.get("Voice", {}).get("VoiceId"),
         )
-        response = requests.post(
+        response = _http_client.post(
             TENCENT_TTS_ENDPOINT,
             data=payload_json.encode("utf-8"),
             headers=headers,
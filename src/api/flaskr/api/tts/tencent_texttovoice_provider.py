@@ -38,6 +38,7 @@ from flaskr.api.tts.base import (
     VoiceSettings,
 )
 from flaskr.common.config import get_config
+from flaskr.common.http_client import PooledHTTPClient
 from flaskr.common.log import AppLoggerProxy
 from flaskr.service.tts import resolve_tts_billable_chars
 from flaskr.service.tts.audio_utils import (
@@ -46,6 +47,7 @@ from flaskr.service.tts.audio_utils import (
 )
 
 logger = AppLoggerProxy(logging.getLogger(__name__))
+_http_client = PooledHTTPClient("tencent_texttovoice")
 
 TENCENT_TEXTTOVOICE_HOST = "tts.tencentcloudapi.com"
 TENCENT_TEXTTOVOICE_ENDPOINT = f"https://{TENCENT_TEXTTOVOICE_HOST}"
@@ -354,7 +356,7 @@ class TencentTextToVoiceProvider(BaseTTSProvider):
             secret_key=secret_key,
         )
         try:
-            response = requests.post(
+            response = _http_client.post(
                 TENCENT_TEXTTOVOICE_ENDPOINT,
                 data=payload_json.encode("utf-8"),
                 headers=headers,
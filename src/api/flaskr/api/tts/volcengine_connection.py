@@ -0,0 +1,348 @@
+"""Warm Volcengine bidirectional TTS WebSocket connections.
+
+Opening a bidirection connection costs a TCP, TLS and WebSocket handshake
+plus a StartConnection round trip. The V3 protocol runs sessions one after
+another over one connection, so ``VolcengineConnectionManager`` keeps up to
+``VOLCENGINE_TTS_WS_POOL_SIZE`` idle connections per resource id in each
+worker process and hands each one to a single session at a time.
+
+A connection goes back to the pool only after its session finished cleanly.
+Before reuse it must still be open, must have been idle for less than
+``VOLCENGINE_TTS_WS_IDLE_SECONDS`` and must have nothing unread on its
+socket: unread bytes on an idle connection mean the server closed it.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import logging
+import os
+import select
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any
+
+from flaskr.api.tts.volcengine_protocol import (
+    Event,
+    MessageType,
+    ProtocolFrame,
+    VolcengineProtocol,
+)
+from flaskr.common.config import get_config
+from flaskr.common.log import AppLoggerProxy
+from flaskr.common.observability import record_volcengine_tts_connection
+
+try:
+    import websocket
+
+    WEBSOCKET_AVAILABLE = True
+except ImportError:
+    WEBSOCKET_AVAILABLE = False
+    websocket = None
+
+
+logger = AppLoggerProxy(logging.getLogger(__name__))
+
+DEFAULT_VOLCENGINE_TTS_WS_POOL_SIZE = 4
+DEFAULT_VOLCENGINE_TTS_WS_IDLE_SECONDS = 50
+CONNECT_TIMEOUT_SECONDS = 10
+_CLOSE_TIMEOUT_SECONDS = 1
+
+
+class VolcengineConnectionError(ValueError):
+    """The WebSocket failed or timed out underneath a connection or session."""
+
+
+@dataclass(frozen=True)
+class VolcengineConnectionKey:
+    """Endpoint, resource id and credentials a connection was opened with."""
+
+    url: str
+    resource_id: str
+    app_key: str = field(repr=False)
+    access_key: str = field(repr=False)
+
+
+def _transport_errors() -> tuple[type[BaseException], ...]:
+    return (websocket.WebSocketException, OSError)
+
+
+class VolcengineConnection:
+    """One bidirection WebSocket that has completed StartConnection."""
+
+    def __init__(self, key: VolcengineConnectionKey, ws: Any, connect_id: str) -> None:
+        """Wrap an open WebSocket; use ``open`` to create one."""
+        self.key = key
+        self.ws = ws
+        self.connect_id = connect_id
+        self.protocol = VolcengineProtocol()
+        self.session_count = 0
+        self.last_used_at = time.monotonic()
+
+    @classmethod
+    def open(
+        cls,
+        key: VolcengineConnectionKey,
+        *,
+        timeout: float = CONNECT_TIMEOUT_SECONDS,
+    ) -> VolcengineConnection:
+        """Connect to ``key.url`` and wait for ConnectionStarted."""
+        connect_id = str(uuid.uuid4())
+        header = {
+            "X-Api-App-Key": key.app_key,
+            "X-Api-Access-Key": key.access_key,
+            "X-Api-Resource-Id": key.resource_id,
+            "X-Api-Connect-Id": connect_id,
+        }
+        try:
+            ws = websocket.create_connection(
+                key.url,
+                header=header,
+                timeout=timeout,
+                skip_utf8_validation=True,
+            )
+        except _transport_errors() as exc:
+            message = f"Connection failed: {exc}"
+            raise VolcengineConnectionError(message) from exc
+
+        connection = cls(key, ws, connect_id)
+        try:
+            connection._start(timeout)
+        except Exception:
+            connection.close(graceful=False)
+            raise
+        return connection
+
+    def _start(self, timeout: float) -> None:
+        self.send(self.protocol.encode_start_connection())
+        deadline = time.monotonic() + timeout
+        while True:
+            frame = self.recv_frame(
+                deadline, timeout_message="Timeout waiting for connection"
+            )
+            if frame.event == Event.CONNECTION_STARTED:
+                logger.debug("Connection started: %s", frame.connection_id)
+                return
+            if frame.event == Event.CONNECTION_FAILED:
+                message = f"Connection failed: {frame.payload}"
+                raise VolcengineConnectionError(message)
+            if frame.message_type == MessageType.ERROR_INFORMATION:
+                message = f"Error {frame.error_code}: {frame.payload}"
+                raise VolcengineConnectionError(message)
+
+    @property
+    def connected(self) -> bool:
+        """Return whether the client side still considers the socket open."""
+        return bool(getattr(self.ws, "connected", False))
+
+    def send(self, frame: bytes) -> None:
+        """Send one binary protocol frame."""
+        try:
+            self.ws.send(frame, opcode=websocket.ABNF.OPCODE_BINARY)
+        except _transport_errors() as exc:
+            message = f"WebSocket send failed: {exc}"
+            raise VolcengineConnectionError(message) from exc
+
+    def recv_frame(self, deadline: float, *, timeout_message: str) -> ProtocolFrame:
+        """Receive and decode the next binary frame before ``deadline``."""
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise VolcengineConnectionError(timeout_message)
+            try:
+                self.ws.settimeout(remaining)
+                message = self.ws.recv()
+            except (websocket.WebSocketTimeoutException, TimeoutError) as exc:
+                raise VolcengineConnectionError(timeout_message) from exc
+            except _transport_errors() as exc:
+                message = f"WebSocket closed: {exc}"
+                raise VolcengineConnectionError(message) from exc
+            if isinstance(message, bytes):
+                return self.protocol.decode_frame(message)
+            if not message:
+                # websocket-client returns an empty string for a close frame.
+                closed_message = "WebSocket closed by server"
+                raise VolcengineConnectionError(closed_message)
+            logger.debug("Ignoring text WebSocket message: %s", message[:200])
+
+    def has_unread_data(self) -> bool:
+        """Return whether bytes are waiting on the socket of an idle connection."""
+        sock = getattr(self.ws, "sock", None)
+        if sock is None:
+            return True
+        pending = getattr(sock, "pending", None)
+        try:
+            if callable(pending) and pending():
+                return True
+            readable, _, _ = select.select([sock], [], [], 0)
+        except (OSError, ValueError):
+            return True
+        return bool(readable)
+
+    def is_reusable(self, *, now: float, idle_seconds: float) -> bool:
+        """Run the health checks a warm connection must pass before reuse."""
+        if not self.connected:
+            return False
+        if now - self.last_used_at > idle_seconds:
+            return False
+        return not self.has_unread_data()
+
+    def close(self, *, graceful: bool = True) -> None:
+        """Close the WebSocket, sending FinishConnection first when graceful."""
+        if graceful and self.connected:
+            with contextlib.suppress(Exception):
+                self.send(self.protocol.encode_finish_connection())
+        with contextlib.suppress(Exception):
+            self.ws.close(timeout=_CLOSE_TIMEOUT_SECONDS)
+
+
+class VolcengineConnectionManager:
+    """Per-process pool of warm bidirection connections per resource id."""
+
+    def __init__(self, *, pool_size: int, idle_seconds: float) -> None:
+        """Keep up to ``pool_size`` idle connections for each connection key."""
+        self.pool_size = max(int(pool_size), 0)
+        self.idle_seconds = max(float(idle_seconds), 0.0)
+        self._idle: dict[VolcengineConnectionKey, list[VolcengineConnection]] = {}
+        self._lock = threading.Lock()
+
+    def idle_count(self, key: VolcengineConnectionKey) -> int:
+        """Return how many warm connections are parked for ``key``."""
+        with self._lock:
+            return len(self._idle.get(key, ()))
+
+    def acquire(
+        self, key: VolcengineConnectionKey, *, fresh: bool = False
+    ) -> tuple[VolcengineConnection, bool]:
+        """Check out a healthy warm connection for ``key`` or open a new one.
+
+        Returns the connection and whether it was reused. ``fresh`` skips the
+        warm connections, for a retry after one of them turned out stale.
+        """
+        connection = None
+        stale: list[VolcengineConnection] = []
+        if not fresh:
+            now = time.monotonic()
+            with self._lock:
+                idle = self._idle.get(key, [])
+                # Most recently used first: it is the least likely to be stale.
+                while idle:
+                    candidate = idle.pop()
+                    if candidate.is_reusable(now=now, idle_seconds=self.idle_seconds):
+                        connection = candidate
+                        break
+                    stale.append(candidate)
+        for candidate in stale:
+            record_volcengine_tts_connection(
+                resource_id=key.resource_id, outcome="stale"
+            )
+            candidate.close(graceful=False)
+        if connection is not None:
+            record_volcengine_tts_connection(
+                resource_id=key.resource_id, outcome="reused"
+            )
+            return connection, True
+
+        connection = VolcengineConnection.open(key)
+        record_volcengine_tts_connection(resource_id=key.resource_id, outcome="opened")
+        return connection, False
+
+    def release(self, connection: VolcengineConnection, *, reusable: bool) -> None:
+        """Take back a checked-out connection and park or close it.
+
+        Pass ``reusable=False`` after any failure: the connection may still
+        hold frames of the failed session.
+        """
+        now = time.monotonic()
+        connection.last_used_at = now
+        key = connection.key
+        expired: list[VolcengineConnection] = []
+        parked = False
+        if reusable and connection.connected and self.pool_size > 0:
+            with self._lock:
+                idle = self._idle.setdefault(key, [])
+                expired = [
+                    candidate
+                    for candidate in idle
+                    if now - candidate.last_used_at > self.idle_seconds
+                ]
+                if expired:
+                    idle[:] = [
+                        candidate for candidate in idle if candidate not in expired
+                    ]
+                if len(idle) < self.pool_size:
+                    idle.append(connection)
+                    parked = True
+        for candidate in expired:
+            record_volcengine_tts_connection(
+                resource_id=key.resource_id, outcome="closed"
+            )
+            candidate.close()
+        if parked:
+            return
+        record_volcengine_tts_connection(
+            resource_id=key.resource_id,
+            outcome="closed" if reusable else "discarded",
+        )
+        connection.close(graceful=reusable)
+
+    def close_all(self) -> None:
+        """Close every parked connection."""
+        with self._lock:
+            connections = [
+                connection for idle in self._idle.values() for connection in idle
+            ]
+            self._idle = {}
+        for connection in connections:
+            connection.close()
+
+
+@dataclass
+class _ConnectionManagerState:
+    pid: int | None = None
+    manager: VolcengineConnectionManager | None = None
+
+
+_manager_state = _ConnectionManagerState()
+_manager_lock = threading.Lock()
+
+
+def _config_int(key: str, default: int, *, minimum: int) -> int:
+    try:
+        value = int(get_config(key, default))
+    except (TypeError, ValueError):
+        return default
+    return value if value >= minimum else default
+
+
+def get_volcengine_connection_manager() -> VolcengineConnectionManager:
+    """Return this process's connection manager, rebuilt after ``fork``."""
+    current_pid = os.getpid()
+    with _manager_lock:
+        if _manager_state.manager is None or _manager_state.pid != current_pid:
+            # Drop, do not close, a parent's connections: closing would send
+            # FinishConnection on sockets the parent process still uses.
+            _manager_state.manager = VolcengineConnectionManager(
+                pool_size=_config_int(
+                    "VOLCENGINE_TTS_WS_POOL_SIZE",
+                    DEFAULT_VOLCENGINE_TTS_WS_POOL_SIZE,
+                    minimum=0,
+                ),
+                idle_seconds=_config_int(
+                    "VOLCENGINE_TTS_WS_IDLE_SECONDS",
+                    DEFAULT_VOLCENGINE_TTS_WS_IDLE_SECONDS,
+                    minimum=1,
+                ),
+            )
+            _manager_state.pid = current_pid
+        return _manager_state.manager
+
+
+def close_volcengine_connections() -> None:
+    """Close this process's warm connections; the next session reopens one."""
+    with _manager_lock:
+        manager = _manager_state.manager if _manager_state.pid == os.getpid() else None
+    if manager is not None:
+        manager.close_all()
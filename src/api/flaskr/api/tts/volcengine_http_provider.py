@@ -22,8 +22,10 @@ from flaskr.api.tts.base import (
     VoiceSettings,
 )
 from flaskr.common.config import get_config, get_explicit_env_override
+from flaskr.common.http_client import PooledHTTPClient
 
 logger = logging.getLogger(__name__)
+_http_client = PooledHTTPClient("volcengine_http")
 
 VOLCENGINE_HTTP_TTS_URL = "https://openspeech.bytedance.com/api/v1/tts"
 
@@ -239,7 +241,7 @@ class VolcengineHttpTTSProvider(BaseTTSProvider):
         headers = {"Authorization": f"Bearer;{token}"}
 
         try:
-            response = requests.post(
+            response = _http_client.post(
                 VOLCENGINE_HTTP_TTS_URL,
                 json=payload,
                 headers=headers,
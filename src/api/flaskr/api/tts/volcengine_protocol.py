@@ -6,6 +6,8 @@ bidirectional TTS WebSocket API.
 Protocol Reference:
 - WebSocket URL: wss://openspeech.bytedance.com/api/v3/tts/bidirection
 - Uses custom binary frame format with 4-byte header
+- One connection runs sessions one after another (StartSession ...
+  FinishSession), so a connection can be kept open across segments
 """
 
 import gzip
@@ -84,6 +86,30 @@ class Event(IntEnum):
     TTS_SUBTITLE = 364
 
 
+# Downstream events that carry a connection id or a session id after the
+# event number. A connection hosts one session at a time, so session events
+# belong to the session the connection is currently running.
+CONNECTION_EVENTS = frozenset(
+    {
+        Event.CONNECTION_STARTED,
+        Event.CONNECTION_FAILED,
+        Event.CONNECTION_FINISHED,
+    }
+)
+SESSION_EVENTS = frozenset(
+    {
+        Event.SESSION_STARTED,
+        Event.SESSION_CANCELED,
+        Event.SESSION_FINISHED,
+        Event.SESSION_FAILED,
+        Event.TTS_SENTENCE_START,
+        Event.TTS_SENTENCE_END,
+        Event.TTS_RESPONSE,
+        Event.TTS_SUBTITLE,
+    }
+)
+
+
 class ErrorCode(IntEnum):
     """Protocol error codes."""
 
@@ -331,11 +357,7 @@ class VolcengineProtocol:
                 offset += 4
 
             # Parse connection_id or session_id based on event type
-            if event and event in [
-                Event.CONNECTION_STARTED,
-                Event.CONNECTION_FAILED,
-                Event.CONNECTION_FINISHED,
-            ]:
+            if event in CONNECTION_EVENTS:
                 # Connection events have connection_id
                 if len(data) >= offset + 4:
                     conn_id_len = struct.unpack(">I", data[offset : offset + 4])[0]
@@ -347,21 +369,7 @@ class VolcengineProtocol:
                         offset += conn_id_len
                         self.connection_id = connection_id
             # Session events have session_id
-            elif (
-                event
-                and event
-                in [
-                    Event.SESSION_STARTED,
-                    Event.SESSION_CANCELED,
-                    Event.SESSION_FINISHED,
-                    Event.SESSION_FAILED,
-                    Event.TTS_SENTENCE_START,
-                    Event.TTS_SENTENCE_END,
-                    Event.TTS_RESPONSE,
-                    Event.TTS_SUBTITLE,
-                ]
-                and len(data) >= offset + 4
-            ):
+            elif event in SESSION_EVENTS and len(data) >= offset + 4:
                 sess_id_len = struct.unpack(">I", data[offset : offset + 4])[0]
                 offset += 4
                 if len(data) >= offset + sess_id_len:
@@ -6,12 +6,16 @@ WebSocket TTS API (ByteDance/Doubao).
 API Reference:
 - WebSocket URL: wss://openspeech.bytedance.com/api/v3/tts/bidirection
 - Uses custom binary protocol for frame encoding/decoding
+- Each segment runs one session over a warm connection checked out from
+  ``volcengine_connection``, so only the first segment pays the handshake
 """
 
 import logging
 import re
 import threading
+import time
 import uuid
+from dataclasses import dataclass, field
 from typing import Any
 
 from flaskr.api.tts.base import (
@@ -22,27 +26,28 @@ from flaskr.api.tts.base import (
     TTSResult,
     VoiceSettings,
 )
+from flaskr.api.tts.volcengine_connection import (
+    WEBSOCKET_AVAILABLE,
+    VolcengineConnection,
+    VolcengineConnectionError,
+    VolcengineConnectionKey,
+    get_volcengine_connection_manager,
+)
 from flaskr.api.tts.volcengine_protocol import (
     Event,
     MessageType,
+    ProtocolFrame,
     VolcengineProtocol,
 )
 from flaskr.common.config import get_config
 from flaskr.common.log import AppLoggerProxy
 
-try:
-    import websocket
-
-    WEBSOCKET_AVAILABLE = True
-except ImportError:
-    WEBSOCKET_AVAILABLE = False
-    websocket = None
-
-
 logger = AppLoggerProxy(logging.getLogger(__name__))
 
 # Volcengine TTS WebSocket endpoint
 VOLCENGINE_TTS_WS_URL = "wss://openspeech.bytedance.com/api/v3/tts/bidirection"
+SESSION_START_TIMEOUT_SECONDS = 10
+SESSION_FINISH_TIMEOUT_SECONDS = 60
 
 
 def _timestamp_seconds_to_ms(value: Any) -> int:
@@ -163,6 +168,83 @@ def _volcengine_uses_subtitle_event(resource_id: str) -> bool:
     return normalized_resource_id.startswith(("seed-tts-2", "seed-icl-2"))
 
 
+@dataclass
+class _VolcengineSession:
+    """Audio, subtitles and state collected for one StartSession."""
+
+    session_id: str
+    started: bool = False
+    finished: bool = False
+    audio_chunks: list[bytes] = field(default_factory=list)
+    subtitle_cues: list[dict[str, Any]] = field(default_factory=list)
+    total_duration_ms: int = 0
+
+    def apply(self, frame: ProtocolFrame) -> None:
+        """Record one downstream frame; raise if it fails the session."""
+        if frame.session_id and frame.session_id != self.session_id:
+            logger.debug("Ignoring frame of another session: %s", frame.session_id)
+            return
+
+        if frame.event == Event.SESSION_STARTED:
+            logger.debug("Session started: %s", frame.session_id)
+            self.started = True
+
+        elif frame.event == Event.SESSION_FINISHED:
+            logger.debug("Session finished: %s", frame.session_id)
+            # Extract usage info if available
+            if isinstance(frame.payload, dict):
+                usage = frame.payload.get("usage", {})
+                if usage:
+                    logger.info("TTS usage: %s", usage)
+            self.finished = True
+
+        elif frame.event == Event.SESSION_FAILED:
+            error_message = f"Session failed: {frame.payload}"
+            logger.error(error_message)
+            raise ValueError(error_message)
+
+        elif frame.event in (Event.CONNECTION_FAILED, Event.CONNECTION_FINISHED):
+            error_message = f"Connection closed during session: {frame.payload}"
+            logger.error(error_message)
+            raise VolcengineConnectionError(error_message)
+
+        elif frame.event == Event.TTS_RESPONSE:
+            # Audio data received
+            if frame.payload and isinstance(frame.payload, bytes):
+                self.audio_chunks.append(frame.payload)
+                logger.debug("Received audio chunk: %s bytes", len(frame.payload))
+
+        elif frame.event == Event.TTS_SENTENCE_START:
+            logger.debug("Sentence start: %s", frame.payload)
+
+        elif frame.event == Event.TTS_SENTENCE_END:
+            logger.debug("Sentence end: %s", frame.payload)
+            # Extract duration if available
+            if isinstance(frame.payload, dict):
+                duration = frame.payload.get("res_params", {}).get("duration_ms", 0)
+                self.total_duration_ms += duration
+                self.subtitle_cues.extend(
+                    _extract_volcengine_subtitle_cues(
+                        frame.payload,
+                        segment_index=len(self.subtitle_cues),
+                    )
+                )
+
+        elif frame.event == Event.TTS_SUBTITLE:
+            logger.debug("Subtitle: %s", frame.payload)
+            self.subtitle_cues.extend(
+                _extract_volcengine_subtitle_cues(
+                    frame.payload,
+                    segment_index=len(self.subtitle_cues),
+                )
+            )
+
+        elif frame.message_type == MessageType.ERROR_INFORMATION:
+            error_message = f"Error {frame.error_code}: {frame.payload}"
+            logger.error(error_message)
+            raise ValueError(error_message)
+
+
 # Volcengine TTS models
 VOLCENGINE_MODELS = [
     # Resource IDs used in the WebSocket handshake header (X-Api-Resource-Id).
@@ -328,7 +410,7 @@ class VolcengineTTSProvider(BaseTTSProvider):
         """Initialize provider-owned protocol and synchronization state.
 
         Creates a ``VolcengineProtocol`` and a lock for the provider instance;
-        synthesis currently constructs request-local protocol objects.
+        synthesis uses the protocol object of each pooled connection.
         """
         self._protocol = VolcengineProtocol()
         self._lock = threading.Lock()
@@ -489,225 +571,57 @@ class VolcengineTTSProvider(BaseTTSProvider):
             )
             raise ValueError(exception_message)
 
-        # Generate unique IDs
-        connect_id = str(uuid.uuid4())
-        session_id = str(uuid.uuid4()).replace("-", "")
-
-        # Collect audio data
-        audio_chunks: list[bytes] = []
-        subtitle_cues: list[dict[str, Any]] = []
-        error_message: str | None = None
-        connection_established = threading.Event()
-        session_started = threading.Event()
-        session_finished = threading.Event()
-        total_duration_ms = 0
-
-        # Create WebSocket connection
-        ws_headers = {
-            "X-Api-App-Key": app_key,
-            "X-Api-Access-Key": access_key,
-            "X-Api-Resource-Id": resource_id,
-            "X-Api-Connect-Id": connect_id,
-        }
-
-        protocol = VolcengineProtocol()
-
-        def on_message(ws, message):
-            _ = ws
-            nonlocal error_message, total_duration_ms
-
-            try:
-                if isinstance(message, bytes):
-                    frame = protocol.decode_frame(message)
-
-                    if frame.event == Event.CONNECTION_STARTED:
-                        logger.debug("Connection started: %s", frame.connection_id)
-                        connection_established.set()
-
-                    elif frame.event == Event.CONNECTION_FAILED:
-                        error_message = f"Connection failed: {frame.payload}"
-                        logger.error(error_message)
-                        connection_established.set()
-                        session_finished.set()
-
-                    elif frame.event == Event.SESSION_STARTED:
-                        logger.debug("Session started: %s", frame.session_id)
-                        session_started.set()
-
-                    elif frame.event == Event.SESSION_FINISHED:
-                        logger.debug("Session finished: %s", frame.session_id)
-                        # Extract usage info if available
-                        if isinstance(frame.payload, dict):
-                            usage = frame.payload.get("usage", {})
-                            if usage:
-                                logger.info("TTS usage: %s", usage)
-                        session_finished.set()
-
-                    elif frame.event == Event.SESSION_FAILED:
-                        error_message = f"Session failed: {frame.payload}"
-                        logger.error(error_message)
-                        session_started.set()
-                        session_finished.set()
-
-                    elif frame.event == Event.TTS_RESPONSE:
-                        # Audio data received
-                        if frame.payload and isinstance(frame.payload, bytes):
-                            audio_chunks.append(frame.payload)
-                            logger.debug(
-                                "Received audio chunk: %s bytes", len(frame.payload)
-                            )
-
-                    elif frame.event == Event.TTS_SENTENCE_START:
-                        logger.debug("Sentence start: %s", frame.payload)
-
-                    elif frame.event == Event.TTS_SENTENCE_END:
-                        logger.debug("Sentence end: %s", frame.payload)
-                        # Extract duration if available
-                        if isinstance(frame.payload, dict):
-                            duration = frame.payload.get("res_params", {}).get(
-                                "duration_ms", 0
-                            )
-                            total_duration_ms += duration
-                            subtitle_cues.extend(
-                                _extract_volcengine_subtitle_cues(
-                                    frame.payload,
-                                    segment_index=len(subtitle_cues),
-                                )
-                            )
-
-                    elif frame.event == Event.TTS_SUBTITLE:
-                        logger.debug("Subtitle: %s", frame.payload)
-                        subtitle_cues.extend(
-                            _extract_volcengine_subtitle_cues(
-                                frame.payload,
-                                segment_index=len(subtitle_cues),
-                            )
-                        )
-
-                    elif frame.message_type == MessageType.ERROR_INFORMATION:
-                        error_message = f"Error {frame.error_code}: {frame.payload}"
-                        logger.error(error_message)
-                        session_started.set()
-                        session_finished.set()
-
-            except Exception as e:
-                logger.exception("Error processing message")
-                error_message = str(e)
-                session_started.set()
-                session_finished.set()
-
-        def on_error(ws, error):
-            _ = ws
-            nonlocal error_message
-            error_message = str(error)
-            logger.error("WebSocket error: %s", error)
-            connection_established.set()
-            session_started.set()
-            session_finished.set()
-
-        def on_close(ws, close_status_code, close_msg):
-            _ = ws
-            logger.debug("WebSocket closed: %s - %s", close_status_code, close_msg)
-            connection_established.set()
-            session_finished.set()
-
-        def on_open(ws):
-            logger.debug("WebSocket opened, sending StartConnection")
-            # Send StartConnection
-            ws.send(
-                protocol.encode_start_connection(), opcode=websocket.ABNF.OPCODE_BINARY
-            )
-
-        # Create and run WebSocket
-        ws = websocket.WebSocketApp(
-            VOLCENGINE_TTS_WS_URL,
-            header=ws_headers,
-            on_message=on_message,
-            on_error=on_error,
-            on_close=on_close,
-            on_open=on_open,
-        )
-
-        # Run WebSocket in a separate thread
-        ws_thread = threading.Thread(
-            target=ws.run_forever, kwargs={"skip_utf8_validation": True}
+        key = VolcengineConnectionKey(
+            url=VOLCENGINE_TTS_WS_URL,
+            resource_id=resource_id,
+            app_key=app_key,
+            access_key=access_key,
         )
-        ws_thread.daemon = True
-        ws_thread.start()
-
-        try:
-            # Wait for connection to be established
-            if not connection_established.wait(timeout=10):
-                exception_message = "Timeout waiting for connection"
-                raise ValueError(exception_message)
-
-            if error_message:
-                raise ValueError(error_message)
-
-            # Send StartSession
-            logger.debug(
-                "Sending StartSession with speaker=%s", voice_settings.voice_id
-            )
-            start_session_frame = protocol.encode_start_session(
-                session_id=session_id,
-                speaker=voice_settings.voice_id,
-                audio_format=audio_settings.format,
-                sample_rate=audio_settings.sample_rate,
-                speed=voice_settings.speed,
-                pitch=voice_settings.pitch,
-                volume=voice_settings.volume,
-                emotion=voice_settings.emotion,
-                model=model_version,
-                enable_timestamp=not use_subtitle_event,
-                enable_subtitle=use_subtitle_event,
-            )
-            ws.send(start_session_frame, opcode=websocket.ABNF.OPCODE_BINARY)
-
-            if not session_started.wait(timeout=10):
-                if error_message:
-                    raise ValueError(error_message)
-                exception_message = "Timeout waiting for TTS session to start"
-                raise ValueError(exception_message)
-
-            if error_message:
-                raise ValueError(error_message)
-
-            # Send TaskRequest with text
-            logger.debug("Sending TaskRequest with text length=%s", len(text))
-            task_request_frame = protocol.encode_task_request(session_id, text)
-            ws.send(task_request_frame, opcode=websocket.ABNF.OPCODE_BINARY)
-
-            # Send FinishSession
-            logger.debug("Sending FinishSession")
-            finish_session_frame = protocol.encode_finish_session(session_id)
-            ws.send(finish_session_frame, opcode=websocket.ABNF.OPCODE_BINARY)
-
-            # Wait for session to finish
-            if not session_finished.wait(timeout=60):
-                exception_message = "Timeout waiting for TTS synthesis"
-                raise ValueError(exception_message)
-
-            if error_message:
-                raise ValueError(error_message)
-
-            # Send FinishConnection
-            ws.send(
-                protocol.encode_finish_connection(), opcode=websocket.ABNF.OPCODE_BINARY
-            )
-
-        finally:
-            # Close WebSocket
-            ws.close()
-            ws_thread.join(timeout=5)
-
+        manager = get_volcengine_connection_manager()
+        fresh = False
+        while True:
+            connection, reused = manager.acquire(key, fresh=fresh)
+            session = _VolcengineSession(session_id=uuid.uuid4().hex)
+            try:
+                self._run_session(
+                    connection,
+                    session,
+                    text=text,
+                    voice_settings=voice_settings,
+                    audio_settings=audio_settings,
+                    model_version=model_version,
+                    use_subtitle_event=use_subtitle_event,
+                )
+            except VolcengineConnectionError as exc:
+                manager.release(connection, reusable=False)
+                # A warm connection that dies before SessionStarted never saw
+                # the text, so one retry on a new connection is safe.
+                if reused and not session.started:
+                    logger.info(
+                        "Volcengine TTS warm connection failed before the session "
+                        "started; reconnecting: %s",
+                        exc,
+                    )
+                    fresh = True
+                    continue
+                raise
+            except Exception:
+                manager.release(connection, reusable=False)
+                raise
+            manager.release(connection, reusable=True)
+            break
+
+        audio_chunks = session.audio_chunks
+        subtitle_cues = session.subtitle_cues
+        total_duration_ms = session.total_duration_ms
         if not audio_chunks:
             logger.warning(
                 "Volcengine TTS session finished with no audio: resource_id=%s speaker=%s text_len=%s session_id=%s connect_id=%s",
                 resource_id,
                 voice_settings.voice_id,
                 len(text or ""),
-                session_id,
-                connect_id,
+                session.session_id,
+                connection.connect_id,
             )
             exception_message = "No audio data received"
             raise ValueError(exception_message)
@@ -745,6 +659,58 @@ class VolcengineTTSProvider(BaseTTSProvider):
             subtitle_cues=subtitle_cues,
         )
 
+    def _run_session(
+        self,
+        connection: VolcengineConnection,
+        session: _VolcengineSession,
+        *,
+        text: str,
+        voice_settings: VoiceSettings,
+        audio_settings: AudioSettings,
+        model_version: str,
+        use_subtitle_event: bool,
+    ) -> None:
+        """Run StartSession, TaskRequest and FinishSession over ``connection``."""
+        protocol = connection.protocol
+        logger.debug("Sending StartSession with speaker=%s", voice_settings.voice_id)
+        connection.send(
+            protocol.encode_start_session(
+                session_id=session.session_id,
+                speaker=voice_settings.voice_id,
+                audio_format=audio_settings.format,
+                sample_rate=audio_settings.sample_rate,
+                speed=voice_settings.speed,
+                pitch=voice_settings.pitch,
+                volume=voice_settings.volume,
+                emotion=voice_settings.emotion,
+                model=model_version,
+                enable_timestamp=not use_subtitle_event,
+                enable_subtitle=use_subtitle_event,
+            )
+        )
+        deadline = time.monotonic() + SESSION_START_TIMEOUT_SECONDS
+        while not session.started:
+            session.apply(
+                connection.recv_frame(
+                    deadline,
+                    timeout_message="Timeout waiting for TTS session to start",
+                )
+            )
+        connection.session_count += 1
+
+        logger.debug("Sending TaskRequest with text length=%s", len(text))
+        connection.send(protocol.encode_task_request(session.session_id, text))
+        logger.debug("Sending FinishSession")
+        connection.send(protocol.encode_finish_session(session.session_id))
+
+        deadline = time.monotonic() + SESSION_FINISH_TIMEOUT_SECONDS
+        while not session.finished:
+            session.apply(
+                connection.recv_frame(
+                    deadline, timeout_message="Timeout waiting for TTS synthesis"
+                )
+            )
+
     def get_provider_config(self) -> ProviderConfig:
         """Get Volcengine provider configuration for frontend."""
         return ProviderConfig(
@@ -29,6 +29,10 @@ class CacheProvider(Protocol):
         """Return the stored value for a key."""
         raise NotImplementedError
 
+    def mget(self, *keys: str) -> list:
+        """Return the stored values for several keys in one round trip."""
+        raise NotImplementedError
+
     def getex(self, key: str, ex: int | None = None, px: int | None = None):
         """Return a cached value and refresh expiration only when a TTL is supplied."""
         raise NotImplementedError
@@ -68,8 +72,13 @@ class CacheProvider(Protocol):
         key: str,
         timeout: int | None = None,
         blocking_timeout: int | None = None,
+        *,
+        thread_local: bool = True,
     ):
-        """Create a lock for the supplied key."""
+        """Create a lock for the supplied key.
+
+        ``thread_local=False`` lets another thread release the lock.
+        """
         raise NotImplementedError
 
 
@@ -94,6 +103,11 @@ class _DynamicRedisCacheProvider:
     def get(self, key: str):
         return self._client().get(key)
 
+    def mget(self, *keys: str) -> list:
+        if not keys:
+            return []
+        return list(self._client().mget(keys))
+
     def getex(self, key: str, ex: int | None = None, px: int | None = None):
         return self._client().getex(key, ex=ex, px=px)
 
@@ -130,9 +144,14 @@ class _DynamicRedisCacheProvider:
         key: str,
         timeout: int | None = None,
         blocking_timeout: int | None = None,
+        *,
+        thread_local: bool = True,
     ):
         return self._client().lock(
-            key, timeout=timeout, blocking_timeout=blocking_timeout
+            key,
+            timeout=timeout,
+            blocking_timeout=blocking_timeout,
+            thread_local=thread_local,
         )
 
 
@@ -202,6 +221,11 @@ class InMemoryCacheProvider:
             entry = self._store.get(key)
             return entry.value if entry is not None else None
 
+    def mget(self, *keys: str) -> list:
+        """Return the stored values for several keys."""
+        with self._mu:
+            return [self.get(key) for key in keys]
+
     def getex(self, key: str, ex: int | None = None, px: int | None = None):
         """Return a cached value and update its expiration."""
         with self._mu:
@@ -291,9 +315,12 @@ class InMemoryCacheProvider:
         key: str,
         timeout: int | None = None,
         blocking_timeout: int | None = None,
+        *,
+        thread_local: bool = True,
     ):
         """Create a process-local fallback lock for the supplied key."""
-        _ = (timeout, blocking_timeout)
+        # threading.Lock may be released by any thread, so thread_local is moot.
+        _ = (timeout, blocking_timeout, thread_local)
         with self._mu:
             lock = self._locks.get(key)
             if lock is None:
@@ -325,6 +352,10 @@ class FallbackCacheProvider:
         """Return the stored value for a key."""
         return self._call("get", key)
 
+    def mget(self, *keys: str) -> list:
+        """Return the stored values for several keys in one round trip."""
+        return self._call("mget", *keys)
+
     def getex(self, key: str, ex: int | None = None, px: int | None = None):
         """Return a cached value and update its expiration."""
         return self._call("getex", key, ex=ex, px=px)
@@ -374,10 +405,16 @@ class FallbackCacheProvider:
         key: str,
         timeout: int | None = None,
         blocking_timeout: int | None = None,
+        *,
+        thread_local: bool = True,
     ):
         """Create a lock, falling back to process-local scope without Redis."""
         return self._call(
-            "lock", key, timeout=timeout, blocking_timeout=blocking_timeout
+            "lock",
+            key,
+            timeout=timeout,
+            blocking_timeout=blocking_timeout,
+            thread_local=thread_local,
         )
 
 
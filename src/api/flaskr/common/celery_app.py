@@ -24,6 +24,7 @@ _DEFAULT_BILLING_LOW_BALANCE_CRON = "0 * * * *"
 _DEFAULT_BILLING_CREDIT_EXPIRING_CRON = "0 * * * *"
 _DEFAULT_BILLING_DAILY_USAGE_METRICS_CRON = "15 1 * * *"
 _DEFAULT_BILLING_DAILY_LEDGER_SUMMARY_CRON = "30 1 * * *"
+_DEFAULT_BILLING_WALLET_PROJECTION_VERIFY_CRON = "40 3 * * *"
 
 
 @dataclass(slots=True)
@@ -196,6 +197,15 @@ def _build_billing_beat_schedule(flask_app: Flask) -> dict[str, Any]:
                 _DEFAULT_BILLING_DAILY_LEDGER_SUMMARY_CRON,
             ),
         },
+        "billing.verify_wallet_projections.schedule": {
+            "task": "billing.verify_wallet_projections",
+            "schedule": _resolve_billing_crontab(
+                flask_app,
+                "BILLING_WALLET_PROJECTION_VERIFY_CRON",
+                _DEFAULT_BILLING_WALLET_PROJECTION_VERIFY_CRON,
+            ),
+            "kwargs": {"repair": True},
+        },
     }
 
 
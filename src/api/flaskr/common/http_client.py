@@ -0,0 +1,250 @@
+"""Per-process pooled HTTP clients for outbound provider calls.
+
+Module-level ``requests.post`` opens a fresh TCP connection and TLS session
+for every call. A ``PooledHTTPClient`` instead sends through one
+``requests.Session`` per client name and process, whose adapter keeps up to
+``HTTP_CLIENT_POOL_SIZE`` idle keep-alive connections per host
+(``HTTP_CLIENT_POOL_SIZES`` overrides it per client name).
+
+Sessions are rebuilt after ``fork`` — the same pid guard the TTS executor
+uses — so a worker never shares a parent's sockets.
+
+Failures to open a connection are retried for any method, because nothing
+was sent. Other connection errors, such as a pooled socket the server closed
+while the request was in flight, are retried only for idempotent methods: a
+POST may already have been processed and billed. Retries draw on a budget:
+each request earns ``HTTP_CLIENT_RETRY_BUDGET_RATIO`` retry tokens, so an
+outage cannot multiply provider traffic. Timeouts and TLS errors are never
+retried, and neither is anything that got an HTTP response.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+from dataclasses import dataclass, field
+from typing import Any
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import NewConnectionError
+
+from .config import get_config
+from .observability import record_http_client_retry
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HTTP_CLIENT_POOL_SIZE = 10
+DEFAULT_HTTP_CLIENT_RETRY_BUDGET_RATIO = 0.1
+# Hosts whose connection pools one client keeps; provider clients talk to one
+# or two hosts, the rest is headroom for regional endpoints.
+_HOST_POOLS_PER_CLIENT = 8
+_MAX_RETRIES_PER_REQUEST = 2
+_IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+# A fresh process starts with some retry tokens so it can ride out a burst
+# of stale connections before it has earned a budget of its own.
+_RETRY_BUDGET_INITIAL_TOKENS = 10.0
+_RETRY_BUDGET_MAX_TOKENS = 100.0
+
+
+class RetryBudget:
+    """Token bucket that caps retries to a share of recent requests."""
+
+    def __init__(
+        self,
+        *,
+        ratio: float,
+        initial_tokens: float = _RETRY_BUDGET_INITIAL_TOKENS,
+        max_tokens: float = _RETRY_BUDGET_MAX_TOKENS,
+    ) -> None:
+        """Start with ``initial_tokens`` and earn ``ratio`` per request."""
+        self.ratio = max(float(ratio), 0.0)
+        self.max_tokens = max(float(max_tokens), 0.0)
+        self._tokens = min(float(initial_tokens), self.max_tokens)
+        self._lock = threading.Lock()
+
+    @property
+    def tokens(self) -> float:
+        """Return the retry tokens currently available."""
+        with self._lock:
+            return self._tokens
+
+    def record_request(self) -> None:
+        """Earn retry tokens for one first attempt."""
+        with self._lock:
+            self._tokens = min(self._tokens + self.ratio, self.max_tokens)
+
+    def try_spend(self) -> bool:
+        """Take one retry token, or return False when the budget is spent."""
+        with self._lock:
+            if self._tokens < 1.0:
+                return False
+            self._tokens -= 1.0
+            return True
+
+
+@dataclass
+class _PooledSession:
+    session: requests.Session
+    budget: RetryBudget
+    pool_size: int
+
+
+@dataclass
+class _HTTPClientState:
+    pid: int | None = None
+    sessions: dict[str, _PooledSession] = field(default_factory=dict)
+
+
+_http_client_state = _HTTPClientState()
+_http_client_lock = threading.Lock()
+
+
+def _coerce_positive_int(value: Any, default: int) -> int:
+    try:
+        parsed = int(value)
+    except (TypeError, ValueError):
+        return default
+    return parsed if parsed > 0 else default
+
+
+def resolve_http_pool_size(name: str) -> int:
+    """Return the per-host keep-alive pool size configured for ``name``."""
+    default = _coerce_positive_int(
+        get_config("HTTP_CLIENT_POOL_SIZE", DEFAULT_HTTP_CLIENT_POOL_SIZE),
+        DEFAULT_HTTP_CLIENT_POOL_SIZE,
+    )
+    raw_overrides = get_config("HTTP_CLIENT_POOL_SIZES", "") or ""
+    if isinstance(raw_overrides, dict):
+        overrides = raw_overrides
+    else:
+        try:
+            overrides = json.loads(raw_overrides) if raw_overrides else {}
+        except (TypeError, ValueError):
+            logger.warning("Ignoring invalid HTTP_CLIENT_POOL_SIZES")
+            overrides = {}
+    if not isinstance(overrides, dict):
+        return default
+    return _coerce_positive_int(overrides.get(name), default)
+
+
+def _resolve_retry_budget_ratio() -> float:
+    raw = get_config(
+        "HTTP_CLIENT_RETRY_BUDGET_RATIO", DEFAULT_HTTP_CLIENT_RETRY_BUDGET_RATIO
+    )
+    try:
+        return min(max(float(raw), 0.0), 1.0)
+    except (TypeError, ValueError):
+        return DEFAULT_HTTP_CLIENT_RETRY_BUDGET_RATIO
+
+
+def _build_pooled_session(name: str) -> _PooledSession:
+    pool_size = resolve_http_pool_size(name)
+    adapter = HTTPAdapter(
+        pool_connections=_HOST_POOLS_PER_CLIENT,
+        pool_maxsize=pool_size,
+        max_retries=0,
+    )
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return _PooledSession(
+        session=session,
+        budget=RetryBudget(ratio=_resolve_retry_budget_ratio()),
+        pool_size=pool_size,
+    )
+
+
+def _get_pooled_session(name: str) -> _PooledSession:
+    current_pid = os.getpid()
+    with _http_client_lock:
+        state = _http_client_state
+        if state.pid != current_pid:
+            # Drop, do not close, the parent's sessions: closing would shut
+            # sockets the parent process is still using.
+            state.sessions = {}
+            state.pid = current_pid
+        pooled = state.sessions.get(name)
+        if pooled is None:
+            pooled = _build_pooled_session(name)
+            state.sessions[name] = pooled
+        return pooled
+
+
+def close_http_clients() -> None:
+    """Close this process's pooled sessions; the next request reopens them."""
+    with _http_client_lock:
+        state = _http_client_state
+        sessions = list(state.sessions.values()) if state.pid == os.getpid() else []
+        state.sessions = {}
+    for pooled in sessions:
+        pooled.session.close()
+
+
+def _failed_before_sending(exc: requests.ConnectionError) -> bool:
+    # requests wraps urllib3's MaxRetryError, whose reason is the real error.
+    reason = exc.args[0] if exc.args else None
+    reason = getattr(reason, "reason", reason)
+    return isinstance(reason, NewConnectionError)
+
+
+def _is_retryable(exc: requests.RequestException, method: str) -> bool:
+    if isinstance(exc, (requests.Timeout, requests.exceptions.SSLError)):
+        return False
+    if not isinstance(exc, requests.ConnectionError):
+        return False
+    return _failed_before_sending(exc) or method.upper() in _IDEMPOTENT_METHODS
+
+
+class PooledHTTPClient:
+    """``requests``-style client that reuses this process's connections.
+
+    Instances are cheap handles; every instance with the same ``name`` shares
+    one session and retry budget per process. Request bodies must be
+    replayable (bytes, str or ``json=``) because retries resend them.
+    """
+
+    def __init__(self, name: str) -> None:
+        """Bind the handle to the pool and budget named ``name``."""
+        self.name = name
+
+    def request(self, method: str, url: str, **kwargs: Any) -> requests.Response:
+        """Send a request like ``requests.request`` over a pooled connection."""
+        pooled = _get_pooled_session(self.name)
+        pooled.budget.record_request()
+        retries = 0
+        while True:
+            try:
+                return pooled.session.request(method, url, **kwargs)
+            except requests.RequestException as exc:
+                if (
+                    not _is_retryable(exc, method)
+                    or retries >= _MAX_RETRIES_PER_REQUEST
+                ):
+                    raise
+                if not pooled.budget.try_spend():
+                    record_http_client_retry(
+                        client=self.name, outcome="budget_exhausted"
+                    )
+                    raise
+                retries += 1
+                record_http_client_retry(client=self.name, outcome="retried")
+                logger.info(
+                    "Retrying %s %s for HTTP client %s after connection error "
+                    "(retry %s): %s",
+                    method,
+                    url.split("?", 1)[0],
+                    self.name,
+                    retries,
+                    exc,
+                )
+
+    def get(self, url: str, **kwargs: Any) -> requests.Response:
+        """Send a GET request."""
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs: Any) -> requests.Response:
+        """Send a POST request."""
+        return self.request("POST", url, **kwargs)
@@ -15,9 +15,12 @@ import pytz
 import requests
 from flask import Flask, request
 
+from .http_client import PooledHTTPClient
 from .observability import current_trace_ids
 from .request_context import thread_local
 
+_http_client = PooledHTTPClient("feishu_log")
+
 
 class AppLoggerProxy:
     """Proxy application logging through the configured logger."""
@@ -139,7 +142,7 @@ class FeishuLogHandler(logging.Handler):
                 "msg_type": "text",
                 "content": {"text": self._build_message_text(log_entry)},
             }
-            response = requests.post(self.webhook_url, json=payload, timeout=5)
+            response = _http_client.post(self.webhook_url, json=payload, timeout=5)
             response.raise_for_status()
         except requests.exceptions.RequestException as exc:
             self._report_delivery_failure(exc)
@@ -11,7 +11,13 @@ from opentelemetry.sdk.resources import Resource
 from opentelemetry.sdk.trace import TracerProvider
 from opentelemetry.sdk.trace.export import BatchSpanProcessor
 from opentelemetry.trace import SpanKind, Status, StatusCode
-from prometheus_client import CONTENT_TYPE_LATEST, Counter, Histogram, generate_latest
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+)
 
 from .request_context import thread_local
 
@@ -31,6 +37,43 @@ CREDIT_NOTIFICATION_EVENTS = Counter(
     "Credit notification lifecycle events.",
     ("event", "notification_type", "channel", "status"),
 )
+RUN_SCRIPT_PRODUCER_POOL_ACTIVE = Gauge(
+    "ai_shifu_run_script_producer_pool_active",
+    "run_script stream producers currently running in this process.",
+)
+RUN_SCRIPT_PRODUCER_POOL_CAPACITY = Gauge(
+    "ai_shifu_run_script_producer_pool_capacity",
+    "Maximum concurrent run_script stream producers in this process.",
+)
+RUN_SCRIPT_PRODUCER_POOL_REJECTED = Counter(
+    "ai_shifu_run_script_producer_pool_rejected_total",
+    "run_script streams rejected because the producer pool was full.",
+)
+HTTP_CLIENT_RETRIES = Counter(
+    "ai_shifu_http_client_retries_total",
+    "Pooled HTTP client connection-error retries by outcome "
+    "(retried, budget_exhausted).",
+    ("client", "outcome"),
+)
+TTS_AUDIO_CACHE_LOOKUPS = Counter(
+    "ai_shifu_tts_audio_cache_lookups_total",
+    "Synthesized audio cache lookups by result (hit, miss, error).",
+    ("provider", "result"),
+)
+TTS_AUDIO_CACHE_EVICTIONS = Counter(
+    "ai_shifu_tts_audio_cache_evictions_total",
+    "Synthesized audio cache entries evicted to stay within the size budget.",
+)
+TTS_AUDIO_CACHE_BYTES = Gauge(
+    "ai_shifu_tts_audio_cache_bytes",
+    "Audio bytes indexed by the synthesized audio cache at the last size check.",
+)
+VOLCENGINE_TTS_CONNECTIONS = Counter(
+    "ai_shifu_volcengine_tts_connections_total",
+    "Volcengine bidirectional TTS WebSocket connection events by outcome "
+    "(opened, reused, stale, discarded, closed).",
+    ("resource_id", "outcome"),
+)
 
 
 def _bool_config(app: Flask, key: str, default: bool = False) -> bool:
@@ -184,6 +227,65 @@ def record_credit_notification_event(
         return
 
 
+def record_run_script_producer_pool(
+    *,
+    active: int,
+    capacity: int,
+    rejected: bool = False,
+) -> None:
+    """Record run_script producer pool occupancy."""
+    try:
+        RUN_SCRIPT_PRODUCER_POOL_ACTIVE.set(max(0, int(active)))
+        RUN_SCRIPT_PRODUCER_POOL_CAPACITY.set(max(0, int(capacity)))
+        if rejected:
+            RUN_SCRIPT_PRODUCER_POOL_REJECTED.inc()
+    except Exception:
+        return
+
+
+def record_http_client_retry(*, client: str, outcome: str) -> None:
+    """Record one pooled HTTP client retry decision."""
+    try:
+        HTTP_CLIENT_RETRIES.labels(
+            str(client or "unknown"),
+            str(outcome or "unknown"),
+        ).inc()
+    except Exception:
+        return
+
+
+def record_tts_audio_cache_lookup(*, provider: str, result: str) -> None:
+    """Record one synthesized audio cache lookup."""
+    try:
+        TTS_AUDIO_CACHE_LOOKUPS.labels(
+            str(provider or "unknown"),
+            str(result or "unknown"),
+        ).inc()
+    except Exception:
+        return
+
+
+def record_tts_audio_cache_size(*, total_bytes: int, evicted: int = 0) -> None:
+    """Record the synthesized audio cache size and evicted entries."""
+    try:
+        TTS_AUDIO_CACHE_BYTES.set(max(0, int(total_bytes)))
+        if evicted > 0:
+            TTS_AUDIO_CACHE_EVICTIONS.inc(int(evicted))
+    except Exception:
+        return
+
+
+def record_volcengine_tts_connection(*, resource_id: str, outcome: str) -> None:
+    """Record one Volcengine TTS WebSocket connection event."""
+    try:
+        VOLCENGINE_TTS_CONNECTIONS.labels(
+            str(resource_id or "unknown"),
+            str(outcome or "unknown"),
+        ).inc()
+    except Exception:
+        return
+
+
 def _request_path_label() -> str:
     if request.url_rule is not None and request.url_rule.rule:
         return request.url_rule.rule
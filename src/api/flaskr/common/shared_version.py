@@ -0,0 +1,60 @@
+"""Redis version counters that invalidate per-process caches across workers.
+
+A process-local cache remembers the version it was filled under and compares
+it with the shared counter; writers bump the counter after committing. Both
+helpers fail open: without Redis, or when a Redis call fails, reads return
+None so the caller falls back to its own expiry, and bumps only log.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from flask import Flask
+
+
+def read_shared_version(app: Flask, key: str, *, label: str) -> str | None:
+    """Return the counter stored at ``key``, or None when Redis is unavailable.
+
+    A missing key reads as ``"0"``. ``label`` names the cache in the warning
+    logged when the read fails.
+    """
+    try:
+        from flaskr.dao import get_redis_client
+
+        redis_client = get_redis_client()
+        if redis_client is None:
+            return None
+        raw = redis_client.get(key)
+    except Exception as exc:
+        app.logger.warning(
+            "%s version read failed, failing open: key=%s error=%s",
+            label,
+            key,
+            repr(exc),
+        )
+        return None
+    if raw is None:
+        return "0"
+    if isinstance(raw, bytes):
+        return raw.decode("utf-8", errors="replace")
+    return str(raw)
+
+
+def bump_shared_version(app: Flask, key: str, *, label: str) -> None:
+    """Increment the counter at ``key`` so other workers drop their copies."""
+    try:
+        from flaskr.dao import get_redis_client
+
+        redis_client = get_redis_client()
+        if redis_client is None:
+            return
+        redis_client.incr(key)
+    except Exception as exc:
+        app.logger.warning(
+            "%s version bump failed: key=%s error=%s",
+            label,
+            key,
+            repr(exc),
+        )
@@ -1,13 +1,40 @@
-"""Admission checks for creator-billed runtime requests."""
+"""Admission checks for creator-billed runtime requests.
+
+Every lesson step, ask and TTS preview is admitted against the creator's
+wallet buckets, subscription and entitlements. The outcome is cached per
+creator in the cache provider for ``BILL_ADMISSION_SNAPSHOT_TTL_SECONDS``,
+capped at the next bucket or subscription period boundary, so a learner
+step for a funded creator costs one cache read. Denials are cached too and
+re-raise the same error.
+
+Committed ORM writes drop the snapshot of the affected creator: any bucket
+insert or delete, bucket status or window changes, a bucket balance crossing
+zero, and any subscription or entitlement write. Settlements that leave a
+bucket positive keep the snapshot, so the reported balance may lag by up to
+one TTL while the admission decision itself does not change.
+
+Dropping a snapshot rotates a per-creator generation token instead of deleting
+the key. Snapshots carry the token read before they were built, so one built
+from rows read before the commit is stored under the old token and never
+served, however late its write lands.
+"""
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+import contextlib
+import json
+import math
+from dataclasses import dataclass, replace
 from decimal import Decimal
 from typing import TYPE_CHECKING, Any
 
+from flask import current_app, has_app_context
+from flaskr.common.cache_provider import cache as cache_provider
 from flaskr.service.common.models import raise_error
 from flaskr.util.datetime import now_utc
+from flaskr.util.uuid import generate_id
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, object_session
 
 from .bucket_categories import (
     load_billing_order_type_by_bid,
@@ -15,16 +42,73 @@ from .bucket_categories import (
 )
 from .consts import CREDIT_BUCKET_CATEGORY_SUBSCRIPTION, CREDIT_BUCKET_STATUS_ACTIVE
 from .entitlements import resolve_creator_entitlement_state
-from .models import BillingSubscription, CreditWalletBucket
+from .models import BillingEntitlement, BillingSubscription, CreditWalletBucket
 from .ownership import resolve_shifu_creator_bid
 from .primitives import is_billing_enabled
 from .primitives import to_decimal as _to_decimal
 from .subscriptions import load_effective_topup_subscription
 
 if TYPE_CHECKING:
+    from datetime import datetime
+
     from flask import Flask
 
 _ZERO_CREDITS = Decimal(0)
+_DEFAULT_SNAPSHOT_TTL_SECONDS = 30
+_SNAPSHOT_KEY_SUFFIX = "billing:admission:"
+_GENERATION_KEY_SUFFIX = "billing:admission-generation:"
+# Generation tokens outlive every snapshot stored under them by this margin, so
+# an expired token never matches a stale snapshot again.
+_GENERATION_TTL_MARGIN_SECONDS = 300
+_STALE_CREATORS_INFO_KEY = "billing_admission_stale_creator_bids"
+_BUCKET_ADMISSION_FIELDS = (
+    "creator_bid",
+    "status",
+    "effective_from",
+    "effective_to",
+    "deleted",
+)
+
+
+@dataclass(slots=True, frozen=True)
+class _AdmissionSnapshot:
+    error_code: str
+    wallet_available_credits: Decimal
+    subscription_status: int | None
+    priority_class: str
+    valid_until: datetime | None = None
+    generation: str = ""
+
+    def to_cache_value(self) -> str:
+        return json.dumps(
+            {
+                "generation": self.generation,
+                "error_code": self.error_code,
+                "wallet_available_credits": str(self.wallet_available_credits),
+                "subscription_status": self.subscription_status,
+                "priority_class": self.priority_class,
+            }
+        )
+
+    @classmethod
+    def from_cache_value(cls, raw: Any) -> _AdmissionSnapshot | None:
+        if raw is None:
+            return None
+        if isinstance(raw, bytes):
+            raw = raw.decode("utf-8", errors="replace")
+        try:
+            payload = json.loads(raw)
+            return cls(
+                error_code=str(payload["error_code"] or ""),
+                wallet_available_credits=Decimal(
+                    str(payload["wallet_available_credits"])
+                ),
+                subscription_status=payload["subscription_status"],
+                priority_class=str(payload["priority_class"]),
+                generation=str(payload.get("generation") or ""),
+            )
+        except (ArithmeticError, AttributeError, KeyError, TypeError, ValueError):
+            return None
 
 
 @dataclass(slots=True, frozen=True)
@@ -84,106 +168,307 @@ def admit_creator_usage(
         )
 
     with app.app_context():
-        buckets = (
-            CreditWalletBucket.query.filter(
-                CreditWalletBucket.deleted == 0,
-                CreditWalletBucket.creator_bid == normalized_creator_bid,
-                CreditWalletBucket.status == CREDIT_BUCKET_STATUS_ACTIVE,
-            )
-            .order_by(CreditWalletBucket.priority.asc(), CreditWalletBucket.id.asc())
-            .all()
+        snapshot = _load_admission_snapshot(
+            app,
+            creator_bid=normalized_creator_bid,
+            shifu_bid=str(shifu_bid or "").strip(),
         )
-        subscription = (
-            BillingSubscription.query.filter(
-                BillingSubscription.deleted == 0,
-                BillingSubscription.creator_bid == normalized_creator_bid,
+        if snapshot.error_code:
+            raise_error(snapshot.error_code)
+    return CreatorUsageAdmission(
+        allowed=True,
+        creator_bid=normalized_creator_bid,
+        shifu_bid=str(shifu_bid or "").strip(),
+        usage_scene=usage_scene,
+        wallet_available_credits=snapshot.wallet_available_credits,
+        subscription_status=snapshot.subscription_status,
+        priority_class=snapshot.priority_class,
+    )
+
+
+def resolve_creator_priority_class(
+    app: Flask,
+    *,
+    creator_bid: str = "",
+    shifu_bid: str = "",
+) -> str:
+    """Return the creator's entitlement priority class from the admission cache.
+
+    Never raises: unknown creators, denied admissions and lookup failures all
+    fall back to ``standard``.
+    """
+    try:
+        with app.app_context():
+            normalized_creator_bid = _resolve_creator_bid(
+                app,
+                creator_bid=creator_bid,
+                shifu_bid=shifu_bid,
             )
-            .order_by(
-                BillingSubscription.created_at.desc(),
-                BillingSubscription.id.desc(),
+            if not normalized_creator_bid or not is_billing_enabled():
+                return "standard"
+            snapshot = _load_admission_snapshot(
+                app,
+                creator_bid=normalized_creator_bid,
+                shifu_bid=str(shifu_bid or "").strip(),
             )
-            .first()
-        )
+    except Exception:
+        # Never let a logging failure break the fallback.
+        with contextlib.suppress(Exception):
+            app.logger.debug("creator priority class lookup failed", exc_info=True)
+        return "standard"
+    if snapshot.error_code:
+        return "standard"
+    return snapshot.priority_class or "standard"
 
-        admission_at = now_utc()
-        active_buckets = [
-            bucket
-            for bucket in buckets
-            if _to_decimal(bucket.available_credits) > _ZERO_CREDITS
-            and (bucket.effective_from is None or bucket.effective_from <= admission_at)
-            and (bucket.effective_to is None or bucket.effective_to > admission_at)
-        ]
-        has_active_subscription = (
-            load_effective_topup_subscription(
-                normalized_creator_bid,
-                as_of=admission_at,
+
+def invalidate_creator_admission_snapshot(app: Flask, *creator_bids: str) -> None:
+    """Drop cached admission snapshots after out-of-band balance changes."""
+    generation_ttl = _snapshot_ttl_seconds(app) + _GENERATION_TTL_MARGIN_SECONDS
+    for creator_bid in dict.fromkeys(creator_bids):
+        if creator_bid:
+            cache_provider.set(
+                _generation_key(app, creator_bid),
+                generate_id(app),
+                ex=generation_ttl,
             )
-            is not None
+
+
+def _snapshot_key(app: Flask, creator_bid: str) -> str:
+    prefix = app.config.get("REDIS_KEY_PREFIX", "ai-shifu")
+    return f"{prefix}{_SNAPSHOT_KEY_SUFFIX}{creator_bid}"
+
+
+def _generation_key(app: Flask, creator_bid: str) -> str:
+    prefix = app.config.get("REDIS_KEY_PREFIX", "ai-shifu")
+    return f"{prefix}{_GENERATION_KEY_SUFFIX}{creator_bid}"
+
+
+def _snapshot_ttl_seconds(app: Flask) -> int:
+    try:
+        return max(
+            int(
+                app.config.get(
+                    "BILL_ADMISSION_SNAPSHOT_TTL_SECONDS",
+                    _DEFAULT_SNAPSHOT_TTL_SECONDS,
+                )
+            ),
+            0,
         )
-        consumable_buckets = [
-            bucket
-            for bucket in active_buckets
-            if has_active_subscription
-            or not wallet_bucket_requires_active_subscription(
-                bucket,
-                load_order_type=load_billing_order_type_by_bid,
-            )
-        ]
-        wallet_available_credits = sum(
-            (_to_decimal(bucket.available_credits) for bucket in consumable_buckets),
-            start=_ZERO_CREDITS,
+    except (TypeError, ValueError):
+        return _DEFAULT_SNAPSHOT_TTL_SECONDS
+
+
+def _load_admission_snapshot(
+    app: Flask,
+    *,
+    creator_bid: str,
+    shifu_bid: str,
+) -> _AdmissionSnapshot:
+    ttl_seconds = _snapshot_ttl_seconds(app)
+    if ttl_seconds <= 0:
+        return _build_admission_snapshot(app, creator_bid, shifu_bid=shifu_bid)
+
+    key = _snapshot_key(app, creator_bid)
+    raw_generation, raw_snapshot = cache_provider.mget(
+        _generation_key(app, creator_bid), key
+    )
+    if isinstance(raw_generation, bytes):
+        raw_generation = raw_generation.decode("utf-8", errors="replace")
+    generation = str(raw_generation or "")
+    cached = _AdmissionSnapshot.from_cache_value(raw_snapshot)
+    if cached is not None and cached.generation == generation:
+        return cached
+
+    # Tag the snapshot with the generation read before building it: if a
+    # commit rotates the token meanwhile, this write is never served.
+    snapshot = replace(
+        _build_admission_snapshot(app, creator_bid, shifu_bid=shifu_bid),
+        generation=generation,
+    )
+    # Never serve a snapshot past the next bucket or subscription boundary.
+    if snapshot.valid_until is not None:
+        remaining = (snapshot.valid_until - now_utc()).total_seconds()
+        ttl_seconds = min(ttl_seconds, max(math.ceil(remaining), 1))
+    cache_provider.set(key, snapshot.to_cache_value(), ex=ttl_seconds)
+    return snapshot
+
+
+def _build_admission_snapshot(
+    app: Flask,
+    creator_bid: str,
+    *,
+    shifu_bid: str,
+) -> _AdmissionSnapshot:
+    buckets = (
+        CreditWalletBucket.query.filter(
+            CreditWalletBucket.deleted == 0,
+            CreditWalletBucket.creator_bid == creator_bid,
+            CreditWalletBucket.status == CREDIT_BUCKET_STATUS_ACTIVE,
         )
-        if wallet_available_credits <= _ZERO_CREDITS and not consumable_buckets:
-            if active_buckets and not has_active_subscription:
-                active_subscription_bucket = next(
-                    (
-                        bucket
-                        for bucket in active_buckets
-                        if int(bucket.bucket_category or 0)
-                        == CREDIT_BUCKET_CATEGORY_SUBSCRIPTION
-                    ),
-                    None,
-                )
-                if active_subscription_bucket is not None:
-                    app.logger.warning(
-                        "billing admission invariant violated: creator has an active "
-                        "subscription bucket but no active subscription "
-                        "creator_bid=%s shifu_bid=%s wallet_bucket_bid=%s "
-                        "source_bid=%s effective_from=%s effective_to=%s",
-                        normalized_creator_bid,
-                        str(shifu_bid or "").strip(),
-                        active_subscription_bucket.wallet_bucket_bid,
-                        active_subscription_bucket.source_bid,
-                        active_subscription_bucket.effective_from,
-                        active_subscription_bucket.effective_to,
-                    )
-                if any(
-                    wallet_bucket_requires_active_subscription(
-                        bucket,
-                        load_order_type=load_billing_order_type_by_bid,
-                    )
-                    for bucket in active_buckets
-                ):
-                    raise_error("server.billing.subscriptionInactive")
-            raise_error("server.billing.creditInsufficient")
+        .order_by(CreditWalletBucket.priority.asc(), CreditWalletBucket.id.asc())
+        .all()
+    )
+    subscription = (
+        BillingSubscription.query.filter(
+            BillingSubscription.deleted == 0,
+            BillingSubscription.creator_bid == creator_bid,
+        )
+        .order_by(
+            BillingSubscription.created_at.desc(),
+            BillingSubscription.id.desc(),
+        )
+        .first()
+    )
 
-        entitlement_state = resolve_creator_entitlement_state(
-            normalized_creator_bid,
+    admission_at = now_utc()
+    valid_until = _next_boundary_after(
+        admission_at,
+        [bucket.effective_from for bucket in buckets]
+        + [bucket.effective_to for bucket in buckets]
+        + [
+            getattr(subscription, "current_period_start_at", None),
+            getattr(subscription, "current_period_end_at", None),
+        ],
+    )
+    subscription_status = getattr(subscription, "status", None)
+    active_buckets = [
+        bucket
+        for bucket in buckets
+        if _to_decimal(bucket.available_credits) > _ZERO_CREDITS
+        and (bucket.effective_from is None or bucket.effective_from <= admission_at)
+        and (bucket.effective_to is None or bucket.effective_to > admission_at)
+    ]
+    has_active_subscription = (
+        load_effective_topup_subscription(
+            creator_bid,
             as_of=admission_at,
         )
-        return CreatorUsageAdmission(
-            allowed=True,
-            creator_bid=normalized_creator_bid,
-            shifu_bid=str(shifu_bid or "").strip(),
-            usage_scene=usage_scene,
-            wallet_available_credits=wallet_available_credits,
-            subscription_status=getattr(subscription, "status", None),
-            priority_class=entitlement_state.priority_class,
+        is not None
+    )
+    consumable_buckets = [
+        bucket
+        for bucket in active_buckets
+        if has_active_subscription
+        or not wallet_bucket_requires_active_subscription(
+            bucket,
+            load_order_type=load_billing_order_type_by_bid,
+        )
+    ]
+    wallet_available_credits = sum(
+        (_to_decimal(bucket.available_credits) for bucket in consumable_buckets),
+        start=_ZERO_CREDITS,
+    )
+    if wallet_available_credits <= _ZERO_CREDITS and not consumable_buckets:
+        error_code = "server.billing.creditInsufficient"
+        if active_buckets and not has_active_subscription:
+            active_subscription_bucket = next(
+                (
+                    bucket
+                    for bucket in active_buckets
+                    if int(bucket.bucket_category or 0)
+                    == CREDIT_BUCKET_CATEGORY_SUBSCRIPTION
+                ),
+                None,
+            )
+            if active_subscription_bucket is not None:
+                app.logger.warning(
+                    "billing admission invariant violated: creator has an active "
+                    "subscription bucket but no active subscription "
+                    "creator_bid=%s shifu_bid=%s wallet_bucket_bid=%s "
+                    "source_bid=%s effective_from=%s effective_to=%s",
+                    creator_bid,
+                    shifu_bid,
+                    active_subscription_bucket.wallet_bucket_bid,
+                    active_subscription_bucket.source_bid,
+                    active_subscription_bucket.effective_from,
+                    active_subscription_bucket.effective_to,
+                )
+            if any(
+                wallet_bucket_requires_active_subscription(
+                    bucket,
+                    load_order_type=load_billing_order_type_by_bid,
+                )
+                for bucket in active_buckets
+            ):
+                error_code = "server.billing.subscriptionInactive"
+        return _AdmissionSnapshot(
+            error_code=error_code,
+            wallet_available_credits=_ZERO_CREDITS,
+            subscription_status=subscription_status,
+            priority_class="standard",
+            valid_until=valid_until,
         )
 
+    entitlement_state = resolve_creator_entitlement_state(
+        creator_bid,
+        as_of=admission_at,
+    )
+    return _AdmissionSnapshot(
+        error_code="",
+        wallet_available_credits=wallet_available_credits,
+        subscription_status=subscription_status,
+        priority_class=entitlement_state.priority_class,
+        valid_until=valid_until,
+    )
+
+
+def _next_boundary_after(
+    admission_at: datetime,
+    boundaries: list[datetime | None],
+) -> datetime | None:
+    upcoming = [
+        boundary
+        for boundary in boundaries
+        if boundary is not None and boundary > admission_at
+    ]
+    return min(upcoming, default=None)
+
 
 def _resolve_creator_bid(app: Flask, *, creator_bid: str, shifu_bid: str) -> str:
     normalized_creator_bid = str(creator_bid or "").strip()
     if normalized_creator_bid:
         return normalized_creator_bid
     return str(resolve_shifu_creator_bid(app, shifu_bid) or "").strip()
+
+
+def _mark_creator_stale(target: Any) -> None:
+    creator_bid = str(getattr(target, "creator_bid", "") or "").strip()
+    session = object_session(target)
+    if creator_bid and session is not None:
+        session.info.setdefault(_STALE_CREATORS_INFO_KEY, set()).add(creator_bid)
+
+
+def _on_admission_row_written(_mapper, _connection, target) -> None:
+    _mark_creator_stale(target)
+
+
+def _on_bucket_updated(_mapper, _connection, target: CreditWalletBucket) -> None:
+    attrs = inspect(target).attrs
+    if any(attrs[name].history.has_changes() for name in _BUCKET_ADMISSION_FIELDS):
+        _mark_creator_stale(target)
+        return
+    credits_history = attrs.available_credits.history
+    if not credits_history.has_changes():
+        return
+    if not credits_history.deleted or credits_history.deleted[0] is None:
+        _mark_creator_stale(target)
+        return
+    was_positive = _to_decimal(credits_history.deleted[0]) > _ZERO_CREDITS
+    if was_positive != (_to_decimal(target.available_credits) > _ZERO_CREDITS):
+        _mark_creator_stale(target)
+
+
+def _on_session_commit(session: Session) -> None:
+    # Marks left by a rolled-back flush only cost one extra rebuild later.
+    creator_bids = session.info.pop(_STALE_CREATORS_INFO_KEY, None)
+    if creator_bids and has_app_context():
+        invalidate_creator_admission_snapshot(current_app, *sorted(creator_bids))
+
+
+event.listen(CreditWalletBucket, "after_insert", _on_admission_row_written)
+event.listen(CreditWalletBucket, "after_delete", _on_admission_row_written)
+event.listen(CreditWalletBucket, "after_update", _on_bucket_updated)
+for _model in (BillingSubscription, BillingEntitlement):
+    for _event_name in ("after_insert", "after_update", "after_delete"):
+        event.listen(_model, _event_name, _on_admission_row_written)
+event.listen(Session, "after_commit", _on_session_commit)
@@ -3,7 +3,11 @@
 from __future__ import annotations
 
 from flaskr.service.billing import primitives as billing_primitives
-from flaskr.service.billing.admission import CreatorUsageAdmission, admit_creator_usage
+from flaskr.service.billing.admission import (
+    CreatorUsageAdmission,
+    admit_creator_usage,
+    resolve_creator_priority_class,
+)
 from flaskr.service.billing.charges import (
     build_metric_charge,
     resolve_credit_multiplier_label,
@@ -44,6 +48,7 @@ from flaskr.service.billing.operation_credits import (
     release_reserved_operation_credits,
     reserve_operation_credits,
 )
+from flaskr.service.billing.rate_index import invalidate_usage_rate_index
 from flaskr.service.billing.read_models import (
     build_billing_catalog,
     build_operator_credit_orders_overview,
@@ -108,6 +113,7 @@ __all__ = [
     "grant_manual_plan_to_user",
     "grant_referral_plan_reward",
     "grant_referral_reward_credits_to_user",
+    "invalidate_usage_rate_index",
     "is_billing_enabled",
     "list_credit_notification_templates",
     "list_credit_notifications",
@@ -120,6 +126,7 @@ __all__ = [
     "reserve_operation_credits",
     "resolve_creator_bid_by_host",
     "resolve_creator_limit_state",
+    "resolve_creator_priority_class",
     "resolve_creator_public_integrations",
     "resolve_credit_multiplier_label",
     "resolve_effective_custom_origin",
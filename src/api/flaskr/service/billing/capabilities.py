@@ -172,7 +172,16 @@ _CAPABILITIES: tuple[BillingCapabilityDefinition, ...] = (
         audience="worker",
         user_visible=False,
         default_enabled=True,
-        task_entries=("billing.settle_usage", "billing.replay_usage_settlement"),
+        task_entries=(
+            "billing.settle_usage",
+            "billing.settle_usage_batch",
+            "billing.replay_usage_settlement",
+        ),
+        config_entries=(
+            "BILL_USAGE_SETTLEMENT_MODE",
+            "BILL_USAGE_SETTLEMENT_BATCH_SIZE",
+            "BILL_USAGE_WRITE_MODE",
+        ),
         cli_entries=("flask console billing backfill-settlement",),
         notes=("Usage settlement is an internal task and CLI repair surface.",),
     ),
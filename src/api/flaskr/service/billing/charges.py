@@ -12,7 +12,7 @@ from flaskr.service.metering.consts import (
     BILL_USAGE_TYPE_TTS,
 )
 from flaskr.service.metering.models import BillUsageRecord
-from flaskr.util.datetime import NAIVE_DATETIME_MIN, now_utc
+from flaskr.util.datetime import now_utc
 
 from .consts import (
     BILLING_METRIC_LABELS,
@@ -25,15 +25,14 @@ from .consts import (
     CREDIT_ROUNDING_MODE_CEIL,
     CREDIT_ROUNDING_MODE_FLOOR,
     CREDIT_ROUNDING_MODE_ROUND,
-    CREDIT_USAGE_RATE_STATUS_ACTIVE,
 )
-from .models import CreditUsageRate
 from .primitives import (
     credit_decimal_to_number,
     decimal_to_number,
     quantize_credit_amount,
     to_decimal,
 )
+from .rate_index import UsageRateSnapshot, lookup_usage_rate
 from .rate_references import resolve_llm_rate_identity
 
 if TYPE_CHECKING:
@@ -246,9 +245,9 @@ def _load_usage_rate_cached(
     usage: BillUsageRecord,
     billing_metric: int,
     settlement_at: datetime,
-    rate_cache: dict[tuple[int, str, str, int, int, datetime], CreditUsageRate | None]
+    rate_cache: dict[tuple[int, str, str, int, int, datetime], UsageRateSnapshot | None]
     | None = None,
-) -> CreditUsageRate | None:
+) -> UsageRateSnapshot | None:
     if rate_cache is None:
         return load_usage_rate(
             usage=usage,
@@ -278,7 +277,7 @@ def build_metric_charge(
     billing_metric: int,
     raw_amount: int,
     settlement_at: datetime,
-    rate_cache: dict[tuple[int, str, str, int, int, datetime], CreditUsageRate | None]
+    rate_cache: dict[tuple[int, str, str, int, int, datetime], UsageRateSnapshot | None]
     | None = None,
 ) -> UsageMetricCharge | None:
     """Build metric charge."""
@@ -318,7 +317,7 @@ def load_usage_rate(
     usage: BillUsageRecord,
     billing_metric: int,
     settlement_at: datetime,
-) -> CreditUsageRate | None:
+) -> UsageRateSnapshot | None:
     """Load usage rate."""
     provider = str(usage.provider or "").strip()
     model = str(usage.model or "").strip()
@@ -334,46 +333,17 @@ def load_usage_rate(
                 model_candidates.append(normalized)
         if not model_candidates:
             model_candidates = [model]
-    usage_scene = int(usage.usage_scene or 0)
-    rows = (
-        CreditUsageRate.query.filter(
-            CreditUsageRate.deleted == 0,
-            CreditUsageRate.status == CREDIT_USAGE_RATE_STATUS_ACTIVE,
-        )
-        .filter(CreditUsageRate.usage_type == int(usage.usage_type or 0))
-        .filter(CreditUsageRate.usage_scene == usage_scene)
-        .filter(CreditUsageRate.billing_metric == billing_metric)
-        .order_by(CreditUsageRate.effective_from.desc(), CreditUsageRate.id.desc())
-        .all()
-    )
-    candidates = [
-        row
-        for row in rows
-        if row.effective_from <= settlement_at
-        and (row.effective_to is None or row.effective_to > settlement_at)
-        and row.provider in {provider, "*"}
-        and row.model in set(model_candidates).union({"*"})
-    ]
-    if not candidates:
-        return None
-    model_priority = {
-        candidate: len(model_candidates) - index
-        for index, candidate in enumerate(model_candidates)
-    }
-    candidates.sort(
-        key=lambda row: (
-            row.provider == provider,
-            row.model in set(model_candidates),
-            model_priority.get(row.model, 0),
-            row.effective_from or NAIVE_DATETIME_MIN,
-            int(row.id or 0),
-        ),
-        reverse=True,
+    return lookup_usage_rate(
+        usage_type=int(usage.usage_type or 0),
+        usage_scene=int(usage.usage_scene or 0),
+        billing_metric=billing_metric,
+        provider=provider,
+        model_candidates=model_candidates,
+        at=settlement_at,
     )
-    return candidates[0]
 
 
-def _rate_unit_cost(rate: CreditUsageRate | None) -> Decimal:
+def _rate_unit_cost(rate: UsageRateSnapshot | None) -> Decimal:
     if rate is None:
         return _ZERO
     unit_size = max(int(rate.unit_size or 1), 1)
@@ -394,7 +364,7 @@ def resolve_credit_multiplier_label(
     usage_scene: int = BILL_USAGE_SCENE_PROD,
     settlement_at: datetime | None = None,
     billing_metrics: tuple[int, ...] | None = None,
-    rate_cache: dict[tuple[int, str, str, int, int, datetime], CreditUsageRate | None]
+    rate_cache: dict[tuple[int, str, str, int, int, datetime], UsageRateSnapshot | None]
     | None = None,
 ) -> str | None:
     """Resolve credit multiplier label."""
@@ -27,7 +27,7 @@ from flaskr.service.user.repository import (
     update_user_entity_fields,
     upsert_credential,
 )
-from flaskr.util.datetime import now_utc
+from flaskr.util.datetime import now_utc, parse_naive_utc
 from flaskr.util.uuid import generate_id
 
 from .checkout import reconcile_billing_provider_reference
@@ -85,6 +85,11 @@ from .daily_aggregates import (
     detect_daily_aggregate_rebuild_range,
     rebuild_daily_aggregates,
 )
+from .history_archive import (
+    HISTORY_TABLE_LEDGER,
+    HISTORY_TABLE_USAGE,
+    archive_billing_history,
+)
 from .manual_credit_grants import (
     MANUAL_CREDIT_GRANT_SOURCES,
     MANUAL_CREDIT_VALIDITY_ALIGN_SUBSCRIPTION,
@@ -120,6 +125,7 @@ from .queries import (
     calculate_self_managed_billing_cycle_end,
     load_primary_active_subscription,
 )
+from .rate_index import invalidate_usage_rate_index
 from .renewal import retry_billing_renewal_event, run_billing_renewal_event
 from .settlement import backfill_bill_usage_settlement
 from .subscriptions import (
@@ -129,6 +135,7 @@ from .subscriptions import (
     repair_topup_grant_expiries,
 )
 from .trials import backfill_missing_creator_trial_credits
+from .wallet_projections import verify_credit_wallet_projections
 from .wallets import (
     rebuild_credit_wallet_snapshots,
     repair_credit_bucket_runtime_statuses,
@@ -938,6 +945,29 @@ def register_billing_commands(console) -> None:
         )
         _echo_payload(payload)
 
+    @billing_group.command(name="verify-wallet-projections")
+    @click.option("--creator-bid", default="", help="Limit to one creator.")
+    @click.option("--wallet-bid", default="", help="Verify one wallet projection.")
+    @click.option(
+        "--repair",
+        is_flag=True,
+        help="Rewrite missing, stale, or drifted projections. Defaults to read-only.",
+    )
+    @with_appcontext
+    def verify_wallet_projections_command(
+        creator_bid: str,
+        wallet_bid: str,
+        repair: bool,
+    ) -> None:
+        """Compare wallet balance projections with a full bucket recompute."""
+        payload = verify_credit_wallet_projections(
+            current_app,
+            creator_bid=creator_bid,
+            wallet_bid=wallet_bid,
+            repair=repair,
+        )
+        _echo_payload(payload)
+
     @billing_group.command(name="audit-credit-state")
     @click.option("--creator-bid", default="", help="Audit one creator.")
     @click.option(
@@ -1229,6 +1259,62 @@ def register_billing_commands(console) -> None:
         )
         _echo_payload(payload)
 
+    @billing_group.command(name="archive-history")
+    @click.option(
+        "--table",
+        "table",
+        type=click.Choice(["usage", "ledger", "all"]),
+        default="all",
+        show_default=True,
+        help="Detail table to move finalized days out of.",
+    )
+    @click.option(
+        "--before",
+        default="",
+        help="Archive only days before this YYYY-MM-DD; capped by retention.",
+    )
+    @click.option(
+        "--batch-size",
+        type=click.IntRange(min=1),
+        default=None,
+        help="Rows moved per transaction; defaults to BILL_HISTORY_ARCHIVE_BATCH_SIZE.",
+    )
+    @click.option(
+        "--apply",
+        "apply_changes",
+        is_flag=True,
+        help="Move the rows. Defaults to dry-run.",
+    )
+    @with_appcontext
+    def archive_history_command(
+        table: str,
+        before: str,
+        batch_size: int | None,
+        apply_changes: bool,
+    ) -> None:
+        """Move finalized usage and ledger days to their archive tables."""
+        archive_before = None
+        normalized_before = str(before or "").strip()
+        if normalized_before:
+            try:
+                archive_before = parse_naive_utc(normalized_before, "%Y-%m-%d")
+            except ValueError as exc:
+                message = "--before must be a YYYY-MM-DD date."
+                raise click.ClickException(message) from exc
+        table_names = {
+            "usage": (HISTORY_TABLE_USAGE,),
+            "ledger": (HISTORY_TABLE_LEDGER,),
+            "all": (HISTORY_TABLE_USAGE, HISTORY_TABLE_LEDGER),
+        }[table]
+        payload = archive_billing_history(
+            current_app,
+            table_names=table_names,
+            archive_before=archive_before,
+            batch_size=batch_size,
+            dry_run=not apply_changes,
+        )
+        _echo_payload(payload)
+
     @billing_group.command(name="reconcile-order")
     @click.option("--creator-bid", default="", help="Limit to one creator.")
     @click.option("--payment-provider", default="", help="Provider name.")
@@ -1362,6 +1448,7 @@ def seed_billing_bootstrap_data() -> dict[str, Any]:
         rows=[dict(row) for row in BILL_SYS_CONFIG_SEEDS],
     )
     db.session.commit()
+    invalidate_usage_rate_index(current_app)
     return {
         "status": "seeded",
         "products": {"count": 0, "inserted": 0, "updated": 0},
@@ -540,7 +540,9 @@ BILL_SYS_CONFIG_SEEDS = (
                 "lookahead_minutes": 60,
                 "processing_timeout_minutes": 30,
                 "queue": "",
+                "use_batch_claims": 0,
                 "use_dedicated_queue": 0,
+                "worker_count": 4,
             },
             separators=(",", ":"),
             sort_keys=True,
@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import json
 import re
+import zlib
 from copy import deepcopy
 from dataclasses import dataclass
 from datetime import UTC, date, datetime, time, timedelta
@@ -31,7 +32,7 @@ from flaskr.service.user.models import UserInfo as UserEntity
 from flaskr.util.datetime import now_utc
 from flaskr.util.timezone import format_with_app_timezone
 from flaskr.util.uuid import generate_id
-from sqlalchemy import func, or_
+from sqlalchemy import and_, func, or_
 from sqlalchemy.exc import IntegrityError
 
 from .consts import (
@@ -73,6 +74,7 @@ SOURCE_TYPE_LEDGER = "ledger"
 SOURCE_TYPE_WALLET = "wallet"
 SOURCE_TYPE_WALLET_BUCKET = "wallet_bucket"
 CREATOR_KEYWORD_MATCH_LIMIT = 500
+_DEFAULT_SCAN_PAGE_SIZE = 500
 LIMIT_STATE_NORMAL = "normal"
 LIMIT_STATE_SOFTLIMIT = "softlimit"
 LIMIT_STATE_HARDLIMIT = "hardlimit"
@@ -1826,14 +1828,223 @@ def _find_credit_expiring_creator_window_record(
     return None
 
 
+@dataclass(slots=True, frozen=True)
+class CreatorScanShard:
+    """Select the creators one scan worker owns by hashing their bid."""
+
+    index: int
+    count: int
+
+    def owns(self, creator_bid: str) -> bool:
+        """Return whether ``creator_bid`` hashes into this shard."""
+        digest = zlib.crc32(str(creator_bid or "").encode("utf-8"))
+        return digest % self.count == self.index
+
+
+def resolve_creator_scan_shard(shard_index: Any, shard_count: Any) -> CreatorScanShard:
+    """Validate shard arguments; a single shard owns every creator."""
+    count = max(_coerce_positive_int(shard_count, 1), 1)
+    try:
+        index = int(shard_index or 0)
+    except (TypeError, ValueError):
+        index = 0
+    if index < 0 or index >= count:
+        raise_param_error("shard_index")
+    return CreatorScanShard(index=index, count=count)
+
+
+def _scan_page_size(app: Flask) -> int:
+    return max(
+        _coerce_positive_int(
+            app.config.get("BILL_NOTIFICATION_SCAN_PAGE_SIZE"),
+            _DEFAULT_SCAN_PAGE_SIZE,
+        ),
+        1,
+    )
+
+
+def _apply_creator_scan_shard(query, column, shard: CreatorScanShard | None):
+    """Push the shard predicate into SQL where the dialect supports CRC32."""
+    if shard is None or shard.count <= 1:
+        return query, None
+    if db.engine.dialect.name == "mysql":
+        return query.filter(func.crc32(column) % shard.count == shard.index), None
+    return query, shard
+
+
+def _iter_keyset_rows(query, order_columns: tuple[Any, ...], page_size: int):
+    """Yield projected rows page by page, resuming after the last sort key.
+
+    Every column in ``order_columns`` must be part of the projection, and the
+    final one must be unique so every page boundary is unambiguous. Staging
+    notifications between pages commits, so offsets would skip rows; keyset
+    predicates do not.
+    """
+    ordered = query.order_by(*(column.asc() for column in order_columns))
+    last_key: tuple[Any, ...] | None = None
+    while True:
+        page_query = ordered
+        if last_key is not None:
+            page_query = page_query.filter(_keyset_after(order_columns, last_key))
+        rows = page_query.limit(page_size).all()
+        if not rows:
+            return
+        yield from rows
+        if len(rows) < page_size:
+            return
+        last_key = tuple(getattr(rows[-1], column.key) for column in order_columns)
+
+
+def _keyset_after(order_columns: tuple[Any, ...], last_key: tuple[Any, ...]):
+    # Expanded (a > x) OR (a = x AND b > y) form; MySQL only uses the index
+    # for row-value comparisons in recent releases.
+    clauses = []
+    for position, column in enumerate(order_columns):
+        equal_prefix = [
+            order_columns[prefix] == last_key[prefix] for prefix in range(position)
+        ]
+        clauses.append(and_(*equal_prefix, column > last_key[position]))
+    return or_(*clauses)
+
+
+def _prime_notification_eligibility(
+    creator_bids: list[str],
+    cache: dict[str, bool],
+) -> None:
+    """Resolve creator eligibility for one scan page with a single query."""
+    pending = sorted(
+        {
+            normalized
+            for normalized in (_normalize_bid(bid) for bid in creator_bids)
+            if normalized and normalized not in cache
+        }
+    )
+    if not pending:
+        return
+    rows = (
+        db.session.query(
+            UserEntity.user_bid,
+            UserEntity.is_creator,
+            UserEntity.state,
+        )
+        .filter(
+            UserEntity.user_bid.in_(pending),
+            UserEntity.deleted == 0,
+        )
+        .order_by(UserEntity.id.asc())
+        .all()
+    )
+    for bid in pending:
+        cache[bid] = False
+    # Later rows win, matching the newest-row lookup of the per-creator check.
+    for row in rows:
+        cache[row.user_bid] = bool(row.is_creator) and (
+            int(row.state or USER_STATE_UNREGISTERED) != USER_STATE_UNREGISTERED
+        )
+
+
+def _iter_scan_rows(
+    app: Flask,
+    query,
+    order_columns: tuple[Any, ...],
+    *,
+    creator_column,
+    shard: CreatorScanShard | None,
+    eligibility_cache: dict[str, bool],
+):
+    """Stream eligible projected rows for a notification scan.
+
+    Rows come from ``_iter_keyset_rows`` in pages; creator eligibility is
+    resolved once per page and, on dialects without CRC32, the shard is
+    filtered here instead of in SQL.
+    """
+    query, python_shard = _apply_creator_scan_shard(query, creator_column, shard)
+    page_size = _scan_page_size(app)
+    page: list[Any] = []
+    for row in _iter_keyset_rows(query, order_columns, page_size):
+        if python_shard is not None and not python_shard.owns(row.creator_bid):
+            continue
+        page.append(row)
+        if len(page) >= page_size:
+            yield from _eligible_scan_rows(page, eligibility_cache)
+            page = []
+    yield from _eligible_scan_rows(page, eligibility_cache)
+
+
+def _eligible_scan_rows(rows: list[Any], eligibility_cache: dict[str, bool]):
+    _prime_notification_eligibility(
+        [row.creator_bid for row in rows],
+        eligibility_cache,
+    )
+    for row in rows:
+        if _is_notification_eligible_creator_cached(
+            row.creator_bid,
+            eligibility_cache,
+        ):
+            yield row
+
+
+def _iter_expiring_creator_groups(buckets):
+    """Fold creator-ordered bucket rows into one merged group per creator."""
+    group: dict[str, Any] | None = None
+    for bucket in buckets:
+        if group is not None and group["creator_bid"] != bucket.creator_bid:
+            yield group
+            group = None
+        if group is None:
+            group = {
+                "creator_bid": bucket.creator_bid,
+                "source_bid": bucket.wallet_bucket_bid,
+                "wallet_bid": bucket.wallet_bid,
+                "bucket_bids": [],
+                "wallet_bids": set(),
+                "available_credits": _ZERO,
+                "effective_to": bucket.effective_to,
+            }
+        group["bucket_bids"].append(bucket.wallet_bucket_bid)
+        group["wallet_bids"].add(bucket.wallet_bid)
+        group["available_credits"] = _to_decimal(
+            group["available_credits"]
+        ) + _to_decimal(bucket.available_credits)
+        if bucket.effective_to is not None and (
+            group.get("effective_to") is None
+            or bucket.effective_to < group["effective_to"]
+        ):
+            group["effective_to"] = bucket.effective_to
+            group["source_bid"] = bucket.wallet_bucket_bid
+            group["wallet_bid"] = bucket.wallet_bid
+    if group is not None:
+        yield group
+
+
+def _low_balance_credit_ceiling(thresholds: list[dict[str, Any]]) -> Decimal | None:
+    """Return the balance above which no threshold can fire, if one exists.
+
+    Estimated-days thresholds depend on each creator's consumption history, so
+    they disable the SQL pushdown.
+    """
+    ceiling: Decimal | None = None
+    for threshold in thresholds:
+        if threshold.get("kind") != LOW_BALANCE_THRESHOLD_KIND_FIXED:
+            return None
+        value = _decimal_from_policy(threshold.get("value"), _ZERO)
+        ceiling = value if ceiling is None else max(ceiling, value)
+    return ceiling
+
+
 def scan_credit_expiring_notifications(
     app: Flask,
     *,
     now: datetime | None = None,
     creator_bid: str = "",
     dry_run: bool = False,
+    shard: CreatorScanShard | None = None,
 ) -> dict[str, Any]:
-    """Scan expiring credits and create or preview eligible notifications."""
+    """Scan expiring credits and create or preview eligible notifications.
+
+    Each window streams active buckets in keyset pages; ``shard`` restricts the
+    scan to the creators one worker owns.
+    """
     scan_now = now or now_utc()
     normalized_creator_bid = _normalize_bid(creator_bid)
     with _maybe_app_context(app):
@@ -1862,7 +2073,14 @@ def scan_credit_expiring_notifications(
                 continue
             window_start = scan_now + timedelta(days=days)
             window_end = scan_now + timedelta(days=days + 1)
-            query = CreditWalletBucket.query.filter(
+            query = db.session.query(
+                CreditWalletBucket.id,
+                CreditWalletBucket.wallet_bucket_bid,
+                CreditWalletBucket.wallet_bid,
+                CreditWalletBucket.creator_bid,
+                CreditWalletBucket.available_credits,
+                CreditWalletBucket.effective_to,
+            ).filter(
                 CreditWalletBucket.deleted == 0,
                 CreditWalletBucket.status == CREDIT_BUCKET_STATUS_ACTIVE,
                 CreditWalletBucket.effective_to.isnot(None),
@@ -1874,48 +2092,22 @@ def scan_credit_expiring_notifications(
                 query = query.filter(
                     CreditWalletBucket.creator_bid == normalized_creator_bid
                 )
-            buckets = (
-                query.order_by(
-                    CreditWalletBucket.effective_to.asc(),
-                    CreditWalletBucket.id.asc(),
-                )
-                .limit(500)
-                .all()
-            )
             if merge_same_creator:
-                grouped: dict[str, dict[str, Any]] = {}
-                for bucket in buckets:
-                    if not _is_notification_eligible_creator_cached(
-                        bucket.creator_bid,
-                        creator_eligibility_cache,
-                    ):
-                        continue
-                    group = grouped.setdefault(
-                        bucket.creator_bid,
-                        {
-                            "creator_bid": bucket.creator_bid,
-                            "source_bid": bucket.wallet_bucket_bid,
-                            "wallet_bid": bucket.wallet_bid,
-                            "bucket_bids": [],
-                            "wallet_bids": set(),
-                            "available_credits": _ZERO,
-                            "effective_to": bucket.effective_to,
-                        },
-                    )
-                    group["bucket_bids"].append(bucket.wallet_bucket_bid)
-                    group["wallet_bids"].add(bucket.wallet_bid)
-                    group["available_credits"] = _to_decimal(
-                        group["available_credits"]
-                    ) + _to_decimal(bucket.available_credits)
-                    if bucket.effective_to is not None and (
-                        group.get("effective_to") is None
-                        or bucket.effective_to < group["effective_to"]
-                    ):
-                        group["effective_to"] = bucket.effective_to
-                        group["source_bid"] = bucket.wallet_bucket_bid
-                        group["wallet_bid"] = bucket.wallet_bid
-
-                for group in grouped.values():
+                # Creator-major order keeps each creator's buckets contiguous,
+                # so groups are emitted as soon as the next creator starts.
+                buckets = _iter_scan_rows(
+                    app,
+                    query,
+                    (
+                        CreditWalletBucket.creator_bid,
+                        CreditWalletBucket.effective_to,
+                        CreditWalletBucket.id,
+                    ),
+                    creator_column=CreditWalletBucket.creator_bid,
+                    shard=shard,
+                    eligibility_cache=creator_eligibility_cache,
+                )
+                for group in _iter_expiring_creator_groups(buckets):
                     dedupe_key = build_credit_expiring_creator_dedupe_key(
                         str(group.get("creator_bid") or ""),
                         window,
@@ -1973,12 +2165,14 @@ def scan_credit_expiring_notifications(
                     )
                 continue
 
-            for bucket in buckets:
-                if not _is_notification_eligible_creator_cached(
-                    bucket.creator_bid,
-                    creator_eligibility_cache,
-                ):
-                    continue
+            for bucket in _iter_scan_rows(
+                app,
+                query,
+                (CreditWalletBucket.effective_to, CreditWalletBucket.id),
+                creator_column=CreditWalletBucket.creator_bid,
+                shard=shard,
+                eligibility_cache=creator_eligibility_cache,
+            ):
                 dedupe_key = build_credit_expiring_dedupe_key(
                     bucket.wallet_bucket_bid,
                     window,
@@ -2199,8 +2393,13 @@ def scan_low_balance_notifications(
     now: datetime | None = None,
     creator_bid: str = "",
     dry_run: bool = False,
+    shard: CreatorScanShard | None = None,
 ) -> dict[str, Any]:
-    """Scan low balances and create or preview eligible notifications."""
+    """Scan low balances and create or preview eligible notifications.
+
+    Wallets stream in keyset pages; when every threshold is fixed, wallets
+    above the highest one are excluded in SQL.
+    """
     scan_now = now or now_utc()
     normalized_creator_bid = _normalize_bid(creator_bid)
     with _maybe_app_context(app):
@@ -2215,22 +2414,31 @@ def scan_low_balance_notifications(
                 "notifications": [],
             }
         thresholds = _load_low_balance_thresholds(policy)
-        query = CreditWallet.query.filter(
+        query = db.session.query(
+            CreditWallet.id,
+            CreditWallet.wallet_bid,
+            CreditWallet.creator_bid,
+            CreditWallet.available_credits,
+        ).filter(
             CreditWallet.deleted == 0,
             CreditWallet.creator_bid != "",
         )
         if normalized_creator_bid:
             query = query.filter(CreditWallet.creator_bid == normalized_creator_bid)
-        wallets = query.order_by(CreditWallet.id.asc()).limit(1000).all()
+        credit_ceiling = _low_balance_credit_ceiling(thresholds)
+        if credit_ceiling is not None:
+            query = query.filter(CreditWallet.available_credits <= credit_ceiling)
         notifications: list[dict[str, Any]] = []
         daily_consumption_cache: dict[tuple[str, int], dict[str, Any]] = {}
         creator_eligibility_cache: dict[str, bool] = {}
-        for wallet in wallets:
-            if not _is_notification_eligible_creator_cached(
-                wallet.creator_bid,
-                creator_eligibility_cache,
-            ):
-                continue
+        for wallet in _iter_scan_rows(
+            app,
+            query,
+            (CreditWallet.id,),
+            creator_column=CreditWallet.creator_bid,
+            shard=shard,
+            eligibility_cache=creator_eligibility_cache,
+        ):
             available = _to_decimal(wallet.available_credits)
             for threshold in thresholds:
                 kind = str(
@@ -2,33 +2,58 @@
 
 from __future__ import annotations
 
-from collections import defaultdict
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from decimal import Decimal
+from itertools import chain
 from typing import TYPE_CHECKING, Any
 
 from flaskr.dao import db
-from flaskr.service.metering.models import BillUsageRecord
+from flaskr.service.metering.consts import BILL_USAGE_TYPE_LLM
+from flaskr.service.metering.models import BillUsageRecord, BillUsageRecordMixin
 from flaskr.util.datetime import now_utc, parse_naive_utc
 from flaskr.util.uuid import generate_id
-from sqlalchemy import select
+from sqlalchemy import case, insert, select, update
 
-from .charges import build_usage_metric_charges
-from .consts import CREDIT_LEDGER_ENTRY_TYPE_CONSUME, CREDIT_SOURCE_TYPE_USAGE
+from .charges import build_usage_metric_charges, load_usage_rate
+from .consts import (
+    BILLING_METRIC_LLM_CACHE_TOKENS,
+    BILLING_METRIC_LLM_INPUT_TOKENS,
+    BILLING_METRIC_LLM_OUTPUT_TOKENS,
+    CREDIT_LEDGER_ENTRY_TYPE_CONSUME,
+    CREDIT_SOURCE_TYPE_USAGE,
+)
+from .history_archive import resolve_history_models
 from .models import (
     BillingDailyLedgerSummary,
     BillingDailyUsageMetric,
     CreditLedgerEntry,
+    CreditLedgerEntryMixin,
 )
 from .ownership import resolve_usage_creator_bid
 from .primitives import quantize_credit_amount as _quantize_credit_amount
 from .primitives import to_decimal as _to_decimal
+from .rate_index import list_usage_rate_boundaries
 
 if TYPE_CHECKING:
+    from collections.abc import Iterable
+
     from flask import Flask
 
 _ZERO = Decimal(0)
+# Metrics an LLM usage charges, in the order of the grouped token sums.
+_LLM_GROUP_METRICS = (
+    BILLING_METRIC_LLM_INPUT_TOKENS,
+    BILLING_METRIC_LLM_CACHE_TOKENS,
+    BILLING_METRIC_LLM_OUTPUT_TOKENS,
+)
+# Key fields: creator, shifu, usage scene and type, provider, model, metric.
+_MetricKey = tuple[str, str, int, int, str, str, int]
+# An open day's window trails ``now`` by this margin. A usage or ledger row is
+# stamped with created_at before its transaction commits; a window ending at
+# ``now`` would miss rows still in flight, and the next incremental run
+# starts after them, so they would only surface when the day is finalized.
+_LATE_COMMIT_MARGIN = timedelta(minutes=5)
 
 
 @dataclass(slots=True, frozen=True)
@@ -49,6 +74,7 @@ class DailyAggregateJobResult:
     row_count: int = 0
     deleted_count: int = 0
     reason: str | None = None
+    watermark: str | None = None
 
     def to_task_payload(self) -> dict[str, Any]:
         """Serialize this result for task processing."""
@@ -69,6 +95,8 @@ class DailyAggregateJobResult:
         }
         if self.reason:
             payload["reason"] = self.reason
+        if self.watermark:
+            payload["watermark"] = self.watermark
         return payload
 
     def __getitem__(self, key: str) -> Any:
@@ -131,139 +159,138 @@ def aggregate_daily_usage_metrics(
     creator_bid: str = "",
     shifu_bid: str = "",
     finalize: bool = False,
+    incremental: bool = False,
     now: datetime | None = None,
 ) -> DailyAggregateJobResult:
-    """Rebuild one day's usage aggregates from usage and ledger details."""
+    """Rebuild one day's usage aggregates from usage and ledger details.
+
+    LLM usages are summed by the database per shifu, model and rate window;
+    other usage types are streamed as column tuples and priced row by row.
+    With ``incremental`` (ignored when finalizing), only usages created since
+    the scope's stored ``window_ended_at`` are folded into the existing rows;
+    the day is recomputed when the scope has no single stored watermark.
+    Until the day is finalized its window ends ``_LATE_COMMIT_MARGIN`` before
+    ``now``, so rows that commit shortly after their created_at still fall
+    after the stored watermark.
+    """
     normalized_creator_bid = str(creator_bid or "").strip()
     normalized_shifu_bid = str(shifu_bid or "").strip()
+    anchor = now or now_utc()
     window_started_at, window_ended_at, normalized_stat_date = _resolve_stat_window(
         stat_date=stat_date,
         finalize=finalize,
-        now=now,
+        now=anchor,
     )
+    if not finalize:
+        window_ended_at = max(
+            window_started_at, min(window_ended_at, anchor - _LATE_COMMIT_MARGIN)
+        )
 
     with app.app_context():
-        usage_rows = (
-            BillUsageRecord.query.filter(
-                BillUsageRecord.deleted == 0,
-                BillUsageRecord.record_level == 0,
-                BillUsageRecord.billable == 1,
-                BillUsageRecord.status == 0,
-                BillUsageRecord.created_at >= window_started_at,
-                BillUsageRecord.created_at < window_ended_at,
+        existing_rows: dict[_MetricKey, _StoredMetricRow] = {}
+        watermark: datetime | None = None
+        if incremental and not finalize:
+            existing_rows = _load_daily_usage_metric_rows(
+                stat_date=normalized_stat_date,
+                creator_bid=normalized_creator_bid,
+                shifu_bid=normalized_shifu_bid,
             )
-            .order_by(BillUsageRecord.id.asc())
-            .yield_per(1000)
-        )
+            watermark = _resolve_incremental_watermark(
+                existing_rows.values(),
+                window_started_at=window_started_at,
+                window_ended_at=window_ended_at,
+            )
+        usage_started_at = watermark or window_started_at
 
-        consumed_credit_map = _load_usage_consumed_credit_map(
-            window_started_at=window_started_at,
-            window_ended_at=window_ended_at,
+        fold = _DailyUsageMetricFold(
+            app,
             creator_bid=normalized_creator_bid,
+            existing_keys=set(existing_rows) if watermark is not None else set(),
         )
-
-        aggregates: dict[
-            tuple[str, str, int, int, str, str, int],
-            dict[str, Any],
-        ] = {}
-        usage_count = 0
-        metric_count = 0
-        skipped_usage_count = 0
-        creator_cache: dict[str, str] = {}
-
-        for usage in usage_rows:
-            resolved_creator_bid = str(
-                _resolve_usage_creator_bid_cached(app, usage, creator_cache) or ""
-            ).strip()
-            if not resolved_creator_bid:
-                skipped_usage_count += 1
-                continue
-            if (
-                normalized_creator_bid
-                and resolved_creator_bid != normalized_creator_bid
-            ):
-                continue
-            if (
-                normalized_shifu_bid
-                and str(usage.shifu_bid or "").strip() != normalized_shifu_bid
-            ):
-                continue
-
-            settlement_at = usage.created_at or window_started_at
-            metric_charges = build_usage_metric_charges(
-                usage,
-                settlement_at=settlement_at,
-            )
-            if not metric_charges:
-                skipped_usage_count += 1
-                continue
-
-            usage_count += 1
-            for charge in metric_charges:
-                metric_code = int(charge.billing_metric)
-                aggregate_key = (
-                    resolved_creator_bid,
-                    str(usage.shifu_bid or "").strip(),
-                    int(usage.usage_scene or 0),
-                    int(usage.usage_type or 0),
-                    str(usage.provider or "").strip(),
-                    str(usage.model or "").strip(),
-                    metric_code,
-                )
-                row_payload = aggregates.setdefault(
-                    aggregate_key,
-                    {
-                        "creator_bid": resolved_creator_bid,
-                        "shifu_bid": str(usage.shifu_bid or "").strip(),
-                        "usage_scene": int(usage.usage_scene or 0),
-                        "usage_type": int(usage.usage_type or 0),
-                        "provider": str(usage.provider or "").strip(),
-                        "model": str(usage.model or "").strip(),
-                        "billing_metric": metric_code,
-                        "raw_amount": 0,
-                        "record_count": 0,
-                        "consumed_credits": _ZERO,
-                    },
-                )
-                row_payload["raw_amount"] += int(charge.raw_amount)
-                row_payload["record_count"] += 1
-                row_payload["consumed_credits"] += consumed_credit_map.get(
-                    (str(usage.usage_bid or "").strip(), metric_code),
-                    _ZERO,
-                )
-                metric_count += 1
-
-        scope_query = BillingDailyUsageMetric.query.filter(
-            BillingDailyUsageMetric.stat_date == normalized_stat_date
+        usage_models = resolve_history_models(
+            BillUsageRecord,
+            started_at=window_started_at,
+            ended_at=window_ended_at,
         )
-        if normalized_creator_bid:
-            scope_query = scope_query.filter(
-                BillingDailyUsageMetric.creator_bid == normalized_creator_bid
+        ledger_models = resolve_history_models(
+            CreditLedgerEntry,
+            started_at=usage_started_at,
+            ended_at=window_ended_at,
+        )
+        for usage_model in usage_models:
+            _fold_grouped_llm_usage(
+                fold,
+                usage_model,
+                _daily_usage_filters(
+                    usage_model,
+                    started_at=usage_started_at,
+                    ended_at=window_ended_at,
+                    shifu_bid=normalized_shifu_bid,
+                ),
+                started_at=usage_started_at,
+                ended_at=window_ended_at,
             )
-        if normalized_shifu_bid:
-            scope_query = scope_query.filter(
-                BillingDailyUsageMetric.shifu_bid == normalized_shifu_bid
+            _fold_streamed_usage(
+                fold,
+                usage_model,
+                _daily_usage_filters(
+                    usage_model,
+                    started_at=usage_started_at,
+                    ended_at=window_ended_at,
+                    shifu_bid=normalized_shifu_bid,
+                ),
+                default_settlement_at=window_started_at,
             )
-        deleted_count = int(scope_query.delete(synchronize_session=False) or 0)
+            # A usage and its consume entry may sit on different sides of
+            # the archive boundary, so every pairing is joined.
+            for ledger_model in ledger_models:
+                _fold_usage_consumed_credits(
+                    fold,
+                    ledger_model,
+                    usage_model,
+                    _daily_usage_filters(
+                        usage_model,
+                        started_at=window_started_at,
+                        ended_at=window_ended_at,
+                        shifu_bid=normalized_shifu_bid,
+                    ),
+                    ledger_started_at=usage_started_at,
+                    ledger_ended_at=window_ended_at,
+                    creator_bid=normalized_creator_bid,
+                )
 
-        for payload in aggregates.values():
-            db.session.add(
-                BillingDailyUsageMetric(
-                    daily_usage_metric_bid=generate_id(app),
-                    stat_date=normalized_stat_date,
-                    creator_bid=payload["creator_bid"],
-                    shifu_bid=payload["shifu_bid"],
-                    usage_scene=payload["usage_scene"],
-                    usage_type=payload["usage_type"],
-                    provider=payload["provider"],
-                    model=payload["model"],
-                    billing_metric=payload["billing_metric"],
-                    raw_amount=int(payload["raw_amount"]),
-                    record_count=int(payload["record_count"]),
-                    consumed_credits=_quantize_decimal(payload["consumed_credits"]),
-                    window_started_at=window_started_at,
-                    window_ended_at=window_ended_at,
+        if watermark is None:
+            scope_query = BillingDailyUsageMetric.query.filter(
+                BillingDailyUsageMetric.stat_date == normalized_stat_date
+            )
+            if normalized_creator_bid:
+                scope_query = scope_query.filter(
+                    BillingDailyUsageMetric.creator_bid == normalized_creator_bid
+                )
+            if normalized_shifu_bid:
+                scope_query = scope_query.filter(
+                    BillingDailyUsageMetric.shifu_bid == normalized_shifu_bid
                 )
+            deleted_count = int(scope_query.delete(synchronize_session=False) or 0)
+            _insert_daily_usage_metric_rows(
+                app,
+                fold.totals,
+                stat_date=normalized_stat_date,
+                window_started_at=window_started_at,
+                window_ended_at=window_ended_at,
+            )
+            row_count = len(fold.totals)
+        else:
+            deleted_count = 0
+            row_count = _merge_daily_usage_metric_rows(
+                app,
+                fold.totals,
+                existing_rows,
+                stat_date=normalized_stat_date,
+                creator_bid=normalized_creator_bid,
+                shifu_bid=normalized_shifu_bid,
+                window_started_at=window_started_at,
+                window_ended_at=window_ended_at,
             )
 
         db.session.commit()
@@ -275,11 +302,12 @@ def aggregate_daily_usage_metrics(
             finalize=bool(finalize),
             window_started_at=window_started_at.isoformat(),
             window_ended_at=window_ended_at.isoformat(),
-            usage_count=usage_count,
-            metric_count=metric_count,
-            skipped_usage_count=skipped_usage_count,
-            row_count=len(aggregates),
+            usage_count=fold.usage_count,
+            metric_count=fold.metric_count,
+            skipped_usage_count=fold.skipped_usage_count,
+            row_count=row_count,
             deleted_count=deleted_count,
+            watermark=watermark.isoformat() if watermark is not None else None,
         )
 
 
@@ -319,16 +347,19 @@ def aggregate_daily_ledger_summary(
     )
 
     with app.app_context():
-        query = CreditLedgerEntry.query.filter(
-            CreditLedgerEntry.deleted == 0,
-            CreditLedgerEntry.created_at >= window_started_at,
-            CreditLedgerEntry.created_at < window_ended_at,
-        )
-        if normalized_creator_bid:
-            query = query.filter(
-                CreditLedgerEntry.creator_bid == normalized_creator_bid
+        ledger_rows = chain.from_iterable(
+            _daily_ledger_rows(
+                ledger_model,
+                started_at=window_started_at,
+                ended_at=window_ended_at,
+                creator_bid=normalized_creator_bid,
+            )
+            for ledger_model in resolve_history_models(
+                CreditLedgerEntry,
+                started_at=window_started_at,
+                ended_at=window_ended_at,
             )
-        ledger_rows = query.order_by(CreditLedgerEntry.id.asc()).yield_per(1000)
+        )
 
         aggregates: dict[tuple[str, int, int], dict[str, Any]] = {}
         entry_count = 0
@@ -554,32 +585,322 @@ def detect_daily_aggregate_rebuild_range(
     )
 
 
-def _load_usage_consumed_credit_map(
+@dataclass(slots=True, frozen=True)
+class _UsageGroup:
+    """Usage columns that decide a usage group's creator and rates."""
+
+    shifu_bid: str
+    user_bid: str
+    usage_scene: int
+    usage_type: int
+    provider: str
+    model: str
+
+
+@dataclass(slots=True)
+class _MetricTotals:
+    raw_amount: int = 0
+    record_count: int = 0
+    consumed_credits: Decimal = _ZERO
+
+
+@dataclass(slots=True, frozen=True)
+class _StoredMetricRow:
+    id: int
+    raw_amount: int
+    record_count: int
+    consumed_credits: Decimal
+    window_ended_at: datetime
+
+
+class _DailyUsageMetricFold:
+    """Accumulate daily metric totals from grouped or streamed usages."""
+
+    def __init__(
+        self,
+        app: Flask,
+        *,
+        creator_bid: str,
+        existing_keys: set[_MetricKey],
+    ) -> None:
+        self.app = app
+        self.creator_bid = creator_bid
+        self.existing_keys = existing_keys
+        self.totals: dict[_MetricKey, _MetricTotals] = {}
+        self.usage_count = 0
+        self.metric_count = 0
+        self.skipped_usage_count = 0
+        self._creator_cache: dict[str, str] = {}
+
+    def resolve_creator_bid(self, usage: Any) -> str:
+        """Return the usage's creator, or an empty string when unresolved."""
+        return str(
+            _resolve_usage_creator_bid_cached(self.app, usage, self._creator_cache)
+            or ""
+        ).strip()
+
+    def add_usages(
+        self,
+        usage: Any,
+        *,
+        usage_count: int,
+        charged_metrics: list[tuple[int, int]],
+    ) -> None:
+        """Fold ``usage_count`` usages charging ``(metric, raw_amount)`` pairs."""
+        resolved_creator_bid = self.resolve_creator_bid(usage)
+        if not resolved_creator_bid:
+            self.skipped_usage_count += usage_count
+            return
+        if self.creator_bid and resolved_creator_bid != self.creator_bid:
+            return
+        if not charged_metrics:
+            self.skipped_usage_count += usage_count
+            return
+        self.usage_count += usage_count
+        for billing_metric, raw_amount in charged_metrics:
+            totals = self.totals.setdefault(
+                _metric_key(resolved_creator_bid, usage, billing_metric),
+                _MetricTotals(),
+            )
+            totals.raw_amount += int(raw_amount)
+            totals.record_count += usage_count
+            self.metric_count += usage_count
+
+    def add_consumed_credits(
+        self, usage: Any, *, billing_metric: int, consumed_credits: Decimal
+    ) -> None:
+        """Add ledger credits to a metric row that usages produced."""
+        resolved_creator_bid = self.resolve_creator_bid(usage)
+        if not resolved_creator_bid:
+            return
+        key = _metric_key(resolved_creator_bid, usage, billing_metric)
+        if key not in self.totals and key not in self.existing_keys:
+            return
+        totals = self.totals.setdefault(key, _MetricTotals())
+        totals.consumed_credits += consumed_credits
+
+
+def _daily_ledger_rows(
+    ledger_model: type[CreditLedgerEntryMixin],
     *,
-    window_started_at: datetime,
-    window_ended_at: datetime,
+    started_at: datetime,
+    ended_at: datetime,
     creator_bid: str = "",
-) -> dict[tuple[str, int], Decimal]:
-    query = CreditLedgerEntry.query.filter(
-        CreditLedgerEntry.deleted == 0,
-        CreditLedgerEntry.entry_type == CREDIT_LEDGER_ENTRY_TYPE_CONSUME,
-        CreditLedgerEntry.source_type == CREDIT_SOURCE_TYPE_USAGE,
-        CreditLedgerEntry.created_at >= window_started_at,
-        CreditLedgerEntry.created_at < window_ended_at,
+) -> Iterable[CreditLedgerEntryMixin]:
+    query = ledger_model.query.filter(
+        ledger_model.deleted == 0,
+        ledger_model.created_at >= started_at,
+        ledger_model.created_at < ended_at,
     )
-    normalized_creator_bid = str(creator_bid or "").strip()
-    if normalized_creator_bid:
-        query = query.filter(CreditLedgerEntry.creator_bid == normalized_creator_bid)
-    rows = query.order_by(CreditLedgerEntry.id.asc()).yield_per(1000)
-
-    consumed_map: defaultdict[tuple[str, int], Decimal] = defaultdict(lambda: _ZERO)
-    for row in rows:
-        usage_bid = str(row.source_bid or "").strip()
-        if not usage_bid:
-            continue
+    if creator_bid:
+        query = query.filter(ledger_model.creator_bid == creator_bid)
+    return query.order_by(ledger_model.id.asc()).yield_per(1000)
+
+
+def _metric_key(creator_bid: str, usage: Any, billing_metric: int) -> _MetricKey:
+    return (
+        creator_bid,
+        str(usage.shifu_bid or "").strip(),
+        int(usage.usage_scene or 0),
+        int(usage.usage_type or 0),
+        str(usage.provider or "").strip(),
+        str(usage.model or "").strip(),
+        int(billing_metric),
+    )
+
+
+def _daily_usage_filters(
+    usage_model: type[BillUsageRecordMixin],
+    *,
+    started_at: datetime,
+    ended_at: datetime,
+    shifu_bid: str = "",
+) -> list[Any]:
+    filters = [
+        usage_model.deleted == 0,
+        usage_model.record_level == 0,
+        usage_model.billable == 1,
+        usage_model.status == 0,
+        usage_model.created_at >= started_at,
+        usage_model.created_at < ended_at,
+    ]
+    if shifu_bid:
+        filters.append(usage_model.shifu_bid == shifu_bid)
+    return filters
+
+
+def _fold_grouped_llm_usage(
+    fold: _DailyUsageMetricFold,
+    usage_model: type[BillUsageRecordMixin],
+    usage_filters: list[Any],
+    *,
+    started_at: datetime,
+    ended_at: datetime,
+) -> None:
+    """Fold LLM usages summed by the database.
+
+    Usages are grouped by everything that decides their creator and rates,
+    by the rate window they were created in and by which token counts are
+    positive, so every usage of a group charges the same metrics.
+    """
+    uncached_input = usage_model.input - usage_model.input_cache
+    # Debug usages without a shifu are owned by their user.
+    creator_hint = case((usage_model.shifu_bid == "", usage_model.user_bid), else_="")
+    flags = [
+        case((uncached_input > 0, 1), else_=0),
+        case((usage_model.input_cache > 0, 1), else_=0),
+        case((usage_model.output > 0, 1), else_=0),
+    ]
+    group_columns = [
+        usage_model.shifu_bid,
+        creator_hint,
+        usage_model.usage_scene,
+        usage_model.provider,
+        usage_model.model,
+        *flags,
+    ]
+    boundaries = list_usage_rate_boundaries(
+        usage_type=BILL_USAGE_TYPE_LLM,
+        window_started_at=started_at,
+        window_ended_at=ended_at,
+    )
+    if boundaries:
+        group_columns.append(
+            case(
+                *[
+                    (usage_model.created_at < boundary, index)
+                    for index, boundary in enumerate(boundaries)
+                ],
+                else_=len(boundaries),
+            )
+        )
+    stmt = (
+        select(
+            *group_columns,
+            db.func.count(),
+            db.func.sum(uncached_input),
+            db.func.sum(usage_model.input_cache),
+            db.func.sum(usage_model.output),
+            db.func.min(usage_model.created_at),
+        )
+        .where(*usage_filters, usage_model.usage_type == BILL_USAGE_TYPE_LLM)
+        .group_by(*group_columns)
+    )
+    for row in db.session.execute(stmt):
+        (
+            shifu_value,
+            user_value,
+            usage_scene,
+            provider,
+            model,
+            *metric_flags,
+        ) = row[:8]
+        usage_count, *metric_amounts = row[-5:-1]
+        rated_at = row[-1] or started_at
+        group = _UsageGroup(
+            shifu_bid=str(shifu_value or ""),
+            user_bid=str(user_value or ""),
+            usage_scene=int(usage_scene or 0),
+            usage_type=BILL_USAGE_TYPE_LLM,
+            provider=str(provider or ""),
+            model=str(model or ""),
+        )
+        charged_metrics = [
+            (billing_metric, int(amount or 0))
+            for billing_metric, flag, amount in zip(
+                _LLM_GROUP_METRICS, metric_flags, metric_amounts, strict=True
+            )
+            if int(flag or 0)
+            and load_usage_rate(
+                usage=group, billing_metric=billing_metric, settlement_at=rated_at
+            )
+            is not None
+        ]
+        fold.add_usages(
+            group, usage_count=int(usage_count), charged_metrics=charged_metrics
+        )
+
+
+def _fold_streamed_usage(
+    fold: _DailyUsageMetricFold,
+    usage_model: type[BillUsageRecordMixin],
+    usage_filters: list[Any],
+    *,
+    default_settlement_at: datetime,
+) -> None:
+    """Price non-LLM usages one column tuple at a time."""
+    stmt = (
+        select(
+            usage_model.shifu_bid,
+            usage_model.user_bid,
+            usage_model.usage_scene,
+            usage_model.usage_type,
+            usage_model.provider,
+            usage_model.model,
+            usage_model.input,
+            usage_model.input_cache,
+            usage_model.output,
+            usage_model.created_at,
+        )
+        .where(*usage_filters, usage_model.usage_type != BILL_USAGE_TYPE_LLM)
+        .order_by(usage_model.id.asc())
+        .execution_options(yield_per=1000)
+    )
+    for usage in db.session.execute(stmt):
+        metric_charges = build_usage_metric_charges(
+            usage,
+            settlement_at=usage.created_at or default_settlement_at,
+        )
+        fold.add_usages(
+            usage,
+            usage_count=1,
+            charged_metrics=[
+                (int(charge.billing_metric), int(charge.raw_amount))
+                for charge in metric_charges
+            ],
+        )
+
+
+def _fold_usage_consumed_credits(
+    fold: _DailyUsageMetricFold,
+    ledger_model: type[CreditLedgerEntryMixin],
+    usage_model: type[BillUsageRecordMixin],
+    usage_filters: list[Any],
+    *,
+    ledger_started_at: datetime,
+    ledger_ended_at: datetime,
+    creator_bid: str = "",
+) -> None:
+    """Add consumed credits of usage ledger entries joined to their usages."""
+    stmt = (
+        select(
+            usage_model.shifu_bid,
+            usage_model.user_bid,
+            usage_model.usage_scene,
+            usage_model.usage_type,
+            usage_model.provider,
+            usage_model.model,
+            ledger_model.amount,
+            ledger_model.metadata_json,
+        )
+        .select_from(ledger_model)
+        .join(usage_model, usage_model.usage_bid == ledger_model.source_bid)
+        .where(
+            ledger_model.deleted == 0,
+            ledger_model.entry_type == CREDIT_LEDGER_ENTRY_TYPE_CONSUME,
+            ledger_model.source_type == CREDIT_SOURCE_TYPE_USAGE,
+            ledger_model.source_bid != "",
+            ledger_model.created_at >= ledger_started_at,
+            ledger_model.created_at < ledger_ended_at,
+            *usage_filters,
+        )
+        .order_by(ledger_model.id.asc())
+        .execution_options(yield_per=1000)
+    )
+    if creator_bid:
+        stmt = stmt.where(ledger_model.creator_bid == creator_bid)
+    for row in db.session.execute(stmt):
         metric_breakdown = list((row.metadata_json or {}).get("metric_breakdown") or [])
-        if not metric_breakdown:
-            continue
         for item in metric_breakdown:
             try:
                 metric_code = int(item.get("billing_metric_code") or 0)
@@ -592,8 +913,165 @@ def _load_usage_consumed_credit_map(
                 consumed_value = _quantize_decimal(-_to_decimal(row.amount))
             else:
                 consumed_value = _quantize_decimal(consumed_credits)
-            consumed_map[(usage_bid, metric_code)] += consumed_value
-    return dict(consumed_map)
+            fold.add_consumed_credits(
+                row, billing_metric=metric_code, consumed_credits=consumed_value
+            )
+
+
+def _load_daily_usage_metric_rows(
+    *,
+    stat_date: str,
+    creator_bid: str = "",
+    shifu_bid: str = "",
+) -> dict[_MetricKey, _StoredMetricRow]:
+    stmt = select(
+        BillingDailyUsageMetric.id,
+        BillingDailyUsageMetric.creator_bid,
+        BillingDailyUsageMetric.shifu_bid,
+        BillingDailyUsageMetric.usage_scene,
+        BillingDailyUsageMetric.usage_type,
+        BillingDailyUsageMetric.provider,
+        BillingDailyUsageMetric.model,
+        BillingDailyUsageMetric.billing_metric,
+        BillingDailyUsageMetric.raw_amount,
+        BillingDailyUsageMetric.record_count,
+        BillingDailyUsageMetric.consumed_credits,
+        BillingDailyUsageMetric.window_ended_at,
+    ).where(
+        BillingDailyUsageMetric.deleted == 0,
+        BillingDailyUsageMetric.stat_date == stat_date,
+    )
+    if creator_bid:
+        stmt = stmt.where(BillingDailyUsageMetric.creator_bid == creator_bid)
+    if shifu_bid:
+        stmt = stmt.where(BillingDailyUsageMetric.shifu_bid == shifu_bid)
+    return {
+        (
+            str(row.creator_bid or ""),
+            str(row.shifu_bid or ""),
+            int(row.usage_scene or 0),
+            int(row.usage_type or 0),
+            str(row.provider or ""),
+            str(row.model or ""),
+            int(row.billing_metric or 0),
+        ): _StoredMetricRow(
+            id=int(row.id),
+            raw_amount=int(row.raw_amount or 0),
+            record_count=int(row.record_count or 0),
+            consumed_credits=_to_decimal(row.consumed_credits),
+            window_ended_at=row.window_ended_at,
+        )
+        for row in db.session.execute(stmt)
+    }
+
+
+def _resolve_incremental_watermark(
+    rows: Iterable[_StoredMetricRow],
+    *,
+    window_started_at: datetime,
+    window_ended_at: datetime,
+) -> datetime | None:
+    """Return the shared window end of stored rows, or None to recompute."""
+    watermarks = {row.window_ended_at for row in rows}
+    if len(watermarks) != 1:
+        return None
+    watermark = next(iter(watermarks))
+    if watermark is None or not window_started_at <= watermark <= window_ended_at:
+        return None
+    return watermark
+
+
+def _insert_daily_usage_metric_rows(
+    app: Flask,
+    totals: dict[_MetricKey, _MetricTotals],
+    *,
+    stat_date: str,
+    window_started_at: datetime,
+    window_ended_at: datetime,
+) -> None:
+    if not totals:
+        return
+    db.session.execute(
+        insert(BillingDailyUsageMetric),
+        [
+            {
+                "daily_usage_metric_bid": generate_id(app),
+                "stat_date": stat_date,
+                "creator_bid": key[0],
+                "shifu_bid": key[1],
+                "usage_scene": key[2],
+                "usage_type": key[3],
+                "provider": key[4],
+                "model": key[5],
+                "billing_metric": key[6],
+                "raw_amount": int(item.raw_amount),
+                "record_count": int(item.record_count),
+                "consumed_credits": _quantize_decimal(item.consumed_credits),
+                "window_started_at": window_started_at,
+                "window_ended_at": window_ended_at,
+            }
+            for key, item in totals.items()
+        ],
+    )
+
+
+def _merge_daily_usage_metric_rows(
+    app: Flask,
+    totals: dict[_MetricKey, _MetricTotals],
+    existing_rows: dict[_MetricKey, _StoredMetricRow],
+    *,
+    stat_date: str,
+    creator_bid: str,
+    shifu_bid: str,
+    window_started_at: datetime,
+    window_ended_at: datetime,
+) -> int:
+    """Add folded totals onto stored rows and return the scope's row count."""
+    updates: list[dict[str, Any]] = []
+    new_totals: dict[_MetricKey, _MetricTotals] = {}
+    for key, item in totals.items():
+        stored = existing_rows.get(key)
+        if stored is None:
+            new_totals[key] = item
+            continue
+        updates.append(
+            {
+                "id": stored.id,
+                "raw_amount": stored.raw_amount + int(item.raw_amount),
+                "record_count": stored.record_count + int(item.record_count),
+                "consumed_credits": _quantize_decimal(
+                    stored.consumed_credits + item.consumed_credits
+                ),
+            }
+        )
+    if updates:
+        db.session.execute(update(BillingDailyUsageMetric), updates)
+    _insert_daily_usage_metric_rows(
+        app,
+        new_totals,
+        stat_date=stat_date,
+        window_started_at=window_started_at,
+        window_ended_at=window_ended_at,
+    )
+    scope_update = (
+        update(BillingDailyUsageMetric)
+        .where(
+            BillingDailyUsageMetric.deleted == 0,
+            BillingDailyUsageMetric.stat_date == stat_date,
+        )
+        .values(window_ended_at=window_ended_at)
+        .execution_options(synchronize_session=False)
+    )
+    if creator_bid:
+        scope_update = scope_update.where(
+            BillingDailyUsageMetric.creator_bid == creator_bid
+        )
+    if shifu_bid:
+        scope_update = scope_update.where(
+            BillingDailyUsageMetric.shifu_bid == shifu_bid
+        )
+    db.session.execute(scope_update)
+    return len(existing_rows) + len(new_totals)
 
 
 def _resolve_usage_creator_bid_cached(
@@ -0,0 +1,418 @@
+"""Hot/archive split for usage records and credit ledger entries.
+
+``bill_usage`` and ``credit_ledger_entries`` grow with every LLM and TTS call.
+Once a day is finalized by the daily aggregates and is older than
+``BILL_HISTORY_HOT_RETENTION_DAYS``, its rows move to ``bill_usage_archive`` and
+``credit_ledger_entries_archive``. The moved rows keep their ids.
+
+``bill_history_archive_states`` records two boundaries per hot table:
+
+* ``archiving_before``: rows created before it may already be archived.
+* ``archived_before``: rows created before it live only in the archive.
+
+A move first raises ``archiving_before`` and then copies and deletes rows in
+id batches, one transaction per batch. It raises ``archived_before`` only once
+the hot table holds nothing older. Because of that order,
+``resolve_history_models`` never drops a table that may still hold rows of a
+range, and scans of recent days never touch the archive.
+
+Native MySQL range partitioning does not fit these tables: every unique key
+would need ``created_at``, and that would weaken the ledger's
+``(creator_bid, idempotency_key)`` guarantee.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Any
+
+from flaskr.dao import db
+from flaskr.dao.uow import unit_of_work
+from flaskr.service.metering.models import BillUsageRecord, BillUsageRecordArchive
+from flaskr.util.datetime import now_utc, parse_naive_utc
+from sqlalchemy import delete, func, insert, select
+
+from .models import (
+    BillingDailyLedgerSummary,
+    BillingDailyUsageMetric,
+    BillingHistoryArchiveState,
+    CreditLedgerEntry,
+    CreditLedgerEntryArchive,
+)
+
+if TYPE_CHECKING:
+    from flask import Flask
+
+DEFAULT_HISTORY_HOT_RETENTION_DAYS = 180
+DEFAULT_HISTORY_ARCHIVE_BATCH_SIZE = 2000
+HISTORY_TABLE_USAGE = BillUsageRecord.__tablename__
+HISTORY_TABLE_LEDGER = CreditLedgerEntry.__tablename__
+_ARCHIVE_MODELS: dict[str, tuple[type, type]] = {
+    HISTORY_TABLE_USAGE: (BillUsageRecord, BillUsageRecordArchive),
+    HISTORY_TABLE_LEDGER: (CreditLedgerEntry, CreditLedgerEntryArchive),
+}
+
+
+@dataclass(slots=True, frozen=True)
+class HistoryArchiveTableResult:
+    """Capture the archive outcome of one hot table."""
+
+    table_name: str
+    archive_before: str | None
+    archived_before: str | None
+    candidate_count: int
+    moved_count: int
+    batch_count: int
+
+    def to_payload(self) -> dict[str, Any]:
+        """Serialize this result as an API payload."""
+        return {
+            "table_name": self.table_name,
+            "archive_before": self.archive_before,
+            "archived_before": self.archived_before,
+            "candidate_count": self.candidate_count,
+            "moved_count": self.moved_count,
+            "batch_count": self.batch_count,
+        }
+
+
+@dataclass(slots=True, frozen=True)
+class HistoryArchiveResult:
+    """Capture one run of the usage and ledger history archive job."""
+
+    status: str
+    dry_run: bool
+    archive_before: str | None
+    finalized_through: str | None
+    tables: list[HistoryArchiveTableResult] = field(default_factory=list)
+
+    def to_task_payload(self) -> dict[str, Any]:
+        """Serialize this result for task processing."""
+        return {
+            "status": self.status,
+            "dry_run": self.dry_run,
+            "archive_before": self.archive_before,
+            "finalized_through": self.finalized_through,
+            "tables": [table.to_payload() for table in self.tables],
+        }
+
+    def __getitem__(self, key: str) -> Any:
+        """Return a task-payload field by key."""
+        return self.to_task_payload()[key]
+
+
+def resolve_history_models(
+    hot_model: type,
+    *,
+    started_at: datetime | None = None,
+    ended_at: datetime | None = None,
+) -> tuple[type, ...]:
+    """Return the hot and/or archive models holding rows created in a range.
+
+    Both bounds are treated as inclusive; ``None`` leaves the range open.
+    Models come back hot first. Callers scan each one with the same filters
+    and combine the results, because a row lives in exactly one of them.
+    """
+    archive_model = _ARCHIVE_MODELS[hot_model.__tablename__][1]
+    state = _load_archive_state(hot_model.__tablename__)
+    if state is None or state.archiving_before is None:
+        return (hot_model,)
+
+    models: list[type] = []
+    if (
+        ended_at is None
+        or state.archived_before is None
+        or ended_at >= state.archived_before
+    ):
+        models.append(hot_model)
+    if started_at is None or started_at < state.archiving_before:
+        models.append(archive_model)
+    return tuple(models)
+
+
+def resolve_history_archive_before(
+    app: Flask,
+    *,
+    now: datetime | None = None,
+) -> tuple[datetime | None, datetime | None]:
+    """Return ``(archive_before, finalized_through)`` for the next move.
+
+    ``archive_before`` is the earlier of two times: the start of the first day
+    inside hot retention, and the end of the last day up to which every stat
+    day of the usage metrics and ledger summary was finalized. It is ``None``
+    when no such day exists yet.
+    """
+    anchor = now or now_utc()
+    retention_days = max(
+        int(
+            app.config.get(
+                "BILL_HISTORY_HOT_RETENTION_DAYS",
+                DEFAULT_HISTORY_HOT_RETENTION_DAYS,
+            )
+            or DEFAULT_HISTORY_HOT_RETENTION_DAYS
+        ),
+        1,
+    )
+    retention_start = anchor.replace(
+        hour=0, minute=0, second=0, microsecond=0
+    ) - timedelta(days=retention_days)
+    # Days below what every hot table already archived were checked before.
+    archived_bounds = [
+        state.archived_before if state is not None else None
+        for state in (_load_archive_state(name) for name in _ARCHIVE_MODELS)
+    ]
+    since = None if None in archived_bounds else min(archived_bounds)
+    usage_finalized_through = _load_finalized_through(
+        BillingDailyUsageMetric, since=since
+    )
+    ledger_finalized_through = _load_finalized_through(
+        BillingDailyLedgerSummary, since=since
+    )
+    if usage_finalized_through is None or ledger_finalized_through is None:
+        return None, None
+    finalized_through = min(usage_finalized_through, ledger_finalized_through)
+    return min(retention_start, finalized_through), finalized_through
+
+
+def archive_billing_history(
+    app: Flask,
+    *,
+    table_names: tuple[str, ...] = (HISTORY_TABLE_USAGE, HISTORY_TABLE_LEDGER),
+    archive_before: datetime | None = None,
+    batch_size: int | None = None,
+    dry_run: bool = True,
+) -> HistoryArchiveResult:
+    """Move finalized usage and ledger days from the hot tables to archive.
+
+    ``archive_before`` can only lower the computed boundary, never raise it
+    past retention or the last finalized day. A dry run only counts the rows
+    that would move.
+    """
+    with app.app_context():
+        computed_before, finalized_through = resolve_history_archive_before(app)
+        effective_before = computed_before
+        if archive_before is not None and computed_before is not None:
+            effective_before = min(archive_before, computed_before)
+        resolved_batch_size = max(
+            int(
+                batch_size
+                or app.config.get(
+                    "BILL_HISTORY_ARCHIVE_BATCH_SIZE",
+                    DEFAULT_HISTORY_ARCHIVE_BATCH_SIZE,
+                )
+                or DEFAULT_HISTORY_ARCHIVE_BATCH_SIZE
+            ),
+            1,
+        )
+
+        table_results: list[HistoryArchiveTableResult] = []
+        for table_name in table_names:
+            hot_model, archive_model = _ARCHIVE_MODELS[table_name]
+            table_results.append(
+                _archive_history_table(
+                    hot_model,
+                    archive_model,
+                    archive_before=effective_before,
+                    batch_size=resolved_batch_size,
+                    dry_run=dry_run,
+                )
+            )
+
+        if effective_before is None:
+            status = "not_finalized"
+        elif dry_run:
+            status = "dry_run"
+        else:
+            status = "archived"
+        return HistoryArchiveResult(
+            status=status,
+            dry_run=dry_run,
+            archive_before=_isoformat(effective_before),
+            finalized_through=_isoformat(finalized_through),
+            tables=table_results,
+        )
+
+
+def _archive_history_table(
+    hot_model: type,
+    archive_model: type,
+    *,
+    archive_before: datetime | None,
+    batch_size: int,
+    dry_run: bool,
+) -> HistoryArchiveTableResult:
+    table_name = hot_model.__tablename__
+    state = _load_archive_state(table_name)
+    archived_before = state.archived_before if state is not None else None
+    if archive_before is None:
+        return HistoryArchiveTableResult(
+            table_name=table_name,
+            archive_before=None,
+            archived_before=_isoformat(archived_before),
+            candidate_count=0,
+            moved_count=0,
+            batch_count=0,
+        )
+
+    # An earlier interrupted move may have aimed further; finish it first.
+    if state is not None and state.archiving_before is not None:
+        archive_before = max(archive_before, state.archiving_before)
+    candidate_count = int(
+        db.session.scalar(
+            select(func.count()).where(hot_model.created_at < archive_before)
+        )
+        or 0
+    )
+    if dry_run:
+        db.session.rollback()
+        return HistoryArchiveTableResult(
+            table_name=table_name,
+            archive_before=archive_before.isoformat(),
+            archived_before=_isoformat(archived_before),
+            candidate_count=candidate_count,
+            moved_count=0,
+            batch_count=0,
+        )
+
+    with unit_of_work():
+        _save_archive_state(table_name, archiving_before=archive_before)
+
+    column_names = [column.name for column in hot_model.__table__.columns]
+    hot_columns = [hot_model.__table__.c[name] for name in column_names]
+    moved_count = 0
+    batch_count = 0
+    while True:
+        with unit_of_work():
+            batch_ids = list(
+                db.session.scalars(
+                    select(hot_model.id)
+                    .where(hot_model.created_at < archive_before)
+                    .order_by(hot_model.id.asc())
+                    .limit(batch_size)
+                )
+            )
+            if batch_ids:
+                _move_history_batch(
+                    hot_model,
+                    archive_model,
+                    batch_ids=batch_ids,
+                    column_names=column_names,
+                    hot_columns=hot_columns,
+                )
+        if not batch_ids:
+            break
+        moved_count += len(batch_ids)
+        batch_count += 1
+
+    with unit_of_work():
+        state = _save_archive_state(
+            table_name,
+            archived_before=archive_before,
+            moved_count=moved_count,
+        )
+    return HistoryArchiveTableResult(
+        table_name=table_name,
+        archive_before=archive_before.isoformat(),
+        archived_before=_isoformat(state.archived_before),
+        candidate_count=candidate_count,
+        moved_count=moved_count,
+        batch_count=batch_count,
+    )
+
+
+def _move_history_batch(
+    hot_model: type,
+    archive_model: type,
+    *,
+    batch_ids: list[int],
+    column_names: list[str],
+    hot_columns: list[Any],
+) -> None:
+    # Copy and delete share a transaction, but a batch retried after a lost
+    # commit acknowledgement may find its copy already archived.
+    already_archived = set(
+        db.session.scalars(
+            select(archive_model.id).where(archive_model.id.in_(batch_ids))
+        )
+    )
+    copy_ids = [row_id for row_id in batch_ids if row_id not in already_archived]
+    if copy_ids:
+        db.session.execute(
+            insert(archive_model.__table__).from_select(
+                column_names,
+                select(*hot_columns).where(hot_model.id.in_(copy_ids)),
+            )
+        )
+    db.session.execute(delete(hot_model.__table__).where(hot_model.id.in_(batch_ids)))
+
+
+def _load_archive_state(table_name: str) -> BillingHistoryArchiveState | None:
+    return (
+        BillingHistoryArchiveState.query.filter(
+            BillingHistoryArchiveState.deleted == 0,
+            BillingHistoryArchiveState.table_name == table_name,
+        )
+        .order_by(BillingHistoryArchiveState.id.desc())
+        .first()
+    )
+
+
+def _save_archive_state(
+    table_name: str,
+    *,
+    archiving_before: datetime | None = None,
+    archived_before: datetime | None = None,
+    moved_count: int = 0,
+) -> BillingHistoryArchiveState:
+    state = _load_archive_state(table_name)
+    if state is None:
+        state = BillingHistoryArchiveState(
+            table_name=table_name,
+            archived_row_count=0,
+        )
+        db.session.add(state)
+    if archiving_before is not None and (
+        state.archiving_before is None or archiving_before > state.archiving_before
+    ):
+        state.archiving_before = archiving_before
+    if archived_before is not None and (
+        state.archived_before is None or archived_before > state.archived_before
+    ):
+        state.archived_before = archived_before
+    state.archived_row_count = int(state.archived_row_count or 0) + moved_count
+    state.updated_at = now_utc()
+    return state
+
+
+def _load_finalized_through(
+    summary_model: type,
+    *,
+    since: datetime | None,
+) -> datetime | None:
+    """Return the end of the last day before the first stat day not finalized.
+
+    A day counts as finalized once its summary window covers the whole day.
+    """
+    query = select(
+        summary_model.stat_date, func.max(summary_model.window_ended_at)
+    ).where(summary_model.deleted == 0)
+    if since is not None:
+        query = query.where(summary_model.stat_date >= since.strftime("%Y-%m-%d"))
+    rows = db.session.execute(
+        query.group_by(summary_model.stat_date).order_by(summary_model.stat_date.asc())
+    )
+    finalized_through = None
+    for stat_date, window_ended_at in rows:
+        try:
+            day_end = parse_naive_utc(str(stat_date), "%Y-%m-%d") + timedelta(days=1)
+        except (TypeError, ValueError):
+            continue
+        if window_ended_at is None or window_ended_at < day_end:
+            break
+        finalized_through = day_end
+    return finalized_through
+
+
+def _isoformat(value: datetime | None) -> str | None:
+    return value.isoformat() if value is not None else None
@@ -1006,33 +1006,77 @@ class CreditWalletBucket(BillingTableMixin, db.Model):
     )
 
 
-class CreditLedgerEntry(BillingTableMixin, db.Model):
-    """Persist credit ledger entry records."""
+class CreditWalletProjection(BillingTableMixin, db.Model):
+    """Persist precomputed wallet balances maintained by bucket writes."""
 
-    __tablename__ = "credit_ledger_entries"
+    __tablename__ = "credit_wallet_projections"
     __table_args__ = (
         UniqueConstraint(
-            "ledger_bid",
-            name="uq_credit_ledger_entries_ledger_bid",
-        ),
-        Index(
-            "ix_credit_ledger_entries_creator_created",
-            "creator_bid",
-            "created_at",
-        ),
-        Index(
-            "ix_credit_ledger_entries_source_type_source_bid",
-            "source_type",
-            "source_bid",
-        ),
-        UniqueConstraint(
-            "creator_bid",
-            "idempotency_key",
-            name="uq_credit_ledger_entries_creator_idempotency",
+            "wallet_bid",
+            name="uq_credit_wallet_projections_wallet_bid",
         ),
-        {"comment": "Credit ledger entries"},
+        {"comment": "Credit wallet balance projections"},
     )
 
+    wallet_bid = Column(
+        String(36),
+        nullable=False,
+        default="",
+        comment="Credit wallet business identifier",
+    )
+    creator_bid = Column(
+        String(36),
+        nullable=False,
+        default="",
+        index=True,
+        comment="Creator business identifier",
+    )
+    available_credits = Column(
+        CREDIT_NUMERIC,
+        nullable=False,
+        default=0,
+        comment="Consumable credits as of the projection window",
+    )
+    reserved_credits = Column(
+        CREDIT_NUMERIC,
+        nullable=False,
+        default=0,
+        comment="Reserved credits",
+    )
+    has_active_subscription = Column(
+        SmallInteger,
+        nullable=False,
+        default=0,
+        comment="Whether subscription-gated buckets counted as consumable",
+    )
+    projected_at = Column(
+        DateTime,
+        nullable=False,
+        default=now_utc,
+        comment="Time the projection was last fully recomputed",
+    )
+    valid_until = Column(
+        DateTime,
+        nullable=True,
+        comment="Next bucket or subscription boundary; NULL means none",
+    )
+    stale = Column(
+        SmallInteger,
+        nullable=False,
+        default=0,
+        comment="Set when a write changed the projection shape: 0=current, 1=stale",
+    )
+    version = Column(
+        Integer,
+        nullable=False,
+        default=0,
+        comment="Projection version",
+    )
+
+
+class CreditLedgerEntryMixin(BillingTableMixin):
+    """Provide the credit ledger columns shared by hot and archive tables."""
+
     ledger_bid = Column(
         String(36),
         nullable=False,
@@ -1118,6 +1162,93 @@ class CreditLedgerEntry(BillingTableMixin, db.Model):
     )
 
 
+class CreditLedgerEntry(CreditLedgerEntryMixin, db.Model):
+    """Persist credit ledger entry records."""
+
+    __tablename__ = "credit_ledger_entries"
+    __table_args__ = (
+        UniqueConstraint(
+            "ledger_bid",
+            name="uq_credit_ledger_entries_ledger_bid",
+        ),
+        Index(
+            "ix_credit_ledger_entries_creator_created",
+            "creator_bid",
+            "created_at",
+        ),
+        Index(
+            "ix_credit_ledger_entries_source_type_source_bid",
+            "source_type",
+            "source_bid",
+        ),
+        UniqueConstraint(
+            "creator_bid",
+            "idempotency_key",
+            name="uq_credit_ledger_entries_creator_idempotency",
+        ),
+        {"comment": "Credit ledger entries"},
+    )
+
+
+class CreditLedgerEntryArchive(CreditLedgerEntryMixin, db.Model):
+    """Persist credit ledger entries moved out of the hot table."""
+
+    __tablename__ = "credit_ledger_entries_archive"
+    __table_args__ = (
+        UniqueConstraint(
+            "ledger_bid",
+            name="uq_credit_ledger_entries_archive_ledger_bid",
+        ),
+        Index(
+            "ix_credit_ledger_entries_archive_creator_created",
+            "creator_bid",
+            "created_at",
+        ),
+        UniqueConstraint(
+            "creator_bid",
+            "idempotency_key",
+            name="uq_credit_ledger_entries_archive_creator_idempotency",
+        ),
+        {"comment": "Archived credit ledger entries for finalized days"},
+    )
+
+
+class BillingHistoryArchiveState(BillingTableMixin, db.Model):
+    """Track how far one detail table has been moved to its archive table."""
+
+    __tablename__ = "bill_history_archive_states"
+    __table_args__ = (
+        UniqueConstraint(
+            "table_name",
+            name="uq_bill_history_archive_states_table_name",
+        ),
+        {"comment": "Hot/archive boundaries for billing detail tables"},
+    )
+
+    table_name = Column(
+        String(64),
+        nullable=False,
+        default="",
+        comment="Hot table name",
+    )
+    archived_before = Column(
+        DateTime,
+        nullable=True,
+        comment="Rows created before this time live only in the archive table",
+    )
+    archiving_before = Column(
+        DateTime,
+        nullable=True,
+        comment="Boundary of the move in progress; rows before it may be archived",
+    )
+    archived_row_count = Column(
+        BIGINT,
+        nullable=False,
+        default=0,
+        comment="Rows moved to the archive table so far",
+    )
+
+
 class NotificationRecord(BillingTableMixin, db.Model):
     """Persist notification record records."""
 
@@ -0,0 +1,363 @@
+"""Share an in-memory interval index of active credit usage rates per process.
+
+Every rate lookup used to load all active ``CreditUsageRate`` rows for a
+(usage_type, usage_scene, billing_metric) triple and filter effective windows
+in Python, so settling or aggregating a day of usage ran one query per usage
+per metric. The rate table is small and changes rarely, so each process keeps
+every active row as an immutable ``UsageRateSnapshot``, grouped by
+(usage_type, usage_scene, billing_metric) and then (provider, model), each
+group sorted by effective time for a bisect lookup.
+
+Writers call ``invalidate_usage_rate_index`` after committing. It drops the
+local index and increments a version stored in Redis; every process re-reads
+that version at most every ``USAGE_RATE_INDEX_VERSION_CHECK_SECONDS`` and
+rebuilds when it changed. Without Redis, or when the version read fails, the
+index is rebuilt once ``USAGE_RATE_INDEX_TTL_SECONDS`` have passed. ORM writes
+to rate rows in this process also drop the local index at flush time.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from bisect import bisect_right
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import TYPE_CHECKING
+
+from flask import current_app, has_app_context
+from flaskr.common.shared_version import bump_shared_version, read_shared_version
+from flaskr.util.datetime import NAIVE_DATETIME_MIN
+from sqlalchemy import event
+
+from .consts import CREDIT_USAGE_RATE_STATUS_ACTIVE
+from .models import CreditUsageRate
+
+if TYPE_CHECKING:
+    from datetime import datetime
+
+    from flask import Flask
+
+USAGE_RATE_INDEX_TTL_SECONDS = 60.0
+USAGE_RATE_INDEX_VERSION_CHECK_SECONDS = 1.0
+_VERSION_KEY_SUFFIX = "billing:usage_rate_index_version"
+
+_RateScope = tuple[int, int, int]
+_RateIdentity = tuple[str, str]
+
+
+@dataclass(frozen=True, slots=True)
+class UsageRateSnapshot:
+    """Read-only copy of one active ``CreditUsageRate`` row."""
+
+    id: int
+    rate_bid: str
+    usage_type: int
+    provider: str
+    model: str
+    usage_scene: int
+    billing_metric: int
+    unit_size: int
+    credits_per_unit: Decimal
+    rounding_mode: int
+    effective_from: datetime
+    effective_to: datetime | None
+    status: int
+
+    @classmethod
+    def from_row(cls, row: CreditUsageRate) -> UsageRateSnapshot:
+        """Copy the columns rate consumers read from an ORM row."""
+        return cls(
+            id=int(row.id or 0),
+            rate_bid=str(row.rate_bid or ""),
+            usage_type=int(row.usage_type or 0),
+            provider=str(row.provider or ""),
+            model=str(row.model or ""),
+            usage_scene=int(row.usage_scene or 0),
+            billing_metric=int(row.billing_metric or 0),
+            unit_size=int(row.unit_size or 1),
+            credits_per_unit=Decimal(str(row.credits_per_unit or 0)),
+            rounding_mode=int(row.rounding_mode or 0),
+            effective_from=row.effective_from or NAIVE_DATETIME_MIN,
+            effective_to=row.effective_to,
+            status=int(row.status or 0),
+        )
+
+    def is_effective_at(self, at: datetime) -> bool:
+        """Return whether ``at`` falls inside this rate's effective window."""
+        return self.effective_from <= at and (
+            self.effective_to is None or self.effective_to > at
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class _RateTimeline:
+    """Rates of one identity ordered by (effective_from, id)."""
+
+    starts: tuple[datetime, ...]
+    rates: tuple[UsageRateSnapshot, ...]
+
+    def rate_at(self, at: datetime) -> UsageRateSnapshot | None:
+        # Later starts win, so walk back from the last rate started by ``at``;
+        # superseded rates end where their successor starts.
+        for index in range(bisect_right(self.starts, at) - 1, -1, -1):
+            rate = self.rates[index]
+            if rate.effective_to is None or rate.effective_to > at:
+                return rate
+        return None
+
+
+@dataclass(frozen=True, slots=True)
+class _UsageRateIndex:
+    scopes: dict[_RateScope, dict[_RateIdentity, _RateTimeline]]
+    rows_by_scope: dict[_RateScope, tuple[UsageRateSnapshot, ...]]
+    version: str | None
+    built_at: float
+
+
+@dataclass(frozen=True, slots=True)
+class UsageRateIndexStats:
+    """Build and lookup counters for the usage rate index."""
+
+    builds: int
+    lookups: int
+    rate_count: int
+    version: str | None
+
+
+@dataclass(slots=True)
+class _UsageRateIndexState:
+    index: _UsageRateIndex | None = None
+    generation: int = 0
+    version_checked_at: float = 0.0
+    builds: int = 0
+    lookups: int = 0
+
+
+_usage_rate_index_state = _UsageRateIndexState()
+_usage_rate_index_lock = threading.Lock()
+
+
+def _version_key(app: Flask) -> str:
+    prefix = str(app.config.get("REDIS_KEY_PREFIX") or "")
+    return f"{prefix}{_VERSION_KEY_SUFFIX}"
+
+
+def _build_index(version: str | None) -> _UsageRateIndex:
+    rows = (
+        CreditUsageRate.query.filter(
+            CreditUsageRate.deleted == 0,
+            CreditUsageRate.status == CREDIT_USAGE_RATE_STATUS_ACTIVE,
+        )
+        .order_by(CreditUsageRate.effective_from.asc(), CreditUsageRate.id.asc())
+        .all()
+    )
+    grouped: dict[_RateScope, dict[_RateIdentity, list[UsageRateSnapshot]]] = {}
+    rows_by_scope: dict[_RateScope, list[UsageRateSnapshot]] = {}
+    for row in rows:
+        rate = UsageRateSnapshot.from_row(row)
+        scope = (rate.usage_type, rate.usage_scene, rate.billing_metric)
+        grouped.setdefault(scope, {}).setdefault(
+            (rate.provider, rate.model), []
+        ).append(rate)
+        rows_by_scope.setdefault(scope, []).append(rate)
+
+    scopes: dict[_RateScope, dict[_RateIdentity, _RateTimeline]] = {}
+    for scope, identities in grouped.items():
+        timelines: dict[_RateIdentity, _RateTimeline] = {}
+        for identity, rates in identities.items():
+            rates.sort(key=lambda rate: (rate.effective_from, rate.id))
+            timelines[identity] = _RateTimeline(
+                starts=tuple(rate.effective_from for rate in rates),
+                rates=tuple(rates),
+            )
+        scopes[scope] = timelines
+    return _UsageRateIndex(
+        scopes=scopes,
+        rows_by_scope={
+            scope: tuple(
+                sorted(
+                    rates,
+                    key=lambda rate: (rate.effective_from, rate.id),
+                    reverse=True,
+                )
+            )
+            for scope, rates in rows_by_scope.items()
+        },
+        version=version,
+        built_at=time.monotonic(),
+    )
+
+
+def _current_index() -> _UsageRateIndex:
+    state = _usage_rate_index_state
+    now = time.monotonic()
+    with _usage_rate_index_lock:
+        index = state.index
+        generation = state.generation
+        check_version = (
+            index is None
+            or now - state.version_checked_at >= USAGE_RATE_INDEX_VERSION_CHECK_SECONDS
+        )
+        if check_version:
+            state.version_checked_at = now
+    if index is not None and not check_version:
+        return index
+
+    app = current_app if has_app_context() else None
+    version = (
+        read_shared_version(app, _version_key(app), label="usage rate index")
+        if app is not None
+        else None
+    )
+    if index is not None:
+        if version is not None and index.version == version:
+            return index
+        if version is None and now - index.built_at < USAGE_RATE_INDEX_TTL_SECONDS:
+            return index
+
+    # The build reads the whole rate table, so it runs unlocked. It is only
+    # installed if no rate write dropped the index meanwhile; otherwise this
+    # caller uses it once and the next lookup rebuilds.
+    index = _build_index(version)
+    with _usage_rate_index_lock:
+        state.builds += 1
+        if state.generation == generation:
+            state.index = index
+    return index
+
+
+def lookup_usage_rate(
+    *,
+    usage_type: int,
+    usage_scene: int,
+    billing_metric: int,
+    provider: str,
+    model_candidates: list[str],
+    at: datetime,
+) -> UsageRateSnapshot | None:
+    """Return the most specific rate effective at ``at``, or None.
+
+    Exact providers beat ``*``, listed models beat ``*`` and earlier model
+    candidates beat later ones; ties go to the latest effective_from, then id.
+    """
+    index = _current_index()
+    with _usage_rate_index_lock:
+        _usage_rate_index_state.lookups += 1
+    timelines = index.scopes.get(
+        (int(usage_type), int(usage_scene), int(billing_metric))
+    )
+    if not timelines:
+        return None
+    candidate_set = set(model_candidates)
+    model_priority = {
+        candidate: len(model_candidates) - position
+        for position, candidate in enumerate(model_candidates)
+    }
+    best: UsageRateSnapshot | None = None
+    best_key: tuple[bool, bool, int, datetime, int] | None = None
+    for candidate_provider in dict.fromkeys((provider, "*")):
+        for candidate_model in dict.fromkeys((*model_candidates, "*")):
+            timeline = timelines.get((candidate_provider, candidate_model))
+            if timeline is None:
+                continue
+            rate = timeline.rate_at(at)
+            if rate is None:
+                continue
+            key = (
+                rate.provider == provider,
+                rate.model in candidate_set,
+                model_priority.get(rate.model, 0),
+                rate.effective_from,
+                rate.id,
+            )
+            if best_key is None or key > best_key:
+                best, best_key = rate, key
+    return best
+
+
+def list_usage_rates(
+    *,
+    usage_type: int,
+    usage_scene: int,
+    billing_metric: int,
+) -> list[UsageRateSnapshot]:
+    """Return active rates of one scope, newest effective_from first."""
+    index = _current_index()
+    return list(
+        index.rows_by_scope.get(
+            (int(usage_type), int(usage_scene), int(billing_metric)), ()
+        )
+    )
+
+
+def list_usage_rate_boundaries(
+    *,
+    usage_type: int,
+    window_started_at: datetime,
+    window_ended_at: datetime,
+) -> list[datetime]:
+    """Return rate window edges of one usage type strictly inside a window.
+
+    Between two consecutive edges every lookup of that usage type resolves
+    to the same rate, which lets callers price grouped usage in bulk.
+    """
+    index = _current_index()
+    edges: set[datetime] = set()
+    for scope, rates in index.rows_by_scope.items():
+        if scope[0] != int(usage_type):
+            continue
+        for rate in rates:
+            for edge in (rate.effective_from, rate.effective_to):
+                if edge is not None and window_started_at < edge < window_ended_at:
+                    edges.add(edge)
+    return sorted(edges)
+
+
+def _drop_local_index() -> None:
+    with _usage_rate_index_lock:
+        state = _usage_rate_index_state
+        state.index = None
+        state.generation += 1
+
+
+def invalidate_usage_rate_index(app: Flask) -> None:
+    """Make every worker rebuild its rate index after rates were committed."""
+    _drop_local_index()
+    bump_shared_version(app, _version_key(app), label="usage rate index")
+
+
+def get_usage_rate_index_stats() -> UsageRateIndexStats:
+    """Return build/lookup counters and the size of the current index."""
+    with _usage_rate_index_lock:
+        state = _usage_rate_index_state
+        index = state.index
+        return UsageRateIndexStats(
+            builds=state.builds,
+            lookups=state.lookups,
+            rate_count=(
+                sum(len(rates) for rates in index.rows_by_scope.values())
+                if index is not None
+                else 0
+            ),
+            version=index.version if index is not None else None,
+        )
+
+
+def clear_usage_rate_index() -> None:
+    """Drop the local index and reset the counters."""
+    with _usage_rate_index_lock:
+        state = _usage_rate_index_state
+        state.index = None
+        state.generation += 1
+        state.version_checked_at = 0.0
+        state.builds = 0
+        state.lookups = 0
+
+
+def _on_rate_row_written(_mapper, _connection, _target) -> None:
+    _drop_local_index()
+
+
+for _event_name in ("after_insert", "after_update", "after_delete"):
+    event.listen(CreditUsageRate, _event_name, _on_rate_row_written)
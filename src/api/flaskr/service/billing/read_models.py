@@ -7,6 +7,7 @@ from decimal import Decimal, InvalidOperation
 from typing import TYPE_CHECKING, Any
 
 from flaskr.dao import db
+from flaskr.dao.uow import unit_of_work
 from flaskr.i18n import _ as translate
 from flaskr.i18n import get_current_language, set_language
 from flaskr.service.common.models import raise_error, raise_param_error
@@ -169,10 +170,8 @@ from .serializers import (
     serialize_wallet_bucket as _serialize_wallet_bucket,
 )
 from .trials import resolve_new_creator_trial_offer as _resolve_new_creator_trial_offer
-from .wallets import (
-    adjust_credit_wallet_balance,
-    calculate_credit_wallet_snapshot_values,
-)
+from .wallet_projections import load_credit_wallet_balance
+from .wallets import adjust_credit_wallet_balance
 
 if TYPE_CHECKING:
     from flask import Flask
@@ -671,16 +670,16 @@ def build_billing_overview(
         wallet_payload = _serialize_wallet(wallet)
         available_credits = Decimal(0)
         if wallet is not None:
-            available_credits, reserved_credits = (
-                calculate_credit_wallet_snapshot_values(
-                    wallet,
-                    snapshot_at=now_utc(),
-                )
-            )
+            # A stale projection is rewritten on read; keep the refresh.
+            with unit_of_work():
+                balance = load_credit_wallet_balance(wallet, at=now_utc())
+            available_credits = balance.available_credits
             wallet_payload.available_credits = credit_decimal_to_number(
                 available_credits
             )
-            wallet_payload.reserved_credits = credit_decimal_to_number(reserved_credits)
+            wallet_payload.reserved_credits = credit_decimal_to_number(
+                balance.reserved_credits
+            )
         subscription_payload = _serialize_subscription(app, subscription)
         limit_state = (
             build_creator_limit_state_for_available_credits(available_credits)
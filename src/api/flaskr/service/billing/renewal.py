@@ -2,7 +2,10 @@
 
 from __future__ import annotations
 
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from statistics import median
 from typing import TYPE_CHECKING, Any
 
 from flaskr.dao import db, retry_on_deadlock, uow
@@ -320,6 +323,53 @@ class RenewalEventResult:
         return self.to_task_payload()[key]
 
 
+@dataclass(slots=True, frozen=True)
+class RenewalEventClaim:
+    """Identify a renewal event claimed by ``claim_due_renewal_events``."""
+
+    renewal_event_bid: str
+    subscription_bid: str
+    creator_bid: str
+    attempt_count: int
+
+
+@dataclass(slots=True, frozen=True)
+class RenewalEventBatchResult:
+    """Capture one batch of claimed renewal events and its stage latency."""
+
+    status: str
+    worker_count: int
+    claimed_count: int
+    status_counts: dict[str, int]
+    renewal_event_bids: list[str]
+    claim_ms: float
+    queue_wait_ms_max: float
+    execute_ms_p50: float
+    execute_ms_max: float
+    total_ms: float
+
+    def to_task_payload(self) -> dict[str, Any]:
+        """Serialize this result for task processing."""
+        return {
+            "status": self.status,
+            "worker_count": self.worker_count,
+            "claimed_count": self.claimed_count,
+            "status_counts": dict(self.status_counts),
+            "renewal_event_bids": list(self.renewal_event_bids),
+            "latency_ms": {
+                "claim": self.claim_ms,
+                "queue_wait_max": self.queue_wait_ms_max,
+                "execute_p50": self.execute_ms_p50,
+                "execute_max": self.execute_ms_max,
+                "total": self.total_ms,
+            },
+        }
+
+    def __getitem__(self, key: str) -> Any:
+        """Return a task-payload field by key."""
+        return self.to_task_payload()[key]
+
+
 @retry_on_deadlock()
 def claim_billing_renewal_event(
     app: Flask,
@@ -381,49 +431,196 @@ def run_billing_renewal_event(
             )
         if claim_status != "claimed":
             return _result_from_event(claim_status, event)
+        return _execute_claimed_renewal_event(app, event)
 
-        owns_transaction = not uow.in_unit_of_work()
-        try:
-            now = now_utc()
-            if event.scheduled_at and event.scheduled_at > now:
-                with unit_of_work():
-                    _release_renewal_event(event, now=now)
-                return _result_from_event("deferred_until_scheduled_at", event)
-
-            if (
-                int(event.event_type or 0)
-                == BILLING_RENEWAL_EVENT_TYPE_CANCEL_EFFECTIVE
-            ):
-                return _execute_cancel_effective(app, event, now=now)
-            if (
-                int(event.event_type or 0)
-                == BILLING_RENEWAL_EVENT_TYPE_DOWNGRADE_EFFECTIVE
-            ):
-                return _execute_downgrade_effective(app, event, now=now)
-            if int(event.event_type or 0) == BILLING_RENEWAL_EVENT_TYPE_RENEWAL:
-                return _execute_subscription_renewal(app, event, now=now)
-            if int(event.event_type or 0) in {
-                BILLING_RENEWAL_EVENT_TYPE_RETRY,
-                BILLING_RENEWAL_EVENT_TYPE_RECONCILE,
-            }:
-                return _execute_retry_or_reconcile(app, event, now=now)
-            if int(event.event_type or 0) == BILLING_RENEWAL_EVENT_TYPE_EXPIRE:
-                return _execute_expire_subscription(app, event, now=now)
 
+def _execute_claimed_renewal_event(
+    app: Flask,
+    event: BillingRenewalEvent,
+) -> RenewalEventResult:
+    owns_transaction = not uow.in_unit_of_work()
+    try:
+        now = now_utc()
+        if event.scheduled_at and event.scheduled_at > now:
             with unit_of_work():
-                _fail_renewal_event(
-                    event,
-                    now=now,
-                    error=(
-                        "renewal_event_handler_not_implemented:"
-                        f"{BILLING_RENEWAL_EVENT_TYPE_LABELS.get(int(event.event_type or 0), event.event_type)}"
-                    ),
+                _release_renewal_event(event, now=now)
+            return _result_from_event("deferred_until_scheduled_at", event)
+
+        if int(event.event_type or 0) == BILLING_RENEWAL_EVENT_TYPE_CANCEL_EFFECTIVE:
+            return _execute_cancel_effective(app, event, now=now)
+        if int(event.event_type or 0) == BILLING_RENEWAL_EVENT_TYPE_DOWNGRADE_EFFECTIVE:
+            return _execute_downgrade_effective(app, event, now=now)
+        if int(event.event_type or 0) == BILLING_RENEWAL_EVENT_TYPE_RENEWAL:
+            return _execute_subscription_renewal(app, event, now=now)
+        if int(event.event_type or 0) in {
+            BILLING_RENEWAL_EVENT_TYPE_RETRY,
+            BILLING_RENEWAL_EVENT_TYPE_RECONCILE,
+        }:
+            return _execute_retry_or_reconcile(app, event, now=now)
+        if int(event.event_type or 0) == BILLING_RENEWAL_EVENT_TYPE_EXPIRE:
+            return _execute_expire_subscription(app, event, now=now)
+
+        with unit_of_work():
+            _fail_renewal_event(
+                event,
+                now=now,
+                error=(
+                    "renewal_event_handler_not_implemented:"
+                    f"{BILLING_RENEWAL_EVENT_TYPE_LABELS.get(int(event.event_type or 0), event.event_type)}"
+                ),
+            )
+        return _result_from_event("failed", event)
+    except RenewalEventClaimLostError:
+        if not owns_transaction:
+            raise
+        return _result_from_lost_claim(event)
+
+
+@retry_on_deadlock()
+def claim_due_renewal_events(
+    app: Flask,
+    *,
+    due_before: datetime,
+    limit: int,
+) -> list[RenewalEventClaim]:
+    """Claim up to ``limit`` due pending renewal events in one transaction.
+
+    Candidates are read ``FOR UPDATE SKIP LOCKED`` where the database supports
+    it, so concurrent dispatchers split a backlog instead of waiting on each
+    other's row locks. Each row still goes through the attempt-count CAS used
+    by single claims, which keeps the claim safe where the hint is ignored.
+    """
+    with _app_context_scope(app), unit_of_work():
+        events = (
+            BillingRenewalEvent.query.filter(
+                BillingRenewalEvent.deleted == 0,
+                BillingRenewalEvent.status == BILLING_RENEWAL_EVENT_STATUS_PENDING,
+                BillingRenewalEvent.scheduled_at <= due_before,
+            )
+            .order_by(
+                BillingRenewalEvent.scheduled_at.asc(),
+                BillingRenewalEvent.id.asc(),
+            )
+            .limit(max(int(limit), 1))
+            .with_for_update(skip_locked=True)
+            .all()
+        )
+        now = now_utc()
+        claims: list[RenewalEventClaim] = []
+        for event in events:
+            expected_attempt_count = int(event.attempt_count or 0)
+            updated_rows = BillingRenewalEvent.query.filter(
+                BillingRenewalEvent.deleted == 0,
+                BillingRenewalEvent.id == event.id,
+                BillingRenewalEvent.status.in_(_CLAIMABLE_EVENT_STATUSES),
+                BillingRenewalEvent.attempt_count == expected_attempt_count,
+            ).update(
+                {
+                    "status": BILLING_RENEWAL_EVENT_STATUS_PROCESSING,
+                    "attempt_count": expected_attempt_count + 1,
+                    "updated_at": now,
+                },
+                synchronize_session=False,
+            )
+            if updated_rows == 1:
+                claims.append(
+                    RenewalEventClaim(
+                        renewal_event_bid=event.renewal_event_bid,
+                        subscription_bid=event.subscription_bid,
+                        creator_bid=event.creator_bid,
+                        attempt_count=expected_attempt_count + 1,
+                    )
                 )
-            return _result_from_event("failed", event)
+        return claims
+
+
+def run_claimed_renewal_event(
+    app: Flask,
+    claim: RenewalEventClaim,
+) -> RenewalEventResult:
+    """Execute a renewal event claimed by ``claim_due_renewal_events``."""
+    with _app_context_scope(app):
+        event = _load_target_renewal_event(renewal_event_bid=claim.renewal_event_bid)
+        if event is None:
+            return _result_without_event(
+                "event_not_found",
+                renewal_event_bid=claim.renewal_event_bid,
+                subscription_bid=claim.subscription_bid,
+                creator_bid=claim.creator_bid,
+            )
+        _bind_renewal_event_claim(event, attempt_count=claim.attempt_count)
+        # The claim may have waited for a free worker. Renew its lease and
+        # make sure stale recovery has not handed the event to someone else.
+        try:
+            with unit_of_work():
+                _ensure_renewal_event_claim_current(event)
         except RenewalEventClaimLostError:
-            if not owns_transaction:
-                raise
             return _result_from_lost_claim(event)
+        return _execute_claimed_renewal_event(app, event)
+
+
+def run_due_renewal_event_batch(
+    app: Flask,
+    *,
+    due_before: datetime,
+    batch_size: int,
+    worker_count: int = 1,
+) -> RenewalEventBatchResult:
+    """Claim one batch of due renewal events and run it on a worker pool.
+
+    Each worker runs its event in its own app context and session. A worker
+    that crashes leaves its event PROCESSING for stale-claim recovery, the
+    same contract as ``run_billing_renewal_event``.
+    """
+    started_at = time.perf_counter()
+    claims = claim_due_renewal_events(app, due_before=due_before, limit=batch_size)
+    claimed_at = time.perf_counter()
+    resolved_worker_count = max(1, min(int(worker_count or 1), len(claims) or 1))
+
+    def run_claim(claim: RenewalEventClaim) -> tuple[str, float, float]:
+        execute_started_at = time.perf_counter()
+        with app.app_context():
+            try:
+                status = run_claimed_renewal_event(app, claim).status
+            except Exception:
+                app.logger.exception(
+                    "renewal event batch execution failed: %s",
+                    claim.renewal_event_bid,
+                )
+                status = "error"
+        finished_at = time.perf_counter()
+        return (
+            status,
+            (execute_started_at - claimed_at) * 1000,
+            (finished_at - execute_started_at) * 1000,
+        )
+
+    if resolved_worker_count == 1:
+        outcomes = [run_claim(claim) for claim in claims]
+    else:
+        with ThreadPoolExecutor(
+            max_workers=resolved_worker_count,
+            thread_name_prefix="billing_renewal_",
+        ) as executor:
+            outcomes = list(executor.map(run_claim, claims))
+
+    status_counts: dict[str, int] = {}
+    for status, _queue_wait_ms, _execute_ms in outcomes:
+        status_counts[status] = status_counts.get(status, 0) + 1
+    queue_wait_ms = [outcome[1] for outcome in outcomes]
+    execute_ms = [outcome[2] for outcome in outcomes]
+    return RenewalEventBatchResult(
+        status="processed" if claims else "noop",
+        worker_count=resolved_worker_count,
+        claimed_count=len(claims),
+        status_counts=status_counts,
+        renewal_event_bids=[claim.renewal_event_bid for claim in claims],
+        claim_ms=round((claimed_at - started_at) * 1000, 3),
+        queue_wait_ms_max=round(max(queue_wait_ms, default=0.0), 3),
+        execute_ms_p50=round(median(execute_ms), 3) if execute_ms else 0.0,
+        execute_ms_max=round(max(execute_ms, default=0.0), 3),
+        total_ms=round((time.perf_counter() - started_at) * 1000, 3),
+    )
 
 
 def retry_billing_renewal_event(
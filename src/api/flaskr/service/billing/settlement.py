@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import time
 from contextlib import contextmanager, suppress
 from dataclasses import dataclass, field
 from decimal import Decimal
@@ -9,9 +10,11 @@ from typing import TYPE_CHECKING, Any
 
 from flaskr.common.cache_provider import cache as cache_provider
 from flaskr.dao import db
+from flaskr.dao.uow import unit_of_work
 from flaskr.service.metering.models import BillUsageRecord
 from flaskr.util.datetime import now_utc
 from flaskr.util.uuid import generate_id
+from sqlalchemy import func, or_
 
 from .bucket_categories import (
     build_wallet_bucket_runtime_sort_key,
@@ -37,10 +40,12 @@ from .primitives import credit_decimal_to_number as _credit_decimal_to_number
 from .primitives import decimal_to_number as _decimal_to_number
 from .primitives import quantize_credit_amount as _quantize_credit_amount
 from .primitives import to_decimal as _to_decimal
+from .queries import load_primary_active_subscription
 from .subscriptions import load_effective_topup_subscription
 from .wallets import (
     persist_credit_wallet_snapshot,
     refresh_credit_wallet_snapshot,
+    summarize_credit_wallet_bucket_rows,
     sync_credit_bucket_status,
 )
 
@@ -49,9 +54,23 @@ if TYPE_CHECKING:
 
     from flask import Flask
 
+    from .bucket_categories import OrderTypeLoader
+    from .charges import UsageMetricCharge
+
 _ZERO = Decimal(0)
 _SETTLEMENT_LOCK_TIMEOUT_SECONDS = 60
 _SETTLEMENT_LOCK_BLOCKING_TIMEOUT_SECONDS = 60
+_DEFAULT_SETTLEMENT_BATCH_SIZE = 100
+# Queued bids outlive any realistic drain backlog; anything older is left to
+# the backfill-settlement CLI.
+_SETTLEMENT_QUEUE_ITEM_TTL_SECONDS = 24 * 60 * 60
+_SETTLEMENT_QUEUE_GAP_RETRIES = 3
+_SETTLEMENT_QUEUE_GAP_WAIT_SECONDS = 0.05
+# Dead-lettered bids stay long enough for an operator to look at them.
+_SETTLEMENT_DEAD_LETTER_TTL_SECONDS = 7 * 24 * 60 * 60
+# Batches one drainer settles before releasing the creator lock, so a long
+# backlog never holds it anywhere near _SETTLEMENT_LOCK_TIMEOUT_SECONDS.
+_SETTLEMENT_BATCHES_PER_LOCK = 10
 
 
 def _serialize_metadata_dt(value: datetime | None) -> str | None:
@@ -155,6 +174,37 @@ class BackfillSettlementResult:
         return self.to_task_payload()[key]
 
 
+@dataclass(slots=True, frozen=True)
+class BatchSettlementResult:
+    """Capture usages settled together for one creator."""
+
+    status: str
+    creator_bid: str | None
+    processed_count: int
+    batch_count: int = 0
+    entry_count: int = 0
+    consumed_credits: int | float = 0
+    status_counts: dict[str, int] = field(default_factory=dict)
+    items: list[SettlementResult] = field(default_factory=list)
+
+    def to_task_payload(self) -> dict[str, Any]:
+        """Serialize this result for task processing."""
+        return {
+            "status": self.status,
+            "creator_bid": self.creator_bid,
+            "processed_count": self.processed_count,
+            "batch_count": self.batch_count,
+            "entry_count": self.entry_count,
+            "consumed_credits": self.consumed_credits,
+            "status_counts": dict(self.status_counts),
+            "items": [item.to_task_payload() for item in self.items],
+        }
+
+    def __getitem__(self, key: str) -> Any:
+        """Return a task-payload field by key."""
+        return self.to_task_payload()[key]
+
+
 def settle_bill_usage(
     app: Flask,
     *,
@@ -172,12 +222,9 @@ def settle_bill_usage(
                 usage_id=usage_id,
             )
 
-        if int(usage.record_level or 0) != 0:
-            return _build_skip_result(usage, reason="segment_record")
-        if int(usage.billable or 0) != 1:
-            return _build_skip_result(usage, reason="non_billable")
-        if int(usage.status or 0) != 0:
-            return _build_skip_result(usage, reason="usage_failed")
+        skip_reason = _resolve_usage_skip_reason(usage)
+        if skip_reason is not None:
+            return _build_skip_result(usage, reason=skip_reason)
 
         creator_bid = str(resolve_usage_creator_bid(app, usage) or "").strip()
         if not creator_bid:
@@ -266,69 +313,8 @@ def settle_bill_usage(
                     consumed_credits=_credit_decimal_to_number(total_required),
                 )
 
-            balance_after = total_available
-            entry_count = 0
-            total_consumed = _ZERO
-            bucket_breakdown_map: dict[str, dict[str, Any]] = {}
-            for charge in metric_charges:
-                remaining = charge.consumed_credits
-                for bucket in buckets:
-                    bucket_available = _to_decimal(bucket.available_credits)
-                    if remaining <= _ZERO:
-                        break
-                    if bucket_available <= _ZERO:
-                        continue
-
-                    consumed = _quantize_credit_amount(min(bucket_available, remaining))
-                    balance_after -= consumed
-                    remaining -= consumed
-                    total_consumed += consumed
-                    bucket.available_credits = _quantize_credit_amount(
-                        bucket_available - consumed
-                    )
-                    bucket.consumed_credits = _quantize_credit_amount(
-                        _to_decimal(bucket.consumed_credits) + consumed
-                    )
-                    sync_credit_bucket_status(bucket)
-                    db.session.add(bucket)
-                    bucket_key = str(bucket.wallet_bucket_bid or "").strip()
-                    metric_breakdown = bucket_breakdown_map.setdefault(
-                        bucket_key,
-                        {
-                            "wallet_bucket_bid": bucket_key,
-                            "bucket_category": CREDIT_BUCKET_CATEGORY_LABELS.get(
-                                int(bucket.bucket_category or 0),
-                                "subscription",
-                            ),
-                            "source_type": CREDIT_SOURCE_TYPE_LABELS.get(
-                                int(bucket.source_type or 0),
-                                "manual",
-                            ),
-                            "source_bid": str(bucket.source_bid or ""),
-                            "consumed_credits": _ZERO,
-                            "effective_from": bucket.effective_from,
-                            "effective_to": bucket.effective_to,
-                            "metric_breakdown": {},
-                        },
-                    )
-                    metric_breakdown["consumed_credits"] += consumed
-                    metric_items = metric_breakdown["metric_breakdown"]
-                    metric_items[int(charge.billing_metric)] = {
-                        "billing_metric": charge.metric_label,
-                        "billing_metric_code": int(charge.billing_metric),
-                        "consumed_credits": (
-                            _to_decimal(
-                                metric_items.get(int(charge.billing_metric), {}).get(
-                                    "consumed_credits",
-                                    _ZERO,
-                                )
-                            )
-                            + consumed
-                        ),
-                    }
-
-                if remaining <= _ZERO:
-                    continue
+            consumption = _consume_usage_charges(metric_charges, buckets)
+            if consumption is None:
                 db.session.rollback()
                 return SettlementResult(
                     status="insufficient",
@@ -337,68 +323,17 @@ def settle_bill_usage(
                     entry_count=0,
                     consumed_credits=_credit_decimal_to_number(total_required),
                 )
-
-            bucket_breakdown = [
-                UsageBucketBreakdownItem(
-                    wallet_bucket_bid=payload["wallet_bucket_bid"],
-                    bucket_category=payload["bucket_category"],
-                    source_type=payload["source_type"],
-                    source_bid=payload["source_bid"],
-                    consumed_credits=_to_decimal(payload["consumed_credits"]),
-                    effective_from=_serialize_metadata_dt(payload["effective_from"]),
-                    effective_to=_serialize_metadata_dt(payload["effective_to"]),
-                    metric_breakdown=[
-                        UsageBucketMetricBreakdownItem(
-                            billing_metric=str(metric_payload["billing_metric"]),
-                            billing_metric_code=int(
-                                metric_payload["billing_metric_code"] or 0
-                            ),
-                            consumed_credits=_to_decimal(
-                                metric_payload["consumed_credits"]
-                            ),
-                        )
-                        for metric_payload in payload["metric_breakdown"].values()
-                    ],
-                )
-                for payload in bucket_breakdown_map.values()
-            ]
-            primary_bucket_payload = (
-                next(iter(bucket_breakdown_map.values()))
-                if len(bucket_breakdown_map) == 1
-                else None
-            )
+            total_consumed = consumption.total_consumed
 
             refresh_credit_wallet_snapshot(wallet, snapshot_at=settlement_at)
-            ledger_entry = CreditLedgerEntry(
-                ledger_bid=generate_id(app),
+            ledger_entry = _build_usage_ledger_entry(
+                app,
+                usage=usage,
                 creator_bid=creator_bid,
-                wallet_bid=wallet.wallet_bid,
-                wallet_bucket_bid=(
-                    str(primary_bucket_payload["wallet_bucket_bid"])
-                    if primary_bucket_payload is not None
-                    else ""
-                ),
-                entry_type=CREDIT_LEDGER_ENTRY_TYPE_CONSUME,
-                source_type=CREDIT_SOURCE_TYPE_USAGE,
-                source_bid=usage.usage_bid,
-                idempotency_key=f"usage:{usage.usage_bid}:consume",
-                amount=-total_consumed,
+                wallet=wallet,
+                metric_charges=metric_charges,
+                consumption=consumption,
                 balance_after=_to_decimal(wallet.available_credits),
-                expires_at=(
-                    primary_bucket_payload["effective_to"]
-                    if primary_bucket_payload is not None
-                    else None
-                ),
-                consumable_from=(
-                    primary_bucket_payload["effective_from"]
-                    if primary_bucket_payload is not None
-                    else None
-                ),
-                metadata_json=build_usage_entry_metadata(
-                    usage=usage,
-                    charges=metric_charges,
-                    bucket_breakdown=bucket_breakdown,
-                ).to_metadata_json(),
             )
             db.session.add(ledger_entry)
             entry_count = 1
@@ -557,8 +492,626 @@ def backfill_bill_usage_settlement(
     )
 
 
+def settle_creator_usage_batch(
+    app: Flask,
+    *,
+    creator_bid: str,
+    usage_bids: list[str],
+) -> BatchSettlementResult:
+    """Settle many usage records of one creator under one lock and commit."""
+    normalized_creator_bid = str(creator_bid or "").strip()
+    with (
+        app.app_context(),
+        _usage_settlement_lock(
+            app,
+            creator_bid=normalized_creator_bid,
+            usage_bid="",
+        ),
+    ):
+        return _settle_creator_usage_batch_locked(
+            app,
+            creator_bid=normalized_creator_bid,
+            usage_bids=usage_bids,
+        )
+
+
+def enqueue_bill_usage_settlement(
+    app: Flask,
+    *,
+    usage_bid: str,
+) -> SettlementResult | BatchSettlementResult:
+    """Queue a usage on its creator's pending list and drain it if idle.
+
+    Usages that can never settle return the same result as ``settle_bill_usage``
+    without being queued. Otherwise the usage bid is appended to the creator's
+    pending queue and the caller tries the creator settlement lock without
+    blocking: the holder drains the queue in batches, and a caller that finds
+    the lock taken returns ``queued`` because the holder re-checks the queue
+    after releasing the lock.
+    """
+    normalized_usage_bid = str(usage_bid or "").strip()
+    with app.app_context():
+        usage = _load_usage_record(usage_bid=normalized_usage_bid, usage_id=None)
+        if usage is None:
+            return SettlementResult(
+                status="not_found",
+                usage_bid=normalized_usage_bid or None,
+            )
+        skip_reason = _resolve_usage_skip_reason(usage)
+        if skip_reason is not None:
+            return _build_skip_result(usage, reason=skip_reason)
+        creator_bid = str(resolve_usage_creator_bid(app, usage) or "").strip()
+        if not creator_bid:
+            return _build_skip_result(usage, reason="creator_not_found")
+
+        _CreatorUsageSettlementQueue(app, creator_bid=creator_bid).push(usage.usage_bid)
+        return drain_creator_usage_settlements(app, creator_bid=creator_bid)
+
+
+def drain_creator_usage_settlements(
+    app: Flask,
+    *,
+    creator_bid: str,
+) -> BatchSettlementResult:
+    """Settle a creator's queued usages in batches while holding its lock."""
+    normalized_creator_bid = str(creator_bid or "").strip()
+    queue = _CreatorUsageSettlementQueue(app, creator_bid=normalized_creator_bid)
+    batch_size = get_usage_settlement_batch_size(app)
+    batches: list[BatchSettlementResult] = []
+    drained = False
+    with app.app_context():
+        while True:
+            with _usage_settlement_lock(
+                app,
+                creator_bid=normalized_creator_bid,
+                usage_bid="",
+                blocking=False,
+            ) as acquired:
+                if not acquired:
+                    break
+                drained = True
+                for _ in range(_SETTLEMENT_BATCHES_PER_LOCK):
+                    usage_bids, start_seq, end_seq = queue.peek(batch_size)
+                    if end_seq <= start_seq:
+                        break
+                    if usage_bids:
+                        batches.extend(
+                            _settle_queued_usage_batch(
+                                app,
+                                queue,
+                                creator_bid=normalized_creator_bid,
+                                usage_bids=usage_bids,
+                            )
+                        )
+                    queue.advance(start_seq, end_seq)
+            # A usage queued while we held the lock found it taken and left
+            # the work to us, so look again after releasing it.
+            if not queue.has_pending():
+                break
+
+    items = [item for batch in batches for item in batch.items]
+    status = _resolve_batch_status(items) if drained else "queued"
+    return _build_batch_settlement_result(
+        status=status,
+        creator_bid=normalized_creator_bid or None,
+        items=items,
+        batch_count=len(batches),
+    )
+
+
+def get_usage_settlement_batch_size(app: Flask) -> int:
+    """Return how many queued usages one settlement batch may drain."""
+    try:
+        size = int(app.config.get("BILL_USAGE_SETTLEMENT_BATCH_SIZE", 0))
+    except (TypeError, ValueError):
+        size = 0
+    return size if size > 0 else _DEFAULT_SETTLEMENT_BATCH_SIZE
+
+
+def _settle_queued_usage_batch(
+    app: Flask,
+    queue: _CreatorUsageSettlementQueue,
+    *,
+    creator_bid: str,
+    usage_bids: list[str],
+) -> list[BatchSettlementResult]:
+    """Settle one queued batch; dead-letter usages that keep failing.
+
+    A failed batch is retried one usage at a time so a single poison usage
+    cannot hold the queue head and block the creator's other settlements.
+    """
+    try:
+        return [
+            _settle_creator_usage_batch_locked(
+                app, creator_bid=creator_bid, usage_bids=usage_bids
+            )
+        ]
+    except Exception:
+        db.session.rollback()
+        app.logger.warning(
+            "usage settlement batch failed; settling one by one: creator_bid=%s",
+            creator_bid,
+            exc_info=True,
+        )
+    batches: list[BatchSettlementResult] = []
+    for usage_bid in usage_bids:
+        try:
+            batches.append(
+                _settle_creator_usage_batch_locked(
+                    app, creator_bid=creator_bid, usage_bids=[usage_bid]
+                )
+            )
+        except Exception:
+            db.session.rollback()
+            app.logger.exception(
+                "usage settlement failed; dead-lettered: creator_bid=%s usage_bid=%s",
+                creator_bid,
+                usage_bid,
+            )
+            queue.dead_letter(usage_bid)
+            batches.append(
+                _build_batch_settlement_result(
+                    status="processed",
+                    creator_bid=creator_bid or None,
+                    items=[
+                        SettlementResult(
+                            status="failed",
+                            reason="dead_lettered",
+                            usage_bid=usage_bid,
+                            creator_bid=creator_bid or None,
+                        )
+                    ],
+                    batch_count=1,
+                )
+            )
+    return batches
+
+
+def _settle_creator_usage_batch_locked(
+    app: Flask,
+    *,
+    creator_bid: str,
+    usage_bids: list[str],
+) -> BatchSettlementResult:
+    normalized_usage_bids = list(
+        dict.fromkeys(
+            normalized
+            for normalized in (str(bid or "").strip() for bid in usage_bids)
+            if normalized
+        )
+    )
+    results: dict[str, SettlementResult] = {}
+    usages_by_bid: dict[str, BillUsageRecord] = {}
+    if normalized_usage_bids:
+        rows = (
+            BillUsageRecord.query.filter(
+                BillUsageRecord.deleted == 0,
+                BillUsageRecord.usage_bid.in_(normalized_usage_bids),
+            )
+            .order_by(BillUsageRecord.id.asc())
+            .all()
+        )
+        for row in rows:
+            usages_by_bid[row.usage_bid] = row
+
+    creator_by_scope: dict[tuple[str, str, str], str] = {}
+    pending: list[BillUsageRecord] = []
+    for usage in sorted(usages_by_bid.values(), key=lambda row: int(row.id or 0)):
+        skip_reason = _resolve_usage_skip_reason(usage)
+        if skip_reason is not None:
+            results[usage.usage_bid] = _build_skip_result(usage, reason=skip_reason)
+            continue
+        scope = (
+            str(usage.shifu_bid or ""),
+            str(usage.usage_scene or ""),
+            str(usage.user_bid or ""),
+        )
+        if scope not in creator_by_scope:
+            creator_by_scope[scope] = str(
+                resolve_usage_creator_bid(app, usage) or ""
+            ).strip()
+        usage_creator_bid = creator_by_scope[scope]
+        if not usage_creator_bid:
+            results[usage.usage_bid] = _build_skip_result(
+                usage, reason="creator_not_found"
+            )
+        elif usage_creator_bid != creator_bid:
+            results[usage.usage_bid] = SettlementResult(
+                status="creator_mismatch",
+                usage_bid=usage.usage_bid,
+                usage_id=int(usage.id or 0),
+                creator_bid=usage_creator_bid,
+                requested_creator_bid=creator_bid,
+            )
+        else:
+            pending.append(usage)
+
+    if pending:
+        results.update(_settle_pending_usages(app, creator_bid, pending))
+
+    items = [
+        results.get(bid) or SettlementResult(status="not_found", usage_bid=bid)
+        for bid in normalized_usage_bids
+    ]
+    return _build_batch_settlement_result(
+        status=_resolve_batch_status(items),
+        creator_bid=creator_bid or None,
+        items=items,
+        batch_count=1,
+    )
+
+
+def _settle_pending_usages(
+    app: Flask,
+    creator_bid: str,
+    usages: list[BillUsageRecord],
+) -> dict[str, SettlementResult]:
+    """Settle one creator's usages against a single wallet and bucket load."""
+    results: dict[str, SettlementResult] = {}
+    existing_entry_counts = _count_usage_ledger_entries(
+        creator_bid,
+        [usage.usage_bid for usage in usages],
+    )
+    wallet = _load_credit_wallet(creator_bid)
+    bucket_rows = _load_wallet_bucket_rows(creator_bid, wallet)
+    consumable_rows = [
+        row
+        for row in bucket_rows
+        if row.creator_bid == creator_bid
+        and int(row.status or 0) == CREDIT_BUCKET_STATUS_ACTIVE
+    ]
+    snapshot_rows = (
+        [row for row in bucket_rows if row.wallet_bid == wallet.wallet_bid]
+        if wallet is not None
+        else []
+    )
+
+    order_types: dict[str, int | None] = {}
+
+    def load_order_type(bill_order_bid: str) -> int | None:
+        if bill_order_bid not in order_types:
+            order_types[bill_order_bid] = load_billing_order_type_by_bid(bill_order_bid)
+        return order_types[bill_order_bid]
+
+    # Subscription lookups only change the outcome when some bucket depends
+    # on one, so skip the per-usage queries otherwise.
+    subscription_gated = any(
+        wallet_bucket_requires_active_subscription(
+            row,
+            load_order_type=load_order_type,
+        )
+        for row in bucket_rows
+    )
+    topup_subscription_at: dict[datetime, bool] = {}
+    primary_subscription_at: dict[datetime, bool] = {}
+
+    def has_topup_subscription(as_of: datetime) -> bool:
+        if not subscription_gated:
+            return False
+        if as_of not in topup_subscription_at:
+            topup_subscription_at[as_of] = (
+                load_effective_topup_subscription(creator_bid, as_of=as_of) is not None
+            )
+        return topup_subscription_at[as_of]
+
+    def has_primary_subscription(as_of: datetime) -> bool:
+        if not subscription_gated:
+            return False
+        if as_of not in primary_subscription_at:
+            primary_subscription_at[as_of] = (
+                load_primary_active_subscription(creator_bid, as_of=as_of) is not None
+            )
+        return primary_subscription_at[as_of]
+
+    ledger_entries: list[CreditLedgerEntry] = []
+    wallet_snapshot: tuple[Decimal, Decimal] | None = None
+    wallet_touched = False
+    last_settled_usage_id = int(wallet.last_settled_usage_id or 0) if wallet else 0
+    total_consumed = _ZERO
+    # Rate lookups must not flush bucket updates once per usage; the whole
+    # batch is written by the single commit below.
+    with db.session.no_autoflush:
+        for usage in usages:
+            existing_entry_count = existing_entry_counts.get(usage.usage_bid, 0)
+            if existing_entry_count:
+                results[usage.usage_bid] = SettlementResult(
+                    status="already_settled",
+                    usage_bid=usage.usage_bid,
+                    creator_bid=creator_bid,
+                    entry_count=existing_entry_count,
+                )
+                continue
+
+            settlement_at = usage.created_at or now_utc()
+            metric_charges = build_usage_metric_charges(
+                usage,
+                settlement_at=settlement_at,
+            )
+            total_required = sum(
+                (charge.consumed_credits for charge in metric_charges),
+                start=_ZERO,
+            )
+            if not metric_charges:
+                if wallet is not None:
+                    wallet_touched = True
+                    last_settled_usage_id = max(
+                        last_settled_usage_id, int(usage.id or 0)
+                    )
+                results[usage.usage_bid] = SettlementResult(
+                    status="noop",
+                    usage_bid=usage.usage_bid,
+                    creator_bid=creator_bid,
+                    entry_count=0,
+                    consumed_credits=0,
+                )
+                continue
+            if wallet is None:
+                results[usage.usage_bid] = SettlementResult(
+                    status="insufficient",
+                    usage_bid=usage.usage_bid,
+                    creator_bid=creator_bid,
+                    entry_count=0,
+                    consumed_credits=_decimal_to_number(total_required),
+                )
+                continue
+
+            buckets = _select_consumable_buckets(
+                consumable_rows,
+                settlement_at=settlement_at,
+                has_active_subscription=has_topup_subscription(settlement_at),
+                load_order_type=load_order_type,
+            )
+            total_available = sum(
+                (_to_decimal(bucket.available_credits) for bucket in buckets),
+                start=_ZERO,
+            )
+            consumption = (
+                _consume_usage_charges(metric_charges, buckets)
+                if total_available >= total_required
+                else None
+            )
+            if consumption is None:
+                results[usage.usage_bid] = SettlementResult(
+                    status="insufficient",
+                    usage_bid=usage.usage_bid,
+                    creator_bid=creator_bid,
+                    entry_count=0,
+                    consumed_credits=_credit_decimal_to_number(total_required),
+                )
+                continue
+
+            wallet_snapshot = summarize_credit_wallet_bucket_rows(
+                snapshot_rows,
+                snapshot_at=settlement_at,
+                has_active_subscription=has_primary_subscription(settlement_at),
+                load_order_type=load_order_type,
+            )
+            ledger_entries.append(
+                _build_usage_ledger_entry(
+                    app,
+                    usage=usage,
+                    creator_bid=creator_bid,
+                    wallet=wallet,
+                    metric_charges=metric_charges,
+                    consumption=consumption,
+                    balance_after=wallet_snapshot[0],
+                )
+            )
+            wallet_touched = True
+            total_consumed += consumption.total_consumed
+            last_settled_usage_id = max(last_settled_usage_id, int(usage.id or 0))
+            results[usage.usage_bid] = SettlementResult(
+                status="settled",
+                usage_bid=usage.usage_bid,
+                creator_bid=creator_bid,
+                entry_count=1,
+                consumed_credits=_credit_decimal_to_number(consumption.total_consumed),
+            )
+
+    if wallet is None or not wallet_touched:
+        return results
+    if wallet_snapshot is not None:
+        wallet.available_credits, wallet.reserved_credits = wallet_snapshot
+    with unit_of_work():
+        db.session.add_all(ledger_entries)
+        persist_credit_wallet_snapshot(
+            wallet,
+            available_credits=wallet.available_credits,
+            reserved_credits=wallet.reserved_credits,
+            lifetime_consumed_credits=(
+                _to_decimal(wallet.lifetime_consumed_credits) + total_consumed
+            ),
+            last_settled_usage_id=last_settled_usage_id,
+            updated_at=now_utc(),
+        )
+    return results
+
+
+def _count_usage_ledger_entries(
+    creator_bid: str,
+    usage_bids: list[str],
+) -> dict[str, int]:
+    rows = (
+        db.session.query(
+            CreditLedgerEntry.source_bid,
+            func.count(CreditLedgerEntry.id),
+        )
+        .filter(
+            CreditLedgerEntry.deleted == 0,
+            CreditLedgerEntry.creator_bid == creator_bid,
+            CreditLedgerEntry.source_type == CREDIT_SOURCE_TYPE_USAGE,
+            CreditLedgerEntry.source_bid.in_(usage_bids),
+        )
+        .group_by(CreditLedgerEntry.source_bid)
+        .all()
+    )
+    return {str(source_bid): int(count or 0) for source_bid, count in rows}
+
+
+def _load_wallet_bucket_rows(
+    creator_bid: str,
+    wallet: CreditWallet | None,
+) -> list[CreditWalletBucket]:
+    owner_filter = CreditWalletBucket.creator_bid == creator_bid
+    if wallet is not None:
+        owner_filter = or_(
+            owner_filter,
+            CreditWalletBucket.wallet_bid == wallet.wallet_bid,
+        )
+    return (
+        CreditWalletBucket.query.filter(
+            CreditWalletBucket.deleted == 0,
+            owner_filter,
+        )
+        .order_by(CreditWalletBucket.id.asc())
+        .all()
+    )
+
+
+def _resolve_batch_status(items: list[SettlementResult]) -> str:
+    if any(item.status == "settled" for item in items):
+        return "settled"
+    return "processed" if items else "noop"
+
+
+def _build_batch_settlement_result(
+    *,
+    status: str,
+    creator_bid: str | None,
+    items: list[SettlementResult],
+    batch_count: int,
+) -> BatchSettlementResult:
+    status_counts: dict[str, int] = {}
+    entry_count = 0
+    consumed = _ZERO
+    for item in items:
+        status_counts[item.status] = status_counts.get(item.status, 0) + 1
+        if item.status == "settled":
+            entry_count += item.entry_count
+            consumed += _to_decimal(item.consumed_credits)
+    return BatchSettlementResult(
+        status=status,
+        creator_bid=creator_bid,
+        processed_count=len(items),
+        batch_count=batch_count,
+        entry_count=entry_count,
+        consumed_credits=_credit_decimal_to_number(consumed),
+        status_counts=status_counts,
+        items=items,
+    )
+
+
+class _CreatorUsageSettlementQueue:
+    """Append-only queue of one creator's usage bids in the cache provider.
+
+    Producers take a sequence number from the ``tail`` counter and then write
+    the usage bid into its slot; only the settlement lock holder reads slots
+    and moves the ``head`` cursor past settled ones. Bids that fail to settle
+    move to a dead-letter list with the same layout.
+    """
+
+    def __init__(self, app: Flask, *, creator_bid: str) -> None:
+        self.app = app
+        self.creator_bid = creator_bid
+        prefix = app.config.get("REDIS_KEY_PREFIX", "ai-shifu")
+        self._key_base = f"{prefix}:billing:settle_usage_queue:{creator_bid}"
+
+    def _head_key(self) -> str:
+        return f"{self._key_base}:head"
+
+    def _tail_key(self) -> str:
+        return f"{self._key_base}:tail"
+
+    def _slot_key(self, seq: int) -> str:
+        return f"{self._key_base}:item:{seq}"
+
+    def _dead_tail_key(self) -> str:
+        return f"{self._key_base}:dead:tail"
+
+    def _dead_slot_key(self, seq: int) -> str:
+        return f"{self._key_base}:dead:{seq}"
+
+    def push(self, usage_bid: str) -> int:
+        seq = int(cache_provider.incr(self._tail_key()))
+        cache_provider.setex(
+            self._slot_key(seq),
+            _SETTLEMENT_QUEUE_ITEM_TTL_SECONDS,
+            usage_bid,
+        )
+        return seq
+
+    def _read_counter(self, key: str) -> int:
+        raw = cache_provider.get(key)
+        if isinstance(raw, bytes):
+            raw = raw.decode("utf-8")
+        try:
+            return int(raw or 0)
+        except (TypeError, ValueError):
+            return 0
+
+    def has_pending(self) -> bool:
+        return self._read_counter(self._tail_key()) > self._read_counter(
+            self._head_key()
+        )
+
+    def peek(self, limit: int) -> tuple[list[str], int, int]:
+        """Return up to ``limit`` queued bids with the seq range they span."""
+        head = self._read_counter(self._head_key())
+        tail = self._read_counter(self._tail_key())
+        usage_bids: list[str] = []
+        seq = head
+        gap_attempts = 0
+        while seq < tail and len(usage_bids) < limit:
+            raw = cache_provider.get(self._slot_key(seq + 1))
+            if raw is None:
+                if usage_bids:
+                    break
+                if gap_attempts < _SETTLEMENT_QUEUE_GAP_RETRIES:
+                    # A producer may sit between its incr and its slot write.
+                    gap_attempts += 1
+                    time.sleep(_SETTLEMENT_QUEUE_GAP_WAIT_SECONDS)
+                    continue
+                self.app.logger.warning(
+                    "usage settlement queue slot missing: creator_bid=%s seq=%s; "
+                    "backfill-settlement can recover the usage",
+                    self.creator_bid,
+                    seq + 1,
+                )
+                seq += 1
+                gap_attempts = 0
+                continue
+            if isinstance(raw, bytes):
+                raw = raw.decode("utf-8")
+            usage_bids.append(str(raw))
+            seq += 1
+        return usage_bids, head, seq
+
+    def dead_letter(self, usage_bid: str) -> None:
+        """Park a bid that failed to settle; backfill-settlement retries it."""
+        with suppress(Exception):
+            seq = int(cache_provider.incr(self._dead_tail_key()))
+            cache_provider.setex(
+                self._dead_slot_key(seq),
+                _SETTLEMENT_DEAD_LETTER_TTL_SECONDS,
+                usage_bid,
+            )
+
+    def advance(self, start_seq: int, end_seq: int) -> None:
+        cache_provider.set(self._head_key(), end_seq)
+        slot_keys = [self._slot_key(seq) for seq in range(start_seq + 1, end_seq + 1)]
+        if slot_keys:
+            with suppress(Exception):
+                cache_provider.delete(*slot_keys)
+
+
 @contextmanager
-def _usage_settlement_lock(app: Flask, *, creator_bid: str, usage_bid: str):
+def _usage_settlement_lock(
+    app: Flask,
+    *,
+    creator_bid: str,
+    usage_bid: str,
+    blocking: bool = True,
+):
     normalized_creator_bid = str(creator_bid or "").strip()
     normalized_usage_bid = str(usage_bid or "").strip()
     lock_scope = normalized_creator_bid or f"usage:{normalized_usage_bid}"
@@ -569,9 +1122,10 @@ def _usage_settlement_lock(app: Flask, *, creator_bid: str, usage_bid: str):
         timeout=_SETTLEMENT_LOCK_TIMEOUT_SECONDS,
         blocking_timeout=_SETTLEMENT_LOCK_BLOCKING_TIMEOUT_SECONDS,
     )
-    acquired = bool(lock.acquire(blocking=True)) if lock is not None else False
+    acquired = bool(lock.acquire(blocking=blocking)) if lock is not None else False
     try:
-        yield
+        # Without a lock provider settlement proceeds unguarded, as before.
+        yield acquired or lock is None
     finally:
         if acquired and lock is not None:
             with suppress(Exception):
@@ -597,6 +1151,16 @@ def _load_usage_record(
     )
 
 
+def _resolve_usage_skip_reason(usage: BillUsageRecord) -> str | None:
+    if int(usage.record_level or 0) != 0:
+        return "segment_record"
+    if int(usage.billable or 0) != 1:
+        return "non_billable"
+    if int(usage.status or 0) != 0:
+        return "usage_failed"
+    return None
+
+
 def _build_skip_result(usage: BillUsageRecord, *, reason: str) -> SettlementResult:
     return SettlementResult(
         status="skipped",
@@ -630,6 +1194,23 @@ def _load_consumable_buckets(
         .order_by(CreditWalletBucket.id.asc())
         .all()
     )
+    has_active_subscription = (
+        load_effective_topup_subscription(creator_bid, as_of=settlement_at) is not None
+    )
+    return _select_consumable_buckets(
+        rows,
+        settlement_at=settlement_at,
+        has_active_subscription=has_active_subscription,
+    )
+
+
+def _select_consumable_buckets(
+    rows: list[CreditWalletBucket],
+    *,
+    settlement_at: datetime,
+    has_active_subscription: bool,
+    load_order_type: OrderTypeLoader = load_billing_order_type_by_bid,
+) -> list[CreditWalletBucket]:
     eligible = [
         row
         for row in rows
@@ -637,22 +1218,173 @@ def _load_consumable_buckets(
         and (row.effective_from is None or row.effective_from <= settlement_at)
         and (row.effective_to is None or row.effective_to > settlement_at)
     ]
-    has_active_subscription = (
-        load_effective_topup_subscription(creator_bid, as_of=settlement_at) is not None
-    )
     eligible = [
         row
         for row in eligible
         if has_active_subscription
         or not wallet_bucket_requires_active_subscription(
             row,
-            load_order_type=load_billing_order_type_by_bid,
+            load_order_type=load_order_type,
         )
     ]
     eligible.sort(
         key=lambda row: build_wallet_bucket_runtime_sort_key(
             row,
-            load_order_type=load_billing_order_type_by_bid,
+            load_order_type=load_order_type,
         )
     )
     return eligible
+
+
+@dataclass(slots=True, frozen=True)
+class _UsageConsumption:
+    total_consumed: Decimal
+    bucket_breakdown_map: dict[str, dict[str, Any]]
+
+
+def _consume_usage_charges(
+    metric_charges: list[UsageMetricCharge],
+    buckets: list[CreditWalletBucket],
+) -> _UsageConsumption | None:
+    """Drain charges from buckets in order, or return None without touching them."""
+    remaining_by_bucket = {
+        id(bucket): _to_decimal(bucket.available_credits) for bucket in buckets
+    }
+    allocations: list[tuple[CreditWalletBucket, UsageMetricCharge, Decimal]] = []
+    for charge in metric_charges:
+        remaining = charge.consumed_credits
+        for bucket in buckets:
+            bucket_available = remaining_by_bucket[id(bucket)]
+            if remaining <= _ZERO:
+                break
+            if bucket_available <= _ZERO:
+                continue
+            consumed = _quantize_credit_amount(min(bucket_available, remaining))
+            remaining -= consumed
+            remaining_by_bucket[id(bucket)] = _quantize_credit_amount(
+                bucket_available - consumed
+            )
+            allocations.append((bucket, charge, consumed))
+        if remaining > _ZERO:
+            return None
+
+    total_consumed = _ZERO
+    bucket_breakdown_map: dict[str, dict[str, Any]] = {}
+    for bucket, charge, consumed in allocations:
+        total_consumed += consumed
+        bucket.available_credits = _quantize_credit_amount(
+            _to_decimal(bucket.available_credits) - consumed
+        )
+        bucket.consumed_credits = _quantize_credit_amount(
+            _to_decimal(bucket.consumed_credits) + consumed
+        )
+        sync_credit_bucket_status(bucket)
+        db.session.add(bucket)
+        bucket_key = str(bucket.wallet_bucket_bid or "").strip()
+        metric_breakdown = bucket_breakdown_map.setdefault(
+            bucket_key,
+            {
+                "wallet_bucket_bid": bucket_key,
+                "bucket_category": CREDIT_BUCKET_CATEGORY_LABELS.get(
+                    int(bucket.bucket_category or 0),
+                    "subscription",
+                ),
+                "source_type": CREDIT_SOURCE_TYPE_LABELS.get(
+                    int(bucket.source_type or 0),
+                    "manual",
+                ),
+                "source_bid": str(bucket.source_bid or ""),
+                "consumed_credits": _ZERO,
+                "effective_from": bucket.effective_from,
+                "effective_to": bucket.effective_to,
+                "metric_breakdown": {},
+            },
+        )
+        metric_breakdown["consumed_credits"] += consumed
+        metric_items = metric_breakdown["metric_breakdown"]
+        metric_items[int(charge.billing_metric)] = {
+            "billing_metric": charge.metric_label,
+            "billing_metric_code": int(charge.billing_metric),
+            "consumed_credits": (
+                _to_decimal(
+                    metric_items.get(int(charge.billing_metric), {}).get(
+                        "consumed_credits",
+                        _ZERO,
+                    )
+                )
+                + consumed
+            ),
+        }
+    return _UsageConsumption(
+        total_consumed=total_consumed,
+        bucket_breakdown_map=bucket_breakdown_map,
+    )
+
+
+def _build_usage_ledger_entry(
+    app: Flask,
+    *,
+    usage: BillUsageRecord,
+    creator_bid: str,
+    wallet: CreditWallet,
+    metric_charges: list[UsageMetricCharge],
+    consumption: _UsageConsumption,
+    balance_after: Decimal,
+) -> CreditLedgerEntry:
+    bucket_breakdown_map = consumption.bucket_breakdown_map
+    bucket_breakdown = [
+        UsageBucketBreakdownItem(
+            wallet_bucket_bid=payload["wallet_bucket_bid"],
+            bucket_category=payload["bucket_category"],
+            source_type=payload["source_type"],
+            source_bid=payload["source_bid"],
+            consumed_credits=_to_decimal(payload["consumed_credits"]),
+            effective_from=_serialize_metadata_dt(payload["effective_from"]),
+            effective_to=_serialize_metadata_dt(payload["effective_to"]),
+            metric_breakdown=[
+                UsageBucketMetricBreakdownItem(
+                    billing_metric=str(metric_payload["billing_metric"]),
+                    billing_metric_code=int(metric_payload["billing_metric_code"] or 0),
+                    consumed_credits=_to_decimal(metric_payload["consumed_credits"]),
+                )
+                for metric_payload in payload["metric_breakdown"].values()
+            ],
+        )
+        for payload in bucket_breakdown_map.values()
+    ]
+    primary_bucket_payload = (
+        next(iter(bucket_breakdown_map.values()))
+        if len(bucket_breakdown_map) == 1
+        else None
+    )
+    return CreditLedgerEntry(
+        ledger_bid=generate_id(app),
+        creator_bid=creator_bid,
+        wallet_bid=wallet.wallet_bid,
+        wallet_bucket_bid=(
+            str(primary_bucket_payload["wallet_bucket_bid"])
+            if primary_bucket_payload is not None
+            else ""
+        ),
+        entry_type=CREDIT_LEDGER_ENTRY_TYPE_CONSUME,
+        source_type=CREDIT_SOURCE_TYPE_USAGE,
+        source_bid=usage.usage_bid,
+        idempotency_key=f"usage:{usage.usage_bid}:consume",
+        amount=-consumption.total_consumed,
+        balance_after=balance_after,
+        expires_at=(
+            primary_bucket_payload["effective_to"]
+            if primary_bucket_payload is not None
+            else None
+        ),
+        consumable_from=(
+            primary_bucket_payload["effective_from"]
+            if primary_bucket_payload is not None
+            else None
+        ),
+        metadata_json=build_usage_entry_metadata(
+            usage=usage,
+            charges=metric_charges,
+            bucket_breakdown=bucket_breakdown,
+        ).to_metadata_json(),
+    )
@@ -30,6 +30,9 @@ from .credit_notifications import (
 from .credit_notifications import (
     deliver_credit_notification as _deliver_credit_notification,
 )
+from .credit_notifications import (
+    resolve_creator_scan_shard as _resolve_creator_scan_shard,
+)
 from .credit_notifications import (
     scan_credit_expiring_notifications as _scan_credit_expiring_notifications,
 )
@@ -43,7 +46,7 @@ from .daily_aggregates import (
     rebuild_daily_aggregates,
 )
 from .domains import verify_domain_binding
-from .models import BillingOrder, BillingRenewalEvent, BillingSubscription, CreditWallet
+from .models import BillingOrder, BillingRenewalEvent
 from .notifications import (
     BILLING_PAID_FEISHU_TASK_NAME as _BILLING_PAID_FEISHU_TASK_NAME,
 )
@@ -59,8 +62,17 @@ from .notifications import (
 from .primitives import coerce_bool as _coerce_bool
 from .primitives import coerce_datetime as _coerce_datetime
 from .primitives import normalize_bid as _normalize_bid
-from .renewal import retry_billing_renewal_event, run_billing_renewal_event
-from .settlement import replay_bill_usage_settlement, settle_bill_usage
+from .renewal import (
+    retry_billing_renewal_event,
+    run_billing_renewal_event,
+    run_due_renewal_event_batch,
+)
+from .settlement import (
+    enqueue_bill_usage_settlement,
+    replay_bill_usage_settlement,
+    settle_bill_usage,
+)
+from .wallet_projections import verify_credit_wallet_projections
 from .wallets import expire_credit_wallet_buckets
 
 if TYPE_CHECKING:
@@ -169,6 +181,8 @@ def _load_renewal_task_config() -> dict[str, Any]:
         "processing_timeout_minutes": 30,
         "queue": "",
         "use_dedicated_queue": 0,
+        "use_batch_claims": 0,
+        "worker_count": 4,
     }
     raw_config = get_config(BILL_CONFIG_KEY_RENEWAL_TASK_CONFIG, "") or ""
     try:
@@ -221,7 +235,11 @@ def _recover_stale_processing_renewal_events(
 def dispatch_due_renewal_events(
     app,
 ) -> dict[str, Any]:
-    """Find due renewal events and enqueue the existing runner task."""
+    """Find due renewal events and enqueue the runner task for each one.
+
+    With ``use_batch_claims`` the events are claimed in one batch and run on
+    a pool of ``worker_count`` threads inside this task instead.
+    """
     with app.app_context():
         config = _load_renewal_task_config()
         if not _coerce_bool(config.get("enabled")):
@@ -255,6 +273,23 @@ def dispatch_due_renewal_events(
             db.session.commit()
 
         cutoff = now + timedelta(minutes=lookahead_minutes)
+        if _coerce_bool(config.get("use_batch_claims")):
+            # Claim the batch with SKIP LOCKED and run it in this worker's
+            # pool instead of fanning out one Celery task per event. The claim
+            # runs in its own unit of work, which also ends this read.
+            payload = _serialize_task_payload(
+                run_due_renewal_event_batch(
+                    app,
+                    due_before=cutoff,
+                    batch_size=batch_size,
+                    worker_count=_coerce_positive_int(
+                        config.get("worker_count"), 4, minimum=1
+                    ),
+                )
+            )
+            payload["recovered_processing_count"] = recovered_processing_count
+            return payload
+
         events = (
             BillingRenewalEvent.query.filter(
                 BillingRenewalEvent.deleted == 0,
@@ -316,29 +351,44 @@ def _run_reconcile_provider_reference(
     )
 
 
-def _collect_low_balance_creator_bids() -> list[str]:
-    wallet_creator_rows = (
-        CreditWallet.query.filter(
-            CreditWallet.deleted == 0,
-            CreditWallet.creator_bid != "",
-        )
-        .order_by(CreditWallet.id.asc())
-        .all()
+def _run_creator_notification_scan(
+    app,
+    scan,
+    shard_task,
+    *,
+    creator_bid: str = "",
+    shard_index: Any = None,
+) -> dict[str, Any]:
+    """Run one notification scan, fanning out per creator shard when configured.
+
+    A targeted ``creator_bid`` always scans inline. Otherwise, with
+    ``BILL_NOTIFICATION_SCAN_SHARD_COUNT`` above one, the scheduled run enqueues
+    one ``shard_task`` per shard and each shard task scans its own creators.
+    """
+    normalized_creator_bid = _normalize_bid(creator_bid)
+    shard_count = _coerce_positive_int(
+        app.config.get("BILL_NOTIFICATION_SCAN_SHARD_COUNT"),
+        1,
+        minimum=1,
     )
-    subscription_creator_rows = (
-        BillingSubscription.query.filter(
-            BillingSubscription.deleted == 0,
-            BillingSubscription.creator_bid != "",
-        )
-        .order_by(BillingSubscription.id.asc())
-        .all()
+    if normalized_creator_bid or (shard_count <= 1 and shard_index is None):
+        return scan(app, creator_bid=normalized_creator_bid)
+    if shard_index is None:
+        for index in range(shard_count):
+            shard_task.apply_async(kwargs={"shard_index": index})
+        return {
+            "status": "dispatched",
+            "shard_count": shard_count,
+            "dispatched_count": shard_count,
+        }
+    payload = scan(
+        app,
+        creator_bid="",
+        shard=_resolve_creator_scan_shard(shard_index, shard_count),
     )
-    creator_bids = {
-        _normalize_bid(row.creator_bid)
-        for row in (*wallet_creator_rows, *subscription_creator_rows)
-        if _normalize_bid(row.creator_bid)
-    }
-    return sorted(creator_bids)
+    payload["shard_index"] = int(shard_index)
+    payload["shard_count"] = shard_count
+    return payload
 
 
 def _expire_pending_billing_orders(
@@ -439,6 +489,17 @@ def settle_usage_task(*, creator_bid: str = "", usage_bid: str = "") -> dict[str
     return payload
 
 
+@shared_task(name="billing.settle_usage_batch")
+def settle_usage_batch_task(*, usage_bid: str = "") -> dict[str, Any]:
+    """Queue a usage for its creator and drain the creator's pending batch."""
+    app = _create_task_app()
+    payload = _serialize_task_payload(
+        enqueue_bill_usage_settlement(app, usage_bid=usage_bid)
+    )
+    payload["task_name"] = "billing.settle_usage_batch"
+    return payload
+
+
 @shared_task(name="billing.replay_usage_settlement")
 def replay_usage_settlement_task(
     *,
@@ -520,13 +581,16 @@ def reconcile_provider_reference_task(
 def send_low_balance_alert_task(
     *,
     creator_bid: str = "",
+    shard_index: Any = None,
 ) -> dict[str, Any]:
     """Scan low-balance notifications while preserving the legacy task name."""
     app = _create_task_app()
-    normalized_creator_bid = _normalize_bid(creator_bid)
-    payload = _scan_low_balance_notifications(
+    payload = _run_creator_notification_scan(
         app,
-        creator_bid=normalized_creator_bid,
+        _scan_low_balance_notifications,
+        send_low_balance_alert_task,
+        creator_bid=creator_bid,
+        shard_index=shard_index,
     )
     payload["task_name"] = "billing.send_low_balance_alert"
     return payload
@@ -536,12 +600,16 @@ def send_low_balance_alert_task(
 def scan_credit_expiring_notifications_task(
     *,
     creator_bid: str = "",
+    shard_index: Any = None,
 ) -> dict[str, Any]:
     """Scan expiring credit buckets and enqueue due notifications."""
     app = _create_task_app()
-    payload = _scan_credit_expiring_notifications(
+    payload = _run_creator_notification_scan(
         app,
-        creator_bid=_normalize_bid(creator_bid),
+        _scan_credit_expiring_notifications,
+        scan_credit_expiring_notifications_task,
+        creator_bid=creator_bid,
+        shard_index=shard_index,
     )
     payload["task_name"] = "billing.scan_credit_expiring_notifications"
     return payload
@@ -551,12 +619,16 @@ def scan_credit_expiring_notifications_task(
 def scan_low_balance_notifications_task(
     *,
     creator_bid: str = "",
+    shard_index: Any = None,
 ) -> dict[str, Any]:
     """Scan low-balance wallets and enqueue due notifications."""
     app = _create_task_app()
-    payload = _scan_low_balance_notifications(
+    payload = _run_creator_notification_scan(
         app,
-        creator_bid=_normalize_bid(creator_bid),
+        _scan_low_balance_notifications,
+        scan_low_balance_notifications_task,
+        creator_bid=creator_bid,
+        shard_index=shard_index,
     )
     payload["task_name"] = "billing.scan_low_balance_notifications"
     return payload
@@ -722,6 +794,7 @@ def aggregate_daily_usage_metrics_task(
     stat_date: str = "",
     creator_bid: str = "",
     finalize: Any = False,
+    incremental: Any = False,
 ) -> dict[str, Any]:
     """Rebuild one creator/day usage aggregate slice from usage + ledger rows."""
     app = _create_task_app()
@@ -730,6 +803,7 @@ def aggregate_daily_usage_metrics_task(
         stat_date=_normalize_bid(stat_date),
         creator_bid=_normalize_bid(creator_bid),
         finalize=_coerce_bool(finalize),
+        incremental=_coerce_bool(incremental),
     )
     payload = _serialize_task_payload(payload)
     payload["task_name"] = "billing.aggregate_daily_usage_metrics"
@@ -799,6 +873,26 @@ def rebuild_daily_aggregates_task(
     return payload
 
 
+@shared_task(name="billing.verify_wallet_projections")
+def verify_wallet_projections_task(
+    *,
+    creator_bid: str = "",
+    wallet_bid: str = "",
+    repair: Any = False,
+) -> dict[str, Any]:
+    """Check wallet balance projections against a full bucket recompute."""
+    app = _create_task_app()
+    payload = verify_credit_wallet_projections(
+        app,
+        creator_bid=_normalize_bid(creator_bid),
+        wallet_bid=_normalize_bid(wallet_bid),
+        repair=_coerce_bool(repair),
+    )
+    payload = _serialize_task_payload(payload)
+    payload["task_name"] = "billing.verify_wallet_projections"
+    return payload
+
+
 @shared_task(name="billing.verify_domain_binding")
 def verify_domain_binding_task(
     *,
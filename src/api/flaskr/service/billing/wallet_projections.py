@@ -0,0 +1,646 @@
+"""Precomputed wallet balance projections.
+
+``credit_wallet_projections`` holds one row per wallet with the consumable and
+reserved credits its buckets imply. A row stays valid until the next bucket
+window or subscription period boundary, so billing pages read one row instead
+of walking every bucket.
+
+Bucket flushes keep the rows current inside the writing transaction. Balance
+and status changes add a relative delta with the flush connection, so savepoint
+rollbacks and concurrent settlements stay consistent. Writes that change which
+buckets count (inserts, deletes, window, ownership or category changes) and any
+subscription write mark the row stale instead. Readers recompute stale or
+expired rows on demand, and ``verify_credit_wallet_projections`` compares rows
+against a full recompute page by page.
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import TYPE_CHECKING, Any
+
+from flaskr.dao import db
+from flaskr.dao.uow import unit_of_work
+from flaskr.util.datetime import now_utc
+from sqlalchemy import case, event, inspect, literal, update
+from sqlalchemy.exc import IntegrityError
+
+from .bucket_categories import (
+    load_billing_order_type_by_bid,
+    wallet_bucket_requires_active_subscription,
+)
+from .consts import ACTIVE_SUBSCRIPTION_STATUSES, CREDIT_BUCKET_STATUS_ACTIVE
+from .models import (
+    BillingSubscription,
+    CreditWallet,
+    CreditWalletBucket,
+    CreditWalletProjection,
+)
+from .primitives import credit_decimal_to_number as _credit_decimal_to_number
+from .primitives import quantize_credit_amount as _quantize_credit_amount
+from .primitives import to_decimal as _to_decimal
+
+if TYPE_CHECKING:
+    from datetime import datetime
+
+    from flask import Flask
+
+    from .bucket_categories import OrderTypeLoader
+
+_ZERO = Decimal(0)
+_VERIFY_PAGE_SIZE = 200
+# Bucket fields that decide whether a bucket counts toward a wallet at all.
+# Changing any of them cannot be expressed as a balance delta.
+_PROJECTION_SHAPE_FIELDS = (
+    "wallet_bid",
+    "creator_bid",
+    "bucket_category",
+    "source_type",
+    "source_bid",
+    "metadata_json",
+    "effective_from",
+    "effective_to",
+    "deleted",
+)
+
+
+@dataclass(slots=True, frozen=True)
+class WalletProjectionValues:
+    """Capture recomputed wallet balances and how long they stay valid."""
+
+    wallet_bid: str
+    creator_bid: str
+    available_credits: Decimal
+    reserved_credits: Decimal
+    has_active_subscription: bool
+    projected_at: datetime
+    valid_until: datetime | None
+
+
+@dataclass(slots=True, frozen=True)
+class WalletBalanceRead:
+    """Capture wallet balances served from a projection row."""
+
+    available_credits: Decimal
+    reserved_credits: Decimal
+    refreshed: bool
+
+
+@dataclass(slots=True, frozen=True)
+class WalletProjectionDriftRecord:
+    """Record a projection row that disagreed with a full recompute."""
+
+    wallet_bid: str
+    creator_bid: str
+    reason: str
+    projected_available_credits: int | float | None
+    available_credits: int | float
+    projected_reserved_credits: int | float | None
+    reserved_credits: int | float
+    repaired: bool
+
+    def to_payload(self) -> dict[str, Any]:
+        """Serialize this result as an API payload."""
+        return {
+            "wallet_bid": self.wallet_bid,
+            "creator_bid": self.creator_bid,
+            "reason": self.reason,
+            "projected_available_credits": self.projected_available_credits,
+            "available_credits": self.available_credits,
+            "projected_reserved_credits": self.projected_reserved_credits,
+            "reserved_credits": self.reserved_credits,
+            "repaired": self.repaired,
+        }
+
+
+@dataclass(slots=True, frozen=True)
+class WalletProjectionVerifyResult:
+    """Capture the outcome of a wallet projection consistency check."""
+
+    status: str
+    creator_bid: str | None
+    wallet_bid: str | None
+    wallet_count: int
+    drift_count: int
+    refreshed_count: int
+    repair: bool
+    drifts: list[WalletProjectionDriftRecord] = field(default_factory=list)
+
+    def to_task_payload(self) -> dict[str, Any]:
+        """Serialize this result for task processing."""
+        return {
+            "status": self.status,
+            "creator_bid": self.creator_bid,
+            "wallet_bid": self.wallet_bid,
+            "wallet_count": self.wallet_count,
+            "drift_count": self.drift_count,
+            "refreshed_count": self.refreshed_count,
+            "repair": self.repair,
+            "drifts": [drift.to_payload() for drift in self.drifts],
+        }
+
+    def __getitem__(self, key: str) -> Any:
+        """Return a task-payload field by key."""
+        return self.to_task_payload()[key]
+
+
+class _OrderTypeLookupNeededError(Exception):
+    pass
+
+
+def sum_credit_wallet_bucket_rows(
+    rows: list[CreditWalletBucket],
+    *,
+    snapshot_at: datetime,
+    has_active_subscription: bool,
+    load_order_type: OrderTypeLoader = load_billing_order_type_by_bid,
+) -> tuple[Decimal, Decimal]:
+    """Sum wallet bucket rows into unrounded consumable and reserved credits."""
+    available_credits = sum(
+        (
+            _to_decimal(row.available_credits)
+            for row in rows
+            if int(row.status or 0) == CREDIT_BUCKET_STATUS_ACTIVE
+            and _to_decimal(row.available_credits) > _ZERO
+            and (row.effective_from is None or row.effective_from <= snapshot_at)
+            and (row.effective_to is None or row.effective_to > snapshot_at)
+            and (
+                has_active_subscription
+                or not wallet_bucket_requires_active_subscription(
+                    row,
+                    load_order_type=load_order_type,
+                )
+            )
+        ),
+        start=_ZERO,
+    )
+    reserved_credits = sum(
+        (_to_decimal(row.reserved_credits) for row in rows),
+        start=_ZERO,
+    )
+    return available_credits, reserved_credits
+
+
+def compute_wallet_projections(
+    wallets: list[tuple[str, str]],
+    *,
+    at: datetime,
+) -> dict[str, WalletProjectionValues]:
+    """Recompute projections for ``(wallet_bid, creator_bid)`` pairs in bulk."""
+    if not wallets:
+        return {}
+    wallet_bids = [wallet_bid for wallet_bid, _creator_bid in wallets]
+    creator_bids = {creator_bid for _wallet_bid, creator_bid in wallets}
+    rows_by_wallet: dict[str, list[CreditWalletBucket]] = defaultdict(list)
+    for row in (
+        CreditWalletBucket.query.filter(
+            CreditWalletBucket.deleted == 0,
+            CreditWalletBucket.wallet_bid.in_(wallet_bids),
+        )
+        .order_by(CreditWalletBucket.id.asc())
+        .all()
+    ):
+        rows_by_wallet[row.wallet_bid].append(row)
+
+    # Same predicate as load_primary_active_subscription, for every creator of
+    # the batch at once; the period bounds are the projection boundaries.
+    active_creator_bids: set[str] = set()
+    boundaries_by_creator: dict[str, list[datetime | None]] = defaultdict(list)
+    for subscription in db.session.query(
+        BillingSubscription.creator_bid,
+        BillingSubscription.current_period_start_at,
+        BillingSubscription.current_period_end_at,
+    ).filter(
+        BillingSubscription.deleted == 0,
+        BillingSubscription.creator_bid.in_(creator_bids),
+        BillingSubscription.status.in_(ACTIVE_SUBSCRIPTION_STATUSES),
+        BillingSubscription.current_period_end_at.isnot(None),
+    ):
+        boundaries_by_creator[subscription.creator_bid].extend(
+            (
+                subscription.current_period_start_at,
+                subscription.current_period_end_at,
+            )
+        )
+        if (
+            subscription.current_period_start_at is None
+            or subscription.current_period_start_at <= at
+        ) and subscription.current_period_end_at > at:
+            active_creator_bids.add(subscription.creator_bid)
+
+    order_types: dict[str, int | None] = {}
+
+    def load_order_type(bill_order_bid: str) -> int | None:
+        if bill_order_bid not in order_types:
+            order_types[bill_order_bid] = load_billing_order_type_by_bid(bill_order_bid)
+        return order_types[bill_order_bid]
+
+    projections: dict[str, WalletProjectionValues] = {}
+    for wallet_bid, creator_bid in wallets:
+        rows = rows_by_wallet.get(wallet_bid, [])
+        has_active_subscription = creator_bid in active_creator_bids
+        available_credits, reserved_credits = sum_credit_wallet_bucket_rows(
+            rows,
+            snapshot_at=at,
+            has_active_subscription=has_active_subscription,
+            load_order_type=load_order_type,
+        )
+        boundaries = [row.effective_from for row in rows]
+        boundaries.extend(row.effective_to for row in rows)
+        boundaries.extend(boundaries_by_creator.get(creator_bid, ()))
+        projections[wallet_bid] = WalletProjectionValues(
+            wallet_bid=wallet_bid,
+            creator_bid=creator_bid,
+            available_credits=available_credits,
+            reserved_credits=reserved_credits,
+            has_active_subscription=has_active_subscription,
+            projected_at=at,
+            valid_until=min(
+                (
+                    boundary
+                    for boundary in boundaries
+                    if boundary is not None and boundary > at
+                ),
+                default=None,
+            ),
+        )
+    return projections
+
+
+def load_credit_wallet_balance(
+    wallet: CreditWallet,
+    *,
+    at: datetime | None = None,
+) -> WalletBalanceRead:
+    """Return wallet balances from its projection, recomputing it if needed.
+
+    A recomputed projection is written to the current session without
+    committing; ``refreshed`` tells the caller whether there is anything to
+    commit.
+    """
+    read_at = at or now_utc()
+    projection = (
+        CreditWalletProjection.query.filter(
+            CreditWalletProjection.deleted == 0,
+            CreditWalletProjection.wallet_bid == wallet.wallet_bid,
+        )
+        .order_by(CreditWalletProjection.id.desc())
+        .first()
+    )
+    if projection is not None and _projection_is_current(projection, read_at):
+        return WalletBalanceRead(
+            available_credits=_quantize_credit_amount(projection.available_credits),
+            reserved_credits=_quantize_credit_amount(projection.reserved_credits),
+            refreshed=False,
+        )
+
+    values = compute_wallet_projections(
+        [(wallet.wallet_bid, wallet.creator_bid)],
+        at=read_at,
+    )[wallet.wallet_bid]
+    refreshed = _store_wallet_projection(values, current=projection)
+    return WalletBalanceRead(
+        available_credits=_quantize_credit_amount(values.available_credits),
+        reserved_credits=_quantize_credit_amount(values.reserved_credits),
+        refreshed=refreshed,
+    )
+
+
+def verify_credit_wallet_projections(
+    app: Flask,
+    *,
+    creator_bid: str = "",
+    wallet_bid: str = "",
+    repair: bool = False,
+) -> WalletProjectionVerifyResult:
+    """Compare projection rows with a full recompute and optionally fix them.
+
+    Missing, stale and expired rows are expected between reads and are only
+    refreshed. Rows that claim to be current but disagree with the buckets are
+    drift and are logged; ``repair`` rewrites both kinds.
+    """
+    normalized_creator_bid = str(creator_bid or "").strip()
+    normalized_wallet_bid = str(wallet_bid or "").strip()
+    with app.app_context():
+        verify_at = now_utc()
+        query = db.session.query(
+            CreditWallet.id,
+            CreditWallet.wallet_bid,
+            CreditWallet.creator_bid,
+        ).filter(CreditWallet.deleted == 0)
+        if normalized_creator_bid:
+            query = query.filter(CreditWallet.creator_bid == normalized_creator_bid)
+        if normalized_wallet_bid:
+            query = query.filter(CreditWallet.wallet_bid == normalized_wallet_bid)
+
+        wallet_count = 0
+        refreshed_count = 0
+        drifts: list[WalletProjectionDriftRecord] = []
+        last_id = 0
+        while True:
+            page = (
+                query.filter(CreditWallet.id > last_id)
+                .order_by(CreditWallet.id.asc())
+                .limit(_VERIFY_PAGE_SIZE)
+                .all()
+            )
+            if not page:
+                break
+            last_id = page[-1].id
+            wallet_count += len(page)
+            projections = {
+                projection.wallet_bid: projection
+                for projection in CreditWalletProjection.query.filter(
+                    CreditWalletProjection.deleted == 0,
+                    CreditWalletProjection.wallet_bid.in_(
+                        [row.wallet_bid for row in page]
+                    ),
+                )
+            }
+            computed = compute_wallet_projections(
+                [(row.wallet_bid, row.creator_bid) for row in page],
+                at=verify_at,
+            )
+            # Each page is its own transaction; verify-only runs never write.
+            with unit_of_work() if repair else nullcontext():
+                for row in page:
+                    projection = projections.get(row.wallet_bid)
+                    values = computed[row.wallet_bid]
+                    reason = _projection_mismatch_reason(projection, values, verify_at)
+                    if not reason:
+                        continue
+                    stored = repair and _store_wallet_projection(
+                        values,
+                        current=projection,
+                    )
+                    if reason != "drift":
+                        refreshed_count += int(stored)
+                        continue
+                    app.logger.warning(
+                        "credit wallet projection drift wallet_bid=%s creator_bid=%s "
+                        "projected=%s/%s recomputed=%s/%s",
+                        row.wallet_bid,
+                        row.creator_bid,
+                        projection.available_credits,
+                        projection.reserved_credits,
+                        values.available_credits,
+                        values.reserved_credits,
+                    )
+                    drifts.append(
+                        WalletProjectionDriftRecord(
+                            wallet_bid=row.wallet_bid,
+                            creator_bid=row.creator_bid,
+                            reason=reason,
+                            projected_available_credits=_credit_decimal_to_number(
+                                _quantize_credit_amount(projection.available_credits)
+                            ),
+                            available_credits=_credit_decimal_to_number(
+                                _quantize_credit_amount(values.available_credits)
+                            ),
+                            projected_reserved_credits=_credit_decimal_to_number(
+                                _quantize_credit_amount(projection.reserved_credits)
+                            ),
+                            reserved_credits=_credit_decimal_to_number(
+                                _quantize_credit_amount(values.reserved_credits)
+                            ),
+                            repaired=bool(stored),
+                        )
+                    )
+            if not repair:
+                db.session.rollback()
+
+        return WalletProjectionVerifyResult(
+            status="drift" if drifts else "consistent",
+            creator_bid=normalized_creator_bid or None,
+            wallet_bid=normalized_wallet_bid or None,
+            wallet_count=wallet_count,
+            drift_count=len(drifts),
+            refreshed_count=refreshed_count,
+            repair=repair,
+            drifts=drifts,
+        )
+
+
+def _projection_is_current(
+    projection: CreditWalletProjection,
+    at: datetime,
+) -> bool:
+    return (
+        int(projection.stale or 0) == 0
+        and projection.projected_at is not None
+        and projection.projected_at <= at
+        and (projection.valid_until is None or at < projection.valid_until)
+    )
+
+
+def _projection_mismatch_reason(
+    projection: CreditWalletProjection | None,
+    values: WalletProjectionValues,
+    at: datetime,
+) -> str:
+    if projection is None:
+        return "missing"
+    if not _projection_is_current(projection, at):
+        return "stale"
+    if bool(projection.has_active_subscription) != values.has_active_subscription:
+        return "drift"
+    if _quantize_credit_amount(projection.available_credits) != (
+        _quantize_credit_amount(values.available_credits)
+    ) or _quantize_credit_amount(projection.reserved_credits) != (
+        _quantize_credit_amount(values.reserved_credits)
+    ):
+        return "drift"
+    return ""
+
+
+def _store_wallet_projection(
+    values: WalletProjectionValues,
+    *,
+    current: CreditWalletProjection | None,
+) -> bool:
+    """Write recomputed values unless a concurrent write got there first."""
+    stored_at = now_utc()
+    if current is None:
+        try:
+            with db.session.begin_nested():
+                db.session.add(
+                    CreditWalletProjection(
+                        wallet_bid=values.wallet_bid,
+                        creator_bid=values.creator_bid,
+                        available_credits=values.available_credits,
+                        reserved_credits=values.reserved_credits,
+                        has_active_subscription=int(values.has_active_subscription),
+                        projected_at=values.projected_at,
+                        valid_until=values.valid_until,
+                        stale=0,
+                        version=0,
+                        created_at=stored_at,
+                        updated_at=stored_at,
+                    )
+                )
+        except IntegrityError:
+            return False
+        return True
+
+    # Bucket deltas bump the version, so a delta that landed after this
+    # recompute read the buckets makes the update miss instead of being lost.
+    updated_rows = CreditWalletProjection.query.filter(
+        CreditWalletProjection.id == current.id,
+        CreditWalletProjection.version == current.version,
+    ).update(
+        {
+            "available_credits": values.available_credits,
+            "reserved_credits": values.reserved_credits,
+            "has_active_subscription": int(values.has_active_subscription),
+            "projected_at": values.projected_at,
+            "valid_until": values.valid_until,
+            "stale": 0,
+            "version": int(current.version or 0) + 1,
+            "updated_at": stored_at,
+        },
+        synchronize_session=False,
+    )
+    db.session.expire(current)
+    return updated_rows == 1
+
+
+def _mark_projections_stale(connection, *, wallet_bids=(), creator_bid="") -> None:
+    table = CreditWalletProjection.__table__
+    statement = update(table).values(
+        stale=1,
+        version=table.c.version + 1,
+        updated_at=now_utc(),
+    )
+    if creator_bid:
+        statement = statement.where(table.c.creator_bid == creator_bid)
+    else:
+        normalized_wallet_bids = sorted({bid for bid in wallet_bids if bid})
+        if not normalized_wallet_bids:
+            return
+        statement = statement.where(table.c.wallet_bid.in_(normalized_wallet_bids))
+    connection.execute(statement)
+
+
+def _attribute_change(attr) -> tuple[bool, Any, Any]:
+    history = attr.history
+    if not history.has_changes():
+        return True, attr.value, attr.value
+    if not history.deleted:
+        # The previous value was never loaded, so no delta can be derived.
+        return False, None, attr.value
+    return True, history.deleted[0], attr.value
+
+
+def _consumable_credits(available: Any, status: Any, *, in_window: bool) -> Decimal:
+    if not in_window or int(status or 0) != CREDIT_BUCKET_STATUS_ACTIVE:
+        return _ZERO
+    return max(_to_decimal(available), _ZERO)
+
+
+def _requires_active_subscription_without_lookup(
+    bucket: CreditWalletBucket,
+) -> bool | None:
+    def refuse_lookup(_bill_order_bid: str) -> int | None:
+        raise _OrderTypeLookupNeededError
+
+    try:
+        return wallet_bucket_requires_active_subscription(
+            bucket,
+            load_order_type=refuse_lookup,
+        )
+    except _OrderTypeLookupNeededError:
+        return None
+
+
+def _on_bucket_shape_written(_mapper, connection, target: CreditWalletBucket) -> None:
+    _mark_projections_stale(connection, wallet_bids=(target.wallet_bid,))
+
+
+def _on_bucket_updated(_mapper, connection, target: CreditWalletBucket) -> None:
+    attrs = inspect(target).attrs
+    shape_history = [attrs[name].history for name in _PROJECTION_SHAPE_FIELDS]
+    if any(history.has_changes() for history in shape_history):
+        wallet_history = attrs.wallet_bid.history
+        _mark_projections_stale(
+            connection,
+            wallet_bids=(target.wallet_bid, *wallet_history.deleted),
+        )
+        return
+
+    known_available, available_before, available_after = _attribute_change(
+        attrs.available_credits
+    )
+    known_reserved, reserved_before, reserved_after = _attribute_change(
+        attrs.reserved_credits
+    )
+    known_status, status_before, status_after = _attribute_change(attrs.status)
+    if not (known_available and known_reserved and known_status):
+        _mark_projections_stale(connection, wallet_bids=(target.wallet_bid,))
+        return
+
+    # Windows are unchanged here, so membership at flush time holds for the
+    # whole validity window of a current projection.
+    flushed_at = now_utc()
+    in_window = (
+        target.effective_from is None or target.effective_from <= flushed_at
+    ) and (target.effective_to is None or target.effective_to > flushed_at)
+    available_delta = _consumable_credits(
+        available_after, status_after, in_window=in_window
+    ) - _consumable_credits(available_before, status_before, in_window=in_window)
+    reserved_delta = _to_decimal(reserved_after) - _to_decimal(reserved_before)
+    if available_delta == _ZERO and reserved_delta == _ZERO:
+        return
+
+    requires_subscription = _requires_active_subscription_without_lookup(target)
+    gated_delta = available_delta if requires_subscription is False else _ZERO
+    table = CreditWalletProjection.__table__
+    credit_type = table.c.available_credits.type
+    values: dict[str, Any] = {
+        "available_credits": table.c.available_credits
+        + case(
+            (
+                table.c.has_active_subscription == 1,
+                literal(available_delta, credit_type),
+            ),
+            else_=literal(gated_delta, credit_type),
+        ),
+        "reserved_credits": table.c.reserved_credits
+        + literal(reserved_delta, credit_type),
+        "version": table.c.version + 1,
+        "updated_at": flushed_at,
+    }
+    if requires_subscription is None:
+        # Without an active subscription the bucket's category needs an order
+        # lookup to decide whether it counts; let the next read recompute.
+        values["stale"] = case(
+            (table.c.has_active_subscription == 0, 1),
+            else_=table.c.stale,
+        )
+    connection.execute(
+        update(table)
+        .where(
+            table.c.wallet_bid == target.wallet_bid,
+            table.c.deleted == 0,
+        )
+        .values(**values)
+    )
+
+
+def _on_subscription_written(
+    _mapper,
+    connection,
+    target: BillingSubscription,
+) -> None:
+    creator_bid = str(target.creator_bid or "").strip()
+    if creator_bid:
+        _mark_projections_stale(connection, creator_bid=creator_bid)
+
+
+event.listen(CreditWalletBucket, "after_insert", _on_bucket_shape_written)
+event.listen(CreditWalletBucket, "after_delete", _on_bucket_shape_written)
+event.listen(CreditWalletBucket, "after_update", _on_bucket_updated)
+for _event_name in ("after_insert", "after_update", "after_delete"):
+    event.listen(BillingSubscription, _event_name, _on_subscription_written)
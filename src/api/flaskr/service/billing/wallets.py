@@ -22,7 +22,6 @@ from .bucket_categories import (
     resolve_credit_bucket_priority,
     resolve_runtime_credit_bucket_category,
     resolve_wallet_bucket_runtime_category,
-    wallet_bucket_requires_active_subscription,
 )
 from .consts import (
     ACTIVE_SUBSCRIPTION_STATUSES,
@@ -59,10 +58,13 @@ from .primitives import credit_decimal_to_number as _credit_decimal_to_number
 from .primitives import quantize_credit_amount as _quantize_credit_amount
 from .primitives import to_decimal as _to_decimal
 from .queries import load_primary_active_subscription
+from .wallet_projections import sum_credit_wallet_bucket_rows
 
 if TYPE_CHECKING:
     from flask import Flask
 
+    from .bucket_categories import OrderTypeLoader
+
 _ZERO = Decimal(0)
 _PRESERVED_BUCKET_STATUSES = {
     CREDIT_BUCKET_STATUS_CANCELED,
@@ -816,28 +818,26 @@ def calculate_credit_wallet_snapshot_values(
         )
         is not None
     )
-    current_consumable_rows = [
-        row
-        for row in rows
-        if int(row.status or 0) == CREDIT_BUCKET_STATUS_ACTIVE
-        and _to_decimal(row.available_credits) > _ZERO
-        and (row.effective_from is None or row.effective_from <= resolved_snapshot_at)
-        and (row.effective_to is None or row.effective_to > resolved_snapshot_at)
-        and (
-            has_active_subscription
-            or not wallet_bucket_requires_active_subscription(
-                row,
-                load_order_type=load_billing_order_type_by_bid,
-            )
-        )
-    ]
-    available_credits = sum(
-        (_to_decimal(row.available_credits) for row in current_consumable_rows),
-        start=_ZERO,
+    return summarize_credit_wallet_bucket_rows(
+        rows,
+        snapshot_at=resolved_snapshot_at,
+        has_active_subscription=has_active_subscription,
     )
-    reserved_credits = sum(
-        (_to_decimal(row.reserved_credits) for row in rows),
-        start=_ZERO,
+
+
+def summarize_credit_wallet_bucket_rows(
+    rows: list[CreditWalletBucket],
+    *,
+    snapshot_at: datetime,
+    has_active_subscription: bool,
+    load_order_type: OrderTypeLoader = load_billing_order_type_by_bid,
+) -> tuple[Decimal, Decimal]:
+    """Sum already-loaded wallet bucket rows into wallet balances at a time."""
+    available_credits, reserved_credits = sum_credit_wallet_bucket_rows(
+        rows,
+        snapshot_at=snapshot_at,
+        has_active_subscription=has_active_subscription,
+        load_order_type=load_order_type,
     )
     return (
         _quantize_credit_amount(available_credits),
@@ -0,0 +1,152 @@
+"""Share parsed MarkdownFlow documents across requests in one process.
+
+Lesson documents are immutable once published, yet every learner step, context
+rebuild, publish and outline count used to construct a fresh ``MarkdownFlow``
+and split the same text into blocks again. This module keeps a bounded LRU of
+parsed documents keyed by a content hash. Callers receive a private copy of
+the cached instance whose mutable internals (the block list, each block and its
+variable list, and the code-block preprocessor tables) are copied too, so
+nothing a caller changes reaches the cache or another caller. Only the
+immutable strings are shared; rebuilding the block objects costs a fraction of
+the regex parse. Output language does not influence block parsing, so it is
+applied to the copy rather than being part of the key.
+"""
+
+from __future__ import annotations
+
+import copy
+import dataclasses
+import hashlib
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+from markdown_flow import MarkdownFlow
+
+MDFLOW_CACHE_MAX_ENTRIES = 256
+
+MarkdownFlowFactory = Callable[..., Any]
+
+
+@dataclass(frozen=True, slots=True)
+class MdflowCacheStats:
+    """Hit and occupancy counters for the parsed MarkdownFlow cache."""
+
+    hits: int
+    misses: int
+    size: int
+    capacity: int
+
+
+@dataclass(slots=True)
+class _MdflowCacheState:
+    entries: OrderedDict[tuple[MarkdownFlowFactory, str], Any]
+    hits: int = 0
+    misses: int = 0
+
+
+_mdflow_cache_state = _MdflowCacheState(entries=OrderedDict())
+_mdflow_cache_lock = threading.Lock()
+
+
+def _document_digest(document: str) -> str:
+    return hashlib.blake2b(
+        document.encode("utf-8"), digest_size=16, usedforsecurity=False
+    ).hexdigest()
+
+
+def _get_parsed_template(document: str, factory: MarkdownFlowFactory) -> Any:
+    key = (factory, _document_digest(document))
+    state = _mdflow_cache_state
+    with _mdflow_cache_lock:
+        template = state.entries.get(key)
+        if template is not None:
+            state.entries.move_to_end(key)
+            state.hits += 1
+            return template
+        state.misses += 1
+
+    # The parse runs regexes over the whole lesson, so it stays off the lock
+    # that cache hits for other lessons wait on. Keys are content digests, so
+    # racing misses on one key store equivalent parses.
+    template = factory(document=document)
+    template.get_all_blocks()
+    with _mdflow_cache_lock:
+        state.entries[key] = template
+        state.entries.move_to_end(key)
+        while len(state.entries) > MDFLOW_CACHE_MAX_ENTRIES:
+            state.entries.popitem(last=False)
+    return template
+
+
+def _copy_block(block: Any) -> Any:
+    if dataclasses.is_dataclass(block):
+        return dataclasses.replace(block, variables=list(block.variables))
+    return copy.copy(block)
+
+
+def _copy_blocks(blocks: list) -> list:
+    return [_copy_block(block) for block in blocks]
+
+
+def _copy_parsed(template: Any) -> Any:
+    # A MarkdownFlow keeps its parsed blocks in ``_blocks`` and the extracted
+    # code blocks in ``_preprocessor``; everything else is an immutable string
+    # or scalar that the copy may share.
+    mdflow = copy.copy(template)
+    blocks = getattr(template, "_blocks", None)
+    if blocks is not None:
+        mdflow._blocks = _copy_blocks(blocks)
+    preprocessor = getattr(template, "_preprocessor", None)
+    if preprocessor is not None:
+        mdflow._preprocessor = copy.deepcopy(preprocessor)
+    return mdflow
+
+
+def get_parsed_mdflow(
+    document: str,
+    *,
+    output_language: str | None = None,
+    factory: MarkdownFlowFactory = MarkdownFlow,
+) -> Any:
+    """Return a private ``MarkdownFlow`` for ``document`` backed by the cache.
+
+    ``factory`` lets modules that resolve ``MarkdownFlow`` from their own
+    namespace keep doing so; entries are keyed per factory.
+    """
+    mdflow = _copy_parsed(_get_parsed_template(document or "", factory))
+    if output_language is not None:
+        mdflow = mdflow.set_output_language(output_language)
+    return mdflow
+
+
+def get_mdflow_blocks(
+    document: str,
+    *,
+    factory: MarkdownFlowFactory = MarkdownFlow,
+) -> list:
+    """Return a private copy of the parsed block list for ``document``."""
+    return _copy_blocks(_get_parsed_template(document or "", factory).get_all_blocks())
+
+
+def get_mdflow_cache_stats() -> MdflowCacheStats:
+    """Return hit/miss counters and occupancy of the parsed document cache."""
+    with _mdflow_cache_lock:
+        state = _mdflow_cache_state
+        return MdflowCacheStats(
+            hits=state.hits,
+            misses=state.misses,
+            size=len(state.entries),
+            capacity=MDFLOW_CACHE_MAX_ENTRIES,
+        )
+
+
+def clear_mdflow_cache() -> None:
+    """Drop every cached document and reset the counters."""
+    with _mdflow_cache_lock:
+        state = _mdflow_cache_state
+        state.entries.clear()
+        state.hits = 0
+        state.misses = 0
@@ -240,3 +240,26 @@ def read_storage_bytes(
 
     message = f"storage object not found: {resolved_key}"
     raise FileNotFoundError(message)
+
+
+def delete_storage_object(
+    *,
+    object_key: str,
+    profile: str = OSS_PROFILE_DEFAULT,
+    bucket_name: str = "",
+) -> None:
+    """Delete a stored object; objects that do not exist are ignored."""
+    resolved_profile = _normalize_profile(profile)
+    resolved_key = _normalize_object_key(object_key)
+
+    get_local_storage_path(resolved_profile, resolved_key).unlink(missing_ok=True)
+
+    should_try_oss = bool(str(bucket_name or "").strip()) or (
+        _resolve_provider(resolved_profile) == STORAGE_PROVIDER_OSS
+    )
+    if should_try_oss and is_oss_profile_configured(resolved_profile):
+        config = get_oss_config(resolved_profile)
+        normalized_bucket = str(bucket_name or "").strip()
+        if normalized_bucket and normalized_bucket != config.bucket:
+            config = replace(config, bucket=normalized_bucket)
+        create_oss_bucket(config).delete_object(resolved_key)
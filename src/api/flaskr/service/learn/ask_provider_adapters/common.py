@@ -129,15 +129,20 @@ def provider_timeout_seconds() -> int:
 
 
 def iter_sse_payloads(response: requests.Response) -> Iterable[str]:
-    """Yield SSE payloads."""
-    for line in response.iter_lines(decode_unicode=True):
-        if not line:
-            continue
-        normalized = line.strip()
-        if normalized.startswith("data:"):
-            yield normalized[5:].strip()
-        else:
-            yield normalized
+    """Yield SSE payloads, releasing the connection when iteration ends."""
+    try:
+        for line in response.iter_lines(decode_unicode=True):
+            if not line:
+                continue
+            normalized = line.strip()
+            if normalized.startswith("data:"):
+                yield normalized[5:].strip()
+            else:
+                yield normalized
+    finally:
+        close = getattr(response, "close", None)
+        if callable(close):
+            close()
 
 
 def extract_text(payload: Any) -> str:
@@ -6,6 +6,7 @@ from typing import Any
 
 import requests
 from flask import Flask
+from flaskr.common.http_client import PooledHTTPClient
 
 from .base import (
     AskProviderChunk,
@@ -22,6 +23,8 @@ from .common import (
 )
 from .consts import ASK_PROVIDER_COZE
 
+_http_client = PooledHTTPClient("coze")
+
 DEFAULT_COZE_BASE_URL = "https://api.coze.cn"
 
 
@@ -90,7 +93,7 @@ class CozeAskProviderAdapter:
         }
 
         try:
-            response = requests.post(
+            response = _http_client.post(
                 url,
                 headers=headers,
                 json=payload,
@@ -6,6 +6,7 @@ from typing import Any
 
 import requests
 from flask import Flask
+from flaskr.common.http_client import PooledHTTPClient
 
 from .base import (
     AskProviderChunk,
@@ -17,6 +18,8 @@ from .base import (
 from .common import extract_text, provider_timeout_seconds, raise_for_provider_response
 from .consts import ASK_PROVIDER_COZE_WORKFLOW
 
+_http_client = PooledHTTPClient("coze_workflow")
+
 DEFAULT_COZE_WORKFLOW_BASE_URL = "https://api.coze.cn"
 WORKFLOW_PATH = "/v1/workflow/run"
 WORKFLOW_CATEGORY_ORDER = (
@@ -225,7 +228,7 @@ class CozeWorkflowAskProviderAdapter:
         url = base_url.rstrip("/") + WORKFLOW_PATH
 
         try:
-            response = requests.post(
+            response = _http_client.post(
                 url,
                 headers=headers,
                 json=payload,
@@ -6,6 +6,7 @@ from typing import Any
 
 import requests
 from flask import Flask
+from flaskr.common.http_client import PooledHTTPClient
 
 from .base import (
     AskProviderChunk,
@@ -22,6 +23,8 @@ from .common import (
 )
 from .consts import ASK_PROVIDER_DIFY
 
+_http_client = PooledHTTPClient("dify")
+
 
 def _build_dify_query(user_query: str, messages: list[dict[str, Any]]) -> str:
     if not isinstance(messages, list) or not messages:
@@ -98,7 +101,7 @@ class DifyAskProviderAdapter:
         }
 
         try:
-            response = requests.post(
+            response = _http_client.post(
                 url,
                 headers=headers,
                 json=payload,
@@ -14,6 +14,7 @@ from typing import Any
 
 import requests
 from flask import Flask
+from flaskr.common.http_client import PooledHTTPClient
 from flaskr.i18n import _
 
 from .base import (
@@ -26,6 +27,8 @@ from .base import (
 from .common import extract_text, provider_timeout_seconds, raise_for_provider_response
 from .consts import ASK_PROVIDER_GET_BIJI_KNOWLEDGE
 
+_http_client = PooledHTTPClient("get_biji_knowledge")
+
 GET_BIJI_BASE_URL = "https://openapi.biji.com"
 GET_BIJI_KNOWLEDGE_RECALL_PATH = "/open/api/v1/resource/recall/knowledge"
 
@@ -158,7 +161,7 @@ class GetBijiKnowledgeAskProviderAdapter:
         }
 
         try:
-            response = requests.post(
+            response = _http_client.post(
                 f"{GET_BIJI_BASE_URL}{GET_BIJI_KNOWLEDGE_RECALL_PATH}",
                 headers=headers,
                 json=payload,
@@ -11,6 +11,7 @@ from urllib.parse import quote
 
 import requests
 from flask import Flask
+from flaskr.common.http_client import PooledHTTPClient
 
 from .base import (
     AskProviderChunk,
@@ -22,6 +23,8 @@ from .base import (
 from .common import extract_text, provider_timeout_seconds, raise_for_provider_response
 from .consts import ASK_PROVIDER_VOLC_KNOWLEDGE
 
+_http_client = PooledHTTPClient("volc_knowledge")
+
 
 def _hash_sha256(content: str) -> str:
     return hashlib.sha256(content.encode("utf-8")).hexdigest()
@@ -281,7 +284,7 @@ class VolcKnowledgeAskProviderAdapter:
         request_headers = {**unsigned_headers, **signed_headers}
 
         try:
-            response = requests.request(
+            response = _http_client.request(
                 method="POST",
                 url=f"{scheme}://{domain}{path}",
                 headers=request_headers,
@@ -37,6 +37,7 @@ from flaskr.common.shifu_context import (
 from flaskr.dao import cleanup_session_after, db, invalidate_session
 from flaskr.i18n import _, get_current_language, set_language
 from flaskr.service.common import raise_error, raise_error_with_args
+from flaskr.service.common.mdflow_cache import get_parsed_mdflow
 from flaskr.service.learn.check_text import check_text_with_llm_response
 from flaskr.service.learn.const import (
     INPUT_TYPE_ASK,
@@ -431,17 +432,23 @@ class MdflowContextV2:
     ) -> None:
         """Create MarkdownFlow with prompts and optional output-language handling.
 
-        Initializes MarkdownFlow with the document, provider, and configured prompts.
+        Takes a private copy of the cached parse of the document and applies
+        the provider and configured prompts to it.
         When learner-language output is enabled, resolves and applies the requested
         or fallback language.
         """
-        self._mdflow = MarkdownFlow(
-            document=document,
-            llm_provider=llm_provider,
-            document_prompt=document_prompt,
-            interaction_prompt=interaction_prompt,
-            interaction_error_prompt=interaction_error_prompt,
-        )
+        # The parsed document comes from the process-wide cache; the copy we
+        # get back is ours to configure for this step.
+        self._mdflow = get_parsed_mdflow(document, factory=MarkdownFlow)
+        if llm_provider is not None:
+            self._mdflow.set_llm_provider(llm_provider)
+        for prompt_type, prompt in (
+            ("document", document_prompt),
+            ("interaction", interaction_prompt),
+            ("interaction_error", interaction_error_prompt),
+        ):
+            if prompt is not None:
+                self._mdflow.set_prompt(prompt_type, prompt)
         # markdown_flow>=0.2.44 removed set_visual_mode; keep backward compatibility.
         set_visual_mode = getattr(self._mdflow, "set_visual_mode", None)
         if callable(set_visual_mode):
@@ -1761,6 +1768,7 @@ class RunScriptContextV2:
         try:
             from flaskr.common.config import get_config
             from flaskr.service.learn.learn_funcs import _resolve_runtime_tts_voice_id
+            from flaskr.service.tts.api import TTS_RPM_LANE_BULK
             from flaskr.service.tts.streaming_tts import StreamingTTSProcessor
             from flaskr.service.tts.validation import validate_tts_settings_strict
 
@@ -1827,6 +1835,7 @@ class RunScriptContextV2:
                 tts_model=validated.model,
                 stream_element_number=stream_element_number,
                 stream_element_type=stream_element_type,
+                rpm_lane=TTS_RPM_LANE_BULK if self._preview_mode else None,
             )
         except Exception as exc:
             self.app.logger.warning(
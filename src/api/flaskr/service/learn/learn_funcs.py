@@ -67,6 +67,7 @@ from flaskr.service.order.consts import (
     ORDER_STATUS_SUCCESS,
 )
 from flaskr.service.order.models import BannerInfo, Order
+from flaskr.service.shifu.api import get_published_struct
 from flaskr.service.shifu.consts import (
     UNIT_TYPE_VALUE_GUEST,
     UNIT_TYPE_VALUE_NORMAL,
@@ -76,7 +77,6 @@ from flaskr.service.shifu.models import (
     DraftOutlineItem,
     DraftShifu,
     LogDraftStruct,
-    LogPublishedStruct,
     PublishedOutlineItem,
     PublishedShifu,
 )
@@ -248,6 +248,24 @@ def _has_next_outline_item(
     return False
 
 
+def _get_latest_struct(
+    app: Flask, shifu_bid: str, preview_mode: bool
+) -> HistoryItem | None:
+    """Return the newest active struct; published ones come from the cache."""
+    if not preview_mode:
+        return get_published_struct(app, shifu_bid)
+    struct_info = (
+        LogDraftStruct.query.filter(
+            LogDraftStruct.shifu_bid == shifu_bid, LogDraftStruct.deleted == 0
+        )
+        .order_by(LogDraftStruct.id.desc())
+        .first()
+    )
+    if not struct_info:
+        return None
+    return HistoryItem.from_json(struct_info.struct)
+
+
 def get_shifu_info(app: Flask, shifu_bid: str, preview_mode: bool) -> LearnShifuInfoDTO:
     """Return shifu info."""
     with app.app_context():
@@ -287,11 +305,9 @@ def get_outline_item_tree(
         is_paid = preview_mode
         if preview_mode:
             outline_item_model = DraftOutlineItem
-            struct_model = LogDraftStruct
             shifu_model = DraftShifu
         else:
             outline_item_model = PublishedOutlineItem
-            struct_model = LogPublishedStruct
             shifu_model = PublishedShifu
         if not is_paid:
             shifu = (
@@ -313,16 +329,9 @@ def get_outline_item_tree(
                 .first()
             )
             is_paid = bool(buy_record)
-        struct = (
-            struct_model.query.filter(
-                struct_model.shifu_bid == shifu_bid, struct_model.deleted == 0
-            )
-            .order_by(struct_model.id.desc())
-            .first()
-        )
+        struct = _get_latest_struct(app, shifu_bid, preview_mode)
         if not struct:
             raise_error("server.shifu.shifuStructNotFound")
-        struct = HistoryItem.from_json(struct.struct)
         outline_items: list[HistoryItem] = []
         q = queue.Queue()
         q.put(struct)
@@ -524,18 +533,10 @@ def get_learn_record(
                             request.user.mobile
                         ):
                             records.remove(last_record)
-        struct_model = LogDraftStruct if preview_mode else LogPublishedStruct
         outline_item_model = DraftOutlineItem if preview_mode else PublishedOutlineItem
         has_next_outline = False
-        struct_info = (
-            struct_model.query.filter(
-                struct_model.shifu_bid == shifu_bid, struct_model.deleted == 0
-            )
-            .order_by(struct_model.id.desc())
-            .first()
-        )
-        if struct_info:
-            struct = HistoryItem.from_json(struct_info.struct)
+        struct = _get_latest_struct(app, shifu_bid, preview_mode)
+        if struct:
             outline_bids = _collect_outline_bids(struct)
             if outline_bids:
                 outline_items = outline_item_model.query.filter(
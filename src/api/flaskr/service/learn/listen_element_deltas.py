@@ -0,0 +1,93 @@
+"""Rewrite streamed text element patches as appended-suffix deltas.
+
+Every streamed text chunk used to put the element's whole ``content`` snapshot
+on the wire, so a long paragraph cost quadratic bytes and serialization time.
+Clients that send ``element_delta: true`` on the run request receive text
+patches whose previous content is a prefix of the new content as
+``change_type="diff"`` messages: ``content`` carries only the appended suffix
+and ``content_offset`` the UTF-16 length of the content it appends to, which
+is what browser clients compare against ``String.length``.
+
+Only the wire changes. The run adapter still builds, persists and replays full
+snapshots, so reconnects and record reads are unaffected. A patch that does
+not extend the last sent content (a rewrite, or the first message of an
+element on this stream) is forwarded unchanged as a full snapshot. Streamed
+text snapshots are sent with ``is_new=True`` and upserted by ``element_bid``,
+so deltas are keyed by ``element_bid`` and always go out as patches
+(``is_new=False`` with ``target_element_bid`` set).
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from flaskr.service.learn.learn_dtos import (
+    ElementChangeType,
+    ElementDTO,
+    ElementType,
+    RunElementSSEMessageDTO,
+)
+
+
+def _utf16_length(text: str) -> int:
+    if text.isascii():
+        return len(text)
+    return len(text.encode("utf-16-le")) // 2
+
+
+@dataclass(slots=True)
+class _SentText:
+    content: str
+    utf16_length: int
+
+
+class ElementDeltaTracker:
+    """Track the text sent per element on one stream and emit suffix deltas."""
+
+    def __init__(self) -> None:
+        """Start with no element content sent."""
+        self._sent: dict[str, _SentText] = {}
+        self.full_messages = 0
+        self.delta_messages = 0
+
+    def apply(self, payload: object) -> object:
+        """Return ``payload``, or its JSON delta form when it extends sent text.
+
+        Deltas are returned as the message's ``__json__`` data with the element
+        rewritten in place, which skips copying the DTOs and is what the SSE
+        frame encoder would have produced from them anyway.
+        """
+        if not isinstance(payload, RunElementSSEMessageDTO):
+            return payload
+        element = payload.content
+        if (
+            not isinstance(element, ElementDTO)
+            or element.element_type != ElementType.TEXT
+        ):
+            return payload
+
+        content = element.content or ""
+        sent = self._sent.get(element.element_bid)
+        if (
+            sent is None
+            or len(content) < len(sent.content)
+            or not content.startswith(sent.content)
+        ):
+            self._sent[element.element_bid] = _SentText(
+                content=content, utf16_length=_utf16_length(content)
+            )
+            self.full_messages += 1
+            return payload
+
+        suffix = content[len(sent.content) :]
+        data = payload.__json__()
+        element_data = data["content"]
+        element_data["content"] = suffix
+        element_data["content_offset"] = sent.utf16_length
+        element_data["change_type"] = ElementChangeType.DIFF.value
+        element_data["is_new"] = False
+        element_data["target_element_bid"] = element.element_bid
+        sent.content = content
+        sent.utf16_length += _utf16_length(suffix)
+        self.delta_messages += 1
+        return data
@@ -373,6 +373,7 @@ def _emit_content_group(
         ).set_mdflow_stream_parts([(item.content, item.type, item.number)])
         messages.extend(list(adapter._handle_content(event)))
     messages.extend(list(adapter._finalize_block(block.generated_block_bid or "")))
+    adapter.flush_element_writes()
     return messages
 
 
@@ -386,7 +387,9 @@ def _emit_interaction_group(
         type=GeneratedType.INTERACTION,
         content=str(block.block_content_conf or ""),
     )
-    return list(adapter._handle_interaction(event))
+    messages = list(adapter._handle_interaction(event))
+    adapter.flush_element_writes()
+    return messages
 
 
 def _emit_follow_up_group(
@@ -421,6 +424,7 @@ def _emit_follow_up_group(
     if final_answer is not None:
         messages.append(final_answer)
     adapter._block_states.pop(generated_block_bid, None)
+    adapter.flush_element_writes()
     return messages
 
 
@@ -29,6 +29,7 @@ from flaskr.service.learn.listen_element_rows import _element_from_row
 from flaskr.service.learn.listen_element_run_state import (
     BlockMeta,
     BlockState,
+    ElementWriteStats,
 )
 from flaskr.service.learn.listen_element_types import (
     _element_type_code,
@@ -243,28 +244,72 @@ class ListenElementRunPersistenceMixin:
         *,
         generated_block_bid: str,
         element_bids: list[str],
-    ) -> None:
+    ) -> int:
         row_ids = self._find_active_element_row_ids(
             generated_block_bid=generated_block_bid,
             element_bids=element_bids,
         )
         if not row_ids:
+            return 0
+
+        # Retire rows in one statement over the sorted primary keys so
+        # concurrent transactions lock the same historical rows in a
+        # deterministic sequence.
+        LearnGeneratedElement.query.filter(
+            LearnGeneratedElement.id.in_(row_ids),
+            LearnGeneratedElement.deleted == 0,
+            LearnGeneratedElement.status == 1,
+        ).update(
+            {
+                "status": 0,
+            },
+            synchronize_session=False,
+        )
+        db.session.flush()
+        return len(row_ids)
+
+    def _retire_element_rows(
+        self,
+        *,
+        generated_block_bid: str,
+        element_bids: list[str],
+    ) -> None:
+        """Queue retirement of the active rows for ``element_bids``.
+
+        Rows still waiting in the write buffer are switched off in memory;
+        rows flushed earlier are retired by the next ``flush_element_writes``.
+        """
+        normalized_bids = {str(bid) for bid in element_bids if bid}
+        if not normalized_bids:
             return
+        self._element_writes.retire(generated_block_bid or "", normalized_bids)
 
-        # Update rows in primary-key order so concurrent transactions retire the
-        # same historical rows in a deterministic sequence.
-        for row_id in row_ids:
-            LearnGeneratedElement.query.filter(
-                LearnGeneratedElement.id == row_id,
-                LearnGeneratedElement.deleted == 0,
-                LearnGeneratedElement.status == 1,
-            ).update(
-                {
-                    "status": 0,
-                },
-                synchronize_session=False,
+    def flush_element_writes(self) -> None:
+        """Write buffered element rows and retirements in bulk statements.
+
+        Retirements run first and only touch rows flushed before this call;
+        buffered rows already carry their final status. Rows are then inserted
+        in emission order, so ids, ``run_event_seq`` and ``sequence_number``
+        keep the order the client saw.
+        """
+        buffer = self._element_writes
+        rows, retired_bids = buffer.take()
+        if not rows and not retired_bids:
+            return
+        for generated_block_bid, element_bids in retired_bids.items():
+            buffer.deactivated_rows += self._deactivate_active_element_rows(
+                generated_block_bid=generated_block_bid,
+                element_bids=sorted(element_bids),
             )
-        db.session.flush()
+        if rows:
+            db.session.bulk_save_objects(rows)
+            db.session.flush()
+            buffer.inserted_rows += len(rows)
+        buffer.flushes += 1
+
+    def get_element_write_stats(self) -> ElementWriteStats:
+        """Return flush and row counters for this run's element writes."""
+        return self._element_writes.stats()
 
     def _insert_row(
         self,
@@ -329,8 +374,7 @@ class ListenElementRunPersistenceMixin:
             deleted=0,
             status=1,
         )
-        db.session.add(row)
-        db.session.flush()
+        self._element_writes.add_row(row)
 
     def _element_message(self, element: ElementDTO) -> RunElementSSEMessageDTO:
         self._persist_element(element)
@@ -385,7 +429,7 @@ class ListenElementRunPersistenceMixin:
         base_element_bid = self._prepare_runtime_element(element)
         replace_same_element_bid = bool(element.is_new and element.element_bid)
         if (not element.is_new) or replace_same_element_bid:
-            self._deactivate_active_element_rows(
+            self._retire_element_rows(
                 generated_block_bid=element.generated_block_bid,
                 element_bids=[base_element_bid],
             )
@@ -560,6 +604,7 @@ class ListenElementRunPersistenceMixin:
         )
         if in_memory_snapshot is not None:
             return in_memory_snapshot.model_copy(deep=True)
+        self.flush_element_writes()
         row = (
             LearnGeneratedElement.query.filter(
                 LearnGeneratedElement.run_session_bid == self.run_session_bid,
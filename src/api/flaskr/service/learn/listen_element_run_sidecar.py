@@ -353,6 +353,8 @@ class ListenElementRunSidecarMixin:
             # this anchor didn't come from a real LearnGeneratedElement row.
             ask_element.payload.anchor_element_bid = anchor_bid
         yield self._element_message(ask_element)
+        # The question opens a follow-up block, which is a write boundary.
+        self.flush_element_writes()
 
     def _finalize_answer_element(
         self, generated_block_bid: str
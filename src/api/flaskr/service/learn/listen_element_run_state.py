@@ -4,13 +4,16 @@ from __future__ import annotations
 
 from collections import OrderedDict
 from dataclasses import dataclass, field
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 from flaskr.service.learn.learn_dtos import (
     ElementAudioDTO,
     ElementType,
 )
 
+if TYPE_CHECKING:
+    from flaskr.service.learn.models import LearnGeneratedElement
+
 
 def _mdflow_new_stream_is_new(element_type: ElementType) -> bool:
     return element_type != ElementType.DIFF
@@ -33,7 +36,14 @@ class StreamElementState:
     element_index: int
     element_type: ElementType
     stream_type: str = ""
-    content_text: str = ""
+    # Every chunk is followed by a snapshot carrying the full text, so the
+    # text is kept ready to read rather than joined from chunks on each read.
+    content_text: str = field(default="", repr=False)
+
+    def append_content(self, chunk: str) -> None:
+        """Append one streamed chunk to the element text."""
+        if chunk:
+            self.content_text += chunk
 
 
 @dataclass
@@ -41,7 +51,7 @@ class BlockState:
     """Track buffered content for one MarkdownFlow block."""
 
     generated_block_bid: str
-    raw_content: str = ""
+    raw_content_chunks: list[str] = field(default_factory=list, repr=False)
     audio_by_position: dict[int, ElementAudioDTO] = field(default_factory=dict)
     live_audio_by_position: dict[int, ElementAudioDTO] = field(default_factory=dict)
     audio_segments_by_position: dict[int, list[dict[str, Any]]] = field(
@@ -58,3 +68,96 @@ class BlockState:
     )
     active_stream_element_key_by_number: dict[int, str] = field(default_factory=dict)
     last_stream_element_key: str | None = None
+    # Text of the first ``_joined_chunk_count`` chunks, extended on read.
+    _joined_text: str = field(default="", init=False, repr=False, compare=False)
+    _joined_chunk_count: int = field(default=0, init=False, repr=False, compare=False)
+
+    @property
+    def raw_content(self) -> str:
+        """Return the raw block content streamed so far.
+
+        Formatted streams only read the block content when it is finalized,
+        while ask and fallback streams read it after every chunk, so each read
+        joins only the chunks appended since the previous one.
+        """
+        if self._joined_chunk_count < len(self.raw_content_chunks):
+            self._joined_text += "".join(
+                self.raw_content_chunks[self._joined_chunk_count :]
+            )
+            self._joined_chunk_count = len(self.raw_content_chunks)
+        return self._joined_text
+
+    def append_raw_content(self, chunk: str) -> None:
+        """Append one streamed chunk to the raw block content."""
+        if chunk:
+            self.raw_content_chunks.append(chunk)
+
+
+@dataclass(frozen=True)
+class ElementWriteStats:
+    """Summarize buffered element writes for one run."""
+
+    flushes: int
+    inserted_rows: int
+    deactivated_rows: int
+    pending_rows: int
+
+
+@dataclass
+class ElementWriteBuffer:
+    """Hold element rows and retirements until the next bulk flush.
+
+    ``active_rows`` indexes pending rows that are still active by
+    ``(generated_block_bid, element_bid)`` and by their target bid, so a
+    retirement can switch them off in memory instead of issuing an UPDATE.
+    ``retired_bids`` collects bids per block whose already-flushed rows must
+    be retired by the next flush.
+    """
+
+    rows: list[LearnGeneratedElement] = field(default_factory=list)
+    active_rows: dict[tuple[str, str], list[LearnGeneratedElement]] = field(
+        default_factory=dict
+    )
+    retired_bids: dict[str, set[str]] = field(default_factory=dict)
+    flushes: int = 0
+    inserted_rows: int = 0
+    deactivated_rows: int = 0
+
+    def add_row(self, row: LearnGeneratedElement) -> None:
+        """Queue ``row`` for insertion in emission order."""
+        self.rows.append(row)
+        if row.event_type != "element" or not row.status:
+            return
+        for bid in {row.element_bid, row.target_element_bid}:
+            if bid:
+                self.active_rows.setdefault((row.generated_block_bid, bid), []).append(
+                    row
+                )
+
+    def retire(self, generated_block_bid: str, element_bids: set[str]) -> None:
+        """Deactivate pending rows now and remember the bids for flushed rows."""
+        for bid in element_bids:
+            for row in self.active_rows.pop((generated_block_bid, bid), ()):
+                if row.status:
+                    row.status = 0
+                    self.deactivated_rows += 1
+        self.retired_bids.setdefault(generated_block_bid, set()).update(element_bids)
+
+    def take(
+        self,
+    ) -> tuple[list[LearnGeneratedElement], dict[str, set[str]]]:
+        """Return and clear everything queued since the last flush."""
+        rows, retired_bids = self.rows, self.retired_bids
+        self.rows = []
+        self.active_rows = {}
+        self.retired_bids = {}
+        return rows, retired_bids
+
+    def stats(self) -> ElementWriteStats:
+        """Return the counters for this run."""
+        return ElementWriteStats(
+            flushes=self.flushes,
+            inserted_rows=self.inserted_rows,
+            deactivated_rows=self.deactivated_rows,
+            pending_rows=len(self.rows),
+        )
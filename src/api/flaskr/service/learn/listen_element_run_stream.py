@@ -249,7 +249,7 @@ class ListenElementRunStreamMixin:
     ) -> Generator[RunElementSSEMessageDTO, None, None]:
         if not state.fallback_element_bid:
             return
-        self._deactivate_active_element_rows(
+        self._retire_element_rows(
             generated_block_bid=state.generated_block_bid,
             element_bids=[state.fallback_element_bid],
         )
@@ -363,6 +363,7 @@ class ListenElementRunStreamMixin:
         return _resolve_audio_target_element_bid(state, position)
 
     def _backfill_audio_url(self, element_bid: str, audio_url: str) -> None:
+        self.flush_element_writes()
         LearnGeneratedElement.query.filter(
             LearnGeneratedElement.run_session_bid == self.run_session_bid,
             LearnGeneratedElement.element_bid == element_bid,
@@ -458,7 +459,7 @@ class ListenElementRunStreamMixin:
         for chunk_content, stream_type, stream_number in parts:
             if not chunk_content:
                 continue
-            state.raw_content += chunk_content
+            state.append_raw_content(chunk_content)
             previous_active_key = state.last_stream_element_key
             normalized_stream_type = (stream_type or "").strip().lower()
             active_key = state.active_stream_element_key_by_number.get(stream_number)
@@ -502,7 +503,7 @@ class ListenElementRunStreamMixin:
                 state.active_stream_element_key_by_number[stream_number] = stream_key
                 active_key = stream_key
             is_new = _mdflow_new_stream_is_new(stream_element_type)
-            stream_state.content_text += chunk_content
+            stream_state.append_content(chunk_content)
             pending_audio = None
             pending_audio_segments = None
             if is_new:
@@ -541,7 +542,7 @@ class ListenElementRunStreamMixin:
         if not state.stream_elements:
             return
         target_bids = [item.element_bid for item in state.stream_elements.values()]
-        self._deactivate_active_element_rows(
+        self._retire_element_rows(
             generated_block_bid=state.generated_block_bid,
             element_bids=target_bids,
         )
@@ -594,7 +595,7 @@ class ListenElementRunStreamMixin:
         )
         if ask_element_bid:
             state = self._ensure_block_state(generated_block_bid)
-            state.raw_content += str(event.content or "")
+            state.append_raw_content(str(event.content or ""))
             answer_element = self._build_answer_element_from_state(
                 generated_block_bid,
                 is_final=False,
@@ -608,7 +609,7 @@ class ListenElementRunStreamMixin:
             yield from self._handle_formatted_content(event, formatted_parts)
             return
         state = self._ensure_block_state(generated_block_bid)
-        state.raw_content += str(event.content or "")
+        state.append_raw_content(str(event.content or ""))
         meta = self._load_block_meta(generated_block_bid)
         yield self._element_message(self._build_fallback_element(state, meta.role))
 
@@ -28,6 +28,7 @@ from flaskr.service.learn.listen_element_run_persistence import (
 from flaskr.service.learn.listen_element_run_sidecar import (
     ListenElementRunSidecarMixin,
 )
+from flaskr.service.learn.listen_element_run_state import ElementWriteBuffer
 from flaskr.service.learn.listen_element_run_stream import (
     ListenElementRunStreamMixin,
 )
@@ -73,7 +74,9 @@ class ListenElementRunAdapter(
 
         Uses the supplied run session ID or generates one, resets event and element
         sequence counters, and initializes the type state machine and element
-        tracking caches used by persisted and streamed events.
+        tracking caches used by persisted and streamed events. Element rows are
+        buffered per run and written in bulk at block boundaries and when the
+        event stream ends.
         """
         self.app = app
         self.shifu_bid = shifu_bid
@@ -93,6 +96,7 @@ class ListenElementRunAdapter(
         self._ask_element_bid_by_block_bid: dict[str, str] = {}
         self._answer_element_bid_by_block_bid: dict[str, str] = {}
         self._latest_element_snapshots: dict[str, object] = {}
+        self._element_writes = ElementWriteBuffer()
 
     def process(
         self, events: Iterable[RunMarkdownFlowDTO]
@@ -114,6 +118,7 @@ class ListenElementRunAdapter(
                 continue
             if event.type == GeneratedType.INTERACTION:
                 yield from self._handle_interaction(event)
+                self.flush_element_writes()
                 continue
             if event.type == GeneratedType.BREAK:
                 generated_block_bid = event.generated_block_bid or ""
@@ -142,6 +147,7 @@ class ListenElementRunAdapter(
                     generated_block_bid=generated_block_bid,
                     is_terminal=False,
                 )
+                self.flush_element_writes()
                 continue
             if event.type == GeneratedType.DONE:
                 for block_id in list(self._block_states.keys()):
@@ -155,6 +161,7 @@ class ListenElementRunAdapter(
                     generated_block_bid=event.generated_block_bid or "",
                     is_terminal=True,
                 )
+                self.flush_element_writes()
                 continue
             if event.type == GeneratedType.VARIABLE_UPDATE:
                 yield self._non_element_message(
@@ -170,6 +177,7 @@ class ListenElementRunAdapter(
                     generated_block_bid=event.generated_block_bid or "",
                 )
                 continue
+        self.flush_element_writes()
 
 
 def get_listen_element_record(
@@ -41,7 +41,11 @@ from flaskr.service.learn.preview_permissions import (
     require_shifu_preview_permission,
     resolve_preview_request_user,
 )
-from flaskr.service.learn.runscript_v2 import get_run_status, run_script
+from flaskr.service.learn.runscript_v2 import (
+    get_run_status,
+    resume_run_script,
+    run_script,
+)
 from flaskr.service.metering.consts import (
     BILL_USAGE_SCENE_PREVIEW,
     BILL_USAGE_SCENE_PROD,
@@ -75,6 +79,15 @@ def _normalize_user_input(value):
     return {"user_input": [str(value)]}
 
 
+def _payload_flag(payload: dict, key: str) -> bool:
+    raw = payload.get(key, False)
+    if isinstance(raw, str):
+        return raw.strip().lower() == "true"
+    if raw is None:
+        return False
+    return bool(raw)
+
+
 def _to_sse_data_line(message) -> str:
     payload = message.__json__() if hasattr(message, "__json__") else message
     return "data: " + json.dumps(payload, ensure_ascii=False) + "\n\n"
@@ -359,6 +372,14 @@ def register_learn_routes(app: Flask, path_prefix: str = "/api/learn") -> Flask:
                         type: boolean
                         required: false
                         description: Whether to enable segmented listen-mode TTS during learning (default: false)
+                    element_delta:
+                        type: boolean
+                        required: false
+                        description: Stream text element patches as appended suffixes with content_offset (default: false)
+                    resumable:
+                        type: boolean
+                        required: false
+                        description: Tag frames with SSE ids and keep generating briefly after a disconnect so the stream can be resumed (default: false)
                     reload_generated_block_bid:
                         type: string
                         required: false
@@ -366,6 +387,11 @@ def register_learn_routes(app: Flask, path_prefix: str = "/api/learn") -> Flask:
               name: preview_mode
               type: string
               required: false
+            - in: header
+              name: Last-Event-ID
+              type: string
+              required: false
+              description: Resume a resumable run after this event id instead of starting a new run
         responses:
             200:
                 description: run the MarkdownFlow of the outline success
@@ -380,13 +406,9 @@ def register_learn_routes(app: Flask, path_prefix: str = "/api/learn") -> Flask:
         input_type = payload.get("input_type", None)
         reload_generated_block_bid = payload.get("reload_generated_block_bid", None)
         reload_element_bid = payload.get("reload_element_bid", None)
-        listen_raw = payload.get("listen", False)
-        if isinstance(listen_raw, str):
-            listen = listen_raw.strip().lower() == "true"
-        elif listen_raw is None:
-            listen = False
-        else:
-            listen = bool(listen_raw)
+        listen = _payload_flag(payload, "listen")
+        element_delta = _payload_flag(payload, "element_delta")
+        resumable = _payload_flag(payload, "resumable")
         preview_mode = request.args.get("preview_mode", "False")
         app.logger.info(
             "run outline item, shifu_bid: %s, outline_bid: %s, preview_mode: %s, listen: %s",
@@ -398,6 +420,17 @@ def register_learn_routes(app: Flask, path_prefix: str = "/api/learn") -> Flask:
         preview_mode = preview_mode.lower() == "true"
         if preview_mode:
             require_shifu_preview_permission(app, user_bid, shifu_bid)
+        resumed_stream = resume_run_script(
+            app, outline_bid, user_bid, request.headers.get("Last-Event-ID")
+        )
+        if resumed_stream is not None:
+            # Replaying an admitted run generates nothing new.
+            return _stream_passthrough_response(
+                app,
+                message_iter_factory=lambda: resumed_stream,
+                close_log="client closed resumed learn runtime stream early",
+                error_log="resume outline item run failed",
+            )
         _admit_creator_usage_for_shifu(
             shifu_bid,
             BILL_USAGE_SCENE_PREVIEW if preview_mode else BILL_USAGE_SCENE_PROD,
@@ -423,6 +456,8 @@ def register_learn_routes(app: Flask, path_prefix: str = "/api/learn") -> Flask:
                 preview_mode=preview_mode,
                 shifu_context_snapshot=shifu_context_snapshot,
                 language=request_language,
+                element_delta=element_delta,
+                resumable=resumable,
             ),
             close_log="client closed learn runtime stream early",
             error_log="run outline item failed",
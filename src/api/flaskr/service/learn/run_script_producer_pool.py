@@ -0,0 +1,141 @@
+"""Bound the background producers that feed run_script SSE streams.
+
+Every learner stream needs one producer that drives the lesson generator while
+the request thread relays its output. Producers spend most of their time in
+LLM network waits, so instead of one fresh OS thread per stream they run on a
+process-wide pool whose size is fixed by ``RUN_SCRIPT_PRODUCER_POOL_SIZE``.
+Admission is decided before submission: a stream that finds every worker busy
+is rejected immediately rather than queued behind running lessons, so the
+caller can tell the learner to retry.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from flaskr.common.observability import record_run_script_producer_pool
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from flask import Flask
+
+DEFAULT_RUN_SCRIPT_PRODUCER_POOL_SIZE = 256
+_PRODUCER_THREAD_NAME_PREFIX = "run_script_stream_producer"
+
+
+# Created lazily and rebuilt per pid for the same reason as the TTS executor:
+# an executor inherited from the gunicorn preload master carries
+# gevent-patched internals bound to the parent's hub.
+@dataclass(slots=True)
+class _ProducerPoolState:
+    executor: ThreadPoolExecutor | None = None
+    pid: int | None = None
+    capacity: int = 0
+    active: int = 0
+    rejected: int = 0
+
+
+@dataclass(frozen=True, slots=True)
+class RunScriptProducerPoolStats:
+    """Point-in-time occupancy of the run_script producer pool."""
+
+    capacity: int
+    active: int
+    rejected: int
+
+
+_producer_pool_state = _ProducerPoolState()
+_producer_pool_lock = threading.Lock()
+
+
+def _get_pool_size(app: Flask) -> int:
+    try:
+        size = int(
+            app.config.get(
+                "RUN_SCRIPT_PRODUCER_POOL_SIZE",
+                DEFAULT_RUN_SCRIPT_PRODUCER_POOL_SIZE,
+            )
+        )
+    except (TypeError, ValueError):
+        return DEFAULT_RUN_SCRIPT_PRODUCER_POOL_SIZE
+    return max(1, size)
+
+
+def _ensure_executor(app: Flask) -> ThreadPoolExecutor:
+    """Return this process's executor; the caller must hold the pool lock."""
+    current_pid = os.getpid()
+    state = _producer_pool_state
+    if state.executor is None or state.pid != current_pid:
+        state.capacity = _get_pool_size(app)
+        state.executor = ThreadPoolExecutor(
+            max_workers=state.capacity,
+            thread_name_prefix=_PRODUCER_THREAD_NAME_PREFIX,
+        )
+        state.pid = current_pid
+        state.active = 0
+        state.rejected = 0
+    return state.executor
+
+
+def _release_slot() -> None:
+    with _producer_pool_lock:
+        state = _producer_pool_state
+        state.active = max(0, state.active - 1)
+        active, capacity = state.active, state.capacity
+    record_run_script_producer_pool(active=active, capacity=capacity)
+
+
+def _run_and_release(producer: Callable[[], None]) -> None:
+    try:
+        producer()
+    finally:
+        _release_slot()
+
+
+def submit_run_script_producer(
+    app: Flask, producer: Callable[[], None]
+) -> Future | None:
+    """Run ``producer`` on the shared pool, or return None when it is full.
+
+    A slot is reserved before submission and released when the producer
+    returns, so the executor never queues work: either a worker picks the
+    producer up right away or the stream is rejected.
+    """
+    with _producer_pool_lock:
+        executor = _ensure_executor(app)
+        state = _producer_pool_state
+        admitted = state.active < state.capacity
+        if admitted:
+            state.active += 1
+        else:
+            state.rejected += 1
+        active, capacity = state.active, state.capacity
+    record_run_script_producer_pool(
+        active=active, capacity=capacity, rejected=not admitted
+    )
+    if not admitted:
+        return None
+
+    try:
+        return executor.submit(_run_and_release, producer)
+    except Exception:
+        _release_slot()
+        raise
+
+
+def get_run_script_producer_pool_stats() -> RunScriptProducerPoolStats:
+    """Return the current producer pool occupancy for this process."""
+    with _producer_pool_lock:
+        state = _producer_pool_state
+        if state.pid != os.getpid():
+            return RunScriptProducerPoolStats(capacity=0, active=0, rejected=0)
+        return RunScriptProducerPoolStats(
+            capacity=state.capacity,
+            active=state.active,
+            rejected=state.rejected,
+        )
@@ -0,0 +1,347 @@
+"""Keep a bounded replay buffer of lesson stream frames in the cache provider.
+
+Runs requested with ``resumable: true`` tag every SSE frame with an
+``id: <stream_id>:<seq>`` line and write it into a ring of
+``RUN_STREAM_REPLAY_BUFFER_SIZE`` slots. When the client drops, ``run_script``
+keeps consuming the producer for ``RUN_STREAM_RESUME_GRACE_SECONDS`` (longer
+while a reconnected reader is attached) instead of stopping generation, so a
+reconnect that sends ``Last-Event-ID`` replays the missed frames and then
+follows the live run rather than regenerating the block with the LLM.
+
+The buffer lives in the shared cache provider, so a reconnect may land on a
+different worker. Keys are scoped by user and outline, so a learner can only
+resume their own streams. Every slot stores its sequence number, so a frame
+costs a single cache write: the stream's meta record (head, state, liveness)
+is only refreshed about once a second, and readers walk the slots past the
+recorded head until they reach one that was not written yet. A reader that
+asks for frames already overwritten by the ring sees an incomplete read and
+falls back to a regular run.
+
+Cache failures never break the live stream: writes log a warning and the
+affected frames simply become unavailable for replay.
+"""
+
+from __future__ import annotations
+
+import time
+import uuid
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from flaskr.common.cache_provider import cache as cache_provider
+
+if TYPE_CHECKING:
+    from collections.abc import Generator
+
+    from flask import Flask
+
+RUN_STREAM_STATE_RUNNING = "running"
+RUN_STREAM_STATE_DONE = "done"
+_EVENT_ID_SEPARATOR = ":"
+_SSE_ID_PREFIX = "id: "
+_DEFAULT_BUFFER_SIZE = 512
+_DEFAULT_GRACE_SECONDS = 30
+# Long enough to outlive a run holding the run_script lock; refreshed on
+# every write.
+_BUFFER_TTL_SECONDS = 5 * 60
+# Writers refresh the meta record (head and liveness) at most this often.
+_WRITER_TOUCH_INTERVAL_SECONDS = 1.0
+# Slots fetched per MGET while replaying or following a stream.
+_READ_BATCH_SIZE = 64
+
+
+def get_run_stream_replay_buffer_size(app: Flask) -> int:
+    """Return the configured number of replayable frames per stream."""
+    try:
+        size = int(app.config.get("RUN_STREAM_REPLAY_BUFFER_SIZE", 0))
+    except (TypeError, ValueError):
+        size = 0
+    return size if size > 0 else _DEFAULT_BUFFER_SIZE
+
+
+def get_run_stream_resume_grace_seconds(app: Flask) -> float:
+    """Return how long a detached stream keeps running without a reader."""
+    try:
+        grace = float(
+            app.config.get("RUN_STREAM_RESUME_GRACE_SECONDS", _DEFAULT_GRACE_SECONDS)
+        )
+    except (TypeError, ValueError):
+        grace = _DEFAULT_GRACE_SECONDS
+    return max(grace, 0.0)
+
+
+def format_run_stream_event_id(stream_id: str, seq: int) -> str:
+    """Return the SSE event id for frame ``seq`` of ``stream_id``."""
+    return f"{stream_id}{_EVENT_ID_SEPARATOR}{int(seq)}"
+
+
+def parse_run_stream_event_id(raw: str | None) -> tuple[str, int] | None:
+    """Return ``(stream_id, seq)`` from a ``Last-Event-ID`` value, or None."""
+    if not raw:
+        return None
+    stream_id, separator, raw_seq = str(raw).strip().rpartition(_EVENT_ID_SEPARATOR)
+    if not separator or not stream_id:
+        return None
+    try:
+        seq = int(raw_seq)
+    except ValueError:
+        return None
+    if seq < 0:
+        return None
+    return stream_id, seq
+
+
+@dataclass(frozen=True, slots=True)
+class RunStreamReplayRead:
+    """Frames read after a sequence number, with the stream's state."""
+
+    frames: list[str]
+    last_seq: int
+    done: bool
+    complete: bool
+    writer_alive: bool
+
+
+def _decode(raw: object) -> str | None:
+    if raw is None:
+        return None
+    if isinstance(raw, bytes):
+        return raw.decode("utf-8", errors="replace")
+    return str(raw)
+
+
+def _parse_slot(raw: object) -> tuple[int | None, str]:
+    """Return ``(seq, frame)`` stored in a ring slot; seq is None when empty."""
+    raw_seq, _, frame = (_decode(raw) or "").partition("\n")
+    try:
+        return int(raw_seq), frame
+    except ValueError:
+        return None, ""
+
+
+class RunStreamReplayBuffer:
+    """Ring buffer of one run's SSE frames stored in the cache provider."""
+
+    def __init__(
+        self,
+        app: Flask,
+        *,
+        user_bid: str,
+        outline_bid: str,
+        stream_id: str,
+        capacity: int,
+        grace_seconds: float,
+    ) -> None:
+        """Bind the buffer of ``stream_id``; use ``create``/``attach`` instead."""
+        self.app = app
+        self.stream_id = stream_id
+        self.capacity = max(int(capacity), 1)
+        self.grace_seconds = grace_seconds
+        prefix = str(app.config.get("REDIS_KEY_PREFIX") or "")
+        self._key_base = f"{prefix}:run_stream:{user_bid}:{outline_bid}:{stream_id}"
+        self._seq = 0
+        self._state = RUN_STREAM_STATE_RUNNING
+        self._last_touch = 0.0
+
+    @classmethod
+    def create(
+        cls, app: Flask, *, user_bid: str, outline_bid: str
+    ) -> RunStreamReplayBuffer:
+        """Start an empty buffer for a new resumable run."""
+        buffer = cls(
+            app,
+            user_bid=user_bid,
+            outline_bid=outline_bid,
+            stream_id=uuid.uuid4().hex,
+            capacity=get_run_stream_replay_buffer_size(app),
+            grace_seconds=get_run_stream_resume_grace_seconds(app),
+        )
+        buffer._write_meta()
+        return buffer
+
+    @classmethod
+    def attach(
+        cls, app: Flask, *, user_bid: str, outline_bid: str, stream_id: str
+    ) -> RunStreamReplayBuffer | None:
+        """Return the buffer of an existing stream, or None when it expired."""
+        buffer = cls(
+            app,
+            user_bid=user_bid,
+            outline_bid=outline_bid,
+            stream_id=stream_id,
+            capacity=get_run_stream_replay_buffer_size(app),
+            grace_seconds=get_run_stream_resume_grace_seconds(app),
+        )
+        if buffer._read_meta() is None:
+            return None
+        return buffer
+
+    def _meta_key(self) -> str:
+        return f"{self._key_base}:meta"
+
+    def _reader_key(self) -> str:
+        return f"{self._key_base}:reader"
+
+    def _slot_key(self, seq: int) -> str:
+        return f"{self._key_base}:event:{seq % self.capacity}"
+
+    def _warn(self, action: str, exc: Exception) -> None:
+        self.app.logger.warning(
+            "run stream replay %s failed: stream_id=%s error=%s",
+            action,
+            self.stream_id,
+            repr(exc),
+        )
+
+    def _write_meta(self) -> None:
+        now = time.time()
+        try:
+            cache_provider.setex(
+                self._meta_key(),
+                _BUFFER_TTL_SECONDS,
+                f"{self._seq} {self._state} {now:.3f}",
+            )
+        except Exception as exc:
+            self._warn("meta write", exc)
+        self._last_touch = time.monotonic()
+
+    def _read_meta(self) -> tuple[int, str, float] | None:
+        try:
+            raw = _decode(cache_provider.get(self._meta_key()))
+        except Exception as exc:
+            self._warn("meta read", exc)
+            return None
+        if not raw:
+            return None
+        try:
+            raw_seq, state, raw_updated_at = raw.split(" ", 2)
+            return int(raw_seq), state, float(raw_updated_at)
+        except ValueError:
+            return None
+
+    def append(self, frame: str) -> str:
+        """Store ``frame`` and return it prefixed with its SSE ``id:`` line."""
+        self._seq += 1
+        tagged = (
+            f"{_SSE_ID_PREFIX}{format_run_stream_event_id(self.stream_id, self._seq)}\n"
+            f"{frame}"
+        )
+        try:
+            cache_provider.setex(
+                self._slot_key(self._seq),
+                _BUFFER_TTL_SECONDS,
+                f"{self._seq}\n{tagged}",
+            )
+        except Exception as exc:
+            self._warn("append", exc)
+        self.touch_writer()
+        return tagged
+
+    def touch_writer(self) -> None:
+        """Refresh the recorded head and tell readers the writer is alive."""
+        if time.monotonic() - self._last_touch >= _WRITER_TOUCH_INTERVAL_SECONDS:
+            self._write_meta()
+
+    def close(self) -> None:
+        """Mark the stream finished so readers stop following it."""
+        self._state = RUN_STREAM_STATE_DONE
+        self._write_meta()
+
+    def touch_reader(self) -> None:
+        """Record that a reconnected client is following this stream."""
+        try:
+            cache_provider.setex(
+                self._reader_key(), max(int(self.grace_seconds), 1), "1"
+            )
+        except Exception as exc:
+            self._warn("reader touch", exc)
+
+    def has_reader(self) -> bool:
+        """Return whether a reconnected client followed the stream recently."""
+        try:
+            return cache_provider.get(self._reader_key()) is not None
+        except Exception as exc:
+            self._warn("reader check", exc)
+            return False
+
+    def _read_slots(self, first_seq: int, count: int) -> list[tuple[int | None, str]]:
+        keys = [self._slot_key(seq) for seq in range(first_seq, first_seq + count)]
+        try:
+            raws = cache_provider.mget(*keys)
+        except Exception as exc:
+            self._warn("read", exc)
+            raws = [None] * len(keys)
+        return [_parse_slot(raw) for raw in raws]
+
+    def read_after(self, seq: int) -> RunStreamReplayRead:
+        """Return the frames stored after ``seq``.
+
+        ``complete`` is False when the stream expired or some requested frame
+        was already overwritten by the ring, in which case the caller cannot
+        resume consistently.
+        """
+        meta = self._read_meta()
+        if meta is None:
+            return RunStreamReplayRead(
+                frames=[], last_seq=seq, done=True, complete=False, writer_alive=False
+            )
+        head, state, updated_at = meta
+        done = state == RUN_STREAM_STATE_DONE
+        writer_alive = done or time.time() - updated_at <= max(self.grace_seconds, 1)
+        frames: list[str] = []
+        complete = True
+        if seq > head:
+            # The head is refreshed lazily, so ``seq`` may be newer than it;
+            # it is only valid if its slot was written.
+            slot_seq, _ = self._read_slots(seq, 1)[0]
+            complete = not done and slot_seq is not None and slot_seq >= seq
+        expected = seq + 1
+        batch_size = min(self.capacity, _READ_BATCH_SIZE)
+        while complete:
+            slots = self._read_slots(expected, batch_size)
+            for slot_seq, frame in slots:
+                if slot_seq != expected:
+                    # A slot still holding an older lap (or nothing) past the
+                    # head has not been written yet; anything else was lost.
+                    complete = expected > head and (
+                        slot_seq is None or slot_seq < expected
+                    )
+                    break
+                frames.append(frame)
+                expected += 1
+            else:
+                continue
+            break
+        return RunStreamReplayRead(
+            frames=frames,
+            last_seq=seq + len(frames),
+            done=done,
+            complete=complete,
+            writer_alive=writer_alive,
+        )
+
+
+def iter_resumed_run_stream(
+    buffer: RunStreamReplayBuffer,
+    read: RunStreamReplayRead,
+    *,
+    poll_interval: float,
+    heartbeat_frame: str,
+) -> Generator[str, None, None]:
+    """Replay ``read`` and follow the run until it ends.
+
+    ``read`` is the caller's first ``read_after``, so the replay range is
+    only fetched once. Stops when the writer marks the stream done, when
+    frames were lost to the ring, or when the writer stopped refreshing the
+    stream (its worker died or gave up waiting); the client then falls back
+    to a regular run.
+    """
+    while True:
+        yield from read.frames
+        if not read.complete or read.done or not read.writer_alive:
+            return
+        if not read.frames:
+            yield heartbeat_frame
+        time.sleep(max(poll_interval, 0.05))
+        buffer.touch_reader()
+        read = buffer.read_after(read.last_seq)
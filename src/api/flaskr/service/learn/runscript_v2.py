@@ -1,7 +1,6 @@
 """Execute learning sessions and stream their results."""
 
 import contextlib
-import json
 import queue
 import sys
 import threading
@@ -9,7 +8,8 @@ import time
 import traceback
 import uuid
 from collections.abc import Generator
-from datetime import datetime
+from concurrent.futures import Future
+from concurrent.futures import wait as futures_wait
 from typing import TYPE_CHECKING, Any
 
 from flask import Flask
@@ -17,6 +17,7 @@ from flaskr.common.cache_provider import cache as cache_provider
 from flaskr.common.log import thread_local as log_thread_local
 from flaskr.common.shifu_context import (
     apply_shifu_context_snapshot,
+    clear_shifu_context,
     get_shifu_context_snapshot,
 )
 from flaskr.dao import (
@@ -25,7 +26,7 @@ from flaskr.dao import (
     is_abnormal_stream_termination,
     is_protocol_interrupt_error,
 )
-from flaskr.i18n import _, get_current_language, set_language
+from flaskr.i18n import _, clear_language, get_current_language, set_language
 from flaskr.service.common.models import AppError, raise_error
 from flaskr.service.learn.const import INPUT_TYPE_ASK
 from flaskr.service.learn.context_v2 import RunScriptContextV2
@@ -37,7 +38,17 @@ from flaskr.service.learn.learn_dtos import (
     RunMarkdownFlowDTO,
     RunStatusDTO,
 )
+from flaskr.service.learn.listen_element_deltas import ElementDeltaTracker
 from flaskr.service.learn.listen_elements import ListenElementRunAdapter
+from flaskr.service.learn.run_script_producer_pool import (
+    submit_run_script_producer,
+)
+from flaskr.service.learn.run_stream_replay import (
+    RunStreamReplayBuffer,
+    iter_resumed_run_stream,
+    parse_run_stream_event_id,
+)
+from flaskr.service.learn.sse_frames import encode_sse_frame, get_sse_frame_encoder
 from flaskr.service.order.consts import ORDER_STATUS_SUCCESS
 from flaskr.service.order.models import Order
 from flaskr.service.shifu.shifu_struct_manager import (
@@ -48,7 +59,6 @@ from flaskr.service.shifu.shifu_struct_manager import (
     get_shifu_struct,
 )
 from flaskr.service.user.repository import load_user_aggregate
-from flaskr.util.datetime import to_utc_iso
 from sqlalchemy import text as sa_text
 from sqlalchemy.exc import InterfaceError, OperationalError, ResourceClosedError
 
@@ -57,6 +67,8 @@ if TYPE_CHECKING:
 
 RUN_SCRIPT_TIMEOUT_SECONDS = 5 * 60
 RUN_SCRIPT_STATUS_REFRESH_SECONDS = 30
+# How often a detached resumable stream re-checks its grace deadline.
+_DETACHED_DRAIN_POLL_SECONDS = 0.5
 
 # Default max parallel ask (follow-up) requests per (user, outline).
 # Actual value is read from Flask config (see MAX_PARALLEL_ASK_COUNT in config.py).
@@ -501,6 +513,10 @@ def run_script_inner(
             )
         except BreakError:
             _finalize_langfuse_if_available(run_script_context)
+            # The break unwound ``element_adapter.process`` before its
+            # end-of-stream flush; write the buffered element rows first.
+            if element_adapter is not None:
+                element_adapter.flush_element_writes()
             db.session.commit()
             yield from _iter_audio_backfill_ready_events(
                 ready_element_bids_by_block_bid
@@ -533,19 +549,24 @@ def run_script_inner(
     yield from _run()
 
 
-def fmt(o):
-    """Serialize a value for the shared API response envelope."""
-    if isinstance(o, datetime):
-        return to_utc_iso(o)
-    return o.__json__()
+def _wait_for_stream_item(
+    output_queue: queue.SimpleQueue, heartbeat_interval: float
+) -> tuple[str, object]:
+    """Block on the producer queue for at most one heartbeat interval.
+
+    ``SimpleQueue.get`` releases the GIL under gthread workers, and gevent's
+    ``patch_all`` swaps ``queue.SimpleQueue`` for its cooperative counterpart
+    under gevent workers, so either way the consumer wakes on the producer's
+    ``put`` instead of the next poll tick. A non-positive interval disables
+    heartbeats; the short fallback timeout keeps the loop re-checking its exit
+    conditions.
+    """
+    timeout = heartbeat_interval if heartbeat_interval > 0 else 0.01
+    return output_queue.get(timeout=timeout)
 
 
 def _to_sse_chunk(payload: object) -> str:
-    return (
-        "data: "
-        + json.dumps(payload, default=fmt, ensure_ascii=False)
-        + b"\n\n".decode("utf-8")
-    )
+    return encode_sse_frame(payload)
 
 
 def _log_run_script_stream_error(app: Flask, stream_error: Exception) -> None:
@@ -643,6 +664,47 @@ def _make_terminal_event(
     )
 
 
+def _iter_busy_events(
+    *,
+    outline_bid: str,
+    content: str,
+    element_adapter: ListenElementRunAdapter | None,
+    use_element_protocol: bool,
+) -> Generator[str, None, None]:
+    """Yield the error-then-done frames that turn a stream away as busy."""
+    terminal_events = (
+        [("error", content), (GeneratedType.DONE.value, "")]
+        if use_element_protocol
+        else [
+            ("error", content),
+            (GeneratedType.BREAK.value, ""),
+            (GeneratedType.DONE.value, ""),
+        ]
+    )
+    for event_type, event_content in terminal_events:
+        yield _to_sse_chunk(
+            _make_terminal_event(
+                outline_bid=outline_bid,
+                event_type=event_type,
+                content=event_content,
+                element_adapter=element_adapter,
+                is_terminal=(
+                    True
+                    if use_element_protocol and event_type == GeneratedType.DONE.value
+                    else None
+                ),
+            )
+        )
+
+
+def _reset_producer_thread_context() -> None:
+    for attr in ("request_id", "url", "client_ip"):
+        if hasattr(log_thread_local, attr):
+            delattr(log_thread_local, attr)
+    clear_language()
+    clear_shifu_context()
+
+
 def _extract_audio_backfill_ready_element_bid(
     payload: object,
 ) -> tuple[str, str] | None:
@@ -694,13 +756,25 @@ def run_script(
     preview_mode: bool = False,
     shifu_context_snapshot: dict[str, Any] | None = None,
     language: str | None = None,
+    element_delta: bool = False,
+    resumable: bool = False,
 ) -> Generator[str, None, None]:
-    """Run script."""
+    """Run script.
+
+    With ``resumable`` every frame carries an SSE ``id`` and is kept in a
+    replay buffer; when the client drops, the rest of the run is handed to
+    the producer pool, which keeps buffering frames for a reconnect (see
+    ``run_stream_replay``) while this request's worker is freed.
+    """
     timeout = RUN_SCRIPT_TIMEOUT_SECONDS
     blocking_timeout = 1
     lock_retry_count = 5
     lock_retry_sleep_seconds = 0.2
     heartbeat_interval = float(app.config.get("SSE_HEARTBEAT_INTERVAL", 0.5))
+    frame_encoder = get_sse_frame_encoder(app)
+    # Negotiated per request: streamed text patches go out as suffix deltas
+    # while the adapter keeps persisting full snapshots.
+    delta_tracker = ElementDeltaTracker() if element_delta else None
     lock_key = _get_run_script_lock_key(app, user_bid, outline_bid)
     is_ask = input_type == INPUT_TYPE_ASK
     runtime_listen = bool(listen) and not is_ask
@@ -728,8 +802,13 @@ def run_script(
                 _get_max_parallel_ask_count(app),
             )
     else:
+        # A detached resumable stream releases the lock from a producer pool
+        # thread, so the token must not be bound to this request's thread.
         lock = cache_provider.lock(
-            lock_key, timeout=timeout, blocking_timeout=blocking_timeout
+            lock_key,
+            timeout=timeout,
+            blocking_timeout=blocking_timeout,
+            thread_local=False,
         )
         acquired = False
         for attempt in range(lock_retry_count + 1):
@@ -747,6 +826,13 @@ def run_script(
                 time.sleep(lock_retry_sleep_seconds)
 
     if acquired:
+        replay_buffer = (
+            RunStreamReplayBuffer.create(
+                app, user_bid=user_bid, outline_bid=outline_bid
+            )
+            if resumable
+            else None
+        )
         stop_event = threading.Event()
         # Use SimpleQueue to avoid gevent-patched Queue lock contention in background threads.
         output_queue: queue.SimpleQueue = queue.SimpleQueue()
@@ -762,9 +848,12 @@ def run_script(
         parent_language = language or get_current_language()
         # Capture shifu context so background thread can reuse it (may be provided by caller)
         parent_shifu_context = shifu_context_snapshot or get_shifu_context_snapshot()
-        producer_thread: threading.Thread | None = None
+        producer_future: Future | None = None
 
         def producer():
+            # Pool threads are reused across streams; drop whatever the
+            # previous stream left in the thread-locals before adopting ours.
+            _reset_producer_thread_context()
             # Propagate logging thread-local context into this background thread
             if parent_request_id:
                 log_thread_local.request_id = parent_request_id
@@ -837,11 +926,42 @@ def run_script(
                     _remove_db_session_safely(app, source="run_script producer")
                     output_queue.put(("done", None))
 
+        # Set once a resumable stream's client dropped and the rest of the run
+        # was handed to the producer pool; that drain then owns the stop
+        # event, the replay buffer and the run lock.
+        handed_off = False
+
+        def _release_run() -> None:
+            stop_event.set()
+            if replay_buffer is not None:
+                replay_buffer.close()
+            if producer_future is not None:
+                futures_wait([producer_future], timeout=0.1)
+            if producer_future is not None and not producer_future.done():
+                app.logger.warning("run_script producer thread did not stop in time")
+
+            if is_ask:
+                _ask_sem_release(app, user_bid, outline_bid)
+            else:
+                with contextlib.suppress(Exception):
+                    lock.release()
+                _clear_run_script_status(app, user_bid, outline_bid)
+
         try:
-            producer_thread = threading.Thread(
-                target=producer, name="run_script_stream_producer", daemon=True
-            )
-            producer_thread.start()
+            producer_future = submit_run_script_producer(app, producer)
+            if producer_future is None:
+                app.logger.warning(
+                    "run_script producer pool full: user_bid=%s outline_bid=%s",
+                    user_bid,
+                    outline_bid,
+                )
+                yield from _iter_busy_events(
+                    outline_bid=outline_bid,
+                    content=str(_("server.learn.streamCapacityBusy")),
+                    element_adapter=stream_element_adapter,
+                    use_element_protocol=use_element_protocol,
+                )
+                return
 
             run_started_at = int(time.time())
             status_last_refreshed_at = 0.0
@@ -879,6 +999,162 @@ def run_script(
                     and not bool(getattr(payload_obj, "is_terminal", False))
                 )
 
+            def _stream_frame(payload_obj: object) -> str:
+                frame = frame_encoder.encode(payload_obj)
+                if replay_buffer is not None:
+                    frame = replay_buffer.append(frame)
+                return frame
+
+            def _encode_data_frame(payload_obj: object) -> str | None:
+                nonlocal last_stream_type, last_stream_done_is_terminal
+                if _should_suppress_live_payload(payload_obj):
+                    return None
+                payload_type = getattr(payload_obj, "type", None)
+                if hasattr(payload_type, "value"):
+                    payload_type = payload_type.value
+                if delta_tracker is not None:
+                    payload_obj = delta_tracker.apply(payload_obj)
+                frame = _stream_frame(payload_obj)
+                if isinstance(payload_type, str):
+                    last_stream_type = payload_type
+                    if payload_type == GeneratedType.DONE.value:
+                        last_stream_done_is_terminal = bool(
+                            getattr(payload_obj, "is_terminal", False)
+                        )
+                    else:
+                        last_stream_done_is_terminal = None
+                return frame
+
+            def _iter_closing_frames(
+                final_error: Exception | None,
+            ) -> Generator[str, None, None]:
+                nonlocal last_stream_type, last_stream_done_is_terminal
+                if final_error is not None:
+                    _log_run_script_stream_error(app, final_error)
+                    if isinstance(final_error, AppError):
+                        error_content = str(final_error)
+                    elif _is_retryable_llm_stream_connection_error(final_error):
+                        error_content = str(_("server.learn.llmStreamInterrupted"))
+                    else:
+                        error_content = str(_("server.common.unknownError"))
+                    yield _stream_frame(
+                        _make_terminal_event(
+                            outline_bid=outline_bid,
+                            event_type="error",
+                            content=error_content,
+                            element_adapter=stream_element_adapter,
+                        )
+                    )
+                    last_stream_type = "error"
+                    block_end_event = _make_terminal_event(
+                        outline_bid=outline_bid,
+                        event_type=GeneratedType.BREAK.value,
+                        content="",
+                        element_adapter=stream_element_adapter,
+                        is_terminal=False if runtime_listen else None,
+                    )
+                    if not _should_suppress_live_payload(block_end_event):
+                        yield _stream_frame(block_end_event)
+                        last_stream_type = (
+                            GeneratedType.DONE.value
+                            if use_element_protocol
+                            else GeneratedType.BREAK.value
+                        )
+                        last_stream_done_is_terminal = (
+                            False if use_element_protocol else None
+                        )
+
+                if not (
+                    use_element_protocol
+                    and last_stream_type == GeneratedType.DONE.value
+                    and last_stream_done_is_terminal is True
+                ):
+                    yield _stream_frame(
+                        _make_terminal_event(
+                            outline_bid=outline_bid,
+                            event_type=GeneratedType.DONE.value,
+                            content="",
+                            element_adapter=stream_element_adapter,
+                            is_terminal=True if use_element_protocol else None,
+                        )
+                    )
+                    last_stream_type = GeneratedType.DONE.value
+                    last_stream_done_is_terminal = (
+                        True if use_element_protocol else None
+                    )
+
+            def _drain_detached_stream() -> None:
+                # Runs on a producer pool thread, not in the WSGI close(): keep
+                # buffering frames while a reconnect may still come (or one is
+                # following), then finish the stream and release the run.
+                drain_error: Exception | None = None
+                finished = False
+                detach_deadline = time.monotonic() + replay_buffer.grace_seconds
+                try:
+                    while True:
+                        if time.monotonic() >= detach_deadline:
+                            if not replay_buffer.has_reader():
+                                app.logger.info(
+                                    "Detached resumable stream expired without "
+                                    "a reader: stream_id=%s",
+                                    replay_buffer.stream_id,
+                                )
+                                break
+                            detach_deadline = (
+                                time.monotonic() + replay_buffer.grace_seconds
+                            )
+                        _refresh_run_script_status()
+                        replay_buffer.touch_writer()
+                        try:
+                            kind, payload = _wait_for_stream_item(
+                                output_queue, _DETACHED_DRAIN_POLL_SECONDS
+                            )
+                        except queue.Empty:
+                            continue
+                        if kind == "data":
+                            _encode_data_frame(payload)
+                            continue
+                        if kind == "error":
+                            drain_error = (
+                                payload
+                                if isinstance(payload, Exception)
+                                else Exception(str(payload))
+                            )
+                        finished = True
+                        break
+                    if finished:
+                        for _frame in _iter_closing_frames(drain_error):
+                            pass
+                except Exception:
+                    app.logger.exception(
+                        "detached resumable stream drain failed: stream_id=%s",
+                        replay_buffer.stream_id,
+                    )
+                finally:
+                    _release_run()
+
+            def _hand_off_for_resume() -> bool:
+                nonlocal handed_off
+                if replay_buffer is None:
+                    return False
+                handed_off = (
+                    submit_run_script_producer(app, _drain_detached_stream) is not None
+                )
+                if handed_off:
+                    app.logger.info(
+                        "Client disconnected from resumable SSE stream, "
+                        "generating for reconnect: stream_id=%s grace=%s",
+                        replay_buffer.stream_id,
+                        replay_buffer.grace_seconds,
+                    )
+                else:
+                    app.logger.warning(
+                        "run_script producer pool full, stopping detached "
+                        "resumable stream: stream_id=%s",
+                        replay_buffer.stream_id,
+                    )
+                return handed_off
+
             while True:
                 kind: str
                 payload: object
@@ -888,13 +1164,15 @@ def run_script(
                     if done_received or client_disconnected:
                         break
                     _refresh_run_script_status()
-                    if heartbeat_interval > 0:
-                        # Keep waiting cooperative under gevent while polling a thread-safe queue.
-                        time.sleep(heartbeat_interval)
-                    else:
-                        time.sleep(0.01)
+                    if replay_buffer is not None:
+                        replay_buffer.touch_writer()
                     try:
-                        kind, payload = output_queue.get_nowait()
+                        # Block until the producer puts the next item so a
+                        # chunk is forwarded as soon as it exists; the
+                        # timeout only bounds how long the heartbeat waits.
+                        kind, payload = _wait_for_stream_item(
+                            output_queue, heartbeat_interval
+                        )
                     except queue.Empty:
                         if heartbeat_interval <= 0:
                             continue
@@ -907,8 +1185,10 @@ def run_script(
                                 if stream_element_adapter is not None
                                 else {"type": "heartbeat"}
                             )
-                            yield _to_sse_chunk(heartbeat_payload)
+                            yield frame_encoder.encode(heartbeat_payload)
                         except GeneratorExit:
+                            if _hand_off_for_resume():
+                                return
                             client_disconnected = True
                             stop_event.set()
                             app.logger.info(
@@ -916,6 +1196,8 @@ def run_script(
                             )
                             return
                         except (ConnectionError, BrokenPipeError, OSError) as exc:
+                            if _hand_off_for_resume():
+                                return
                             client_disconnected = True
                             stop_event.set()
                             app.logger.info(
@@ -928,25 +1210,13 @@ def run_script(
                 if kind == "data":
                     try:
                         _refresh_run_script_status()
-                        if _should_suppress_live_payload(payload):
+                        frame = _encode_data_frame(payload)
+                        if frame is None:
                             continue
-                        payload_type = getattr(payload, "type", None)
-                        if hasattr(payload_type, "value"):
-                            payload_type = payload_type.value
-                        yield (
-                            "data: "
-                            + json.dumps(payload, default=fmt, ensure_ascii=False)
-                            + b"\n\n".decode("utf-8")
-                        )
-                        if isinstance(payload_type, str):
-                            last_stream_type = payload_type
-                            if payload_type == GeneratedType.DONE.value:
-                                last_stream_done_is_terminal = bool(
-                                    getattr(payload, "is_terminal", False)
-                                )
-                            else:
-                                last_stream_done_is_terminal = None
+                        yield frame
                     except GeneratorExit:
+                        if _hand_off_for_resume():
+                            return
                         client_disconnected = True
                         stop_event.set()
                         app.logger.info(
@@ -954,6 +1224,8 @@ def run_script(
                         )
                         return
                     except (ConnectionError, BrokenPipeError, OSError) as exc:
+                        if _hand_off_for_resume():
+                            return
                         client_disconnected = True
                         stop_event.set()
                         app.logger.info(
@@ -970,74 +1242,11 @@ def run_script(
                     done_received = True
                     break
 
-            if (
-                stream_error
-                and not client_disconnected
-                and isinstance(stream_error, Exception)
-            ):
-                _log_run_script_stream_error(app, stream_error)
-                if isinstance(stream_error, AppError):
-                    error_content = str(stream_error)
-                elif _is_retryable_llm_stream_connection_error(stream_error):
-                    error_content = str(_("server.learn.llmStreamInterrupted"))
-                else:
-                    error_content = str(_("server.common.unknownError"))
-                yield _to_sse_chunk(
-                    _make_terminal_event(
-                        outline_bid=outline_bid,
-                        event_type="error",
-                        content=error_content,
-                        element_adapter=stream_element_adapter,
-                    )
-                )
-                last_stream_type = "error"
-                block_end_event = _make_terminal_event(
-                    outline_bid=outline_bid,
-                    event_type=GeneratedType.BREAK.value,
-                    content="",
-                    element_adapter=stream_element_adapter,
-                    is_terminal=False if runtime_listen else None,
-                )
-                if not _should_suppress_live_payload(block_end_event):
-                    yield _to_sse_chunk(block_end_event)
-                    last_stream_type = (
-                        GeneratedType.DONE.value
-                        if use_element_protocol
-                        else GeneratedType.BREAK.value
-                    )
-                    last_stream_done_is_terminal = (
-                        False if use_element_protocol else None
-                    )
-
-            if not client_disconnected and not (
-                use_element_protocol
-                and last_stream_type == GeneratedType.DONE.value
-                and last_stream_done_is_terminal is True
-            ):
-                yield _to_sse_chunk(
-                    _make_terminal_event(
-                        outline_bid=outline_bid,
-                        event_type=GeneratedType.DONE.value,
-                        content="",
-                        element_adapter=stream_element_adapter,
-                        is_terminal=True if use_element_protocol else None,
-                    )
-                )
-                last_stream_type = GeneratedType.DONE.value
-                last_stream_done_is_terminal = True if use_element_protocol else None
+            if not client_disconnected:
+                yield from _iter_closing_frames(stream_error)
         finally:
-            stop_event.set()
-            if producer_thread is not None:
-                producer_thread.join(timeout=0.1)
-            if producer_thread is not None and producer_thread.is_alive():
-                app.logger.warning("run_script producer thread did not stop in time")
-
-            if is_ask:
-                _ask_sem_release(app, user_bid, outline_bid)
-            else:
-                with contextlib.suppress(Exception):
-                    lock.release()
-                _clear_run_script_status(app, user_bid, outline_bid)
+            if not handed_off:
+                _release_run()
     else:
         app.logger.warning(
             "run_script acquisition failed (is_ask=%s): user_bid=%s outline_bid=%s",
@@ -1045,31 +1254,56 @@ def run_script(
             user_bid,
             outline_bid,
         )
-        busy_content = str(_("server.learn.outputInProgress"))
-        terminal_events = (
-            [("error", busy_content), (GeneratedType.DONE.value, "")]
-            if use_element_protocol
-            else [
-                ("error", busy_content),
-                (GeneratedType.BREAK.value, ""),
-                (GeneratedType.DONE.value, ""),
-            ]
+        yield from _iter_busy_events(
+            outline_bid=outline_bid,
+            content=str(_("server.learn.outputInProgress")),
+            element_adapter=stream_element_adapter,
+            use_element_protocol=use_element_protocol,
         )
-        for event_type, content in terminal_events:
-            yield _to_sse_chunk(
-                _make_terminal_event(
-                    outline_bid=outline_bid,
-                    event_type=event_type,
-                    content=content,
-                    element_adapter=stream_element_adapter,
-                    is_terminal=(
-                        True
-                        if use_element_protocol
-                        and event_type == GeneratedType.DONE.value
-                        else None
-                    ),
-                )
+
+
+def resume_run_script(
+    app: Flask,
+    outline_bid: str,
+    user_bid: str,
+    last_event_id: str | None,
+) -> Generator[str, None, None] | None:
+    """Return a stream replaying a resumable run after ``last_event_id``.
+
+    Returns None when the id is malformed, the run's replay buffer expired
+    or the frames after it were already overwritten; the caller then starts
+    a regular run instead.
+    """
+    parsed = parse_run_stream_event_id(last_event_id)
+    if parsed is None:
+        return None
+    stream_id, after_seq = parsed
+    replay_buffer = RunStreamReplayBuffer.attach(
+        app, user_bid=user_bid, outline_bid=outline_bid, stream_id=stream_id
+    )
+    if replay_buffer is None:
+        return None
+    replay_buffer.touch_reader()
+    first_read = replay_buffer.read_after(after_seq)
+    if not first_read.complete:
+        return None
+    app.logger.info(
+        "resuming run stream: user_bid=%s outline_bid=%s stream_id=%s after=%s",
+        user_bid,
+        outline_bid,
+        stream_id,
+        after_seq,
+    )
+    return iter_resumed_run_stream(
+        replay_buffer,
+        first_read,
+        poll_interval=float(app.config.get("SSE_HEARTBEAT_INTERVAL", 0.5)),
+        heartbeat_frame=encode_sse_frame(
+            RunElementSSEMessageDTO(
+                type="heartbeat", event_type="heartbeat", content=""
             )
+        ),
+    )
 
 
 def get_run_status(
@@ -0,0 +1,100 @@
+"""Encode run_script payloads as ``data: ...`` SSE frames.
+
+Every streamed event used to go through
+``json.dumps(payload, default=fmt, ensure_ascii=False)``. Passing ``default``
+makes ``json.dumps`` build a fresh ``JSONEncoder`` per call, and element DTOs
+only reached their ``__json__`` through that fallback hook after the encoder
+had already failed to serialize them. ``SSEFrameEncoder`` converts DTOs up
+front and reuses one configured encoder, producing byte-identical frames.
+
+``SSE_JSON_BACKEND=orjson`` switches to orjson when it is installed. orjson
+always writes compact separators, so its frames decode to the same JSON value
+but are not byte-identical to the stdlib output; payloads orjson rejects (for
+example integers wider than 64 bits) fall back to the stdlib encoder.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+from datetime import datetime
+from typing import TYPE_CHECKING, Any
+
+from flaskr.util.datetime import to_utc_iso
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson ships with the default image
+    orjson = None
+
+if TYPE_CHECKING:
+    from flask import Flask
+
+SSE_JSON_BACKEND_JSON = "json"
+SSE_JSON_BACKEND_ORJSON = "orjson"
+SSE_JSON_BACKENDS = (SSE_JSON_BACKEND_JSON, SSE_JSON_BACKEND_ORJSON)
+
+_SSE_FRAME_PREFIX = "data: "
+_SSE_FRAME_SUFFIX = "\n\n"
+# Values the stdlib encoder writes itself; anything else goes through
+# ``_json_default`` exactly as the ``default`` hook would have.
+_JSON_NATIVE_TYPES = (str, int, float, bool, list, tuple, dict, type(None))
+
+
+def _json_default(o: Any) -> Any:
+    if isinstance(o, datetime):
+        return to_utc_iso(o)
+    return o.__json__()
+
+
+class SSEFrameEncoder:
+    """Serialize payloads into SSE ``data:`` frames with one reusable encoder."""
+
+    def __init__(self, backend: str = SSE_JSON_BACKEND_JSON) -> None:
+        """Create an encoder for ``backend``; orjson needs the package installed."""
+        if backend == SSE_JSON_BACKEND_ORJSON and orjson is None:
+            backend = SSE_JSON_BACKEND_JSON
+        self.backend = backend
+        self._json_encode = json.JSONEncoder(
+            ensure_ascii=False, default=_json_default
+        ).encode
+
+    def encode(self, payload: object) -> str:
+        """Return ``payload`` as one SSE ``data:`` frame."""
+        if not isinstance(payload, _JSON_NATIVE_TYPES):
+            payload = _json_default(payload)
+        if self.backend == SSE_JSON_BACKEND_ORJSON:
+            try:
+                body = orjson.dumps(
+                    payload,
+                    default=_json_default,
+                    option=orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME,
+                ).decode("utf-8")
+            except TypeError:
+                body = self._json_encode(payload)
+        else:
+            body = self._json_encode(payload)
+        return _SSE_FRAME_PREFIX + body + _SSE_FRAME_SUFFIX
+
+
+_default_encoder = SSEFrameEncoder()
+_encoders: dict[str, SSEFrameEncoder] = {SSE_JSON_BACKEND_JSON: _default_encoder}
+_encoders_lock = threading.Lock()
+
+
+def get_sse_frame_encoder(app: Flask) -> SSEFrameEncoder:
+    """Return the shared encoder for the app's ``SSE_JSON_BACKEND``."""
+    backend = str(app.config.get("SSE_JSON_BACKEND") or SSE_JSON_BACKEND_JSON)
+    backend = backend.strip().lower()
+    if backend not in SSE_JSON_BACKENDS:
+        backend = SSE_JSON_BACKEND_JSON
+    encoder = _encoders.get(backend)
+    if encoder is None:
+        with _encoders_lock:
+            encoder = _encoders.setdefault(backend, SSEFrameEncoder(backend))
+    return encoder
+
+
+def encode_sse_frame(payload: object) -> str:
+    """Encode ``payload`` with the default, byte-compatible stdlib backend."""
+    return _default_encoder.encode(payload)
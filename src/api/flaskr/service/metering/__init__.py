@@ -13,7 +13,7 @@ from .consts import (  # noqa: F401
     normalize_usage_scene,
     normalize_usage_type,
 )
-from .models import BillUsageRecord  # noqa: F401
+from .models import BillUsageRecord, BillUsageRecordArchive  # noqa: F401
 from .recorder import UsageContext, record_llm_usage, record_tts_usage  # noqa: F401
 
 register_dict("bill_usage_type", "Bill usage type", BILL_USAGE_TYPE_DICT)
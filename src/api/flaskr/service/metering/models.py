@@ -1,6 +1,8 @@
 """Billing usage metering models.
 
-This module stores per-invocation usage data for LLM and TTS calls.
+This module stores per-invocation usage data for LLM and TTS calls. Finalized
+days move from ``bill_usage`` to ``bill_usage_archive``; see
+``flaskr.service.billing.history_archive``.
 """
 
 from flaskr.dao import db
@@ -18,16 +20,8 @@ from sqlalchemy import (
 from sqlalchemy.dialects.mysql import BIGINT
 
 
-class BillUsageRecord(db.Model):
-    """Usage metering record for LLM/TTS billing."""
-
-    __tablename__ = "bill_usage"
-    __table_args__ = (
-        Index("idx_bill_usage_user_created", "user_bid", "created_at"),
-        Index("idx_bill_usage_shifu_created", "shifu_bid", "created_at"),
-        Index("idx_bill_usage_type_created", "usage_type", "created_at"),
-        {"comment": "Bill usage records for LLM/TTS billing"},
-    )
+class BillUsageRecordMixin:
+    """Provide the usage metering columns shared by hot and archive tables."""
 
     # 1. Primary key
     id = Column(BIGINT, primary_key=True, autoincrement=True, comment="Unique ID")
@@ -271,3 +265,27 @@ class BillUsageRecord(db.Model):
         onupdate=now_utc,
         comment="Last update timestamp",
     )
+
+
+class BillUsageRecord(BillUsageRecordMixin, db.Model):
+    """Usage metering record for LLM/TTS billing."""
+
+    __tablename__ = "bill_usage"
+    __table_args__ = (
+        Index("idx_bill_usage_user_created", "user_bid", "created_at"),
+        Index("idx_bill_usage_shifu_created", "shifu_bid", "created_at"),
+        Index("idx_bill_usage_type_created", "usage_type", "created_at"),
+        {"comment": "Bill usage records for LLM/TTS billing"},
+    )
+
+
+class BillUsageRecordArchive(BillUsageRecordMixin, db.Model):
+    """Usage metering record moved out of the hot table after its day closed."""
+
+    __tablename__ = "bill_usage_archive"
+    __table_args__ = (
+        Index("idx_bill_usage_archive_user_created", "user_bid", "created_at"),
+        Index("idx_bill_usage_archive_shifu_created", "shifu_bid", "created_at"),
+        Index("idx_bill_usage_archive_type_created", "usage_type", "created_at"),
+        {"comment": "Archived bill usage records for finalized days"},
+    )
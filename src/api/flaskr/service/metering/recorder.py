@@ -3,6 +3,8 @@
 Provides best-effort helpers to persist LLM and TTS usage records.
 Billing settlement stays asynchronous; request threads stop after raw
 `bill_usage` persistence and may only enqueue follow-up settlement work.
+In buffered write mode the rows are committed in batches by
+``usage_buffer.UsageWriteBuffer`` and settlement is enqueued after that commit.
 """
 
 from __future__ import annotations
@@ -22,6 +24,7 @@ from .consts import (
     normalize_usage_scene,
 )
 from .models import BillUsageRecord
+from .usage_buffer import get_usage_write_buffer
 
 if TYPE_CHECKING:
     from flask import Flask
@@ -79,6 +82,31 @@ def _persist_usage_record(app: Flask, record: BillUsageRecord) -> bool:
             return True
 
 
+def _store_usage_record(
+    app: Flask,
+    record: BillUsageRecord,
+    *,
+    enqueue_settlement: bool,
+) -> bool:
+    """Persist or buffer a usage row, enqueueing settlement once it is durable."""
+    buffer = get_usage_write_buffer(
+        app,
+        enqueue_settlement=lambda buffer_app, usage_bid: _enqueue_usage_settlement(
+            buffer_app, usage_bid=usage_bid
+        ),
+    )
+    if buffer is not None:
+        buffer.submit(record, enqueue_settlement=enqueue_settlement)
+        return True
+    # Read before persisting: the commit expires and detaches the instance.
+    usage_bid = record.usage_bid
+    if not _persist_usage_record(app, record):
+        return False
+    if enqueue_settlement:
+        _enqueue_usage_settlement(app, usage_bid=usage_bid)
+    return True
+
+
 def _should_enqueue_usage_settlement(
     *,
     billable: int,
@@ -92,6 +120,13 @@ def _should_enqueue_usage_settlement(
     )
 
 
+def _resolve_usage_settlement_task_name(app: Flask) -> str:
+    mode = str(app.config.get("BILL_USAGE_SETTLEMENT_MODE") or "").strip().lower()
+    if mode == "batch":
+        return "billing.settle_usage_batch"
+    return "billing.settle_usage"
+
+
 def _enqueue_usage_settlement(app: Flask, *, usage_bid: str) -> None:
     normalized_usage_bid = str(usage_bid or "").strip()
     if not normalized_usage_bid:
@@ -99,11 +134,13 @@ def _enqueue_usage_settlement(app: Flask, *, usage_bid: str) -> None:
     try:
         from flaskr.common.celery_app import get_celery_app
 
+        task_name = _resolve_usage_settlement_task_name(app)
         celery_app = get_celery_app(flask_app=app)
-        task = celery_app.tasks.get("billing.settle_usage")
+        task = celery_app.tasks.get(task_name)
         if task is None:
             app.logger.warning(
-                "billing.settle_usage is unavailable for usage_bid=%s",
+                "%s is unavailable for usage_bid=%s",
+                task_name,
                 normalized_usage_bid,
             )
             return
@@ -171,13 +208,15 @@ def record_llm_usage(
         error_message=error_message or "",
         extra=extra or None,
     )
-    if _persist_usage_record(app, record):
-        if _should_enqueue_usage_settlement(
+    if _store_usage_record(
+        app,
+        record,
+        enqueue_settlement=_should_enqueue_usage_settlement(
             billable=resolved_billable,
             status=status,
             record_level=0,
-        ):
-            _enqueue_usage_settlement(app, usage_bid=usage_bid)
+        ),
+    ):
         # Best-effort logging; ignore failures so they do not mask the result.
         with contextlib.suppress(Exception):
             usage_source = (
@@ -269,12 +308,15 @@ def record_tts_usage(
         error_message=error_message or "",
         extra=extra or None,
     )
-    if _persist_usage_record(app, record):
-        if enqueue_settlement and _should_enqueue_usage_settlement(
+    if _store_usage_record(
+        app,
+        record,
+        enqueue_settlement=enqueue_settlement
+        and _should_enqueue_usage_settlement(
             billable=resolved_billable,
             status=status,
             record_level=record_level,
-        ):
-            _enqueue_usage_settlement(app, usage_bid=resolved_usage_bid)
+        ),
+    ):
         return resolved_usage_bid
     return ""
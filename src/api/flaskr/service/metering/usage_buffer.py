@@ -0,0 +1,491 @@
+"""Coalesce usage record inserts into batched commits.
+
+With ``BILL_USAGE_WRITE_MODE=buffered`` the recorder hands raw usage rows to a
+per-process ``UsageWriteBuffer`` instead of committing one row per LLM call or
+TTS segment on the request path. A daemon thread commits the queued rows in
+one transaction once ``BILL_USAGE_WRITE_BATCH_SIZE`` rows are waiting or
+``BILL_USAGE_WRITE_FLUSH_INTERVAL_MS`` after the oldest queued row, and only
+then enqueues their settlement tasks.
+
+When a batch cannot be committed it is written to a new JSON-lines file in
+``BILL_USAGE_WRITE_SPILL_DIR`` (fsynced, then renamed into place). Every flush
+first replays spill files left by any process, claiming each file by rename,
+skipping usage_bids that are already stored, and enqueueing settlement for the
+rows it inserted. After a spill, replays wait ``_SPILL_RETRY_SECONDS`` so a
+database outage is not hammered. A file that fails to replay while a later
+file in the same pass replays moves to the ``quarantine`` subdirectory, where
+it is retried after every regular file, so one bad file cannot hold the others
+back; when no later file replays the database is likely down and failed files
+stay where they are, behind the other files of the next pass.
+"""
+
+from __future__ import annotations
+
+import atexit
+import contextlib
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from flaskr.dao import cleanup_session_after, db
+from flaskr.dao.uow import unit_of_work
+from flaskr.util.datetime import now_utc
+from flaskr.util.uuid import generate_id
+
+from .models import BillUsageRecord
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from flask import Flask
+
+USAGE_WRITE_MODE_DIRECT = "direct"
+USAGE_WRITE_MODE_BUFFERED = "buffered"
+
+_EXTENSION_KEY = "usage_write_buffer"
+_DEFAULT_BATCH_SIZE = 50
+_DEFAULT_FLUSH_INTERVAL_MS = 200
+_DEFAULT_SPILL_DIR = "data/usage-spill"
+_SPILL_SUFFIX = ".jsonl"
+_REPLAYING_SUFFIX = ".replaying"
+_QUARANTINE_DIR = "quarantine"
+# A replay pass stops after this many files in a row failed to replay.
+_MAX_CONSECUTIVE_REPLAY_FAILURES = 2
+# Spill files are retried at most this often while the database is down.
+_SPILL_RETRY_SECONDS = 30.0
+# A claimed spill file whose replayer died becomes claimable again.
+_STALE_CLAIM_SECONDS = 600.0
+_DATETIME_FIELDS = ("created_at", "updated_at")
+
+_buffer_creation_lock = threading.Lock()
+
+
+@dataclass(slots=True)
+class _PendingUsage:
+    values: dict[str, Any]
+    enqueue_settlement: bool
+
+
+@dataclass(slots=True)
+class UsageWriteBufferStats:
+    """Counters of one process's usage write buffer."""
+
+    submitted: int = 0
+    committed: int = 0
+    commits: int = 0
+    spilled: int = 0
+    replayed: int = 0
+    settlements_enqueued: int = 0
+
+
+def resolve_usage_write_mode(app: Flask) -> str:
+    """Return the configured usage write mode, defaulting to direct commits."""
+    mode = str(app.config.get("BILL_USAGE_WRITE_MODE") or "").strip().lower()
+    if mode == USAGE_WRITE_MODE_BUFFERED:
+        return USAGE_WRITE_MODE_BUFFERED
+    return USAGE_WRITE_MODE_DIRECT
+
+
+def get_usage_write_buffer(
+    app: Flask,
+    *,
+    enqueue_settlement: Callable[[Flask, str], None],
+) -> UsageWriteBuffer | None:
+    """Return this app's usage write buffer, or None in direct mode."""
+    if resolve_usage_write_mode(app) != USAGE_WRITE_MODE_BUFFERED:
+        return None
+    buffer = app.extensions.get(_EXTENSION_KEY)
+    if buffer is not None:
+        return buffer
+    with _buffer_creation_lock:
+        buffer = app.extensions.get(_EXTENSION_KEY)
+        if buffer is None:
+            buffer = UsageWriteBuffer(
+                app,
+                batch_size=_config_int(app, "BILL_USAGE_WRITE_BATCH_SIZE")
+                or _DEFAULT_BATCH_SIZE,
+                flush_interval_ms=_config_int(app, "BILL_USAGE_WRITE_FLUSH_INTERVAL_MS")
+                or _DEFAULT_FLUSH_INTERVAL_MS,
+                spill_dir=str(
+                    app.config.get("BILL_USAGE_WRITE_SPILL_DIR") or _DEFAULT_SPILL_DIR
+                ),
+                enqueue_settlement=enqueue_settlement,
+            )
+            app.extensions[_EXTENSION_KEY] = buffer
+            atexit.register(buffer.close)
+    return buffer
+
+
+def flush_usage_write_buffer(app: Flask) -> int:
+    """Commit every queued usage row now and return how many were stored."""
+    buffer = app.extensions.get(_EXTENSION_KEY)
+    if buffer is None:
+        return 0
+    return buffer.flush()
+
+
+def _config_int(app: Flask, key: str) -> int:
+    try:
+        return max(int(app.config.get(key) or 0), 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+class UsageWriteBuffer:
+    """Queue raw usage rows and commit them in bounded batches."""
+
+    def __init__(
+        self,
+        app: Flask,
+        *,
+        batch_size: int,
+        flush_interval_ms: int,
+        spill_dir: str,
+        enqueue_settlement: Callable[[Flask, str], None],
+    ) -> None:
+        """Bind the buffer to an app; the flush thread starts on first submit."""
+        self._app = app
+        self._batch_size = max(int(batch_size), 1)
+        self._flush_interval = max(int(flush_interval_ms), 1) / 1000
+        self._spill_dir = Path(spill_dir)
+        self._enqueue_settlement = enqueue_settlement
+        self._condition = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._pending: list[_PendingUsage] = []
+        self._oldest_at = 0.0
+        self._spill_checked_at: float | None = None
+        # Spill files that failed in a pass no later file replayed in.
+        self._unproven_failures: set[str] = set()
+        self._thread: threading.Thread | None = None
+        self._closed = False
+        self.stats = UsageWriteBufferStats()
+
+    def submit(self, record: BillUsageRecord, *, enqueue_settlement: bool) -> None:
+        """Queue one usage row; settlement is enqueued after it is committed."""
+        values = _usage_record_values(record)
+        with self._condition:
+            if not self._pending:
+                self._oldest_at = time.monotonic()
+            self._pending.append(
+                _PendingUsage(values=values, enqueue_settlement=enqueue_settlement)
+            )
+            self.stats.submitted += 1
+            if self._thread is None and not self._closed:
+                self._thread = threading.Thread(
+                    target=self._run,
+                    name="usage_write_buffer",
+                    daemon=True,
+                )
+                self._thread.start()
+            self._condition.notify()
+
+    def flush(self) -> int:
+        """Replay spill files, then commit the queued rows in one transaction."""
+        with self._flush_lock:
+            with self._condition:
+                batch = self._pending
+                self._pending = []
+            stored = self._replay_spill_files()
+            if not batch:
+                return stored
+            if self._commit([pending.values for pending in batch]):
+                self.stats.committed += len(batch)
+                self._enqueue_settlements(batch)
+                return stored + len(batch)
+            self._spill(batch)
+            return stored
+
+    def close(self) -> None:
+        """Stop the flush thread after committing or spilling queued rows."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+            thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=5)
+        self.flush()
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                idle = False
+                while not self._pending and not self._closed:
+                    # Idle wakeups retry spill files left while the DB was down.
+                    if not self._condition.wait(timeout=_SPILL_RETRY_SECONDS):
+                        idle = True
+                        break
+                while self._pending and not self._closed:
+                    remaining = (
+                        self._oldest_at + self._flush_interval - (time.monotonic())
+                    )
+                    if len(self._pending) >= self._batch_size or remaining <= 0:
+                        break
+                    self._condition.wait(timeout=remaining)
+                closed = self._closed
+                # A caller may have flushed the rows this thread woke up for.
+                due = idle or bool(self._pending)
+            if closed:
+                return
+            if not due:
+                continue
+            try:
+                self.flush()
+            except Exception:
+                with contextlib.suppress(Exception):
+                    self._app.logger.exception("Usage write buffer flush failed")
+
+    def _commit(self, rows: list[dict[str, Any]]) -> bool:
+        with self._app.app_context():
+            try:
+                with unit_of_work():
+                    db.session.add_all([BillUsageRecord(**values) for values in rows])
+            except Exception:
+                with contextlib.suppress(Exception):
+                    self._app.logger.exception(
+                        "Usage write buffer commit failed rows=%s", len(rows)
+                    )
+                return False
+        self.stats.commits += 1
+        return True
+
+    def _enqueue_settlements(self, batch: list[_PendingUsage]) -> None:
+        for pending in batch:
+            if not pending.enqueue_settlement:
+                continue
+            self._enqueue_settlement(self._app, pending.values["usage_bid"])
+            self.stats.settlements_enqueued += 1
+
+    def _spill(self, batch: list[_PendingUsage]) -> None:
+        lines: list[str] = []
+        spilled: list[_PendingUsage] = []
+        for pending in batch:
+            try:
+                lines.append(
+                    json.dumps(
+                        {
+                            "values": pending.values,
+                            "enqueue_settlement": pending.enqueue_settlement,
+                        },
+                        default=_encode_datetime,
+                    )
+                )
+            except (TypeError, ValueError):
+                # One row that cannot be serialized must not take the rest of
+                # the batch down with it.
+                with contextlib.suppress(Exception):
+                    self._app.logger.exception(
+                        "Usage write buffer cannot spill row; usage row lost "
+                        "usage_bid=%s",
+                        pending.values.get("usage_bid"),
+                    )
+                continue
+            spilled.append(pending)
+        if not spilled:
+            return
+        name = f"usage-{os.getpid()}-{time.time_ns()}-{generate_id(self._app)}"
+        target = self._spill_dir / f"{name}{_SPILL_SUFFIX}"
+        staging = self._spill_dir / f".{name}.tmp"
+        try:
+            self._spill_dir.mkdir(parents=True, exist_ok=True)
+            with staging.open("w", encoding="utf-8") as handle:
+                for line in lines:
+                    handle.write(line)
+                    handle.write("\n")
+                handle.flush()
+                os.fsync(handle.fileno())
+            staging.replace(target)
+        except OSError:
+            with contextlib.suppress(Exception):
+                self._app.logger.exception(
+                    "Usage write buffer spill failed; usage rows lost usage_bids=%s",
+                    [pending.values.get("usage_bid") for pending in spilled],
+                )
+            with contextlib.suppress(OSError):
+                staging.unlink()
+            return
+        self.stats.spilled += len(spilled)
+        # The commit just failed, so replay no sooner than the retry interval.
+        self._spill_checked_at = time.monotonic()
+        with contextlib.suppress(Exception):
+            self._app.logger.warning(
+                "Usage write buffer spilled rows=%s file=%s", len(spilled), target
+            )
+
+    def _replay_spill_files(self) -> int:
+        now = time.monotonic()
+        if (
+            self._spill_checked_at is not None
+            and now - self._spill_checked_at < _SPILL_RETRY_SECONDS
+        ):
+            return 0
+        self._spill_checked_at = now
+        unproven = self._unproven_failures
+
+        def retry_order(path: Path) -> tuple[bool, str]:
+            # Files that failed in an unproven pass go behind the others.
+            return (path.name in unproven, path.name)
+
+        try:
+            paths = sorted(self._spill_dir.iterdir(), key=retry_order)
+        except OSError:
+            return 0
+        with contextlib.suppress(OSError):
+            # Quarantined files are retried behind every regular file.
+            paths += sorted(
+                (self._spill_dir / _QUARANTINE_DIR).iterdir(), key=retry_order
+            )
+        stored = 0
+        # Claimed files that failed since the last file that replayed.
+        failed: list[Path] = []
+        for path in paths:
+            claimed = _claim_spill_file(path)
+            if claimed is None:
+                continue
+            try:
+                replayed = self._replay_spill_file(claimed)
+            except (OSError, ValueError):
+                replayed = None
+            if replayed is None:
+                failed.append(claimed)
+                if len(failed) >= _MAX_CONSECUTIVE_REPLAY_FAILURES:
+                    # The database is most likely down; the rest would fail too.
+                    break
+                continue
+            # This file replayed, so the database is up and the files that
+            # failed before it are bad.
+            for bad in failed:
+                self._quarantine_spill_file(bad)
+            failed = []
+            stored += replayed
+            with contextlib.suppress(OSError):
+                claimed.unlink()
+        # No later file replayed, so the database may be down: release the
+        # claims and leave these files where they are.
+        for claimed in failed:
+            with contextlib.suppress(OSError):
+                claimed.replace(_unclaimed_path(claimed))
+        self._unproven_failures = {_unclaimed_path(claimed).name for claimed in failed}
+        return stored
+
+    def _quarantine_spill_file(self, claimed: Path) -> None:
+        """Park a spill file that failed to replay behind the other files."""
+        quarantine_dir = self._spill_dir / _QUARANTINE_DIR
+        target = quarantine_dir / _unclaimed_path(claimed).name
+        try:
+            quarantine_dir.mkdir(parents=True, exist_ok=True)
+            claimed.replace(target)
+        except OSError:
+            # Leave the file for the next retry, from this or another process.
+            with contextlib.suppress(OSError):
+                claimed.replace(_unclaimed_path(claimed))
+            return
+        with contextlib.suppress(Exception):
+            self._app.logger.warning(
+                "Usage write buffer spill replay failed; quarantined file=%s",
+                target,
+            )
+
+    def _replay_spill_file(self, path: Path) -> int | None:
+        batch: list[_PendingUsage] = []
+        with path.open(encoding="utf-8") as handle:
+            for line in handle:
+                try:
+                    payload = json.loads(line)
+                    values = _decode_datetimes(dict(payload["values"]))
+                except (KeyError, TypeError, ValueError):
+                    # A torn trailing line cannot hold a complete row.
+                    continue
+                batch.append(
+                    _PendingUsage(
+                        values=values,
+                        enqueue_settlement=bool(payload.get("enqueue_settlement")),
+                    )
+                )
+        if not batch:
+            return 0
+        with self._app.app_context():
+            try:
+                stored_bids = {
+                    usage_bid
+                    for (usage_bid,) in db.session.query(BillUsageRecord.usage_bid)
+                    .filter(
+                        BillUsageRecord.usage_bid.in_(
+                            [pending.values.get("usage_bid") for pending in batch]
+                        )
+                    )
+                    .all()
+                }
+            except Exception as exc:
+                cleanup_session_after(exc, source="usage write buffer replay")
+                return None
+        missing = [
+            pending
+            for pending in batch
+            if pending.values.get("usage_bid") not in stored_bids
+        ]
+        if missing and not self._commit([pending.values for pending in missing]):
+            return None
+        self.stats.replayed += len(missing)
+        self._enqueue_settlements(missing)
+        return len(missing)
+
+
+def _usage_record_values(record: BillUsageRecord) -> dict[str, Any]:
+    state = record.__dict__
+    values = {
+        column.key: state[column.key]
+        for column in BillUsageRecord.__table__.columns
+        if not column.primary_key and state.get(column.key) is not None
+    }
+    # Stamp the request time; the row may be committed a flush interval later.
+    created_at = values.setdefault("created_at", now_utc())
+    values.setdefault("updated_at", created_at)
+    return values
+
+
+def _claim_spill_file(path: Path) -> Path | None:
+    name = path.name
+    if name.endswith(_REPLAYING_SUFFIX):
+        # Claims are named "<file>.jsonl.<pid>-<claimed_at>.replaying".
+        try:
+            claimed_at = int(name.rsplit("-", 1)[1][: -len(_REPLAYING_SUFFIX)])
+        except (IndexError, ValueError):
+            return None
+        if time.time() - claimed_at < _STALE_CLAIM_SECONDS:
+            return None
+    elif not name.endswith(_SPILL_SUFFIX):
+        return None
+    claimed = path.with_name(
+        f"{_unclaimed_path(path).name}.{os.getpid()}-{int(time.time())}"
+        f"{_REPLAYING_SUFFIX}"
+    )
+    try:
+        path.replace(claimed)
+    except OSError:
+        # Another process claimed the file first.
+        return None
+    return claimed
+
+
+def _unclaimed_path(path: Path) -> Path:
+    name = path.name
+    return path.with_name(name[: name.index(_SPILL_SUFFIX) + len(_SPILL_SUFFIX)])
+
+
+def _encode_datetime(value: Any) -> str:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    message = f"Unsupported spill value: {type(value).__name__}"
+    raise TypeError(message)
+
+
+def _decode_datetimes(values: dict[str, Any]) -> dict[str, Any]:
+    for field in _DATETIME_FIELDS:
+        if isinstance(values.get(field), str):
+            values[field] = datetime.fromisoformat(values[field])
+    return values
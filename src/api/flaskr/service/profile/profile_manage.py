@@ -7,10 +7,10 @@ from flaskr.common.i18n_utils import get_markdownflow_output_language
 from flaskr.dao import db
 from flaskr.i18n import _
 from flaskr.service.common import raise_error
+from flaskr.service.common.mdflow_cache import get_parsed_mdflow
 from flaskr.service.shifu.models import DraftOutlineItem
 from flaskr.util.datetime import now_utc
 from flaskr.util.uuid import generate_id
-from markdown_flow import MarkdownFlow
 from sqlalchemy import func, inspect, text
 
 from .dtos import (
@@ -59,8 +59,9 @@ def _collect_used_variables(app: Flask, shifu_bid: str) -> set[str]:
             if not item.content:
                 continue
             try:
-                markdown_flow = MarkdownFlow(item.content).set_output_language(
-                    get_markdownflow_output_language()
+                markdown_flow = get_parsed_mdflow(
+                    item.content,
+                    output_language=get_markdownflow_output_language(),
                 )
                 for var in markdown_flow.extract_variables() or []:
                     if var:
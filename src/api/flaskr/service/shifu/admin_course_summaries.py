@@ -9,9 +9,9 @@ from dataclasses import dataclass
 from datetime import datetime, timedelta
 from typing import TYPE_CHECKING, Any
 
-from flaskr.common.i18n_utils import get_markdownflow_output_language
 from flaskr.dao import db
 from flaskr.i18n import _
+from flaskr.service.common.mdflow_cache import get_mdflow_blocks
 from flaskr.service.common.models import (
     raise_error_with_args,
     raise_param_error,
@@ -41,7 +41,6 @@ from flaskr.service.shifu.models import (
 )
 from flaskr.service.shifu.shifu_history_manager import HistoryItem
 from flaskr.util.datetime import NAIVE_DATETIME_MIN, now_utc
-from markdown_flow import MarkdownFlow
 from sqlalchemy import and_, case, literal, not_
 from sqlalchemy.orm import defer
 
@@ -822,10 +821,7 @@ def _build_outline_history_tree(
     def _count_blocks(content: str) -> int:
         if not content:
             return 0
-        mdflow = MarkdownFlow(content).set_output_language(
-            get_markdownflow_output_language()
-        )
-        return len(mdflow.get_all_blocks())
+        return len(get_mdflow_blocks(content))
 
     def _build(parent_bid: str) -> list[HistoryItem]:
         children = outline_children_map.get(parent_bid, [])
@@ -10,6 +10,7 @@ from flaskr.api.llm import get_current_models
 from flaskr.api.tts import get_all_provider_configs
 from flaskr.dao import db
 from flaskr.dao.uow import app_context_scope, unit_of_work
+from flaskr.service.billing.api import invalidate_usage_rate_index
 from flaskr.service.billing.consts import (
     BILLING_METRIC_LABELS,
     BILLING_METRIC_LLM_CACHE_TOKENS,
@@ -833,7 +834,7 @@ def update_operator_rate_config(
                     status=status_code,
                 )
             )
-        return _serialize_rate_row(
+        result = _serialize_rate_row(
             usage_type=usage_type,
             provider=provider,
             model=model,
@@ -848,3 +849,5 @@ def update_operator_rate_config(
             baseline_cost=baseline_cost,
             tts_chars_per_llm_token=_load_tts_chars_per_llm_token(),
         )
+    invalidate_usage_rate_index(app)
+    return result
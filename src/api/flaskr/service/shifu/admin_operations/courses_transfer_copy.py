@@ -10,9 +10,9 @@ from typing import TYPE_CHECKING, Any
 from flask import Flask, current_app
 from flaskr.common.cache_provider import cache as redis
 from flaskr.common.config import get_redis_key_prefix
-from flaskr.common.i18n_utils import get_markdownflow_output_language
 from flaskr.dao import db
 from flaskr.i18n import _
+from flaskr.service.common.mdflow_cache import get_mdflow_blocks
 from flaskr.service.common.models import (
     raise_error,
     raise_error_with_args,
@@ -62,7 +62,6 @@ from flaskr.service.user.utils import (
 )
 from flaskr.util import generate_id
 from flaskr.util.datetime import now_utc
-from markdown_flow import MarkdownFlow
 
 if TYPE_CHECKING:
     from collections.abc import Sequence
@@ -145,10 +144,7 @@ def _build_outline_history_tree(
     def _count_blocks(content: str) -> int:
         if not content:
             return 0
-        mdflow = MarkdownFlow(content).set_output_language(
-            get_markdownflow_output_language()
-        )
-        return len(mdflow.get_all_blocks())
+        return len(get_mdflow_blocks(content))
 
     def _build(parent_bid: str) -> list[HistoryItem]:
         children = outline_children_map.get(parent_bid, [])
@@ -367,6 +367,7 @@ def _verify_minimax_voice_id(voice_id: str) -> None:
             voice_settings=voice_settings,
             provider_name="minimax",
             model=OPERATOR_VOICE_VERIFY_MODEL,
+            use_cache=False,
         )
     except Exception as exc:  # surface the real reason to the operator
         raise_param_error(f"voice_id verification failed: {exc}")
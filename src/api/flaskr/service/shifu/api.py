@@ -0,0 +1,7 @@
+"""Expose the shifu service API."""
+
+from __future__ import annotations
+
+from flaskr.service.shifu.published_struct_cache import get_published_struct
+
+__all__ = ["get_published_struct"]
@@ -0,0 +1,189 @@
+"""Share decoded published shifu structs across requests in one process.
+
+Every learner request used to load the newest ``LogPublishedStruct`` row and
+run ``HistoryItem.from_json`` over the whole course tree. Published rows are
+immutable, so decoded trees are cached per ``(shifu_bid, struct row id)`` in a
+bounded LRU and are never invalidated by content changes: a publish inserts a
+new row with a new id.
+
+To also skip the "which row is newest" query, each process remembers the
+latest row id per shifu together with a publish version read from Redis.
+Publishing increments that version, so every gunicorn worker notices on its
+next lookup and re-resolves the newest row. When Redis is unavailable the
+version check fails open: the newest id is queried every time, but the decode
+is still served from the cache. Remembered ids also expire after
+``PUBLISHED_STRUCT_POINTER_TTL_SECONDS`` so a lost Redis key cannot pin a
+stale row for long.
+
+Cached trees are shared between callers and must be treated as read-only.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from flaskr.common.shared_version import bump_shared_version, read_shared_version
+from flaskr.service.shifu.models import LogPublishedStruct
+from flaskr.service.shifu.shifu_history_manager import HistoryItem
+
+if TYPE_CHECKING:
+    from flask import Flask
+
+PUBLISHED_STRUCT_CACHE_MAX_ENTRIES = 128
+PUBLISHED_STRUCT_POINTER_TTL_SECONDS = 60.0
+_VERSION_KEY_SUFFIX = "shifu:published_struct_version:"
+
+
+@dataclass(frozen=True, slots=True)
+class PublishedStructCacheStats:
+    """Hit and occupancy counters for the published struct cache."""
+
+    hits: int
+    misses: int
+    size: int
+    capacity: int
+
+
+@dataclass(frozen=True, slots=True)
+class _LatestStructPointer:
+    version: str
+    struct_id: int
+    expires_at: float
+
+
+@dataclass(slots=True)
+class _PublishedStructCacheState:
+    structs: OrderedDict[tuple[str, int], HistoryItem]
+    latest: dict[tuple[str, bool], _LatestStructPointer]
+    hits: int = 0
+    misses: int = 0
+
+
+_published_struct_cache_state = _PublishedStructCacheState(
+    structs=OrderedDict(), latest={}
+)
+_published_struct_cache_lock = threading.Lock()
+
+
+def _version_key(app: Flask, shifu_bid: str) -> str:
+    prefix = str(app.config.get("REDIS_KEY_PREFIX") or "")
+    return f"{prefix}{_VERSION_KEY_SUFFIX}{shifu_bid}"
+
+
+def _query_latest_struct_id(shifu_bid: str, active_only: bool) -> int | None:
+    query = LogPublishedStruct.query.with_entities(LogPublishedStruct.id).filter(
+        LogPublishedStruct.shifu_bid == shifu_bid
+    )
+    if active_only:
+        query = query.filter(LogPublishedStruct.deleted == 0)
+    row = query.order_by(LogPublishedStruct.id.desc()).first()
+    return int(row[0]) if row else None
+
+
+def _load_struct(shifu_bid: str, struct_id: int) -> HistoryItem | None:
+    state = _published_struct_cache_state
+    key = (shifu_bid, struct_id)
+    with _published_struct_cache_lock:
+        struct = state.structs.get(key)
+        if struct is not None:
+            state.structs.move_to_end(key)
+            state.hits += 1
+            return struct
+        state.misses += 1
+
+    row = (
+        LogPublishedStruct.query.with_entities(LogPublishedStruct.struct)
+        .filter(LogPublishedStruct.id == struct_id)
+        .first()
+    )
+    if not row:
+        return None
+    # from_json walks the whole course tree, so it runs unlocked: the first
+    # request after a publish must not stall lookups of other shifus. Rows are
+    # immutable, so racing misses on one id store equal trees.
+    struct = HistoryItem.from_json(row[0])
+    with _published_struct_cache_lock:
+        state.structs[key] = struct
+        state.structs.move_to_end(key)
+        while len(state.structs) > PUBLISHED_STRUCT_CACHE_MAX_ENTRIES:
+            state.structs.popitem(last=False)
+    return struct
+
+
+def get_published_struct(
+    app: Flask, shifu_bid: str, *, active_only: bool = True
+) -> HistoryItem | None:
+    """Return the newest published struct for ``shifu_bid``, or None.
+
+    Args:
+        app: Flask application instance
+        shifu_bid: Shifu bid
+        active_only: Ignore rows flagged as deleted
+    Returns:
+        HistoryItem | None: Shared, read-only struct tree.
+
+    """
+    version = read_shared_version(
+        app, _version_key(app, shifu_bid), label="published struct"
+    )
+    pointer_key = (shifu_bid, active_only)
+    state = _published_struct_cache_state
+    if version is not None:
+        with _published_struct_cache_lock:
+            pointer = state.latest.get(pointer_key)
+        if (
+            pointer is not None
+            and pointer.version == version
+            and pointer.expires_at > time.monotonic()
+        ):
+            struct = _load_struct(shifu_bid, pointer.struct_id)
+            if struct is not None:
+                return struct
+
+    struct_id = _query_latest_struct_id(shifu_bid, active_only)
+    if struct_id is None:
+        return None
+    struct = _load_struct(shifu_bid, struct_id)
+    if struct is not None and version is not None:
+        with _published_struct_cache_lock:
+            state.latest[pointer_key] = _LatestStructPointer(
+                version=version,
+                struct_id=struct_id,
+                expires_at=time.monotonic() + PUBLISHED_STRUCT_POINTER_TTL_SECONDS,
+            )
+    return struct
+
+
+def invalidate_published_struct(app: Flask, shifu_bid: str) -> None:
+    """Make every worker re-resolve the newest struct after a publish."""
+    with _published_struct_cache_lock:
+        state = _published_struct_cache_state
+        for active_only in (True, False):
+            state.latest.pop((shifu_bid, active_only), None)
+    bump_shared_version(app, _version_key(app, shifu_bid), label="published struct")
+
+
+def get_published_struct_cache_stats() -> PublishedStructCacheStats:
+    """Return hit/miss counters and occupancy of the decoded struct cache."""
+    with _published_struct_cache_lock:
+        state = _published_struct_cache_state
+        return PublishedStructCacheStats(
+            hits=state.hits,
+            misses=state.misses,
+            size=len(state.structs),
+            capacity=PUBLISHED_STRUCT_CACHE_MAX_ENTRIES,
+        )
+
+
+def clear_published_struct_cache() -> None:
+    """Drop every cached struct and remembered row id and reset the counters."""
+    with _published_struct_cache_lock:
+        state = _published_struct_cache_state
+        state.structs.clear()
+        state.latest.clear()
+        state.hits = 0
+        state.misses = 0
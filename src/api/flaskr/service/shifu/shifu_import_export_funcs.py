@@ -5,9 +5,9 @@ from decimal import Decimal
 from pathlib import Path
 
 from flask import Flask
-from flaskr.common.i18n_utils import get_markdownflow_output_language
 from flaskr.dao import db
 from flaskr.service.check_risk.funcs import check_text_with_risk_control
+from flaskr.service.common.mdflow_cache import get_mdflow_blocks
 from flaskr.service.common.models import raise_error
 from flaskr.service.shifu.models import DraftOutlineItem, DraftShifu
 from flaskr.service.shifu.shifu_draft_funcs import (
@@ -23,7 +23,6 @@ from flaskr.service.shifu.shifu_history_manager import (
 from flaskr.service.shifu.shifu_struct_manager import get_shifu_struct
 from flaskr.util import generate_id
 from flaskr.util.datetime import now_utc, to_utc_iso
-from markdown_flow import MarkdownFlow
 from werkzeug.datastructures import FileStorage
 
 
@@ -395,10 +394,7 @@ def import_shifu(
                 elif item_type == "outline":
                     if old_bid in created_items:
                         item_id = created_items[old_bid].id
-                        mdflow = MarkdownFlow(
-                            created_items[old_bid].content
-                        ).set_output_language(get_markdownflow_output_language())
-                        block_list = mdflow.get_all_blocks()
+                        block_list = get_mdflow_blocks(created_items[old_bid].content)
                         child_count = len(block_list)
                     else:
                         return None
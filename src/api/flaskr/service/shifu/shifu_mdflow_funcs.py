@@ -8,6 +8,7 @@ from flaskr.common.i18n_utils import get_markdownflow_output_language
 from flaskr.dao import db, retry_on_deadlock
 from flaskr.service.check_risk.funcs import check_text_with_risk_control
 from flaskr.service.common import raise_error
+from flaskr.service.common.mdflow_cache import get_parsed_mdflow
 from flaskr.service.profile.profile_manage import (
     add_profile_item_quick_internal,
     get_profile_item_definition_list,
@@ -24,7 +25,6 @@ from flaskr.service.shifu.shifu_history_manager import (
 )
 from flaskr.service.user.models import UserInfo
 from flaskr.util.datetime import now_utc
-from markdown_flow import MarkdownFlow
 
 
 def get_shifu_mdflow(app: Flask, shifu_bid: str, outline_bid: str) -> str:
@@ -226,8 +226,8 @@ def save_shifu_mdflow(
                 new_outline.updated_at = now_utc()
                 db.session.add(new_outline)
                 db.session.flush()
-                markdown_flow = MarkdownFlow(content).set_output_language(
-                    get_markdownflow_output_language()
+                markdown_flow = get_parsed_mdflow(
+                    content, output_language=get_markdownflow_output_language()
                 )
                 blocks = markdown_flow.get_all_blocks()
                 variable_definitions = get_profile_item_definition_list(app, shifu_bid)
@@ -288,8 +288,8 @@ def parse_shifu_mdflow(
         mdflow = outline_item.content
         if data:
             mdflow = data
-        markdown_flow = MarkdownFlow(mdflow).set_output_language(
-            get_markdownflow_output_language()
+        markdown_flow = get_parsed_mdflow(
+            mdflow, output_language=get_markdownflow_output_language()
         )
         blocks = markdown_flow.get_all_blocks()
 
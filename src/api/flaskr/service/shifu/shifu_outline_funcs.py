@@ -8,13 +8,12 @@ Date: 2025-08-07
 
 from decimal import Decimal
 
-from flaskr.common.i18n_utils import get_markdownflow_output_language
 from flaskr.dao import db
 from flaskr.service.check_risk.funcs import check_text_with_risk_control
+from flaskr.service.common.mdflow_cache import get_mdflow_blocks
 from flaskr.service.common.models import raise_error, raise_param_error
 from flaskr.util import generate_id
 from flaskr.util.datetime import now_utc
-from markdown_flow import MarkdownFlow
 from sqlalchemy.orm import load_only
 
 from .consts import (
@@ -533,13 +532,10 @@ def build_outline_history_tree_from_outlines(
         parent_bid = str(outline.parent_bid or "").strip()
         outline_children_map.setdefault(parent_bid, []).append(outline)
 
-    output_lang = get_markdownflow_output_language()
-
     def _count_blocks(content: str) -> int:
         if not content:
             return 0
-        mdflow = MarkdownFlow(content).set_output_language(output_lang)
-        return len(mdflow.get_all_blocks())
+        return len(get_mdflow_blocks(content))
 
     def _build(parent_bid: str) -> list[HistoryItem]:
         children = outline_children_map.get(parent_bid, [])
@@ -723,10 +719,7 @@ def reorder_outline_tree(
                             bid=outline_dto.bid, id=item.id, type="outline", children=[]
                         )
                     if history_info.child_count == 0 and bool(item.content):
-                        mdflow = MarkdownFlow(item.content).set_output_language(
-                            get_markdownflow_output_language()
-                        )
-                        block_list = mdflow.get_all_blocks()
+                        block_list = get_mdflow_blocks(item.content)
                         history_info.child_count = len(block_list)
 
                     history_infos.append(history_info)
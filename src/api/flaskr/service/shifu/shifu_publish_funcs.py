@@ -15,13 +15,13 @@ from flaskr.api.langfuse import (
     get_langfuse_client,
 )
 from flaskr.api.llm import invoke_llm
-from flaskr.common.i18n_utils import get_markdownflow_output_language
 from flaskr.common.shifu_context import (
     apply_shifu_context_snapshot,
     get_shifu_context_snapshot,
 )
 from flaskr.dao import db
 from flaskr.service.common import raise_error
+from flaskr.service.common.mdflow_cache import get_mdflow_blocks
 from flaskr.service.metering import UsageContext
 from flaskr.service.metering.consts import BILL_USAGE_SCENE_DEBUG
 from flaskr.service.shifu.consts import (
@@ -33,6 +33,7 @@ from flaskr.service.shifu.models import (
     PublishedOutlineItem,
     PublishedShifu,
 )
+from flaskr.service.shifu.published_struct_cache import invalidate_published_struct
 from flaskr.service.shifu.shifu_draft_funcs import get_latest_shifu_draft
 from flaskr.service.shifu.shifu_history_manager import HistoryItem
 from flaskr.service.shifu.shifu_outline_funcs import (
@@ -50,7 +51,6 @@ from flaskr.util.datetime import now_utc
 from flaskr.util.prompt_loader import load_prompt_template
 from markdown_flow import (
     BlockType,
-    MarkdownFlow,
 )
 
 
@@ -183,10 +183,7 @@ def publish_shifu_draft(
             outline_item.content = draft_outline_item.content
             db.session.add(outline_item)
             db.session.flush()
-            markdown_flow = MarkdownFlow(
-                draft_outline_item.content
-            ).set_output_language(get_markdownflow_output_language())
-            blocks = markdown_flow.get_all_blocks()
+            blocks = get_mdflow_blocks(draft_outline_item.content)
             outline_item_history_item = HistoryItem(
                 bid=node.outline_id,
                 id=outline_item.id,
@@ -213,6 +210,7 @@ def publish_shifu_draft(
         shifu_log_published_struct.created_at = now_time
         db.session.add(shifu_log_published_struct)
         db.session.commit()
+        invalidate_published_struct(app, shifu_id)
         parent_shifu_context = get_shifu_context_snapshot()
         if sync_summary:
             _run_summary_with_error_handling(app, shifu_id, parent_shifu_context)
@@ -392,10 +390,7 @@ def _generate_summaries(
                     "outline_item: %s has mdflow content,make summary from mdflow",
                     outline_item.outline_item_bid,
                 )
-                mdflow = MarkdownFlow(outline_item.content).set_output_language(
-                    get_markdownflow_output_language()
-                )
-                blocks = mdflow.get_all_blocks()
+                blocks = get_mdflow_blocks(outline_item.content)
                 for block in blocks:
                     if block.block_type == BlockType.CONTENT:
                         now_lesson_script_prompts += "\n" + block.content
@@ -19,10 +19,10 @@ from flaskr.service.shifu.models import (
     DraftOutlineItem,
     DraftShifu,
     LogDraftStruct,
-    LogPublishedStruct,
     PublishedOutlineItem,
     PublishedShifu,
 )
+from flaskr.service.shifu.published_struct_cache import get_published_struct
 from flaskr.service.shifu.shifu_history_manager import HistoryItem
 from flaskr.service.shifu.utils import get_shifu_res_url
 from pydantic import BaseModel
@@ -75,13 +75,17 @@ def get_shifu_struct(
     """
     with app.app_context():
         app.logger.info("get_shifu_struct:%s,%s", shifu_bid, is_preview)
-        model = LogDraftStruct if is_preview else LogPublishedStruct
+        if not is_preview:
+            struct = get_published_struct(app, shifu_bid, active_only=False)
+            if not struct:
+                raise_error("server.shifu.shifuNotFound")
+            return struct
         shifu_struct = (
-            model.query.filter(
-                model.shifu_bid == shifu_bid,
+            LogDraftStruct.query.filter(
+                LogDraftStruct.shifu_bid == shifu_bid,
             )
             .order_by(
-                model.id.desc(),
+                LogDraftStruct.id.desc(),
             )
             .first()
         )
@@ -171,7 +175,11 @@ def get_shifu_outline_tree(
 
         outline_items = [recurse_outline_item(i) for i in struct.children]
         shifu_info.outline_items = [i for i in outline_items if i]
-        app.logger.info("shifu_info: %s", shifu_info.__json__())
+        app.logger.info(
+            "shifu_info: bid=%s outline_items=%s",
+            shifu_info.bid,
+            len(shifu_info.outline_items),
+        )
         return shifu_info
 
 
@@ -20,7 +20,7 @@ from flaskr.service.tts.minimax_voice_clone import (
     submit_minimax_voice_clone,
 )
 from flaskr.service.tts.pipeline import build_av_segmentation_contract
-from flaskr.service.tts.rpm_gate import TTSRpmQueueTimeoutError
+from flaskr.service.tts.rpm_gate import TTS_RPM_LANE_BULK, TTSRpmQueueTimeoutError
 from flaskr.service.tts.subtitle_utils import (
     append_subtitle_cue,
     normalize_subtitle_cues,
@@ -40,6 +40,7 @@ def create_streaming_tts_processor(**kwargs: object):
 
 
 __all__ = [
+    "TTS_RPM_LANE_BULK",
     "TTSRpmQueueTimeoutError",
     "append_subtitle_cue",
     "build_av_segmentation_contract",
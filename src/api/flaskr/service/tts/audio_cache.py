@@ -0,0 +1,374 @@
+"""Content-addressed cache of synthesized TTS audio.
+
+Results are keyed by a SHA-256 of the normalized text and every setting that
+changes the audio: provider, model, voice, speed, pitch, emotion, volume and
+output format. Audio bytes live in the storage layer under ``tts-cache/``;
+``tts_audio_cache_entries`` indexes them with the provider metadata callers
+meter on. Every store uploads to its own object name, so concurrent misses
+and evictions of the same key never touch each other's bytes. Once the
+indexed bytes exceed ``TTS_AUDIO_CACHE_MAX_BYTES`` the least recently hit
+entries are evicted; stores track a running total and only re-sum the index
+when it crosses the budget or goes stale. Index reads and writes run on their
+own connection, so a lookup never commits or rolls back the caller's session.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import threading
+import time
+import unicodedata
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from flaskr.api.tts.base import TTSResult
+from flaskr.common.log import AppLoggerProxy
+from flaskr.common.observability import (
+    record_tts_audio_cache_lookup,
+    record_tts_audio_cache_size,
+)
+from flaskr.dao import db
+from flaskr.service.common.storage import (
+    delete_storage_object,
+    read_storage_bytes,
+    upload_to_storage,
+)
+from flaskr.service.tts.models import TTSAudioCacheEntry
+from flaskr.util.datetime import now_utc
+from flaskr.util.uuid import generate_id
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.exc import IntegrityError
+
+if TYPE_CHECKING:
+    from flask import Flask
+    from flaskr.api.tts.base import AudioSettings, BaseTTSProvider, VoiceSettings
+
+logger = AppLoggerProxy(logging.getLogger(__name__))
+
+_KEY_VERSION = 1
+_OBJECT_KEY_PREFIX = "tts-cache"
+# Evict down to this share of the budget so the next few stores skip eviction.
+_EVICTION_TARGET_RATIO = 0.9
+_EVICTION_BATCH_SIZE = 200
+# Other processes store into the same index, so the running total is re-summed
+# at least this often.
+_SIZE_RESYNC_SECONDS = 60.0
+_CONTENT_TYPES = {
+    "mp3": "audio/mpeg",
+    "wav": "audio/wav",
+    "ogg": "audio/ogg",
+    "pcm": "application/octet-stream",
+}
+
+
+@dataclass(slots=True)
+class _CacheSizeEstimate:
+    """Running view of the indexed cache size kept by one process."""
+
+    total_bytes: int = 0
+    synced_at: float | None = None
+
+
+_size_estimate = _CacheSizeEstimate()
+_size_estimate_lock = threading.Lock()
+
+
+def build_tts_audio_cache_key(
+    *,
+    text: str,
+    provider_name: str,
+    model: str,
+    voice_settings: VoiceSettings,
+    audio_settings: AudioSettings,
+) -> str:
+    """Return the cache key for one synthesis request."""
+    normalized_text = " ".join(unicodedata.normalize("NFC", text or "").split())
+    payload = {
+        "v": _KEY_VERSION,
+        "text": normalized_text,
+        "provider": (provider_name or "").strip().lower(),
+        "model": (model or "").strip(),
+        "voice_id": voice_settings.voice_id or "",
+        "speed": round(float(voice_settings.speed or 0), 3),
+        "pitch": int(voice_settings.pitch or 0),
+        "emotion": voice_settings.emotion or "",
+        "volume": round(float(voice_settings.volume or 0), 3),
+        "format": (audio_settings.format or "").lower(),
+        "sample_rate": int(audio_settings.sample_rate or 0),
+        "bitrate": int(audio_settings.bitrate or 0),
+        "channel": int(audio_settings.channel or 0),
+    }
+    encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def synthesize_with_audio_cache(
+    app: Flask,
+    provider: BaseTTSProvider,
+    *,
+    text: str,
+    voice_settings: VoiceSettings | None,
+    audio_settings: AudioSettings | None,
+    model: str | None,
+) -> TTSResult:
+    """Serve a synthesis from the cache, synthesizing and storing it on a miss.
+
+    Cache failures never fail the synthesis; they are logged and counted as
+    ``error`` lookups.
+    """
+    max_bytes = _max_bytes(app)
+    if max_bytes <= 0:
+        return provider.synthesize(
+            text=text,
+            voice_settings=voice_settings,
+            audio_settings=audio_settings,
+            model=model,
+        )
+
+    provider_name = provider.provider_name
+    cache_key = build_tts_audio_cache_key(
+        text=text,
+        provider_name=provider_name,
+        model=model or "",
+        voice_settings=voice_settings or provider.get_default_voice_settings(),
+        audio_settings=audio_settings or provider.get_default_audio_settings(),
+    )
+    try:
+        cached = _load_cached_result(cache_key)
+    except Exception:
+        logger.warning("TTS audio cache lookup failed", exc_info=True)
+        record_tts_audio_cache_lookup(provider=provider_name, result="error")
+        cached = None
+    else:
+        record_tts_audio_cache_lookup(
+            provider=provider_name,
+            result="hit" if cached is not None else "miss",
+        )
+    if cached is not None:
+        return cached
+
+    result = provider.synthesize(
+        text=text,
+        voice_settings=voice_settings,
+        audio_settings=audio_settings,
+        model=model,
+    )
+    if result.audio_data and len(result.audio_data) <= max_bytes:
+        try:
+            stored = _store_result(
+                app,
+                cache_key,
+                result,
+                provider_name=provider_name,
+                model=model or "",
+                voice_id=getattr(voice_settings, "voice_id", "") or "",
+            )
+            if stored and _should_evict(len(result.audio_data), max_bytes=max_bytes):
+                evict_tts_audio_cache(max_bytes=max_bytes)
+        except Exception:
+            logger.warning("TTS audio cache store failed", exc_info=True)
+    return result
+
+
+def evict_tts_audio_cache(*, max_bytes: int) -> int:
+    """Evict least recently hit entries until the cache fits ``max_bytes``.
+
+    Returns the number of evicted entries.
+    """
+    total_column = func.coalesce(func.sum(TTSAudioCacheEntry.size_bytes), 0)
+    with db.engine.begin() as connection:
+        total_bytes = int(connection.execute(select(total_column)).scalar_one())
+        if total_bytes <= max_bytes:
+            _sync_size_estimate(total_bytes)
+            record_tts_audio_cache_size(total_bytes=total_bytes)
+            return 0
+
+        target_bytes = int(max_bytes * _EVICTION_TARGET_RATIO)
+        victims = []
+        while total_bytes > target_bytes:
+            rows = connection.execute(
+                select(
+                    TTSAudioCacheEntry.id,
+                    TTSAudioCacheEntry.storage_object_key,
+                    TTSAudioCacheEntry.storage_bucket,
+                    TTSAudioCacheEntry.size_bytes,
+                )
+                .order_by(
+                    TTSAudioCacheEntry.last_hit_at.asc(),
+                    TTSAudioCacheEntry.id.asc(),
+                )
+                .limit(_EVICTION_BATCH_SIZE)
+            ).all()
+            if not rows:
+                break
+            batch = []
+            for row in rows:
+                if total_bytes <= target_bytes:
+                    break
+                batch.append(row)
+                total_bytes -= int(row.size_bytes or 0)
+            connection.execute(
+                delete(TTSAudioCacheEntry).where(
+                    TTSAudioCacheEntry.id.in_([row.id for row in batch])
+                )
+            )
+            victims.extend(batch)
+
+    _sync_size_estimate(total_bytes)
+    # Objects go after their rows are committed; a reader that still holds an
+    # evicted row sees a missing object and falls back to synthesis. A key
+    # stored again meanwhile uploaded under a new object name.
+    for row in victims:
+        try:
+            delete_storage_object(
+                object_key=row.storage_object_key,
+                bucket_name=row.storage_bucket or "",
+            )
+        except Exception:
+            logger.warning(
+                "Failed to delete evicted TTS audio cache object %s",
+                row.storage_object_key,
+                exc_info=True,
+            )
+    record_tts_audio_cache_size(total_bytes=total_bytes, evicted=len(victims))
+    return len(victims)
+
+
+def _should_evict(stored_bytes: int, *, max_bytes: int) -> bool:
+    """Add a store to the running total; True when the index must be re-summed."""
+    with _size_estimate_lock:
+        state = _size_estimate
+        if (
+            state.synced_at is None
+            or time.monotonic() - state.synced_at >= _SIZE_RESYNC_SECONDS
+        ):
+            return True
+        state.total_bytes += stored_bytes
+        return state.total_bytes > max_bytes
+
+
+def _sync_size_estimate(total_bytes: int) -> None:
+    with _size_estimate_lock:
+        _size_estimate.total_bytes = total_bytes
+        _size_estimate.synced_at = time.monotonic()
+
+
+def _max_bytes(app: Flask) -> int:
+    try:
+        return max(int(app.config.get("TTS_AUDIO_CACHE_MAX_BYTES", 0) or 0), 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+def _load_cached_result(cache_key: str) -> TTSResult | None:
+    with db.engine.connect() as connection:
+        row = connection.execute(
+            select(
+                TTSAudioCacheEntry.id,
+                TTSAudioCacheEntry.storage_object_key,
+                TTSAudioCacheEntry.storage_bucket,
+                TTSAudioCacheEntry.audio_format,
+                TTSAudioCacheEntry.duration_ms,
+                TTSAudioCacheEntry.sample_rate,
+                TTSAudioCacheEntry.word_count,
+                TTSAudioCacheEntry.usage_characters,
+                TTSAudioCacheEntry.subtitle_cues,
+            ).where(TTSAudioCacheEntry.cache_key == cache_key)
+        ).first()
+    if row is None:
+        return None
+
+    try:
+        audio_data = read_storage_bytes(
+            object_key=row.storage_object_key,
+            bucket_name=row.storage_bucket or "",
+        )
+    except FileNotFoundError:
+        with db.engine.begin() as connection:
+            connection.execute(
+                delete(TTSAudioCacheEntry).where(TTSAudioCacheEntry.id == row.id)
+            )
+        return None
+
+    with db.engine.begin() as connection:
+        connection.execute(
+            update(TTSAudioCacheEntry)
+            .where(TTSAudioCacheEntry.id == row.id)
+            .values(
+                hit_count=TTSAudioCacheEntry.hit_count + 1,
+                last_hit_at=now_utc(),
+            )
+        )
+    return TTSResult(
+        audio_data=audio_data,
+        duration_ms=int(row.duration_ms or 0),
+        sample_rate=int(row.sample_rate or 0),
+        format=row.audio_format or "mp3",
+        word_count=int(row.word_count or 0),
+        usage_characters=int(row.usage_characters or 0),
+        subtitle_cues=list(row.subtitle_cues or []),
+    )
+
+
+def _store_result(
+    app: Flask,
+    cache_key: str,
+    result: TTSResult,
+    *,
+    provider_name: str,
+    model: str,
+    voice_id: str,
+) -> bool:
+    """Index ``result`` under ``cache_key``; False when another store won."""
+    audio_format = (result.format or "mp3").lower()
+    upload = upload_to_storage(
+        app,
+        file_content=result.audio_data,
+        object_key=(
+            f"{_OBJECT_KEY_PREFIX}/{cache_key[:2]}/{cache_key}-{generate_id(app)}"
+            f".{audio_format}"
+        ),
+        content_type=_CONTENT_TYPES.get(audio_format, "application/octet-stream"),
+        warm_up=False,
+    )
+    now = now_utc()
+    try:
+        with db.engine.begin() as connection:
+            connection.execute(
+                insert(TTSAudioCacheEntry).values(
+                    cache_key=cache_key,
+                    provider=provider_name[:32],
+                    model=model[:100],
+                    voice_id=voice_id[:128],
+                    storage_object_key=upload.object_key,
+                    storage_bucket=upload.bucket or "",
+                    audio_format=audio_format[:16],
+                    size_bytes=len(result.audio_data),
+                    duration_ms=int(result.duration_ms or 0),
+                    sample_rate=int(result.sample_rate or 0),
+                    word_count=int(result.word_count or 0),
+                    usage_characters=int(result.usage_characters or 0),
+                    subtitle_cues=list(result.subtitle_cues or []),
+                    hit_count=0,
+                    last_hit_at=now,
+                    created_at=now,
+                    updated_at=now,
+                )
+            )
+    except IntegrityError:
+        # A concurrent miss indexed the key first and serves its own object;
+        # the upload above is unreferenced.
+        try:
+            delete_storage_object(
+                object_key=upload.object_key, bucket_name=upload.bucket or ""
+            )
+        except Exception:
+            logger.warning(
+                "Failed to delete unindexed TTS audio cache object %s",
+                upload.object_key,
+                exc_info=True,
+            )
+        return False
+    return True
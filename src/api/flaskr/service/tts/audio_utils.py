@@ -1,6 +1,8 @@
 """Audio Processing Utilities.
 
-This module provides audio concatenation and processing functions using pydub/ffmpeg.
+This module provides audio concatenation and processing functions. Same-format
+MP3 is joined, measured and sliced at frame boundaries without decoding; other
+inputs go through pydub/ffmpeg.
 """
 
 import io
@@ -8,6 +10,7 @@ import logging
 from collections.abc import Sequence
 
 from flaskr.common.log import AppLoggerProxy
+from flaskr.service.tts.mp3_frames import concat_mp3_frames, parse_mp3_frames
 
 logger = AppLoggerProxy(logging.getLogger(__name__))
 # Sentence-level TTS segments should concatenate without overlap by default.
@@ -22,7 +25,9 @@ try:
     PYDUB_AVAILABLE = True
 except ImportError:
     PYDUB_AVAILABLE = False
-    logger.warning("pydub is not installed. Audio concatenation will not be available.")
+    logger.warning(
+        "pydub is not installed. Only same-format MP3 can be concatenated or sliced."
+    )
 
 
 def is_audio_processing_available() -> bool:
@@ -36,6 +41,21 @@ def _estimated_duration_ms(audio_data: bytes) -> int:
     return int(len(audio_data or b"") / 16000 * 1000)
 
 
+def _is_mp3(audio_format: str) -> bool:
+    return (audio_format or "").lower() == "mp3"
+
+
+def _concat_mp3_frame_segments(segments: Sequence[bytes]) -> bytes | None:
+    """Join MP3 segments at frame boundaries, or None if any cannot be."""
+    streams = []
+    for segment_data in segments:
+        stream = parse_mp3_frames(segment_data)
+        if stream is None:
+            return None
+        streams.append(stream)
+    return concat_mp3_frames(streams)
+
+
 def _load_audio_segment(audio_data: bytes, *, input_format: str = "mp3"):
     audio_io = io.BytesIO(audio_data)
     if input_format == "mp3" and hasattr(AudioSegment, "from_mp3"):
@@ -49,6 +69,10 @@ def try_get_audio_duration_ms(
     """Return decoded audio duration, or None when the bytes are not decodable."""
     if not audio_data:
         return 0
+    if _is_mp3(audio_format):
+        stream = parse_mp3_frames(audio_data)
+        if stream is not None:
+            return stream.duration_ms
     if not PYDUB_AVAILABLE:
         return _estimated_duration_ms(audio_data)
 
@@ -73,6 +97,9 @@ def concat_audio_mp3(
 ) -> bytes:
     """Concatenate multiple MP3 audio segments into a single audio file.
 
+    Segments that share one MP3 format are joined at frame boundaries without
+    re-encoding; mismatched or undecodable segments are re-encoded by pydub.
+
     Args:
         segments: List of audio data bytes (MP3 format)
         output_format: Output format (default: mp3)
@@ -83,17 +110,10 @@ def concat_audio_mp3(
         Concatenated audio data as bytes
 
     Raises:
-        ImportError: If pydub is not available
+        ImportError: If pydub is needed but not available
         ValueError: If no segments provided
 
     """
-    if not PYDUB_AVAILABLE:
-        error_message = (
-            "pydub is required for audio concatenation. "
-            "Install it with: pip install pydub"
-        )
-        raise ImportError(error_message)
-
     if not segments:
         error_message = "No audio segments to concatenate"
         raise ValueError(error_message)
@@ -101,6 +121,23 @@ def concat_audio_mp3(
     if len(segments) == 1:
         return segments[0]
 
+    if _is_mp3(output_format) and int(crossfade_ms or 0) <= 0:
+        joined = _concat_mp3_frame_segments(segments)
+        if joined:
+            logger.info(
+                "Joined %s MP3 segments at frame boundaries -> %s bytes",
+                len(segments),
+                len(joined),
+            )
+            return joined
+
+    if not PYDUB_AVAILABLE:
+        error_message = (
+            "pydub is required for audio concatenation. "
+            "Install it with: pip install pydub"
+        )
+        raise ImportError(error_message)
+
     logger.info("Concatenating %s audio segments", len(segments))
 
     # Initialize combined audio
@@ -209,8 +246,10 @@ def concat_audio_best_effort(
 ) -> bytes:
     """Concatenate audio segments with graceful fallback when processing is unavailable.
 
-    Never raw-byte-joins multiple MP3 files. If normal concatenation fails, it
-    re-exports the decodable subset so callers upload a standalone audio file.
+    Never raw-byte-joins multiple MP3 files: same-format MP3 is joined at frame
+    boundaries with tags and metadata frames dropped. If normal concatenation
+    fails, it re-exports the decodable subset so callers upload a standalone
+    audio file.
     """
     if not segments:
         return b""
@@ -230,6 +269,12 @@ def concat_audio_best_effort(
             return b""
         return only_segment
 
+    if _is_mp3(output_format):
+        present = [segment for segment in segments if segment]
+        joined = _concat_mp3_frame_segments(present)
+        if joined:
+            return joined
+
     if is_audio_processing_available():
         try:
             return concat_audio_mp3(list(segments), output_format=output_format)
@@ -247,6 +292,19 @@ def concat_audio_best_effort(
             logger.warning("Audio fallback found no decodable segments")
             return b""
 
+    if _is_mp3(output_format):
+        streams = [parse_mp3_frames(segment) for segment in segments if segment]
+        decodable = [stream for stream in streams if stream is not None]
+        joined = concat_mp3_frames(decodable) if decodable else None
+        if joined:
+            logger.warning(
+                "Audio processing unavailable; joined %s of %s MP3 segments "
+                "that share one format",
+                len(decodable),
+                len(segments),
+            )
+            return joined
+
     first_segment = next((segment for segment in segments if segment), b"")
     if len(segments) > 1 and first_segment:
         logger.warning(
@@ -267,9 +325,10 @@ def export_audio_range_best_effort(
 ) -> tuple[bytes, int]:
     """Export a time range from an encoded audio blob as a standalone audio file.
 
-    Returns ``(audio_bytes, duration_ms)``. If pydub/ffmpeg cannot decode the
-    range, returns ``(b"", 0)`` except for the full-audio fallback, where the
-    original bytes are returned.
+    Returns ``(audio_bytes, duration_ms)``. MP3 in and out is cut at frame
+    boundaries without re-encoding, keeping the frames that start inside the
+    range. If pydub/ffmpeg cannot decode the range, returns ``(b"", 0)`` except
+    for the full-audio fallback, where the original bytes are returned.
     """
     if not audio_data:
         return b"", 0
@@ -277,6 +336,11 @@ def export_audio_range_best_effort(
     safe_start_ms = max(int(start_ms or 0), 0)
     safe_end_ms = int(end_ms) if end_ms is not None else None
 
+    if _is_mp3(input_format) and _is_mp3(output_format):
+        stream = parse_mp3_frames(audio_data)
+        if stream is not None:
+            return stream.slice_ms(safe_start_ms, safe_end_ms)
+
     if is_audio_processing_available():
         try:
             audio = _load_audio_segment(audio_data, input_format=input_format)
@@ -354,3 +354,89 @@ class TTSMiniMaxClonedVoice(db.Model):
             "status": self.status,
             "created_at": to_utc_iso(self.created_at),
         }
+
+
+class TTSAudioCacheEntry(db.Model):
+    """Index row of one content-addressed synthesized audio object."""
+
+    __tablename__ = "tts_audio_cache_entries"
+    __table_args__ = (
+        UniqueConstraint("cache_key", name="uq_tts_audio_cache_entries_cache_key"),
+        Index("ix_tts_audio_cache_entries_last_hit", "last_hit_at", "id"),
+        {"comment": "Content-addressed cache of synthesized TTS audio"},
+    )
+
+    id = Column(BIGINT, primary_key=True, autoincrement=True)
+    cache_key = Column(
+        String(64),
+        nullable=False,
+        default="",
+        comment="SHA-256 of the normalized text and synthesis settings",
+    )
+    provider = Column(String(32), nullable=False, default="", comment="TTS provider")
+    model = Column(String(100), nullable=False, default="", comment="TTS model")
+    voice_id = Column(String(128), nullable=False, default="", comment="Voice ID")
+    storage_object_key = Column(
+        String(512),
+        nullable=False,
+        default="",
+        comment="Storage object key of the audio",
+    )
+    storage_bucket = Column(
+        String(255),
+        nullable=False,
+        default="",
+        comment="Storage bucket name",
+    )
+    audio_format = Column(
+        String(16),
+        nullable=False,
+        default="mp3",
+        comment="Audio format",
+    )
+    size_bytes = Column(Integer, nullable=False, default=0, comment="Audio bytes")
+    duration_ms = Column(
+        Integer,
+        nullable=False,
+        default=0,
+        comment="Audio duration in milliseconds",
+    )
+    sample_rate = Column(Integer, nullable=False, default=0, comment="Sample rate")
+    word_count = Column(
+        Integer,
+        nullable=False,
+        default=0,
+        comment="Provider word count",
+    )
+    usage_characters = Column(
+        Integer,
+        nullable=False,
+        default=0,
+        comment="Provider billed characters",
+    )
+    subtitle_cues = Column(JSON, nullable=True, comment="Provider subtitle cues")
+    hit_count = Column(
+        Integer,
+        nullable=False,
+        default=0,
+        comment="Times the entry was served",
+    )
+    last_hit_at = Column(
+        DateTime,
+        nullable=False,
+        default=now_utc,
+        comment="Last time the entry was stored or served",
+    )
+    created_at = Column(
+        DateTime,
+        nullable=False,
+        default=now_utc,
+        comment="Creation timestamp",
+    )
+    updated_at = Column(
+        DateTime,
+        nullable=False,
+        default=now_utc,
+        onupdate=now_utc,
+        comment="Last update timestamp",
+    )
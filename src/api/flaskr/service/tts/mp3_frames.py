@@ -0,0 +1,323 @@
+"""MPEG audio frame parsing for decode-free MP3 concat, duration and slicing.
+
+TTS providers return MPEG-1/2/2.5 Layer I-III streams whose frames can be
+joined, counted and cut without decoding. ``parse_mp3_frames`` walks the frame
+headers once, skipping ID3v2/ID3v1/APEv2 tags and the Xing/Info/VBRI metadata
+frame, and returns ``None`` for anything it does not recognise so callers can
+fall back to pydub/ffmpeg.
+
+Durations count whole frames. Encoder priming and padding recorded in a LAME
+tag are not subtracted, so a tagged file reads up to two frames longer than
+ffmpeg decodes it. Slices start on a frame boundary; a Layer III slice whose
+first frame borrows from the bit reservoir loses that frame's audio when
+decoded on its own.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+# Bitrates in kbps indexed by [version family][layer][bitrate index].
+_BITRATES_KBPS = {
+    1: {
+        1: (0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448),
+        2: (0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384),
+        3: (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    },
+    2: {
+        1: (0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256),
+        2: (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+        3: (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+    },
+}
+# Version bits -> (version label, sample rates by index).
+_VERSIONS = {
+    0: ("2.5", (11025, 12000, 8000)),
+    2: ("2", (22050, 24000, 16000)),
+    3: ("1", (44100, 48000, 32000)),
+}
+# Layer bits -> layer number.
+_LAYERS = {1: 3, 2: 2, 3: 1}
+_ID3V1_SIZE = 128
+_APE_FOOTER_SIZE = 32
+
+
+@dataclass(frozen=True)
+class Mp3Format:
+    """Stream parameters that must match for frames to be joined."""
+
+    version: str
+    layer: int
+    sample_rate: int
+    channels: int
+
+    @property
+    def samples_per_frame(self) -> int:
+        """Return PCM samples per channel carried by one frame."""
+        if self.layer == 1:
+            return 384
+        if self.layer == 3 and self.version != "1":
+            return 576
+        return 1152
+
+
+@dataclass(frozen=True)
+class _FrameHeader:
+    format: Mp3Format
+    length: int
+    side_info_offset: int
+    side_info_size: int
+
+
+@dataclass(frozen=True)
+class Mp3Frames:
+    """Audio frames located in one MP3 blob."""
+
+    data: bytes
+    format: Mp3Format
+    # (offset, length) of every audio frame; the metadata frame is excluded.
+    frames: list[tuple[int, int]]
+
+    @property
+    def sample_count(self) -> int:
+        """Return the number of PCM samples per channel in the stream."""
+        return len(self.frames) * self.format.samples_per_frame
+
+    @property
+    def duration_ms(self) -> int:
+        """Return the stream duration rounded to the nearest millisecond."""
+        return _samples_to_ms(self.sample_count, self.format.sample_rate)
+
+    def to_bytes(self) -> bytes:
+        """Return the audio frames without tags or a metadata frame."""
+        return _join_frames(self.data, self.frames)
+
+    def slice_ms(self, start_ms: int, end_ms: int | None = None) -> tuple[bytes, int]:
+        """Return the frames starting in ``[start_ms, end_ms)`` and their duration.
+
+        Frames are assigned by start time, so adjacent ranges partition the
+        stream without overlap.
+        """
+        frame_ms_scale = self.format.samples_per_frame * 1000
+        sample_rate = self.format.sample_rate
+        first = _ceil_div(max(int(start_ms), 0) * sample_rate, frame_ms_scale)
+        last = len(self.frames)
+        if end_ms is not None:
+            end_frame = _ceil_div(max(int(end_ms), 0) * sample_rate, frame_ms_scale)
+            last = min(end_frame, last)
+        if first >= last:
+            return b"", 0
+        selected = self.frames[first:last]
+        duration_ms = _samples_to_ms(
+            len(selected) * self.format.samples_per_frame, sample_rate
+        )
+        return _join_frames(self.data, selected), duration_ms
+
+
+def parse_mp3_frames(data: bytes) -> Mp3Frames | None:
+    """Locate the audio frames in ``data``.
+
+    Returns ``None`` when the bytes are not a single-format MPEG audio stream.
+    """
+    if not data:
+        return None
+    end = _audio_end(data)
+    position = 0
+    frames: list[tuple[int, int]] = []
+    stream_format: Mp3Format | None = None
+    in_sync = False
+    junk_bytes = 0
+    header_cache: dict[bytes, _FrameHeader | None] = {}
+    last_header_bytes = b""
+    last_header: _FrameHeader | None = None
+
+    while position + 4 <= end:
+        # Fast path: constant-bitrate streams repeat one header frame after frame.
+        if in_sync and data.startswith(last_header_bytes, position):
+            if position + last_header.length > end:
+                break
+            frames.append((position, last_header.length))
+            position += last_header.length
+            continue
+
+        if data.startswith(b"ID3", position):
+            tag_size = _id3v2_size(data, position)
+            if tag_size is None:
+                return None
+            position += tag_size
+            continue
+
+        header_bytes = data[position : position + 4]
+        if header_bytes in header_cache:
+            header = header_cache[header_bytes]
+        else:
+            header = header_cache[header_bytes] = _parse_header(header_bytes)
+
+        if in_sync and header is not None and header.format == stream_format:
+            if position + header.length > end:
+                # A stream cut mid-frame: keep the complete frames.
+                break
+        elif header is None or not _confirms_sync(
+            data, position, header, end, stream_format
+        ):
+            in_sync = False
+            position += 1
+            junk_bytes += 1
+            continue
+
+        in_sync = True
+        last_header_bytes, last_header = header_bytes, header
+        if stream_format is None:
+            stream_format = header.format
+            if _is_metadata_frame(data, position, header):
+                position += header.length
+                continue
+        frames.append((position, header.length))
+        position += header.length
+
+    if stream_format is None or not frames:
+        return None
+    if junk_bytes * 8 > len(data):
+        return None
+    return Mp3Frames(data=data, format=stream_format, frames=frames)
+
+
+def concat_mp3_frames(streams: Sequence[Mp3Frames]) -> bytes | None:
+    """Join parsed streams at frame boundaries.
+
+    Returns ``None`` when the streams do not share one format.
+    """
+    if not streams:
+        return None
+    stream_format = streams[0].format
+    if any(stream.format != stream_format for stream in streams):
+        return None
+    return b"".join(stream.to_bytes() for stream in streams)
+
+
+def _parse_header(header: bytes) -> _FrameHeader | None:
+    if len(header) < 4 or header[0] != 0xFF or header[1] & 0xE0 != 0xE0:
+        return None
+    version_bits = (header[1] >> 3) & 0x03
+    layer = _LAYERS.get((header[1] >> 1) & 0x03)
+    version = _VERSIONS.get(version_bits)
+    bitrate_index = header[2] >> 4
+    sample_rate_index = (header[2] >> 2) & 0x03
+    if (
+        version is None
+        or layer is None
+        or bitrate_index in (0, 15)
+        or sample_rate_index == 3
+    ):
+        return None
+
+    version_label, sample_rates = version
+    bitrate = _BITRATES_KBPS[1 if version_label == "1" else 2][layer][bitrate_index]
+    sample_rate = sample_rates[sample_rate_index]
+    padding = (header[2] >> 1) & 0x01
+    channels = 1 if header[3] >> 6 == 3 else 2
+    stream_format = Mp3Format(
+        version=version_label,
+        layer=layer,
+        sample_rate=sample_rate,
+        channels=channels,
+    )
+    if layer == 1:
+        length = (12 * bitrate * 1000 // sample_rate + padding) * 4
+    else:
+        slot_factor = stream_format.samples_per_frame // 8
+        length = slot_factor * bitrate * 1000 // sample_rate + padding
+
+    side_info_offset = 4 if header[1] & 0x01 else 6
+    if layer != 3:
+        side_info_size = 0
+    elif version_label == "1":
+        side_info_size = 17 if channels == 1 else 32
+    else:
+        side_info_size = 9 if channels == 1 else 17
+    return _FrameHeader(
+        format=stream_format,
+        length=length,
+        side_info_offset=side_info_offset,
+        side_info_size=side_info_size,
+    )
+
+
+def _confirms_sync(
+    data: bytes,
+    position: int,
+    header: _FrameHeader,
+    end: int,
+    stream_format: Mp3Format | None,
+) -> bool:
+    """Accept a new sync point only when the next frame or a tag follows it."""
+    if stream_format is not None and header.format != stream_format:
+        return False
+    next_position = position + header.length
+    if next_position > end:
+        return False
+    if next_position + 4 > end or data[next_position : next_position + 3] == b"ID3":
+        return True
+    following = _parse_header(data[next_position : next_position + 4])
+    return following is not None and following.format == header.format
+
+
+def _is_metadata_frame(data: bytes, position: int, header: _FrameHeader) -> bool:
+    xing_offset = position + header.side_info_offset + header.side_info_size
+    if data[xing_offset : xing_offset + 4] in (b"Xing", b"Info"):
+        return True
+    return data[position + 36 : position + 40] == b"VBRI"
+
+
+def _id3v2_size(data: bytes, position: int) -> int | None:
+    header = data[position : position + 10]
+    if len(header) < 10 or any(byte & 0x80 for byte in header[6:10]):
+        return None
+    size = (header[6] << 21) | (header[7] << 14) | (header[8] << 7) | header[9]
+    footer = 10 if header[5] & 0x10 else 0
+    return 10 + size + footer
+
+
+def _audio_end(data: bytes) -> int:
+    end = len(data)
+    if end >= _ID3V1_SIZE and data[end - _ID3V1_SIZE : end - _ID3V1_SIZE + 3] == (
+        b"TAG"
+    ):
+        end -= _ID3V1_SIZE
+    footer_start = end - _APE_FOOTER_SIZE
+    if footer_start >= 0 and data[footer_start : footer_start + 8] == b"APETAGEX":
+        tag_size = int.from_bytes(data[footer_start + 12 : footer_start + 16], "little")
+        flags = int.from_bytes(data[footer_start + 20 : footer_start + 24], "little")
+        has_header = bool(flags & 0x80000000)
+        end = max(end - tag_size - (_APE_FOOTER_SIZE if has_header else 0), 0)
+    return end
+
+
+def _join_frames(data: bytes, frames: Sequence[tuple[int, int]]) -> bytes:
+    """Copy frames out of ``data``, merging runs that are already contiguous."""
+    if not frames:
+        return b""
+    view = memoryview(data)
+    spans: list[memoryview] = []
+    span_start, span_end = frames[0][0], frames[0][0] + frames[0][1]
+    for offset, length in frames[1:]:
+        if offset != span_end:
+            spans.append(view[span_start:span_end])
+            span_start = offset
+        span_end = offset + length
+    spans.append(view[span_start:span_end])
+    if len(spans) == 1 and span_start == 0 and span_end == len(data):
+        return data
+    return b"".join(spans)
+
+
+def _samples_to_ms(samples: int, sample_rate: int) -> int:
+    return (samples * 1000 + sample_rate // 2) // sample_rate
+
+
+def _ceil_div(numerator: int, denominator: int) -> int:
+    return -(-numerator // denominator)
@@ -82,6 +82,10 @@ AV_SANDBOX_START = re.compile(
 AV_CLOSING_BOUNDARY = re.compile(r"</[a-z][^>]*>\s*\n(?=[^\s<])", re.IGNORECASE)
 AV_SPEAKABLE_HINT = re.compile(r"<(p|li|h[1-6])\b", re.IGNORECASE)
 
+# Every AV boundary candidate starts at one of these sequences; text between
+# them can be skipped by the incremental contract builder.
+AV_CANDIDATE_TRIGGER = re.compile(r"!\[|\$\$|```|<|\|")
+
 # Fixed marker validation
 FIXED_MARKER_TAIL = re.compile(r"^[\s!=]*$")
 
@@ -41,6 +41,7 @@ from flaskr.service.tts.audio_utils import (
     get_audio_duration_ms,
 )
 from flaskr.service.tts.patterns import (
+    AV_CANDIDATE_TRIGGER,
     AV_CLOSING_BOUNDARY,
     AV_IFRAME_CLOSE,
     AV_IFRAME_OPEN,
@@ -511,6 +512,251 @@ def build_av_segmentation_contract(raw: str, block_bid: str = "") -> dict:
     }
 
 
+_AV_OPEN_TAG_PATTERNS = (
+    AV_SVG_OPEN,
+    AV_IFRAME_OPEN,
+    AV_VIDEO_OPEN,
+    AV_TABLE_OPEN,
+    AV_IMG_TAG_START,
+    AV_SANDBOX_START,
+)
+
+
+def _is_live_av_trigger(raw: str, index: int, line_floor: int) -> bool:
+    """Return whether the trigger at ``index`` may start an AV boundary.
+
+    Callers only pass triggers on complete lines, so a trigger reported dead
+    stays dead however the text grows. ``line_floor`` is where the text being
+    segmented starts; it counts as a line start.
+    """
+    if raw.startswith("<", index):
+        return any(pattern.match(raw, index) for pattern in _AV_OPEN_TAG_PATTERNS)
+    if raw.startswith("|", index):
+        line_start = max(raw.rfind("\n", line_floor, index) + 1, line_floor)
+        line_end = raw.find("\n", index)
+        if line_end == -1:
+            line_end = len(raw)
+        return AV_MD_TABLE_ROW.match(raw[line_start:line_end]) is not None
+    if raw.startswith("![", index):
+        if AV_MD_IMAGE.match(raw, index):
+            return True
+        alt_close = raw.find("]", index + 2)
+        if alt_close == -1 or alt_close + 1 >= len(raw):
+            return True
+        if raw[alt_close + 1] != "(":
+            return False
+        # The image did not match, so a newline already ended its URL.
+        return raw.find("\n", alt_close + 2) == -1
+    # Fences and `$$` stay live until they are closed.
+    return True
+
+
+class IncrementalAVSegmenter:
+    """Keep ``build_av_segmentation_contract`` output current for a growing text.
+
+    Streaming listen mode used to rebuild the contract over the whole block
+    after every LLM chunk. This builder produces the same contract, but it
+    commits a visual boundary, and the speakable text before it, once no
+    later text can change that decision. Only the uncommitted tail is
+    segmented again on each chunk, and whole lines without a possible
+    boundary start are skipped, so the work per chunk stays bounded by the
+    pending tail instead of the block length.
+
+    A boundary is committed only when it is complete, a newline follows its
+    end (fixed-marker extension and fence language detection look at that
+    line), sandbox blocks end on a closing-tag boundary rather than the
+    end-of-buffer fallback, and no construct that could still complete
+    (an open ``![`` or ``$$``) appears before it.
+    """
+
+    def __init__(self, block_bid: str = "") -> None:
+        """Start an empty contract for ``block_bid``."""
+        self._block_bid = block_bid or ""
+        self._raw = ""
+        self._visual_boundaries: list[dict] = []
+        self._speakable_segments: list[dict] = []
+        # Offset where the uncommitted tail starts and the visual before it.
+        self._committed_end = 0
+        self._after_visual_kind = ""
+        # Line-aligned offset before which the tail holds no live trigger,
+        # and the offset from which triggers are still to be examined.
+        self._search_start = 0
+        self._trigger_cursor = 0
+        self._contract: dict = {"visual_boundaries": [], "speakable_segments": []}
+
+    @property
+    def raw(self) -> str:
+        """Return the accumulated raw text."""
+        return self._raw
+
+    @property
+    def contract(self) -> dict:
+        """Return the contract for the accumulated raw text."""
+        return self._contract
+
+    def append(self, chunk: str) -> dict:
+        """Append ``chunk`` and return the contract for the accumulated text."""
+        if chunk:
+            self._raw += chunk
+            self._contract = self._rebuild()
+        return self._contract
+
+    def _append_speakable(
+        self,
+        segments: list[dict],
+        *,
+        text: str,
+        start_offset: int,
+        end_offset: int,
+        after_visual_kind: str,
+    ) -> None:
+        cleaned = (text or "").strip()
+        if not cleaned:
+            return
+        segments.append(
+            {
+                "position": len(segments),
+                "text": cleaned,
+                "after_visual_kind": after_visual_kind,
+                "block_bid": self._block_bid,
+                "source_span": [int(start_offset), int(end_offset)],
+            }
+        )
+
+    def _append_visual(
+        self, boundaries: list[dict], *, kind: str, start: int, end: int
+    ) -> None:
+        boundaries.append(
+            {
+                "kind": kind,
+                "position": len(boundaries),
+                "block_bid": self._block_bid,
+                "source_span": [int(start), int(end)],
+            }
+        )
+
+    def _skip_dead_lines(self) -> None:
+        """Advance the search start over complete lines without live triggers."""
+        raw = self._raw
+        limit = raw.rfind("\n", self._trigger_cursor) + 1
+        if limit <= self._trigger_cursor:
+            return
+        for match in AV_CANDIDATE_TRIGGER.finditer(raw, self._trigger_cursor, limit):
+            index = match.start()
+            if _is_live_av_trigger(raw, index, self._committed_end):
+                line_start = max(
+                    raw.rfind("\n", self._committed_end, index) + 1,
+                    self._committed_end,
+                )
+                self._search_start = max(self._search_start, line_start)
+                self._trigger_cursor = index
+                return
+            self._trigger_cursor = match.end()
+        self._search_start = max(self._search_start, limit)
+        self._trigger_cursor = limit
+
+    def _has_live_trigger_before(self, end: int) -> bool:
+        raw = self._raw
+        for match in AV_CANDIDATE_TRIGGER.finditer(
+            raw, self._search_start, min(len(raw), end + 2)
+        ):
+            if match.start() >= end:
+                break
+            if _is_live_av_trigger(raw, match.start(), self._committed_end):
+                return True
+        return False
+
+    def _is_stable(self, text: str, boundary: tuple[str, int, int, bool]) -> bool:
+        kind, start, end, complete = boundary
+        if not complete or end <= start:
+            return False
+        if self._raw.find("\n", self._search_start + end) == -1:
+            return False
+        if kind == "sandbox":
+            closing = next(
+                (
+                    match
+                    for match in AV_CLOSING_BOUNDARY.finditer(text)
+                    if match.start() > start
+                ),
+                None,
+            )
+            if closing is None or closing.end() != end:
+                return False
+        return not self._has_live_trigger_before(self._search_start + start)
+
+    def _commit(self, boundary: tuple[str, int, int, bool]) -> None:
+        kind, start, end, _complete = boundary
+        start += self._search_start
+        end += self._search_start
+        self._append_speakable(
+            self._speakable_segments,
+            text=self._raw[self._committed_end : start],
+            start_offset=self._committed_end,
+            end_offset=start,
+            after_visual_kind=self._after_visual_kind,
+        )
+        self._append_visual(self._visual_boundaries, kind=kind, start=start, end=end)
+        self._committed_end = end
+        self._search_start = end
+        self._trigger_cursor = end
+        self._after_visual_kind = kind
+
+    def _rebuild(self) -> dict:
+        while True:
+            self._skip_dead_lines()
+            text = self._raw[self._search_start :]
+            boundary = _find_next_av_boundary(text)
+            if boundary is None or not self._is_stable(text, boundary):
+                break
+            self._commit(boundary)
+
+        visual_boundaries = list(self._visual_boundaries)
+        speakable_segments = list(self._speakable_segments)
+        # Segment the tail exactly like build_av_segmentation_contract, reusing
+        # the first boundary found above (shifted to tail coordinates).
+        text = self._raw[self._committed_end :]
+        base_offset = self._committed_end
+        after_visual_kind = self._after_visual_kind
+        if boundary is not None:
+            shift = self._search_start - self._committed_end
+            kind, start, end, complete = boundary
+            boundary = (kind, start + shift, end + shift, complete)
+        while text and text.strip():
+            if boundary is None or boundary[2] <= boundary[1]:
+                self._append_speakable(
+                    speakable_segments,
+                    text=text,
+                    start_offset=base_offset,
+                    end_offset=base_offset + len(text),
+                    after_visual_kind=after_visual_kind,
+                )
+                break
+            kind, start, end, _complete = boundary
+            self._append_speakable(
+                speakable_segments,
+                text=text[:start],
+                start_offset=base_offset,
+                end_offset=base_offset + start,
+                after_visual_kind=after_visual_kind,
+            )
+            self._append_visual(
+                visual_boundaries,
+                kind=kind,
+                start=base_offset + start,
+                end=base_offset + end,
+            )
+            text = text[end:]
+            base_offset += end
+            after_visual_kind = kind
+            boundary = _find_next_av_boundary(text) if text else None
+
+        return {
+            "visual_boundaries": visual_boundaries,
+            "speakable_segments": speakable_segments,
+        }
+
+
 def split_av_speakable_segments(raw: str) -> list[str]:
     """Split raw Markdown/HTML content into ordered speakable segments for AV sync.
 
@@ -7,7 +7,7 @@ import logging
 import math
 import threading
 import time
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import TYPE_CHECKING
 
 from flaskr.common.log import AppLoggerProxy
@@ -18,11 +18,82 @@ if TYPE_CHECKING:
 
 logger = AppLoggerProxy(logging.getLogger(__name__))
 
-_LOCAL_STATE: dict[str, float] = {}
+_LOCAL_STATE: dict[str, _SlotScope] = {}
 _LOCAL_LOCK = threading.RLock()
 _FALLBACK_WARNING_LOCK = threading.Lock()
 _FALLBACK_WARNING_KEYS: set[str] = set()
 
+TTS_RPM_LANE_PRIORITY = "priority"
+TTS_RPM_LANE_STANDARD = "standard"
+TTS_RPM_LANE_BULK = "bulk"
+
+# How many slots ahead of the shared cursor each lane may book; ``None`` books
+# as far ahead as the caller's wait budget allows.
+_LANE_LOOKAHEAD_SLOTS: dict[str, int | None] = {
+    TTS_RPM_LANE_PRIORITY: None,
+    TTS_RPM_LANE_STANDARD: 1,
+    TTS_RPM_LANE_BULK: 0,
+}
+_PRIORITY_CLASSES = frozenset({"priority", "vip"})
+# Matches the microsecond precision slots are stored with.
+_SLOT_EPSILON_SECONDS = 1e-6
+# A queued waiter keeps its ticket until this long past its own deadline; a
+# waiter that died without leaving the queue is skipped once its lease lapses.
+_WAITER_LEASE_GRACE_SECONDS = 5.0
+# Shortest re-poll (capped at one slot interval) for a waiter that still has
+# tickets ahead of it, so it does not spin while the head has yet to book.
+_QUEUED_POLL_SECONDS = 0.05
+
+# KEYS[1]: next_available_at; KEYS[2..4]: the lane's waiting tickets (zset by
+# arrival), ticket leases (hash) and ticket counter. ARGV: now, interval,
+# lookahead (<0 = unlimited, no queue), deadline, ttl, ticket ('' = new),
+# lease_until. Returns {granted, slot, ticket, waiters ahead}; slot is a string
+# so Lua keeps the fractional seconds. _book_slot mirrors this script.
+_RESERVE_SLOT_SCRIPT = """
+local now = tonumber(ARGV[1])
+local interval = tonumber(ARGV[2])
+local lookahead = tonumber(ARGV[3])
+local deadline = tonumber(ARGV[4])
+local ticket = ARGV[6]
+local next_at = tonumber(redis.call('get', KEYS[1]) or '0') or 0
+local slot = math.max(now, next_at)
+local ahead = 0
+if lookahead >= 0 then
+    if ticket == '' or not redis.call('zscore', KEYS[2], ticket) then
+        ticket = tostring(redis.call('incr', KEYS[4]))
+        redis.call('zadd', KEYS[2], ticket, ticket)
+    end
+    redis.call('hset', KEYS[3], ticket, ARGV[7])
+    for _, waiter in ipairs(redis.call('zrange', KEYS[2], 0, -1)) do
+        if waiter == ticket then
+            break
+        end
+        local lease = tonumber(redis.call('hget', KEYS[3], waiter) or '0') or 0
+        if lease < now then
+            redis.call('zrem', KEYS[2], waiter)
+            redis.call('hdel', KEYS[3], waiter)
+        else
+            ahead = ahead + 1
+        end
+    end
+    for index = 2, 4 do
+        redis.call('expire', KEYS[index], ARGV[5])
+    end
+    slot = slot + ahead * interval
+end
+local granted = ahead == 0 and slot <= deadline
+    and (lookahead < 0 or slot - now <= lookahead)
+if lookahead >= 0 and (granted or slot > deadline) then
+    redis.call('zrem', KEYS[2], ticket)
+    redis.call('hdel', KEYS[3], ticket)
+end
+if not granted then
+    return {0, string.format('%.6f', slot), ticket, ahead}
+end
+redis.call('set', KEYS[1], string.format('%.6f', slot + interval), 'EX', ARGV[5])
+return {1, string.format('%.6f', slot), ticket, 0}
+"""
+
 
 class TTSRpmQueueTimeoutError(TimeoutError):
     """Raised when a TTS request cannot enter the RPM queue fast enough."""
@@ -36,6 +107,38 @@ class TTSRpmGateResult:
     scheduled_at: float
 
 
+@dataclass(frozen=True)
+class _Reservation:
+    granted: bool
+    scheduled_at: float
+    ticket: str = ""
+    queued_ahead: int = 0
+
+
+@dataclass
+class _SlotScope:
+    """Process-local twin of one scope's Redis keys."""
+
+    next_available_at: float = 0.0
+    last_tickets: dict[str, int] = field(default_factory=dict)
+    # lane -> ticket -> lease_until, in arrival order.
+    waiters: dict[str, dict[str, float]] = field(default_factory=dict)
+
+
+def resolve_tts_rpm_lane(*, priority_class: str, live: bool) -> str:
+    """Map a creator priority class to an RPM gate lane.
+
+    Only live learner-facing synthesis can use the priority lane; preview,
+    debug and backfill synthesis always queue in the bulk lane.
+    """
+    if not live:
+        return TTS_RPM_LANE_BULK
+    normalized = str(priority_class or "").strip().lower()
+    if normalized in _PRIORITY_CLASSES:
+        return TTS_RPM_LANE_PRIORITY
+    return TTS_RPM_LANE_STANDARD
+
+
 def acquire_tts_rpm_slot(
     *,
     provider: str,
@@ -43,6 +146,7 @@ def acquire_tts_rpm_slot(
     rpm_limit: float,
     max_wait_seconds: float,
     model: str = "",
+    lane: str = TTS_RPM_LANE_STANDARD,
     now_fn: Callable[[], float] = time.time,
     sleep_fn: Callable[[float], None] = time.sleep,
 ) -> TTSRpmGateResult:
@@ -52,9 +156,21 @@ def acquire_tts_rpm_slot(
     queue is scoped by model as well as provider/API key: each model smooths
     against its own limit instead of sharing a single global queue.
 
-    The Redis path coordinates all workers. When Redis is not configured or is
-    unreachable, the local process path still protects a single worker so the
-    request can continue with reduced coordination guarantees.
+    All lanes share one slot cursor. The priority lane books the next slot
+    straight away; the standard lane books at most one slot ahead and the bulk
+    lane only books a slot that is already due, re-polling otherwise, so a
+    priority request arriving later still takes the next free slot.
+
+    Waiters in the standard and bulk lanes take a ticket on their first poll
+    and only the oldest live ticket of a lane may book, so a lane is served in
+    arrival order however its waiters' polls interleave. A waiter whose place
+    in the queue already puts its slot past the deadline gives up its ticket
+    and times out.
+
+    The Redis path reserves each slot with one atomic script call. When Redis
+    is not configured or is unreachable, the local process path still protects
+    a single worker so the request can continue with reduced coordination
+    guarantees.
     """
     limit = float(rpm_limit or 0)
     if limit <= 0:
@@ -63,104 +179,198 @@ def acquire_tts_rpm_slot(
 
     wait_cap = max(float(max_wait_seconds or 0), 0.0)
     interval = 60.0 / limit
+    lane = _normalize_lane(lane)
+    lookahead = _lane_lookahead_seconds(lane, interval=interval)
+    booking_window = lookahead + _SLOT_EPSILON_SECONDS if lookahead >= 0 else -1.0
     scope_key = _model_scope_key(provider=provider, api_key=api_key, model=model)
     start = now_fn()
     deadline = start + wait_cap
+    lease_until = deadline + _WAITER_LEASE_GRACE_SECONDS
+    use_redis = True
+    ticket = ""
 
-    try:
-        result = _acquire_redis_slot(
-            scope_key=scope_key,
-            interval=interval,
-            deadline=deadline,
-            max_wait_seconds=wait_cap,
-            now_fn=now_fn,
-        )
-    except TTSRpmQueueTimeoutError:
-        raise
-    except Exception as exc:
-        _warn_redis_fallback_once(provider=provider, scope_key=scope_key, exc=exc)
-        result = _acquire_local_slot(
-            scope_key=scope_key,
-            interval=interval,
-            deadline=deadline,
-            now_fn=now_fn,
-        )
-
-    sleep_seconds = max(result.scheduled_at - now_fn(), 0.0)
+    while True:
+        now = now_fn()
+        reservation = None
+        if use_redis:
+            try:
+                reservation = _reserve_redis_slot(
+                    scope_key=scope_key,
+                    lane=lane,
+                    now=now,
+                    interval=interval,
+                    lookahead=booking_window,
+                    deadline=deadline,
+                    max_wait_seconds=wait_cap,
+                    ticket=ticket,
+                    lease_until=lease_until,
+                )
+            except Exception as exc:
+                _warn_redis_fallback_once(
+                    provider=provider, scope_key=scope_key, exc=exc
+                )
+                use_redis = False
+                # Redis tickets mean nothing to the local queue.
+                ticket = ""
+        if reservation is None:
+            reservation = _reserve_local_slot(
+                scope_key=scope_key,
+                lane=lane,
+                now=now,
+                interval=interval,
+                lookahead=booking_window,
+                deadline=deadline,
+                ticket=ticket,
+                lease_until=lease_until,
+            )
+
+        scheduled_at = reservation.scheduled_at
+        if reservation.granted:
+            break
+        if scheduled_at > deadline:
+            message = f"TTS RPM queue wait exceeded {wait_cap:.2f}s"
+            raise TTSRpmQueueTimeoutError(message)
+        ticket = reservation.ticket
+        # Not booked yet: come back once the next free slot is within reach.
+        wait = max(scheduled_at - lookahead - now, 0.0)
+        if reservation.queued_ahead:
+            wait = max(wait, min(interval, _QUEUED_POLL_SECONDS))
+        sleep_fn(wait)
+
+    sleep_seconds = max(scheduled_at - now_fn(), 0.0)
     if sleep_seconds > 0:
         sleep_fn(sleep_seconds)
 
     return TTSRpmGateResult(
-        waited_seconds=max(result.scheduled_at - start, 0.0),
-        scheduled_at=result.scheduled_at,
+        waited_seconds=max(scheduled_at - start, 0.0),
+        scheduled_at=scheduled_at,
     )
 
 
-def _acquire_redis_slot(
+def _normalize_lane(lane: str) -> str:
+    normalized = str(lane or "").strip().lower()
+    if normalized in _LANE_LOOKAHEAD_SLOTS:
+        return normalized
+    return TTS_RPM_LANE_STANDARD
+
+
+def _lane_lookahead_seconds(lane: str, *, interval: float) -> float:
+    slots = _LANE_LOOKAHEAD_SLOTS[lane]
+    if slots is None:
+        return -1.0
+    return slots * interval
+
+
+def _reserve_redis_slot(
     *,
     scope_key: str,
+    lane: str,
+    now: float,
     interval: float,
+    lookahead: float,
     deadline: float,
     max_wait_seconds: float,
-    now_fn: Callable[[], float],
-) -> TTSRpmGateResult:
+    ticket: str,
+    lease_until: float,
+) -> _Reservation:
     redis_client = _get_redis_client()
-    next_key = f"tts:rpm_gate:{scope_key}:next_available_at"
-    lock_key = f"tts:rpm_gate:{scope_key}:lock"
-    lock_timeout = max(math.ceil(max_wait_seconds + 5), 5)
-    lock = redis_client.lock(
-        lock_key,
-        timeout=lock_timeout,
-        blocking_timeout=max_wait_seconds,
+    key_prefix = f"tts:rpm_gate:{scope_key}"
+    ttl_seconds = max(math.ceil(interval * 4 + max_wait_seconds + 60), 120)
+    result = redis_client.eval(
+        _RESERVE_SLOT_SCRIPT,
+        4,
+        f"{key_prefix}:next_available_at",
+        f"{key_prefix}:{lane}:waiters",
+        f"{key_prefix}:{lane}:leases",
+        f"{key_prefix}:{lane}:tickets",
+        f"{now:.6f}",
+        f"{interval:.6f}",
+        f"{lookahead:.6f}",
+        f"{deadline:.6f}",
+        str(ttl_seconds),
+        ticket,
+        f"{lease_until:.6f}",
+    )
+    granted, raw_slot, raw_ticket, queued_ahead = result
+    if isinstance(raw_ticket, bytes):
+        raw_ticket = raw_ticket.decode("utf-8", errors="ignore")
+    return _Reservation(
+        granted=int(granted) == 1,
+        scheduled_at=_parse_timestamp(raw_slot, default=now),
+        ticket=str(raw_ticket or ""),
+        queued_ahead=int(queued_ahead),
     )
-    acquired = lock.acquire(blocking=True, blocking_timeout=max_wait_seconds)
-    if not acquired:
-        message = f"TTS RPM queue lock timed out after {max_wait_seconds:.2f}s"
-        raise TTSRpmQueueTimeoutError(message)
-
-    try:
-        now = now_fn()
-        raw_next = redis_client.get(next_key)
-        next_available_at = _parse_timestamp(raw_next, default=now)
-        scheduled_at = max(now, next_available_at)
-        if scheduled_at > deadline:
-            message = f"TTS RPM queue wait exceeded {max_wait_seconds:.2f}s"
-            raise TTSRpmQueueTimeoutError(message)
-
-        ttl_seconds = max(math.ceil(interval * 4 + max_wait_seconds + 60), 120)
-        redis_client.set(next_key, f"{scheduled_at + interval:.6f}", ex=ttl_seconds)
-        return TTSRpmGateResult(
-            waited_seconds=max(scheduled_at - now, 0.0),
-            scheduled_at=scheduled_at,
-        )
-    finally:
-        try:
-            lock.release()
-        except Exception:
-            logger.debug("Failed to release TTS RPM Redis lock", exc_info=True)
 
 
-def _acquire_local_slot(
+def _reserve_local_slot(
     *,
     scope_key: str,
+    lane: str,
+    now: float,
     interval: float,
+    lookahead: float,
     deadline: float,
-    now_fn: Callable[[], float],
-) -> TTSRpmGateResult:
+    ticket: str,
+    lease_until: float,
+) -> _Reservation:
     with _LOCAL_LOCK:
-        now = now_fn()
-        scheduled_at = max(now, _LOCAL_STATE.get(scope_key, now))
-        if scheduled_at > deadline:
-            message = "TTS RPM local queue wait exceeded limit"
-            raise TTSRpmQueueTimeoutError(message)
-
-        _LOCAL_STATE[scope_key] = scheduled_at + interval
-        return TTSRpmGateResult(
-            waited_seconds=max(scheduled_at - now, 0.0),
-            scheduled_at=scheduled_at,
+        scope = _LOCAL_STATE.setdefault(scope_key, _SlotScope())
+        return _book_slot(
+            scope,
+            lane=lane,
+            now=now,
+            interval=interval,
+            lookahead=lookahead,
+            deadline=deadline,
+            ticket=ticket,
+            lease_until=lease_until,
         )
 
 
+def _book_slot(
+    scope: _SlotScope,
+    *,
+    lane: str,
+    now: float,
+    interval: float,
+    lookahead: float,
+    deadline: float,
+    ticket: str,
+    lease_until: float,
+) -> _Reservation:
+    """Apply ``_RESERVE_SLOT_SCRIPT`` to ``scope``; callers hold its lock."""
+    slot = max(now, scope.next_available_at)
+    ahead = 0
+    waiters = scope.waiters.setdefault(lane, {}) if lookahead >= 0 else {}
+    if lookahead >= 0:
+        if not ticket or ticket not in waiters:
+            scope.last_tickets[lane] = scope.last_tickets.get(lane, 0) + 1
+            ticket = str(scope.last_tickets[lane])
+        waiters[ticket] = lease_until
+        for waiter, lease in list(waiters.items()):
+            if waiter == ticket:
+                break
+            if lease < now:
+                del waiters[waiter]
+            else:
+                ahead += 1
+        slot += ahead * interval
+
+    granted = (
+        ahead == 0 and slot <= deadline and (lookahead < 0 or slot - now <= lookahead)
+    )
+    if granted or slot > deadline:
+        waiters.pop(ticket, None)
+    if granted:
+        scope.next_available_at = slot + interval
+    return _Reservation(
+        granted=granted,
+        scheduled_at=slot,
+        ticket=ticket,
+        queued_ahead=ahead,
+    )
+
+
 def _get_redis_client():
     from flaskr.dao import get_redis_client
 
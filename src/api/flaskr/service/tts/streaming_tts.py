@@ -61,10 +61,10 @@ from flaskr.service.tts.patterns import (
     SENTENCE_ENDINGS,
 )
 from flaskr.service.tts.pipeline import (
+    IncrementalAVSegmenter,
     _find_next_av_boundary,
-    build_av_segmentation_contract,
 )
-from flaskr.service.tts.rpm_gate import TTSRpmQueueTimeoutError
+from flaskr.service.tts.rpm_gate import TTSRpmQueueTimeoutError, resolve_tts_rpm_lane
 from flaskr.service.tts.subtitle_utils import (
     append_subtitle_cue,
     normalize_subtitle_cues,
@@ -289,11 +289,14 @@ class StreamingTTSProcessor:
         stream_element_type: str | None = None,
         av_contract: dict[str, Any] | None = None,
         usage_scene: int = BILL_USAGE_SCENE_PROD,
+        rpm_lane: str | None = None,
     ) -> None:
         """Initialize configuration and buffered synthesis state for one TTS block.
 
         Binds block, voice, provider, and usage context, then creates output buffers,
         ordered segment queues, aggregate counters, and synchronization state.
+        ``rpm_lane`` overrides the RPM gate lane otherwise derived from the usage
+        scene and the creator's priority class.
         """
         self.app = app
         self.generated_block_bid = generated_block_bid
@@ -337,6 +340,7 @@ class StreamingTTSProcessor:
         self._word_count_total = 0
         self._output_char_total = 0
         self._usage_scene = usage_scene
+        self._rpm_lane = rpm_lane
         self.usage_context = UsageContext(
             user_bid=user_bid,
             shifu_bid=shifu_bid,
@@ -366,6 +370,23 @@ class StreamingTTSProcessor:
                 tts_provider or "(unset)",
             )
 
+    @property
+    def rpm_lane(self) -> str:
+        """Return the RPM gate lane, resolving the creator's class on first use."""
+        if self._rpm_lane is None:
+            from flaskr.service.billing.api import resolve_creator_priority_class
+
+            live = self._usage_scene == BILL_USAGE_SCENE_PROD
+            self._rpm_lane = resolve_tts_rpm_lane(
+                priority_class=(
+                    resolve_creator_priority_class(self.app, shifu_bid=self.shifu_bid)
+                    if live
+                    else ""
+                ),
+                live=live,
+            )
+        return self._rpm_lane
+
     def process_chunk(self, chunk: str) -> Generator[RunMarkdownFlowDTO, None, None]:
         """Process a chunk of streaming content.
 
@@ -1580,6 +1601,7 @@ class StreamingTTSProcessor:
                 voice_settings=self.voice_settings,
                 audio_settings=self.audio_settings,
                 model=self.tts_model,
+                rpm_lane=self.rpm_lane,
             ):
                 if chunk.audio_data:
                     audio_chunks.append(chunk.audio_data)
@@ -2117,6 +2139,7 @@ class AVStreamingTTSProcessor:
         tts_model: str = "",
         usage_scene: int = BILL_USAGE_SCENE_PROD,
         element_index_offset: int = 0,
+        rpm_lane: str | None = None,
     ) -> None:
         """Initialize AV segmentation configuration and pending-stream state.
 
@@ -2138,11 +2161,12 @@ class AVStreamingTTSProcessor:
         self.tts_model = tts_model
         self.usage_scene = usage_scene
         self.element_index_offset = int(element_index_offset or 0)
+        self.rpm_lane = rpm_lane
 
         self._position_cursor = 0
         self._current_processor: StreamingTTSProcessor | None = None
         self._raw_buffer = ""
-        self._raw_full_content = ""
+        self._av_segmenter = IncrementalAVSegmenter(generated_block_bid)
         self._av_contract: dict[str, Any] | None = None
         self._next_element_index = self.element_index_offset
         self._current_segment_has_speakable_text = False
@@ -2154,11 +2178,13 @@ class AVStreamingTTSProcessor:
             # 'fence' | 'svg' | 'iframe' | 'video' | 'html_table' | 'md_table' | 'sandbox' | 'md_img'
         )
 
-    def _update_av_contract(self):
+    @property
+    def _raw_full_content(self) -> str:
+        return self._av_segmenter.raw
+
+    def _update_av_contract(self, chunk: str):
         try:
-            self._av_contract = build_av_segmentation_contract(
-                self._raw_full_content, self.generated_block_bid
-            )
+            self._av_contract = self._av_segmenter.append(chunk)
         except Exception:
             self._av_contract = None
 
@@ -2182,6 +2208,7 @@ class AVStreamingTTSProcessor:
             tts_model=self.tts_model,
             av_contract=self._av_contract,
             usage_scene=self.usage_scene,
+            rpm_lane=self.rpm_lane,
         )
         self._current_segment_has_speakable_text = False
         return self._current_processor
@@ -2242,8 +2269,7 @@ class AVStreamingTTSProcessor:
             yield from self.drain_ready_segments()
             return
 
-        self._raw_full_content += chunk
-        self._update_av_contract()
+        self._update_av_contract(chunk)
         if self._current_processor is not None:
             self._current_processor.av_contract = self._av_contract
         self._raw_buffer += chunk
@@ -0,0 +1,123 @@
+"""add credit wallet projections.
+
+Revision ID: d3e5f7a9b1c2
+Revises: c7b9e1a2d4f6
+Create Date: 2026-10-16 10:00:00.000000
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import mysql
+
+revision = "d3e5f7a9b1c2"
+down_revision = "c7b9e1a2d4f6"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "credit_wallet_projections",
+        sa.Column(
+            "id",
+            mysql.BIGINT(),
+            autoincrement=True,
+            nullable=False,
+            comment="Primary key",
+        ),
+        sa.Column(
+            "wallet_bid",
+            sa.String(length=36),
+            nullable=False,
+            comment="Credit wallet business identifier",
+        ),
+        sa.Column(
+            "creator_bid",
+            sa.String(length=36),
+            nullable=False,
+            comment="Creator business identifier",
+        ),
+        sa.Column(
+            "available_credits",
+            sa.Numeric(precision=20, scale=10),
+            nullable=False,
+            comment="Consumable credits as of the projection window",
+        ),
+        sa.Column(
+            "reserved_credits",
+            sa.Numeric(precision=20, scale=10),
+            nullable=False,
+            comment="Reserved credits",
+        ),
+        sa.Column(
+            "has_active_subscription",
+            sa.SmallInteger(),
+            nullable=False,
+            comment="Whether subscription-gated buckets counted as consumable",
+        ),
+        sa.Column(
+            "projected_at",
+            sa.DateTime(),
+            nullable=False,
+            comment="Time the projection was last fully recomputed",
+        ),
+        sa.Column(
+            "valid_until",
+            sa.DateTime(),
+            nullable=True,
+            comment="Next bucket or subscription boundary; NULL means none",
+        ),
+        sa.Column(
+            "stale",
+            sa.SmallInteger(),
+            nullable=False,
+            comment="Set when a write changed the projection shape: 0=current, 1=stale",
+        ),
+        sa.Column(
+            "version",
+            sa.Integer(),
+            nullable=False,
+            comment="Projection version",
+        ),
+        sa.Column(
+            "deleted",
+            sa.SmallInteger(),
+            nullable=False,
+            comment="Deletion flag",
+        ),
+        sa.Column(
+            "created_at",
+            sa.DateTime(),
+            nullable=False,
+            comment="Creation timestamp",
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(),
+            nullable=False,
+            comment="Last update timestamp",
+        ),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "wallet_bid",
+            name="uq_credit_wallet_projections_wallet_bid",
+        ),
+        comment="Credit wallet balance projections",
+    )
+    with op.batch_alter_table("credit_wallet_projections", schema=None) as batch_op:
+        batch_op.create_index(
+            batch_op.f("ix_credit_wallet_projections_creator_bid"),
+            ["creator_bid"],
+            unique=False,
+        )
+        batch_op.create_index(
+            batch_op.f("ix_credit_wallet_projections_deleted"),
+            ["deleted"],
+            unique=False,
+        )
+
+
+def downgrade():
+    op.drop_table("credit_wallet_projections")
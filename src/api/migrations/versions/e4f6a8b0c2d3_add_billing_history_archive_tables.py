@@ -0,0 +1,281 @@
+"""add billing history archive tables.
+
+Revision ID: e4f6a8b0c2d3
+Revises: d3e5f7a9b1c2
+Create Date: 2026-10-16 12:00:00.000000
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import mysql
+
+revision = "e4f6a8b0c2d3"
+down_revision = "d3e5f7a9b1c2"
+branch_labels = None
+depends_on = None
+
+_USAGE_ARCHIVE_INDEXED_COLUMNS = (
+    "usage_bid",
+    "parent_usage_bid",
+    "user_bid",
+    "shifu_bid",
+    "outline_item_bid",
+    "progress_record_bid",
+    "generated_block_bid",
+    "audio_bid",
+    "request_id",
+    "deleted",
+)
+_LEDGER_ARCHIVE_INDEXED_COLUMNS = (
+    "ledger_bid",
+    "creator_bid",
+    "wallet_bid",
+    "wallet_bucket_bid",
+    "entry_type",
+    "source_type",
+    "source_bid",
+    "idempotency_key",
+    "expires_at",
+    "deleted",
+)
+
+
+def _bid(name: str, comment: str, length: int = 36) -> sa.Column:
+    return sa.Column(name, sa.String(length=length), nullable=False, comment=comment)
+
+
+def _int(name: str, comment: str) -> sa.Column:
+    return sa.Column(name, sa.Integer(), nullable=False, comment=comment)
+
+
+def _small_int(name: str, comment: str) -> sa.Column:
+    return sa.Column(name, sa.SmallInteger(), nullable=False, comment=comment)
+
+
+def upgrade():
+    op.create_table(
+        "bill_usage_archive",
+        sa.Column(
+            "id",
+            mysql.BIGINT(),
+            autoincrement=True,
+            nullable=False,
+            comment="Unique ID",
+        ),
+        _bid("usage_bid", "Usage business identifier"),
+        _bid("parent_usage_bid", "Parent usage business identifier"),
+        _bid("user_bid", "User business identifier"),
+        _bid("shifu_bid", "Shifu business identifier"),
+        _bid("outline_item_bid", "Outline item business identifier"),
+        _bid("progress_record_bid", "Progress record business identifier"),
+        _bid("generated_block_bid", "Generated block business identifier"),
+        _bid("audio_bid", "Audio business identifier"),
+        _bid("request_id", "Request identifier (X-Request-ID)", 64),
+        _bid("trace_id", "Trace identifier (Langfuse)", 64),
+        _small_int("usage_type", "Usage type: 1101=LLM, 1102=TTS"),
+        _small_int("record_level", "Record level: 0=request, 1=segment"),
+        _small_int(
+            "usage_scene", "Usage scene: 1201=debug, 1202=preview, 1203=production"
+        ),
+        _bid("provider", "Provider name", 32),
+        _bid("model", "Provider model", 100),
+        _small_int("is_stream", "Is stream: 0=no, 1=yes"),
+        _int("input", "Input usage (tokens for LLM, chars for TTS)"),
+        _int("input_cache", "Cached input tokens (LLM only)"),
+        _int("output", "Output usage (tokens for LLM, chars for TTS)"),
+        _int("total", "Total usage (tokens for LLM, chars for TTS)"),
+        _int("word_count", "TTS provider word count"),
+        _int("duration_ms", "TTS duration in milliseconds"),
+        _int("latency_ms", "Latency in milliseconds"),
+        _int("segment_index", "Segment index for segment records"),
+        _int("segment_count", "Number of segments"),
+        _small_int("billable", "Billable: 0=no, 1=yes"),
+        _small_int("status", "Status: 0=success, 1=failed"),
+        sa.Column("error_message", sa.Text(), nullable=True, comment="Error message"),
+        sa.Column("extra", sa.JSON(), nullable=True, comment="Extra metadata"),
+        _small_int("deleted", "Deletion flag: 0=active, 1=deleted"),
+        sa.Column(
+            "created_at",
+            sa.DateTime(),
+            nullable=False,
+            comment="Creation timestamp",
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(),
+            nullable=False,
+            comment="Last update timestamp",
+        ),
+        sa.PrimaryKeyConstraint("id"),
+        comment="Archived bill usage records for finalized days",
+    )
+    with op.batch_alter_table("bill_usage_archive", schema=None) as batch_op:
+        batch_op.create_index(
+            "idx_bill_usage_archive_user_created",
+            ["user_bid", "created_at"],
+            unique=False,
+        )
+        batch_op.create_index(
+            "idx_bill_usage_archive_shifu_created",
+            ["shifu_bid", "created_at"],
+            unique=False,
+        )
+        batch_op.create_index(
+            "idx_bill_usage_archive_type_created",
+            ["usage_type", "created_at"],
+            unique=False,
+        )
+        for column_name in _USAGE_ARCHIVE_INDEXED_COLUMNS:
+            batch_op.create_index(
+                batch_op.f(f"ix_bill_usage_archive_{column_name}"),
+                [column_name],
+                unique=False,
+            )
+
+    op.create_table(
+        "credit_ledger_entries_archive",
+        sa.Column(
+            "id",
+            mysql.BIGINT(),
+            autoincrement=True,
+            nullable=False,
+            comment="Primary key",
+        ),
+        _bid("ledger_bid", "Credit ledger business identifier"),
+        _bid("creator_bid", "Creator business identifier"),
+        _bid("wallet_bid", "Credit wallet business identifier"),
+        _bid("wallet_bucket_bid", "Credit wallet bucket business identifier"),
+        _small_int("entry_type", "Billing ledger entry type code"),
+        _small_int("source_type", "Billing ledger source type code"),
+        _bid("source_bid", "Ledger source business identifier"),
+        _bid("idempotency_key", "Ledger idempotency key", 128),
+        sa.Column(
+            "amount",
+            sa.Numeric(precision=20, scale=10),
+            nullable=False,
+            comment="Ledger amount",
+        ),
+        sa.Column(
+            "balance_after",
+            sa.Numeric(precision=20, scale=10),
+            nullable=False,
+            comment="Balance after entry",
+        ),
+        sa.Column(
+            "expires_at",
+            sa.DateTime(),
+            nullable=True,
+            comment="Entry expiration timestamp",
+        ),
+        sa.Column(
+            "consumable_from",
+            sa.DateTime(),
+            nullable=True,
+            comment="Consumable from timestamp",
+        ),
+        sa.Column(
+            "metadata",
+            sa.JSON(),
+            nullable=True,
+            comment="Billing ledger metadata",
+        ),
+        _small_int("deleted", "Deletion flag"),
+        sa.Column(
+            "created_at",
+            sa.DateTime(),
+            nullable=False,
+            comment="Creation timestamp",
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(),
+            nullable=False,
+            comment="Last update timestamp",
+        ),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "ledger_bid",
+            name="uq_credit_ledger_entries_archive_ledger_bid",
+        ),
+        sa.UniqueConstraint(
+            "creator_bid",
+            "idempotency_key",
+            name="uq_credit_ledger_entries_archive_creator_idempotency",
+        ),
+        comment="Archived credit ledger entries for finalized days",
+    )
+    with op.batch_alter_table("credit_ledger_entries_archive", schema=None) as batch_op:
+        batch_op.create_index(
+            "ix_credit_ledger_entries_archive_creator_created",
+            ["creator_bid", "created_at"],
+            unique=False,
+        )
+        for column_name in _LEDGER_ARCHIVE_INDEXED_COLUMNS:
+            batch_op.create_index(
+                batch_op.f(f"ix_credit_ledger_entries_archive_{column_name}"),
+                [column_name],
+                unique=False,
+            )
+
+    op.create_table(
+        "bill_history_archive_states",
+        sa.Column(
+            "id",
+            mysql.BIGINT(),
+            autoincrement=True,
+            nullable=False,
+            comment="Primary key",
+        ),
+        _bid("table_name", "Hot table name", 64),
+        sa.Column(
+            "archived_before",
+            sa.DateTime(),
+            nullable=True,
+            comment="Rows created before this time live only in the archive table",
+        ),
+        sa.Column(
+            "archiving_before",
+            sa.DateTime(),
+            nullable=True,
+            comment="Boundary of the move in progress; rows before it may be archived",
+        ),
+        sa.Column(
+            "archived_row_count",
+            mysql.BIGINT(),
+            nullable=False,
+            comment="Rows moved to the archive table so far",
+        ),
+        _small_int("deleted", "Deletion flag"),
+        sa.Column(
+            "created_at",
+            sa.DateTime(),
+            nullable=False,
+            comment="Creation timestamp",
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(),
+            nullable=False,
+            comment="Last update timestamp",
+        ),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "table_name",
+            name="uq_bill_history_archive_states_table_name",
+        ),
+        comment="Hot/archive boundaries for billing detail tables",
+    )
+    with op.batch_alter_table("bill_history_archive_states", schema=None) as batch_op:
+        batch_op.create_index(
+            batch_op.f("ix_bill_history_archive_states_deleted"),
+            ["deleted"],
+            unique=False,
+        )
+
+
+def downgrade():
+    op.drop_table("bill_history_archive_states")
+    op.drop_table("credit_ledger_entries_archive")
+    op.drop_table("bill_usage_archive")
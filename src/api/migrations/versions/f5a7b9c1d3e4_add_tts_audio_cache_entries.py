@@ -0,0 +1,94 @@
+"""add tts audio cache entries.
+
+Revision ID: f5a7b9c1d3e4
+Revises: e4f6a8b0c2d3
+Create Date: 2026-10-16 14:00:00.000000
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import mysql
+
+revision = "f5a7b9c1d3e4"
+down_revision = "e4f6a8b0c2d3"
+branch_labels = None
+depends_on = None
+
+
+def _str(name: str, length: int, comment: str) -> sa.Column:
+    return sa.Column(name, sa.String(length=length), nullable=False, comment=comment)
+
+
+def _int(name: str, comment: str) -> sa.Column:
+    return sa.Column(name, sa.Integer(), nullable=False, comment=comment)
+
+
+def upgrade():
+    op.create_table(
+        "tts_audio_cache_entries",
+        sa.Column(
+            "id",
+            mysql.BIGINT(),
+            autoincrement=True,
+            nullable=False,
+        ),
+        _str(
+            "cache_key",
+            64,
+            "SHA-256 of the normalized text and synthesis settings",
+        ),
+        _str("provider", 32, "TTS provider"),
+        _str("model", 100, "TTS model"),
+        _str("voice_id", 128, "Voice ID"),
+        _str("storage_object_key", 512, "Storage object key of the audio"),
+        _str("storage_bucket", 255, "Storage bucket name"),
+        _str("audio_format", 16, "Audio format"),
+        _int("size_bytes", "Audio bytes"),
+        _int("duration_ms", "Audio duration in milliseconds"),
+        _int("sample_rate", "Sample rate"),
+        _int("word_count", "Provider word count"),
+        _int("usage_characters", "Provider billed characters"),
+        sa.Column(
+            "subtitle_cues",
+            sa.JSON(),
+            nullable=True,
+            comment="Provider subtitle cues",
+        ),
+        _int("hit_count", "Times the entry was served"),
+        sa.Column(
+            "last_hit_at",
+            sa.DateTime(),
+            nullable=False,
+            comment="Last time the entry was stored or served",
+        ),
+        sa.Column(
+            "created_at",
+            sa.DateTime(),
+            nullable=False,
+            comment="Creation timestamp",
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(),
+            nullable=False,
+            comment="Last update timestamp",
+        ),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "cache_key",
+            name="uq_tts_audio_cache_entries_cache_key",
+        ),
+        comment="Content-addressed cache of synthesized TTS audio",
+    )
+    with op.batch_alter_table("tts_audio_cache_entries", schema=None) as batch_op:
+        batch_op.create_index(
+            "ix_tts_audio_cache_entries_last_hit",
+            ["last_hit_at", "id"],
+            unique=False,
+        )
+
+
+def downgrade():
+    op.drop_table("tts_audio_cache_entries")
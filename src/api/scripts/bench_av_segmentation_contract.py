@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""Compare full and incremental AV segmentation contract builds while streaming.
+
+A synthetic listen-mode block (prose paragraphs interleaved with SVG, tables,
+fences and images) is fed chunk by chunk. The "full" mode rebuilds the
+contract over the accumulated text after every chunk, which is what
+``AVStreamingTTSProcessor`` used to do; the "incremental" mode uses
+``IncrementalAVSegmenter``. Both contracts are checked to be identical at the
+end, and the microseconds per character show how each mode scales with the
+block length.
+
+Run from the ``src/api`` directory:
+
+    PYTHONPATH=. python scripts/bench_av_segmentation_contract.py
+    PYTHONPATH=. python scripts/bench_av_segmentation_contract.py --chunk-size 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+
+os.environ.setdefault("SKIP_LOAD_DOTENV", "1")
+os.environ.setdefault("SKIP_APP_AUTOCREATE", "1")
+os.environ.setdefault("SKIP_DB_MIGRATIONS_FOR_TESTS", "1")
+
+_PARAGRAPH = (
+    "Streaming lessons mix narration with visuals, and each sentence here is "
+    "long enough to look like real LLM output. Ratios such as a < b appear too.\n\n"
+)
+_VISUALS = (
+    '<svg width="320" height="120"><text x="10" y="20">chart</text></svg>\n\n',
+    "| metric | value |\n|---|---|\n| speed | fast |\n\n",
+    "```python\nprint('hello')\n```\n\n",
+    "![diagram](https://example.com/diagram.png)\n\n",
+)
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse arguments for the segmentation benchmark."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark full vs incremental AV segmentation contracts."
+    )
+    parser.add_argument(
+        "--sizes",
+        default="2500,5000,10000,20000",
+        help="Comma-separated block lengths in characters",
+    )
+    parser.add_argument("--chunk-size", type=int, default=8)
+    parser.add_argument(
+        "--skip-full-above",
+        type=int,
+        default=40000,
+        help="Skip the quadratic full rebuild for blocks longer than this",
+    )
+    return parser.parse_args()
+
+
+def build_block(length: int) -> str:
+    """Return a synthetic listen-mode block of roughly ``length`` characters."""
+    parts: list[str] = []
+    total = 0
+    index = 0
+    while total < length:
+        part = _PARAGRAPH if index % 3 else _VISUALS[(index // 3) % len(_VISUALS)]
+        parts.append(part)
+        total += len(part)
+        index += 1
+    return "".join(parts)[:length]
+
+
+def main() -> int:
+    """Run the benchmark and print timings per block length."""
+    args = parse_args()
+
+    from flaskr.service.tts.pipeline import (
+        IncrementalAVSegmenter,
+        build_av_segmentation_contract,
+    )
+
+    chunk_size = max(1, args.chunk_size)
+    print(f"chunk_size={chunk_size}")
+    ok = True
+    for length in (int(value) for value in args.sizes.split(",") if value.strip()):
+        raw = build_block(length)
+        chunks = [raw[i : i + chunk_size] for i in range(0, len(raw), chunk_size)]
+
+        started = time.perf_counter()
+        segmenter = IncrementalAVSegmenter("bench")
+        for chunk in chunks:
+            incremental = segmenter.append(chunk)
+        incremental_s = time.perf_counter() - started
+
+        full_s = None
+        if length <= args.skip_full_above:
+            started = time.perf_counter()
+            accumulated = ""
+            for chunk in chunks:
+                accumulated += chunk
+                full = build_av_segmentation_contract(accumulated, "bench")
+            full_s = time.perf_counter() - started
+            ok = ok and full == incremental
+        ok = ok and incremental == build_av_segmentation_contract(raw, "bench")
+
+        full_text = (
+            f"full_ms={full_s * 1000:.1f} full_us_per_char={full_s * 1e6 / length:.2f}"
+            if full_s is not None
+            else "full_ms=skipped"
+        )
+        print(
+            f"chars={length} chunks={len(chunks)} "
+            f"incremental_ms={incremental_s * 1000:.1f} "
+            f"incremental_us_per_char={incremental_s * 1e6 / length:.2f} "
+            f"{full_text}"
+        )
+    print(f"contracts_identical={ok}")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,591 @@
+#!/usr/bin/env python3
+"""Load-test the billing settlement, renewal, expiry and aggregate pipeline.
+
+Seeds ``--creators`` creators, each with a wallet, a shifu, ``--buckets``
+credit buckets (every other one already past its ``effective_to``) and
+``--usages`` billable LLM usages. The first ``--renewal-creators`` creators
+also get a subscription whose period just ended and a due expire renewal
+event. The billing Celery tasks then run eagerly, in the order the workers
+and beat would run them:
+
+1. ``billing.settle_usage`` for every usage
+2. ``billing.dispatch_due_renewal_events``
+3. ``billing.run_renewal_event`` for every event the dispatcher enqueued
+4. ``billing.expire_wallet_buckets``
+5. ``billing.aggregate_daily_usage_metrics`` and
+   ``billing.aggregate_daily_ledger_summary`` for the seeded day
+
+Settlement locks and admission snapshots use an in-memory cache provider.
+For each operation the harness reports throughput, the SQL statements it
+issued (counted with SQLAlchemy cursor events), the time spent in
+``SELECT ... FOR UPDATE`` statements and the time spent waiting for cache
+locks. ``--check-budgets`` compares the query counts with
+``QUERY_BUDGETS`` and exits with status 1 on any overrun, so CI can catch
+N+1 regressions.
+
+Run from the ``src/api`` directory:
+
+    PYTHONPATH=. python scripts/bench_billing_pipeline.py --check-budgets
+    PYTHONPATH=. python scripts/bench_billing_pipeline.py --creators 200 --buckets 6 --usages 50 --database-uri "mysql+pymysql://root:pw@127.0.0.1/ai_shifu_bench"
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+os.environ.setdefault("SKIP_LOAD_DOTENV", "1")
+os.environ.setdefault("SKIP_APP_AUTOCREATE", "1")
+os.environ.setdefault("SKIP_DB_MIGRATIONS_FOR_TESTS", "1")
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from datetime import datetime
+
+    from flask import Flask
+
+OP_SETTLE_USAGE = "settle_usage"
+OP_DISPATCH_RENEWAL_EVENTS = "dispatch_renewal_events"
+OP_RUN_RENEWAL_EVENT = "run_renewal_event"
+OP_EXPIRE_WALLET_BUCKETS = "expire_wallet_buckets"
+OP_AGGREGATE_USAGE_METRICS = "aggregate_daily_usage_metrics"
+OP_AGGREGATE_LEDGER_SUMMARY = "aggregate_daily_ledger_summary"
+
+# Statement ceilings per operation as (fixed, per unit of work). They are
+# deliberately loose: they exist to catch per-row query fan-out, not to pin
+# exact counts.
+QUERY_BUDGETS: dict[str, tuple[int, int]] = {
+    OP_SETTLE_USAGE: (20, 60),
+    OP_DISPATCH_RENEWAL_EVENTS: (10, 1),
+    OP_RUN_RENEWAL_EVENT: (20, 80),
+    OP_EXPIRE_WALLET_BUCKETS: (20, 40),
+    OP_AGGREGATE_USAGE_METRICS: (40, 15),
+    OP_AGGREGATE_LEDGER_SUMMARY: (20, 5),
+}
+
+
+@dataclass(slots=True, frozen=True)
+class PipelineSeed:
+    """Describe the synthetic billing data set to load."""
+
+    creators: int = 20
+    buckets: int = 4
+    usages: int = 10
+    renewal_creators: int = 5
+
+    @property
+    def expiring_buckets_per_creator(self) -> int:
+        """Return how many of each creator's buckets are already past due."""
+        return max(self.buckets, 1) // 2
+
+
+@dataclass(slots=True)
+class OperationStats:
+    """Capture the measured cost of one pipeline operation."""
+
+    name: str
+    units: int = 0
+    elapsed_seconds: float = 0.0
+    query_count: int = 0
+    statement_seconds: float = 0.0
+    row_lock_seconds: float = 0.0
+    cache_lock_wait_seconds: float = 0.0
+
+    @property
+    def units_per_second(self) -> float:
+        """Return units of work completed per second."""
+        if self.elapsed_seconds <= 0:
+            return float("inf")
+        return self.units / self.elapsed_seconds
+
+    @property
+    def query_budget(self) -> int | None:
+        """Return the statement ceiling for this run, if one is defined."""
+        budget = QUERY_BUDGETS.get(self.name)
+        if budget is None:
+            return None
+        fixed, per_unit = budget
+        return fixed + per_unit * self.units
+
+
+@dataclass(slots=True)
+class _PipelineCounters:
+    current: OperationStats | None = None
+    operations: list[OperationStats] = field(default_factory=list)
+
+
+class _TimedLock:
+    """Delegate to a cache lock and record how long ``acquire`` blocks."""
+
+    def __init__(self, lock: Any, counters: _PipelineCounters) -> None:
+        """Wrap ``lock`` and charge its waits to the running operation."""
+        self._lock = lock
+        self._counters = counters
+
+    def acquire(self, *args: Any, **kwargs: Any) -> Any:
+        """Acquire the wrapped lock and record the time spent waiting."""
+        started = time.perf_counter()
+        try:
+            return self._lock.acquire(*args, **kwargs)
+        finally:
+            if self._counters.current is not None:
+                self._counters.current.cache_lock_wait_seconds += (
+                    time.perf_counter() - started
+                )
+
+    def __getattr__(self, name: str) -> Any:
+        """Delegate everything else to the wrapped lock."""
+        return getattr(self._lock, name)
+
+
+class _TimedCacheProvider:
+    """Wrap a cache provider so the locks it hands out are timed."""
+
+    def __init__(self, provider: Any, counters: _PipelineCounters) -> None:
+        """Wrap ``provider``; its locks charge waits to ``counters``."""
+        self._provider = provider
+        self._counters = counters
+
+    def lock(self, *args: Any, **kwargs: Any) -> Any:
+        """Return a timed lock from the wrapped provider."""
+        lock = self._provider.lock(*args, **kwargs)
+        if lock is None:
+            return None
+        return _TimedLock(lock, self._counters)
+
+    def __getattr__(self, name: str) -> Any:
+        """Delegate everything else to the wrapped provider."""
+        return getattr(self._provider, name)
+
+
+class _CapturedTask:
+    """Stand in for a Celery task and keep the kwargs it was enqueued with."""
+
+    def __init__(self) -> None:
+        """Start with no captured calls."""
+        self.calls: list[dict[str, Any]] = []
+
+    def apply_async(
+        self, kwargs: dict[str, Any] | None = None, **_options: Any
+    ) -> None:
+        """Record the task kwargs instead of publishing them."""
+        self.calls.append(dict(kwargs or {}))
+
+    def delay(self, **kwargs: Any) -> None:
+        """Record the task kwargs instead of publishing them."""
+        self.calls.append(dict(kwargs))
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse arguments for the billing pipeline benchmark."""
+    parser = argparse.ArgumentParser(
+        description="Load-test the billing settlement and renewal pipeline."
+    )
+    defaults = PipelineSeed()
+    parser.add_argument("--creators", type=int, default=defaults.creators)
+    parser.add_argument(
+        "--buckets",
+        type=int,
+        default=defaults.buckets,
+        help="Credit buckets per creator; every other one is already expired",
+    )
+    parser.add_argument(
+        "--usages",
+        type=int,
+        default=defaults.usages,
+        help="Billable usages per creator",
+    )
+    parser.add_argument(
+        "--renewal-creators",
+        type=int,
+        default=defaults.renewal_creators,
+        help="Creators whose subscription has a due expire renewal event",
+    )
+    parser.add_argument(
+        "--database-uri",
+        default="sqlite:///:memory:",
+        help="Database to benchmark against; its tables are dropped and rebuilt",
+    )
+    parser.add_argument(
+        "--check-budgets",
+        action="store_true",
+        help="Exit with status 1 when an operation exceeds its query budget",
+    )
+    return parser.parse_args()
+
+
+def build_bench_app(database_uri: str) -> Flask:
+    """Return a bare Flask app bound to ``database_uri`` for the benchmark."""
+    from flask import Flask
+    from flaskr import dao
+
+    app = Flask(__name__)
+    app.config.update(
+        SQLALCHEMY_DATABASE_URI=database_uri,
+        SQLALCHEMY_BINDS={
+            "ai_shifu_saas": database_uri,
+            "ai_shifu_admin": database_uri,
+        },
+        SQLALCHEMY_TRACK_MODIFICATIONS=False,
+        REDIS_KEY_PREFIX="bench",
+        TZ="UTC",
+    )
+    dao.db.init_app(app)
+    return app
+
+
+def seed_billing_pipeline(seed: PipelineSeed, *, now: datetime) -> str:
+    """Rebuild the schema, load ``seed`` and return the usages' stat date.
+
+    Must run inside an app context.
+    """
+    from datetime import timedelta
+    from decimal import Decimal
+
+    from flaskr import dao
+    from flaskr.service.billing.consts import (
+        BILLING_METRIC_LLM_INPUT_TOKENS,
+        BILLING_RENEWAL_EVENT_STATUS_PENDING,
+        BILLING_RENEWAL_EVENT_TYPE_EXPIRE,
+        BILLING_SUBSCRIPTION_STATUS_ACTIVE,
+        CREDIT_BUCKET_CATEGORY_FREE,
+        CREDIT_BUCKET_STATUS_ACTIVE,
+        CREDIT_ROUNDING_MODE_CEIL,
+        CREDIT_SOURCE_TYPE_MANUAL,
+        CREDIT_USAGE_RATE_STATUS_ACTIVE,
+    )
+    from flaskr.service.billing.models import (
+        BillingRenewalEvent,
+        BillingSubscription,
+        CreditUsageRate,
+        CreditWallet,
+        CreditWalletBucket,
+    )
+    from flaskr.service.metering.consts import (
+        BILL_USAGE_SCENE_PROD,
+        BILL_USAGE_TYPE_LLM,
+    )
+    from flaskr.service.metering.models import BillUsageRecord
+    from flaskr.service.shifu.models import DraftShifu
+
+    dao.db.drop_all()
+    dao.db.create_all()
+
+    long_ago = now - timedelta(days=365)
+    period_end_at = now - timedelta(minutes=1)
+    expired_at = now - timedelta(hours=1)
+    # Open-day aggregation trails ``now`` by a late-commit margin (five
+    # minutes); older usages keep the aggregate step doing real work.
+    usage_created_at = now - timedelta(minutes=10)
+    # Each usage costs one credit; every live bucket can cover all of them.
+    live_credits = Decimal(max(seed.usages, 1))
+
+    dao.db.session.add(
+        CreditUsageRate(
+            rate_bid="bench-rate",
+            usage_type=BILL_USAGE_TYPE_LLM,
+            provider="*",
+            model="*",
+            usage_scene=BILL_USAGE_SCENE_PROD,
+            billing_metric=BILLING_METRIC_LLM_INPUT_TOKENS,
+            unit_size=1000,
+            credits_per_unit=Decimal("1.0000000000"),
+            rounding_mode=CREDIT_ROUNDING_MODE_CEIL,
+            effective_from=long_ago,
+            effective_to=None,
+            status=CREDIT_USAGE_RATE_STATUS_ACTIVE,
+        )
+    )
+    for creator_index in range(seed.creators):
+        creator_bid = f"bench-creator-{creator_index}"
+        wallet_bid = f"bench-wallet-{creator_index}"
+        shifu_bid = f"bench-shifu-{creator_index}"
+        buckets = []
+        for bucket_index in range(max(seed.buckets, 1)):
+            expiring = bucket_index % 2 == 1
+            buckets.append(
+                CreditWalletBucket(
+                    wallet_bucket_bid=f"bench-bucket-{creator_index}-{bucket_index}",
+                    wallet_bid=wallet_bid,
+                    creator_bid=creator_bid,
+                    bucket_category=CREDIT_BUCKET_CATEGORY_FREE,
+                    source_type=CREDIT_SOURCE_TYPE_MANUAL,
+                    source_bid=f"bench-grant-{creator_index}-{bucket_index}",
+                    priority=10,
+                    original_credits=live_credits,
+                    available_credits=live_credits,
+                    reserved_credits=Decimal(0),
+                    consumed_credits=Decimal(0),
+                    expired_credits=Decimal(0),
+                    effective_from=now - timedelta(days=30),
+                    effective_to=expired_at if expiring else None,
+                    status=CREDIT_BUCKET_STATUS_ACTIVE,
+                    metadata_json={},
+                    created_at=now - timedelta(days=30),
+                    updated_at=now - timedelta(days=30),
+                )
+            )
+        total_credits = live_credits * len(buckets)
+        dao.db.session.add(
+            CreditWallet(
+                wallet_bid=wallet_bid,
+                creator_bid=creator_bid,
+                available_credits=total_credits,
+                reserved_credits=Decimal(0),
+                lifetime_granted_credits=total_credits,
+                lifetime_consumed_credits=Decimal(0),
+                last_settled_usage_id=0,
+                version=0,
+            )
+        )
+        dao.db.session.add_all(buckets)
+        dao.db.session.add(
+            DraftShifu(shifu_bid=shifu_bid, created_user_bid=creator_bid)
+        )
+        if creator_index < seed.renewal_creators:
+            subscription_bid = f"bench-subscription-{creator_index}"
+            dao.db.session.add(
+                BillingSubscription(
+                    subscription_bid=subscription_bid,
+                    creator_bid=creator_bid,
+                    product_bid="bench-product",
+                    status=BILLING_SUBSCRIPTION_STATUS_ACTIVE,
+                    billing_provider="pingxx",
+                    provider_subscription_id="",
+                    provider_customer_id="",
+                    current_period_start_at=period_end_at - timedelta(days=30),
+                    current_period_end_at=period_end_at,
+                    cancel_at_period_end=0,
+                    metadata_json={},
+                    created_at=period_end_at - timedelta(days=30),
+                    updated_at=period_end_at - timedelta(days=30),
+                )
+            )
+            dao.db.session.add(
+                BillingRenewalEvent(
+                    renewal_event_bid=f"bench-renewal-{creator_index}",
+                    subscription_bid=subscription_bid,
+                    creator_bid=creator_bid,
+                    event_type=BILLING_RENEWAL_EVENT_TYPE_EXPIRE,
+                    scheduled_at=period_end_at,
+                    status=BILLING_RENEWAL_EVENT_STATUS_PENDING,
+                    attempt_count=0,
+                    last_error="",
+                    payload_json={},
+                    processed_at=None,
+                )
+            )
+        dao.db.session.add_all(
+            BillUsageRecord(
+                usage_bid=f"bench-usage-{creator_index}-{usage_index}",
+                user_bid=f"bench-learner-{usage_index}",
+                shifu_bid=shifu_bid,
+                request_id=f"bench-request-{creator_index}-{usage_index}",
+                usage_type=BILL_USAGE_TYPE_LLM,
+                record_level=0,
+                usage_scene=BILL_USAGE_SCENE_PROD,
+                provider="openai",
+                model="gpt-bench",
+                is_stream=1,
+                input=1000,
+                input_cache=0,
+                output=0,
+                total=1000,
+                billable=1,
+                status=0,
+                extra={},
+                created_at=usage_created_at,
+                updated_at=usage_created_at,
+            )
+            for usage_index in range(seed.usages)
+        )
+        # One commit per creator keeps each flush small on large seeds.
+        dao.db.session.commit()
+    dao.db.session.commit()
+    return usage_created_at.strftime("%Y-%m-%d")
+
+
+def run_billing_pipeline(
+    app: Flask,
+    seed: PipelineSeed,
+    *,
+    now: datetime | None = None,
+) -> list[OperationStats]:
+    """Seed the database, run every pipeline task and return per-op stats."""
+    import json
+    from unittest import mock
+
+    from flaskr import dao
+    from flaskr.common.cache_provider import InMemoryCacheProvider
+    from flaskr.service.billing import admission, settlement, tasks
+    from flaskr.service.billing.consts import BILL_CONFIG_KEY_RENEWAL_TASK_CONFIG
+    from flaskr.service.config import config_overrides
+    from flaskr.util.datetime import now_utc
+    from sqlalchemy import event
+
+    counters = _PipelineCounters()
+    timed_cache = _TimedCacheProvider(InMemoryCacheProvider(), counters)
+
+    def before_cursor_execute(conn: Any, *_args: Any) -> None:
+        conn.info.setdefault("bench_started_at", []).append(time.perf_counter())
+
+    def after_cursor_execute(
+        conn: Any, _cursor: Any, statement: str, *_args: Any
+    ) -> None:
+        started_at = conn.info["bench_started_at"].pop()
+        current = counters.current
+        if current is None:
+            return
+        elapsed = time.perf_counter() - started_at
+        current.query_count += 1
+        current.statement_seconds += elapsed
+        if "FOR UPDATE" in statement.upper():
+            current.row_lock_seconds += elapsed
+
+    @contextmanager
+    def measure(name: str) -> Iterator[OperationStats]:
+        stats = OperationStats(name=name)
+        dao.db.session.remove()
+        counters.current = stats
+        started_at = time.perf_counter()
+        try:
+            yield stats
+        finally:
+            stats.elapsed_seconds = time.perf_counter() - started_at
+            counters.current = None
+            counters.operations.append(stats)
+
+    renewal_task_config = json.dumps(
+        {
+            "enabled": 1,
+            "batch_size": max(seed.renewal_creators, 1),
+            "lookahead_minutes": 0,
+        }
+    )
+    with app.app_context():
+        stat_date = seed_billing_pipeline(seed, now=now or now_utc())
+        engines = list(dao.db.engines.values())
+        for engine in engines:
+            event.listen(engine, "before_cursor_execute", before_cursor_execute)
+            event.listen(engine, "after_cursor_execute", after_cursor_execute)
+        captured_renewals = _CapturedTask()
+        try:
+            with (
+                mock.patch.object(tasks, "_create_task_app", return_value=app),
+                mock.patch.object(settlement, "cache_provider", timed_cache),
+                mock.patch.object(admission, "cache_provider", timed_cache),
+                config_overrides(
+                    {BILL_CONFIG_KEY_RENEWAL_TASK_CONFIG: renewal_task_config}
+                ),
+            ):
+                # Call the task bodies through ``run``: once a Celery app is
+                # configured, calling the task pushes that app's Flask context
+                # over the bench app and the work runs against the wrong app.
+                with measure(OP_SETTLE_USAGE) as stats:
+                    for creator_index in range(seed.creators):
+                        for usage_index in range(seed.usages):
+                            payload = tasks.settle_usage_task.run(
+                                usage_bid=f"bench-usage-{creator_index}-{usage_index}"
+                            )
+                            if payload["status"] == "settled":
+                                stats.units += 1
+
+                with (
+                    mock.patch.object(
+                        tasks, "run_renewal_event_task", captured_renewals
+                    ),
+                    measure(OP_DISPATCH_RENEWAL_EVENTS) as stats,
+                ):
+                    payload = tasks.dispatch_due_renewal_events_task.run()
+                    stats.units = int(payload["enqueued_count"])
+
+                with measure(OP_RUN_RENEWAL_EVENT) as stats:
+                    for kwargs in captured_renewals.calls:
+                        payload = tasks.run_renewal_event_task.run(**kwargs)
+                        if payload["status"] == "applied":
+                            stats.units += 1
+
+                with measure(OP_EXPIRE_WALLET_BUCKETS) as stats:
+                    payload = tasks.expire_wallet_buckets_task.run()
+                    stats.units = int(payload["bucket_count"])
+
+                with measure(OP_AGGREGATE_USAGE_METRICS) as stats:
+                    payload = tasks.aggregate_daily_usage_metrics_task.run(
+                        stat_date=stat_date
+                    )
+                    stats.units = int(payload["metric_count"])
+
+                with measure(OP_AGGREGATE_LEDGER_SUMMARY) as stats:
+                    payload = tasks.aggregate_daily_ledger_summary_task.run(
+                        stat_date=stat_date
+                    )
+                    stats.units = int(payload["row_count"])
+        finally:
+            for engine in engines:
+                event.remove(engine, "before_cursor_execute", before_cursor_execute)
+                event.remove(engine, "after_cursor_execute", after_cursor_execute)
+            dao.db.session.remove()
+    return counters.operations
+
+
+def find_budget_violations(operations: list[OperationStats]) -> list[str]:
+    """Return a message for every operation that exceeded its query budget."""
+    violations: list[str] = []
+    for stats in operations:
+        budget = stats.query_budget
+        if budget is not None and stats.query_count > budget:
+            violations.append(
+                f"{stats.name}: {stats.query_count} queries for {stats.units} "
+                f"units exceeds the budget of {budget}"
+            )
+    return violations
+
+
+def main() -> int:
+    """Run the pipeline once and print per-operation cost."""
+    args = parse_args()
+    seed = PipelineSeed(
+        creators=args.creators,
+        buckets=args.buckets,
+        usages=args.usages,
+        renewal_creators=min(args.renewal_creators, args.creators),
+    )
+    app = build_bench_app(args.database_uri)
+    operations = run_billing_pipeline(app, seed)
+    with app.app_context():
+        from flaskr import dao
+
+        dao.db.drop_all()
+
+    print(
+        f"creators: {seed.creators}  buckets/creator: {seed.buckets}  "
+        f"usages/creator: {seed.usages}  renewal creators: {seed.renewal_creators}  "
+        f"database: {args.database_uri.split('://')[0]}"
+    )
+    for stats in operations:
+        queries_per_unit = stats.query_count / stats.units if stats.units else 0.0
+        budget = stats.query_budget
+        print(
+            f"{stats.name:>31}: {stats.units:6d} units  "
+            f"{stats.elapsed_seconds * 1000:9.1f} ms  "
+            f"{stats.units_per_second:9.1f} units/s  "
+            f"{stats.query_count:6d} queries ({queries_per_unit:5.1f}/unit, "
+            f"budget {budget if budget is not None else '-'})  "
+            f"sql {stats.statement_seconds * 1000:8.1f} ms  "
+            f"row locks {stats.row_lock_seconds * 1000:7.1f} ms  "
+            f"cache lock wait {stats.cache_lock_wait_seconds * 1000:7.1f} ms"
+        )
+    violations = find_budget_violations(operations)
+    for violation in violations:
+        print(f"over budget: {violation}")
+    if args.check_budgets and violations:
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
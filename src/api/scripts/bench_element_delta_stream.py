@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""Compare full-snapshot and suffix-delta wire formats for streamed text.
+
+Each lesson transcript is replayed as the element messages a learner stream
+emits and encoded twice with ``SSEFrameEncoder``: once as sent today, where
+every text patch repeats the whole element content, and once through
+``ElementDeltaTracker`` as negotiated by ``element_delta: true``. The deltas
+are folded back on the client side to check they rebuild the same content.
+
+A transcript is either a recorded run stream (a file of ``data: {...}`` SSE
+lines, for example captured with ``curl -N`` against the run endpoint) or the
+plain markdown output of a lesson block, which is split into LLM-sized chunks
+and streamed as one growing text element per paragraph. Without ``--transcript``
+a built-in bilingual lesson is used.
+
+Run from the ``src/api`` directory:
+
+    PYTHONPATH=. python scripts/bench_element_delta_stream.py
+    PYTHONPATH=. python scripts/bench_element_delta_stream.py \
+        --transcript /tmp/run.sse --transcript lesson.md --chunk-size 3
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+os.environ.setdefault("SKIP_LOAD_DOTENV", "1")
+os.environ.setdefault("SKIP_APP_AUTOCREATE", "1")
+os.environ.setdefault("SKIP_DB_MIGRATIONS_FOR_TESTS", "1")
+
+_SSE_DATA_PREFIX = "data: "
+_BUILTIN_LESSON = "\n\n".join(
+    [
+        "## 光速与信息传递\n\n"
+        "光的传播速度约为每秒三十万公里，这也是宇宙中信息传递的上限。" * 12,  # noqa: RUF001 - intentional fullwidth Chinese punctuation
+        "When we say nothing travels faster than light, we mean that no "
+        "signal can carry information between two places faster than a "
+        "photon could make the same trip. " * 10,
+        "想一想：如果太阳突然消失，地球上的我们需要多久才会察觉？"  # noqa: RUF001 - intentional fullwidth Chinese punctuation
+        * 8,
+        "The answer is roughly eight minutes and twenty seconds, because "
+        "that is how long sunlight takes to reach us. " * 12,
+    ]
+)
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse arguments for the element delta benchmark."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark suffix-delta text element streaming."
+    )
+    parser.add_argument(
+        "--transcript",
+        action="append",
+        default=[],
+        help="Recorded SSE stream or markdown lesson output (repeatable)",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=4,
+        help="Characters per streamed chunk for markdown transcripts",
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    return parser.parse_args()
+
+
+def _markdown_messages(text: str, chunk_size: int) -> list[object]:
+    from flaskr.service.learn.learn_dtos import (
+        ElementChangeType,
+        ElementDTO,
+        ElementPayloadDTO,
+        ElementType,
+        RunElementSSEMessageDTO,
+    )
+
+    messages: list[object] = []
+    paragraphs = [item for item in text.split("\n\n") if item.strip()]
+    for index, paragraph in enumerate(paragraphs, start=1):
+        ends = list(range(chunk_size, len(paragraph), chunk_size))
+        ends.append(len(paragraph))
+        for end in ends:
+            element = ElementDTO(
+                element_bid=f"element-{index}",
+                generated_block_bid="block-1",
+                element_index=index,
+                role="teacher",
+                element_type=ElementType.TEXT,
+                element_type_code=213,
+                change_type=ElementChangeType.RENDER,
+                is_new=True,
+                is_speakable=True,
+                is_final=end == len(paragraph),
+                content_text=paragraph[:end],
+                payload=ElementPayloadDTO(audio=None, previous_visuals=[]),
+                run_session_bid="run-1",
+                run_event_seq=len(messages) + 1,
+            )
+            messages.append(
+                RunElementSSEMessageDTO(
+                    type="element",
+                    event_type="element",
+                    generated_block_bid="block-1",
+                    run_session_bid="run-1",
+                    run_event_seq=len(messages) + 1,
+                    content=element,
+                )
+            )
+    return messages
+
+
+def _recorded_messages(text: str) -> list[object]:
+    from flaskr.service.learn.learn_dtos import ElementDTO, RunElementSSEMessageDTO
+
+    messages: list[object] = []
+    for raw_line in text.splitlines():
+        line = raw_line.strip()
+        if not line.startswith(_SSE_DATA_PREFIX):
+            continue
+        event = json.loads(line[len(_SSE_DATA_PREFIX) :])
+        content = event.get("content")
+        if event.get("type") == "element" and isinstance(content, dict):
+            element = ElementDTO.model_validate(content)
+            messages.append(RunElementSSEMessageDTO(**{**event, "content": element}))
+        else:
+            messages.append(event)
+    return messages
+
+
+def load_transcripts(args: argparse.Namespace) -> list[tuple[str, list[object]]]:
+    """Return ``(name, messages)`` for every requested transcript."""
+    if not args.transcript:
+        return [("builtin", _markdown_messages(_BUILTIN_LESSON, args.chunk_size))]
+    transcripts = []
+    for raw_path in args.transcript:
+        path = Path(raw_path)
+        text = path.read_text(encoding="utf-8")
+        if any(line.startswith(_SSE_DATA_PREFIX) for line in text.splitlines()):
+            transcripts.append((path.name, _recorded_messages(text)))
+        else:
+            transcripts.append((path.name, _markdown_messages(text, args.chunk_size)))
+    return transcripts
+
+
+def _encode_stream(messages: list[object], *, delta: bool) -> tuple[list[str], float]:
+    from flaskr.service.learn.listen_element_deltas import ElementDeltaTracker
+    from flaskr.service.learn.sse_frames import SSEFrameEncoder
+
+    encoder = SSEFrameEncoder()
+    tracker = ElementDeltaTracker() if delta else None
+    started = time.perf_counter()
+    frames = []
+    for message in messages:
+        payload = tracker.apply(message) if tracker is not None else message
+        frames.append(encoder.encode(payload))
+    return frames, time.perf_counter() - started
+
+
+def _fold_text(frames: list[str]) -> dict[str, str]:
+    elements: dict[str, str] = {}
+    for frame in frames:
+        event = json.loads(frame[len(_SSE_DATA_PREFIX) :])
+        content = event.get("content")
+        if event.get("type") != "element" or not isinstance(content, dict):
+            continue
+        if content.get("element_type") != "text":
+            continue
+        if "content_offset" in content:
+            elements[content["element_bid"]] += content["content"]
+        else:
+            elements[content["element_bid"]] = content["content"]
+    return elements
+
+
+def _measure(
+    messages: list[object], *, delta: bool, repeat: int
+) -> tuple[list[str], float]:
+    best = float("inf")
+    frames: list[str] = []
+    for _ in range(max(repeat, 1)):
+        frames, elapsed = _encode_stream(messages, delta=delta)
+        best = min(best, elapsed)
+    return frames, best
+
+
+def main() -> int:
+    """Replay each transcript and print bytes and encode time per format."""
+    args = parse_args()
+    for name, messages in load_transcripts(args):
+        full_frames, full_seconds = _measure(messages, delta=False, repeat=args.repeat)
+        delta_frames, delta_seconds = _measure(messages, delta=True, repeat=args.repeat)
+        full_bytes = sum(len(frame.encode("utf-8")) for frame in full_frames)
+        delta_bytes = sum(len(frame.encode("utf-8")) for frame in delta_frames)
+        print(f"transcript={name} frames={len(messages)}")
+        print(f"  full   bytes={full_bytes:>10} encode_ms={full_seconds * 1000:8.2f}")
+        print(f"  delta  bytes={delta_bytes:>10} encode_ms={delta_seconds * 1000:8.2f}")
+        print(
+            f"  saved_bytes={1 - delta_bytes / max(full_bytes, 1):.1%} "
+            f"encode_speedup={full_seconds / max(delta_seconds, 1e-9):.2f}x "
+            f"reconstructed={_fold_text(delta_frames) == _fold_text(full_frames)}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""Compare TLS handshakes and latency of per-call and pooled provider HTTP.
+
+Starts a local HTTPS stand-in for a provider API: a threaded HTTP/1.1 server
+with keep-alive, a self-signed certificate generated by ``openssl`` and a
+fixed service delay per request. The same POST workload is then sent twice
+from a pool of worker threads: once through module-level ``requests.post``,
+which opens a connection per call, and once through ``PooledHTTPClient``.
+
+The server counts completed TLS handshakes, so the report shows how many
+connections each path opened next to its latency percentiles.
+
+Run from the ``src/api`` directory:
+
+    PYTHONPATH=. python scripts/bench_http_client_pool.py
+    PYTHONPATH=. python scripts/bench_http_client_pool.py --requests 2000 --workers 32 --pool-size 32 --delay-ms 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import ssl
+import subprocess
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+os.environ.setdefault("SKIP_LOAD_DOTENV", "1")
+os.environ.setdefault("SKIP_APP_AUTOCREATE", "1")
+
+
+@dataclass
+class PathStats:
+    """Outcome of one client path against the stand-in server."""
+
+    name: str
+    requests: int
+    errors: int
+    handshakes: int
+    peak_connections: int
+    wall_seconds: float
+    p50_ms: float
+    p99_ms: float
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse arguments for the pooled HTTP client benchmark."""
+    parser = argparse.ArgumentParser(
+        description="Compare per-call requests.post with PooledHTTPClient."
+    )
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=16)
+    parser.add_argument("--pool-size", type=int, default=16)
+    parser.add_argument("--delay-ms", type=float, default=10.0)
+    parser.add_argument("--payload-bytes", type=int, default=2048)
+    return parser.parse_args()
+
+
+def generate_certificate(directory: Path) -> tuple[Path, Path]:
+    """Write a self-signed localhost certificate and key into ``directory``."""
+    cert_path = directory / "cert.pem"
+    key_path = directory / "key.pem"
+    subprocess.run(
+        [
+            "openssl",
+            "req",
+            "-x509",
+            "-newkey",
+            "rsa:2048",
+            "-nodes",
+            "-days",
+            "1",
+            "-subj",
+            "/CN=localhost",
+            "-addext",
+            "subjectAltName=DNS:localhost,IP:127.0.0.1",
+            "-keyout",
+            str(key_path),
+            "-out",
+            str(cert_path),
+        ],
+        check=True,
+        capture_output=True,
+    )
+    return cert_path, key_path
+
+
+class StandInServer(ThreadingHTTPServer):
+    """HTTPS server that counts handshakes and concurrent connections."""
+
+    daemon_threads = True
+
+    def __init__(self, context: ssl.SSLContext, delay_seconds: float) -> None:
+        """Listen on an ephemeral localhost port."""
+        super().__init__(("127.0.0.1", 0), StandInHandler)
+        self.context = context
+        self.delay_seconds = delay_seconds
+        self.counter_lock = threading.Lock()
+        self.handshakes = 0
+        self.open_connections = 0
+        self.peak_connections = 0
+
+    def reset_counters(self) -> None:
+        """Start counting a new client path."""
+        with self.counter_lock:
+            self.handshakes = 0
+            self.peak_connections = self.open_connections
+
+    def get_request(self):
+        """Accept a connection; the handshake runs on the handler thread."""
+        sock, address = self.socket.accept()
+        wrapped = self.context.wrap_socket(
+            sock, server_side=True, do_handshake_on_connect=False
+        )
+        return wrapped, address
+
+    def finish_request(self, request, client_address) -> None:
+        """Complete the TLS handshake, then serve the keep-alive connection."""
+        try:
+            request.do_handshake()
+        except (OSError, ssl.SSLError):
+            return
+        with self.counter_lock:
+            self.handshakes += 1
+            self.open_connections += 1
+            self.peak_connections = max(self.peak_connections, self.open_connections)
+        try:
+            super().finish_request(request, client_address)
+        finally:
+            with self.counter_lock:
+                self.open_connections -= 1
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Answer every POST with a small JSON body after the service delay."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self) -> None:
+        """Drain the request body, wait, and reply on the same connection."""
+        length = int(self.headers.get("Content-Length") or 0)
+        self.rfile.read(length)
+        time.sleep(self.server.delay_seconds)
+        body = b'{"code":0,"data":"ok"}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: object) -> None:  # noqa: A002
+        """Keep the benchmark output free of access logs."""
+
+
+def percentile(samples: list[float], fraction: float) -> float:
+    """Return the nearest-rank percentile of ``samples``."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(int(fraction * len(ordered)), len(ordered) - 1)
+    return ordered[index]
+
+
+def run_path(
+    name: str,
+    post: Callable[..., object],
+    *,
+    server: StandInServer,
+    url: str,
+    cert_path: Path,
+    args: argparse.Namespace,
+) -> PathStats:
+    """Send the workload through ``post`` from ``args.workers`` threads."""
+    payload = {"text": "x" * args.payload_bytes}
+    latencies: list[float] = []
+    errors = 0
+    results_lock = threading.Lock()
+
+    def send_one(_: int) -> None:
+        nonlocal errors
+        started = time.perf_counter()
+        try:
+            response = post(url, json=payload, verify=str(cert_path), timeout=10)
+            response.raise_for_status()
+            response.content  # noqa: B018 - read the body like providers do
+        except Exception:
+            with results_lock:
+                errors += 1
+            return
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        with results_lock:
+            latencies.append(elapsed_ms)
+
+    server.reset_counters()
+    wall_started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.workers) as executor:
+        list(executor.map(send_one, range(args.requests)))
+    wall_seconds = time.perf_counter() - wall_started
+    with server.counter_lock:
+        handshakes = server.handshakes
+        peak_connections = server.peak_connections
+    return PathStats(
+        name=name,
+        requests=args.requests,
+        errors=errors,
+        handshakes=handshakes,
+        peak_connections=peak_connections,
+        wall_seconds=wall_seconds,
+        p50_ms=percentile(latencies, 0.50),
+        p99_ms=percentile(latencies, 0.99),
+    )
+
+
+def main() -> int:
+    """Run both client paths against the stand-in server and print a report."""
+    args = parse_args()
+    os.environ["HTTP_CLIENT_POOL_SIZE"] = str(args.pool_size)
+
+    import requests
+    from flaskr.common.http_client import PooledHTTPClient, close_http_clients
+
+    with tempfile.TemporaryDirectory() as directory:
+        cert_path, key_path = generate_certificate(Path(directory))
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        context.load_cert_chain(cert_path, key_path)
+        server = StandInServer(context, args.delay_ms / 1000)
+        server_thread = threading.Thread(target=server.serve_forever, daemon=True)
+        server_thread.start()
+        url = f"https://localhost:{server.server_address[1]}/v1/t2a"
+        try:
+            results = [
+                run_path(
+                    "per-call",
+                    requests.post,
+                    server=server,
+                    url=url,
+                    cert_path=cert_path,
+                    args=args,
+                ),
+                run_path(
+                    "pooled",
+                    PooledHTTPClient("bench").post,
+                    server=server,
+                    url=url,
+                    cert_path=cert_path,
+                    args=args,
+                ),
+            ]
+        finally:
+            close_http_clients()
+            server.shutdown()
+            server.server_close()
+
+    print(
+        f"workload: {args.requests} POSTs from {args.workers} worker threads, "
+        f"pool size {args.pool_size}, service delay {args.delay_ms:g} ms"
+    )
+    for stats in results:
+        print(
+            f"{stats.name:>8}  handshakes {stats.handshakes:6}  "
+            f"peak connections {stats.peak_connections:4}  "
+            f"p50 {stats.p50_ms:7.1f} ms  p99 {stats.p99_ms:7.1f} ms  "
+            f"wall {stats.wall_seconds:6.2f} s  errors {stats.errors}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""Compare string concatenation and list joins for streamed LLM text.
+
+Reasoning models stream very long outputs as many tiny deltas. This script
+feeds a synthetic output of each requested length through three accumulators:
+
+- ``local_concat``: ``text += delta`` on a local variable (CPython can often
+  resize such strings in place, so this is the best case for concatenation)
+- ``attr_concat``: ``state.text += delta`` on an object attribute, which is how
+  ``BlockState.raw_content`` used to grow and always copies the whole string
+- ``chunk_join``: ``chunks.append(delta)`` and one ``"".join`` at the end, as
+  ``invoke_llm``/``chat_llm`` now do
+
+Element text in the listen run state is read after every chunk to build the
+streamed snapshot, so it stays an incremental string; joining there would
+only move the copy from the append to the read. ``BlockState.raw_content``
+keeps chunks and joins only the ones appended since its last read, so
+formatted streams that read it once pay one join and ask or fallback streams
+that read it per chunk pay one concatenation per chunk.
+
+It also prints how many characters the old full-response log line carried
+compared with the bounded preview now written by the LLM helpers.
+
+Run from the ``src/api`` directory:
+
+    PYTHONPATH=. python scripts/bench_llm_stream_accumulation.py
+    PYTHONPATH=. python scripts/bench_llm_stream_accumulation.py --delta-size 2
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+
+os.environ.setdefault("SKIP_LOAD_DOTENV", "1")
+os.environ.setdefault("SKIP_APP_AUTOCREATE", "1")
+os.environ.setdefault("SKIP_DB_MIGRATIONS_FOR_TESTS", "1")
+
+_SENTENCE = (
+    "Let me reconsider the constraint before answering, because the second "
+    "case changes the bound. "
+)
+
+
+class _AttributeHolder:
+    text = ""
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse arguments for the accumulation benchmark."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark LLM stream text accumulation strategies."
+    )
+    parser.add_argument(
+        "--sizes",
+        default="50000,200000,800000",
+        help="Comma-separated output lengths in characters",
+    )
+    parser.add_argument(
+        "--delta-size",
+        type=int,
+        default=4,
+        help="Characters per streamed delta",
+    )
+    return parser.parse_args()
+
+
+def build_deltas(length: int, delta_size: int) -> list[str]:
+    """Return ``length`` characters of synthetic output split into deltas."""
+    text = (_SENTENCE * (length // len(_SENTENCE) + 1))[:length]
+    return [text[i : i + delta_size] for i in range(0, len(text), delta_size)]
+
+
+def local_concat(deltas: list[str]) -> str:
+    """Accumulate with ``+=`` on a local variable."""
+    text = ""
+    for delta in deltas:
+        text += delta
+    return text
+
+
+def attr_concat(deltas: list[str]) -> str:
+    """Accumulate with ``+=`` on an object attribute."""
+    holder = _AttributeHolder()
+    for delta in deltas:
+        holder.text += delta
+    return holder.text
+
+
+def chunk_join(deltas: list[str]) -> str:
+    """Accumulate into a list and join once."""
+    chunks: list[str] = []
+    for delta in deltas:
+        chunks.append(delta)  # noqa: PERF402 - mirrors per-delta streaming
+    return "".join(chunks)
+
+
+def main() -> int:
+    """Run the benchmark and print timings per output length."""
+    args = parse_args()
+
+    from flaskr.api.llm import _preview_response_for_log
+
+    delta_size = max(1, args.delta_size)
+    print(f"delta_size={delta_size}")
+    ok = True
+    for length in (int(value) for value in args.sizes.split(",") if value.strip()):
+        deltas = build_deltas(length, delta_size)
+        expected = "".join(deltas)
+        timings = []
+        for accumulate in (local_concat, attr_concat, chunk_join):
+            started = time.perf_counter()
+            result = accumulate(deltas)
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            ok = ok and result == expected
+            timings.append(f"{accumulate.__name__}_ms={elapsed_ms:.1f}")
+        print(
+            f"chars={length} deltas={len(deltas)} {' '.join(timings)} "
+            f"log_chars_full={len(expected)} "
+            f"log_chars_preview={len(_preview_response_for_log(expected))}"
+        )
+    print(f"results_identical={ok}")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
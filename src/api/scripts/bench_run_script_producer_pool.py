@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""Load-test the shared run_script producer pool with many concurrent streams.
+
+Each simulated learner runs ``runscript_v2.run_script`` end to end against a
+fake lesson generator that sleeps between chunks (standing in for LLM network
+waits). A sampler records the number of live producer threads, the total
+thread count and the process RSS while the streams run, and the summary shows
+how many streams were admitted versus turned away with the busy event.
+
+Run from the ``src/api`` directory:
+
+    PYTHONPATH=. python scripts/bench_run_script_producer_pool.py --streams 600
+    PYTHONPATH=. python scripts/bench_run_script_producer_pool.py --pool-size 64
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+os.environ.setdefault("SKIP_LOAD_DOTENV", "1")
+os.environ.setdefault("SKIP_APP_AUTOCREATE", "1")
+os.environ.setdefault("SKIP_DB_MIGRATIONS_FOR_TESTS", "1")
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse arguments for the producer pool load test."""
+    parser = argparse.ArgumentParser(
+        description="Load-test run_script with many concurrent streams."
+    )
+    parser.add_argument("--streams", type=int, default=600)
+    parser.add_argument("--pool-size", type=int, default=256)
+    parser.add_argument("--chunks", type=int, default=20)
+    parser.add_argument(
+        "--gap-ms",
+        type=float,
+        default=50.0,
+        help="Delay between fake LLM chunks inside each producer",
+    )
+    return parser.parse_args()
+
+
+def _rss_mb() -> float:
+    try:
+        with Path("/proc/self/status").open(encoding="utf-8") as status_file:
+            for line in status_file:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024.0
+    except OSError:
+        pass
+    import resource
+
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+
+
+def main() -> int:
+    """Run the load test and print thread, memory and admission figures."""
+    args = parse_args()
+
+    import json
+    import threading
+    import time
+
+    from flask import Flask
+    from flaskr.common.cache_provider import InMemoryCacheProvider
+    from flaskr.service.learn import runscript_v2
+    from flaskr.service.learn.learn_dtos import RunElementSSEMessageDTO
+    from flaskr.service.learn.run_script_producer_pool import (
+        get_run_script_producer_pool_stats,
+    )
+
+    app = Flask(__name__)
+    app.config["REDIS_KEY_PREFIX"] = "bench"
+    app.config["SSE_HEARTBEAT_INTERVAL"] = 0.5
+    app.config["RUN_SCRIPT_PRODUCER_POOL_SIZE"] = args.pool_size
+    runscript_v2.cache_provider = InMemoryCacheProvider()
+    # The fake lesson never touches the database.
+    runscript_v2._ensure_healthy_db_connection = lambda *_args, **_kwargs: None
+    runscript_v2._remove_db_session_safely = lambda *_args, **_kwargs: None
+    runscript_v2._discard_session_connection = lambda *_args, **_kwargs: None
+    gap_seconds = args.gap_ms / 1000.0
+
+    def fake_run_script_inner(**_kwargs: object):
+        for index in range(args.chunks):
+            time.sleep(gap_seconds)
+            yield RunElementSSEMessageDTO(
+                type="element", event_type="element", content=str(index)
+            )
+
+    runscript_v2.run_script_inner = fake_run_script_inner
+
+    outcomes = {"completed": 0, "busy": 0}
+    outcomes_lock = threading.Lock()
+
+    def learner(index: int) -> None:
+        busy = False
+        with app.app_context():
+            for chunk in runscript_v2.run_script(
+                app=app,
+                shifu_bid="bench-shifu",
+                outline_bid=f"bench-outline-{index}",
+                user_bid=f"bench-user-{index}",
+                user_input={"input": ["x"]},
+                input_type="normal",
+            ):
+                payload = json.loads(chunk[len("data: ") :])
+                if payload.get("type") == "error":
+                    busy = True
+        with outcomes_lock:
+            outcomes["busy" if busy else "completed"] += 1
+
+    samples = {"producers": 0, "threads": 0, "rss_mb": 0.0}
+    sampling = threading.Event()
+
+    def sampler() -> None:
+        while not sampling.is_set():
+            producers = sum(
+                1
+                for thread in threading.enumerate()
+                if thread.name.startswith("run_script_stream_producer")
+            )
+            samples["producers"] = max(samples["producers"], producers)
+            samples["threads"] = max(samples["threads"], threading.active_count())
+            samples["rss_mb"] = max(samples["rss_mb"], _rss_mb())
+            sampling.wait(0.05)
+
+    baseline_rss = _rss_mb()
+    sampler_thread = threading.Thread(target=sampler, daemon=True)
+    sampler_thread.start()
+    started = time.perf_counter()
+    learners = [
+        threading.Thread(target=learner, args=(index,), daemon=True)
+        for index in range(args.streams)
+    ]
+    for thread in learners:
+        thread.start()
+    for thread in learners:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    sampling.set()
+    sampler_thread.join()
+
+    stats = get_run_script_producer_pool_stats()
+    print(
+        f"streams={args.streams} pool_size={args.pool_size} "
+        f"completed={outcomes['completed']} busy={outcomes['busy']} "
+        f"elapsed_s={elapsed:.2f}"
+    )
+    print(
+        f"peak_producer_threads={samples['producers']} "
+        f"peak_threads={samples['threads']} "
+        f"rss_mb baseline={baseline_rss:.1f} peak={samples['rss_mb']:.1f}"
+    )
+    print(
+        f"pool capacity={stats.capacity} active={stats.active} "
+        f"rejected={stats.rejected}"
+    )
+    return 0 if samples["producers"] <= args.pool_size else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
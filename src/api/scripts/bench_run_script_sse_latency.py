@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""Measure the delay between a run_script producer put and its SSE yield.
+
+The benchmark drives ``runscript_v2.run_script`` with a fake lesson generator
+that emits chunks at a fixed cadence, records the moment each chunk is handed
+to the producer queue, and the moment the consumer yields the matching
+``data: ...`` frame. It reports per-chunk latency percentiles so changes to the
+consumer wait strategy can be compared under the same heartbeat interval.
+
+Run from the ``src/api`` directory:
+
+    PYTHONPATH=. python scripts/bench_run_script_sse_latency.py --chunks 200 --gap-ms 7
+    PYTHONPATH=. python scripts/bench_run_script_sse_latency.py --gevent
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+
+os.environ.setdefault("SKIP_LOAD_DOTENV", "1")
+os.environ.setdefault("SKIP_APP_AUTOCREATE", "1")
+os.environ.setdefault("SKIP_DB_MIGRATIONS_FOR_TESTS", "1")
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse arguments for the SSE latency benchmark."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark producer-put to SSE-yield latency in run_script."
+    )
+    parser.add_argument("--chunks", type=int, default=200)
+    parser.add_argument(
+        "--gap-ms",
+        type=float,
+        default=7.0,
+        help="Delay between producer chunks, simulating LLM token cadence",
+    )
+    parser.add_argument(
+        "--heartbeat-interval",
+        type=float,
+        default=0.5,
+        help="SSE_HEARTBEAT_INTERVAL used by the consumer loop",
+    )
+    parser.add_argument(
+        "--gevent",
+        action="store_true",
+        help="Monkey-patch with gevent first to mimic the gevent worker",
+    )
+    return parser.parse_args()
+
+
+def _percentile(values: list[float], fraction: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, round(fraction * (len(ordered) - 1)))
+    return ordered[index]
+
+
+def main() -> int:
+    """Run the benchmark and print latency percentiles in milliseconds."""
+    args = parse_args()
+    if args.gevent:
+        from gevent import monkey
+
+        monkey.patch_all()
+
+    import json
+    import time
+
+    from flask import Flask
+    from flaskr.common.cache_provider import InMemoryCacheProvider
+    from flaskr.service.learn import runscript_v2
+    from flaskr.service.learn.learn_dtos import RunElementSSEMessageDTO
+
+    app = Flask(__name__)
+    app.config["REDIS_KEY_PREFIX"] = "bench"
+    app.config["SSE_HEARTBEAT_INTERVAL"] = args.heartbeat_interval
+    runscript_v2.cache_provider = InMemoryCacheProvider()
+    # The fake lesson never touches the database.
+    runscript_v2._ensure_healthy_db_connection = lambda *_args, **_kwargs: None
+    runscript_v2._remove_db_session_safely = lambda *_args, **_kwargs: None
+    runscript_v2._discard_session_connection = lambda *_args, **_kwargs: None
+
+    put_times: dict[int, float] = {}
+    gap_seconds = args.gap_ms / 1000.0
+
+    def fake_run_script_inner(**_kwargs: object):
+        for index in range(args.chunks):
+            time.sleep(gap_seconds)
+            put_times[index] = time.perf_counter()
+            yield RunElementSSEMessageDTO(
+                type="element",
+                event_type="element",
+                content=str(index),
+                run_event_seq=index,
+            )
+
+    runscript_v2.run_script_inner = fake_run_script_inner
+
+    latencies_ms: list[float] = []
+    heartbeats = 0
+    started = time.perf_counter()
+    with app.app_context():
+        for chunk in runscript_v2.run_script(
+            app=app,
+            shifu_bid="bench-shifu",
+            outline_bid="bench-outline",
+            user_bid="bench-user",
+            user_input={"input": ["x"]},
+            input_type="normal",
+        ):
+            yielded_at = time.perf_counter()
+            payload = json.loads(chunk[len("data: ") :])
+            if payload.get("type") == "heartbeat":
+                heartbeats += 1
+                continue
+            if payload.get("type") != "element":
+                continue
+            index = int(payload["content"])
+            latencies_ms.append((yielded_at - put_times[index]) * 1000.0)
+    total_seconds = time.perf_counter() - started
+
+    print(
+        f"chunks={len(latencies_ms)} gap_ms={args.gap_ms} "
+        f"heartbeat_interval={args.heartbeat_interval} gevent={args.gevent} "
+        f"heartbeats={heartbeats} total_s={total_seconds:.3f}"
+    )
+    print(
+        "latency_ms "
+        f"p50={_percentile(latencies_ms, 0.50):.3f} "
+        f"p90={_percentile(latencies_ms, 0.90):.3f} "
+        f"p99={_percentile(latencies_ms, 0.99):.3f} "
+        f"max={max(latencies_ms, default=0.0):.3f}"
+    )
+    return 0 if len(latencies_ms) == args.chunks else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
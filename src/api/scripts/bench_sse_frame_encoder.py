@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""Measure SSE frame encoding throughput for a listen-mode lesson stream.
+
+A synthetic lesson is built from the element-protocol DTOs the learner stream
+emits: each text element is streamed as growing patches, followed by base64
+audio segments, an audio completion and an inter-element ``done``. Every frame
+is then encoded three ways:
+
+- ``legacy``: ``json.dumps(payload, default=fmt, ensure_ascii=False)`` as
+  ``run_script`` used to do
+- ``json``: ``SSEFrameEncoder`` with the default, byte-identical backend
+- ``orjson``: ``SSEFrameEncoder`` with ``SSE_JSON_BACKEND=orjson``
+
+Run from the ``src/api`` directory:
+
+    PYTHONPATH=. python scripts/bench_sse_frame_encoder.py
+    PYTHONPATH=. python scripts/bench_sse_frame_encoder.py --elements 80 --repeat 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import base64
+import json
+import os
+import sys
+import time
+from datetime import datetime
+
+os.environ.setdefault("SKIP_LOAD_DOTENV", "1")
+os.environ.setdefault("SKIP_APP_AUTOCREATE", "1")
+os.environ.setdefault("SKIP_DB_MIGRATIONS_FOR_TESTS", "1")
+
+_SENTENCE = "光的传播速度约为每秒三十万公里，这也是宇宙中信息传递的上限。"  # noqa: RUF001 - intentional fullwidth Chinese punctuation
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse arguments for the SSE frame encoder benchmark."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark SSE frame encoding for listen-mode lessons."
+    )
+    parser.add_argument("--elements", type=int, default=40)
+    parser.add_argument("--patches-per-element", type=int, default=30)
+    parser.add_argument("--audio-segments-per-element", type=int, default=6)
+    parser.add_argument("--repeat", type=int, default=3)
+    return parser.parse_args()
+
+
+def build_lesson_frames(args: argparse.Namespace) -> list[object]:
+    """Return the payloads a listen-mode lesson stream would emit."""
+    from flaskr.service.learn.learn_dtos import (
+        AudioCompleteDTO,
+        AudioSegmentDTO,
+        ElementChangeType,
+        ElementDTO,
+        ElementPayloadDTO,
+        ElementType,
+        RunElementSSEMessageDTO,
+    )
+
+    audio_data = base64.b64encode(os.urandom(3000)).decode("ascii")
+    payloads: list[object] = []
+    seq = 0
+    for index in range(args.elements):
+        element_bid = f"element-{index}"
+        text = ""
+        for patch in range(args.patches_per_element):
+            seq += 1
+            text += _SENTENCE[patch % len(_SENTENCE)] * 3
+            element = ElementDTO(
+                event_type="element",
+                element_bid=element_bid,
+                generated_block_bid=f"block-{index // 4}",
+                element_index=index,
+                role="teacher",
+                element_type=ElementType.TEXT,
+                element_type_code=213,
+                change_type=ElementChangeType.RENDER,
+                target_element_bid=None if patch == 0 else element_bid,
+                is_renderable=True,
+                is_new=patch == 0,
+                is_marker=False,
+                sequence_number=seq,
+                is_speakable=True,
+                is_navigable=1,
+                is_final=False,
+                content_text=text,
+                payload=ElementPayloadDTO(audio=None, previous_visuals=[]),
+                run_session_bid="run-bench",
+                run_event_seq=seq,
+            )
+            payloads.append(
+                RunElementSSEMessageDTO(
+                    type="element",
+                    event_type="element",
+                    generated_block_bid=element.generated_block_bid,
+                    run_session_bid="run-bench",
+                    run_event_seq=seq,
+                    content=element,
+                )
+            )
+        for segment in range(args.audio_segments_per_element):
+            seq += 1
+            payloads.append(
+                RunElementSSEMessageDTO(
+                    type="audio_segment",
+                    event_type="audio_segment",
+                    generated_block_bid=f"block-{index // 4}",
+                    run_session_bid="run-bench",
+                    run_event_seq=seq,
+                    content=AudioSegmentDTO(
+                        segment_index=segment,
+                        audio_data=audio_data,
+                        duration_ms=480,
+                        position=0,
+                    ),
+                )
+            )
+        seq += 1
+        payloads.append(
+            RunElementSSEMessageDTO(
+                type="audio_complete",
+                event_type="audio_complete",
+                generated_block_bid=f"block-{index // 4}",
+                run_session_bid="run-bench",
+                run_event_seq=seq,
+                content=AudioCompleteDTO(
+                    audio_url=f"https://example.com/{element_bid}.mp3",
+                    audio_bid=f"audio-{index}",
+                    duration_ms=2880,
+                ),
+            )
+        )
+        seq += 1
+        payloads.append(
+            RunElementSSEMessageDTO(
+                type="done",
+                event_type="done",
+                run_session_bid="run-bench",
+                run_event_seq=seq,
+                is_terminal=False,
+                content="",
+            )
+        )
+        payloads.append({"type": "heartbeat"})
+    return payloads
+
+
+def _legacy_fmt(o: object) -> object:
+    from flaskr.util.datetime import to_utc_iso
+
+    if isinstance(o, datetime):
+        return to_utc_iso(o)
+    return o.__json__()
+
+
+def _legacy_encode(payload: object) -> str:
+    return (
+        "data: "
+        + json.dumps(payload, default=_legacy_fmt, ensure_ascii=False)
+        + b"\n\n".decode("utf-8")
+    )
+
+
+def _measure(encode, payloads: list[object], repeat: int) -> tuple[float, int]:
+    best = float("inf")
+    total_bytes = 0
+    for _ in range(max(1, repeat)):
+        started = time.perf_counter()
+        frames = [encode(payload) for payload in payloads]
+        best = min(best, time.perf_counter() - started)
+        total_bytes = sum(len(frame.encode("utf-8")) for frame in frames)
+    return best, total_bytes
+
+
+def main() -> int:
+    """Run the benchmark and print frames per second for each encoder."""
+    args = parse_args()
+
+    from flaskr.service.learn.sse_frames import (
+        SSE_JSON_BACKEND_JSON,
+        SSE_JSON_BACKEND_ORJSON,
+        SSEFrameEncoder,
+    )
+
+    payloads = build_lesson_frames(args)
+    json_encoder = SSEFrameEncoder(SSE_JSON_BACKEND_JSON)
+    orjson_encoder = SSEFrameEncoder(SSE_JSON_BACKEND_ORJSON)
+    identical = all(
+        json_encoder.encode(payload) == _legacy_encode(payload) for payload in payloads
+    )
+    print(f"frames={len(payloads)} byte_identical_json={identical}")
+    modes = [("legacy", _legacy_encode), ("json", json_encoder.encode)]
+    if orjson_encoder.backend == SSE_JSON_BACKEND_ORJSON:
+        modes.append(("orjson", orjson_encoder.encode))
+    else:
+        print("orjson=unavailable")
+    for name, encode in modes:
+        elapsed, total_bytes = _measure(encode, payloads, args.repeat)
+        print(
+            f"encoder={name} ms={elapsed * 1000:.1f} "
+            f"frames_per_s={len(payloads) / elapsed:,.0f} bytes={total_bytes}"
+        )
+    return 0 if identical else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
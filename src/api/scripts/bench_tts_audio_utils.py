@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""Measure CPU time and memory of MP3 concat, duration and range export.
+
+Builds lesson-length audio from sentence-sized MP3 segments, then runs the
+three operations the TTS pipeline performs on it: joining the segments,
+reading the joined duration and cutting the joined audio into consecutive
+ranges. The frame path is what ``flaskr.service.tts.audio_utils`` does today;
+the pydub path decodes every segment and re-encodes at 128k, as the module
+did before it parsed MP3 frames, and runs only when pydub and ffmpeg are
+installed.
+
+Segments are silent synthetic frames unless ``--input`` names a real MP3 file,
+whose frames are tiled to the requested length.
+
+Run from the ``src/api`` directory:
+
+    PYTHONPATH=. python scripts/bench_tts_audio_utils.py
+    PYTHONPATH=. python scripts/bench_tts_audio_utils.py --minutes 30 --input /path/to/sentence.mp3 --skip-pydub
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+import os
+import resource
+import time
+import tracemalloc
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+os.environ.setdefault("SKIP_LOAD_DOTENV", "1")
+os.environ.setdefault("SKIP_APP_AUTOCREATE", "1")
+
+# MPEG-2 Layer III, 128 kbps, 24 kHz, mono: the shape of provider TTS output.
+_SYNTHETIC_HEADER = b"\xff\xf3\xc4\xc4"
+
+
+@dataclass
+class OperationStats:
+    """Cost of one benchmarked operation."""
+
+    path: str
+    name: str
+    wall_seconds: float
+    cpu_seconds: float
+    child_cpu_seconds: float
+    peak_python_bytes: int
+    output_bytes: int
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse arguments for the audio utilities benchmark."""
+    parser = argparse.ArgumentParser(
+        description="Measure MP3 concat, duration and range export costs."
+    )
+    parser.add_argument("--minutes", type=float, default=30.0)
+    parser.add_argument("--segment-seconds", type=float, default=4.0)
+    parser.add_argument("--range-pieces", type=int, default=20)
+    parser.add_argument(
+        "--input",
+        default="",
+        help="MP3 file whose frames are tiled instead of synthetic silence",
+    )
+    parser.add_argument("--skip-pydub", action="store_true")
+    return parser.parse_args()
+
+
+def build_segments(
+    *, minutes: float, segment_seconds: float, input_path: str
+) -> list[bytes]:
+    """Return sentence-sized MP3 segments adding up to ``minutes`` of audio."""
+    from flaskr.service.tts.mp3_frames import parse_mp3_frames
+
+    if input_path:
+        source = parse_mp3_frames(Path(input_path).read_bytes())
+        if source is None:
+            message = f"not an MPEG audio stream: {input_path}"
+            raise SystemExit(message)
+        frames = [
+            source.data[offset : offset + length] for offset, length in source.frames
+        ]
+        frame_seconds = source.format.samples_per_frame / source.format.sample_rate
+    else:
+        frame_length = 72 * 128000 // 24000
+        frames = [_SYNTHETIC_HEADER + bytes(frame_length - len(_SYNTHETIC_HEADER))]
+        frame_seconds = 576 / 24000
+
+    frames_per_segment = max(int(segment_seconds / frame_seconds), 1)
+    segment_count = max(int(minutes * 60 / (frames_per_segment * frame_seconds)), 1)
+    segments = []
+    for segment_index in range(segment_count):
+        start = segment_index * frames_per_segment
+        segments.append(
+            b"".join(
+                frames[(start + index) % len(frames)]
+                for index in range(frames_per_segment)
+            )
+        )
+    return segments
+
+
+def measure(path: str, name: str, operation: Callable[[], bytes]) -> OperationStats:
+    """Time ``operation``, then run it again under tracemalloc for peak memory.
+
+    The passes are separate because tracemalloc slows allocation-heavy code
+    enough to distort the CPU figures.
+    """
+    children_before = resource.getrusage(resource.RUSAGE_CHILDREN)
+    cpu_before = time.process_time()
+    wall_before = time.perf_counter()
+    output = operation()
+    wall_seconds = time.perf_counter() - wall_before
+    cpu_seconds = time.process_time() - cpu_before
+    children_after = resource.getrusage(resource.RUSAGE_CHILDREN)
+    child_cpu_seconds = (children_after.ru_utime + children_after.ru_stime) - (
+        children_before.ru_utime + children_before.ru_stime
+    )
+
+    tracemalloc.start()
+    try:
+        operation()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return OperationStats(
+        path=path,
+        name=name,
+        wall_seconds=wall_seconds,
+        cpu_seconds=cpu_seconds,
+        child_cpu_seconds=child_cpu_seconds,
+        peak_python_bytes=peak,
+        output_bytes=len(output),
+    )
+
+
+def run_frame_path(segments: list[bytes], range_pieces: int) -> list[OperationStats]:
+    """Benchmark the frame-level implementation in ``audio_utils``."""
+    from flaskr.service.tts import audio_utils
+
+    joined = audio_utils.concat_audio_mp3(segments)
+    duration_ms = audio_utils.get_audio_duration_ms(joined)
+    piece_ms = max(duration_ms // max(range_pieces, 1), 1)
+
+    def export_ranges() -> bytes:
+        pieces = []
+        for start_ms in range(0, duration_ms, piece_ms):
+            piece, _ = audio_utils.export_audio_range_best_effort(
+                joined, start_ms=start_ms, end_ms=start_ms + piece_ms
+            )
+            pieces.append(piece)
+        return b"".join(pieces)
+
+    return [
+        measure("frames", "concat", lambda: audio_utils.concat_audio_mp3(segments)),
+        measure(
+            "frames",
+            "duration",
+            lambda: str(audio_utils.get_audio_duration_ms(joined)).encode(),
+        ),
+        measure("frames", "range_export", export_ranges),
+    ]
+
+
+def run_pydub_path(segments: list[bytes], range_pieces: int) -> list[OperationStats]:
+    """Benchmark decoding and re-encoding every segment through pydub."""
+    from pydub import AudioSegment
+
+    def decode(audio_data: bytes):
+        return AudioSegment.from_mp3(io.BytesIO(audio_data))
+
+    def encode(audio) -> bytes:
+        output = io.BytesIO()
+        audio.export(output, format="mp3", bitrate="128k")
+        return output.getvalue()
+
+    def concat() -> bytes:
+        combined = decode(segments[0])
+        for segment in segments[1:]:
+            combined = combined.append(decode(segment), crossfade=0)
+        return encode(combined)
+
+    joined = concat()
+    duration_ms = len(decode(joined))
+    piece_ms = max(duration_ms // max(range_pieces, 1), 1)
+
+    def export_ranges() -> bytes:
+        pieces = []
+        for start_ms in range(0, duration_ms, piece_ms):
+            audio = decode(joined)
+            pieces.append(encode(audio[start_ms : start_ms + piece_ms]))
+        return b"".join(pieces)
+
+    return [
+        measure("pydub", "concat", concat),
+        measure("pydub", "duration", lambda: str(len(decode(joined))).encode()),
+        measure("pydub", "range_export", export_ranges),
+    ]
+
+
+def main() -> int:
+    """Build the lesson audio and print the cost of each operation."""
+    args = parse_args()
+    segments = build_segments(
+        minutes=args.minutes,
+        segment_seconds=args.segment_seconds,
+        input_path=args.input,
+    )
+    print(
+        f"audio: {args.minutes:g} min in {len(segments)} segments, "
+        f"{sum(len(segment) for segment in segments) / 1_000_000:.1f} MB"
+    )
+
+    results = run_frame_path(segments, args.range_pieces)
+    if not args.skip_pydub:
+        try:
+            results.extend(run_pydub_path(segments, args.range_pieces))
+        except (ImportError, OSError) as exc:
+            print(f"pydub path skipped: {exc}")
+
+    for stats in results:
+        print(
+            f"{stats.path:>6} {stats.name:<12} "
+            f"wall {stats.wall_seconds * 1000:9.1f} ms  "
+            f"cpu {stats.cpu_seconds * 1000:9.1f} ms  "
+            f"ffmpeg cpu {stats.child_cpu_seconds * 1000:9.1f} ms  "
+            f"python peak {stats.peak_python_bytes / 1_000_000:7.1f} MB  "
+            f"output {stats.output_bytes / 1_000_000:6.1f} MB"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""Measure TTS RPM gate latency and lane fairness against a Redis stand-in.
+
+Worker threads call ``acquire_tts_rpm_slot`` back to back on one
+provider/API-key/model scope: ``--bulk-workers`` in the bulk lane (preview and
+backfill synthesis), ``--standard-workers`` in the standard lane and
+``--priority-workers`` in the priority lane (premium live listen mode). The
+same workload runs twice: once with those lanes and once with every worker in
+the standard lane, which is how the gate queued before lanes existed.
+
+By default the gate talks to an in-process Redis stand-in that runs the slot
+reservation atomically and sleeps ``--round-trip-ms`` per command. Pass
+``--redis-url`` to run against a local Redis server instead.
+
+Run from the ``src/api`` directory:
+
+    PYTHONPATH=. python scripts/bench_tts_rpm_gate.py
+    PYTHONPATH=. python scripts/bench_tts_rpm_gate.py --rpm 600 --bulk-workers 8 --redis-url redis://127.0.0.1:6379/15
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import threading
+import time
+
+os.environ.setdefault("SKIP_LOAD_DOTENV", "1")
+os.environ.setdefault("SKIP_APP_AUTOCREATE", "1")
+
+
+class RedisStandIn:
+    """Evaluate the gate's reservation script in process, one call at a time."""
+
+    def __init__(self, *, round_trip_seconds: float) -> None:
+        """Start with an empty keyspace and no recorded commands."""
+        self.round_trip_seconds = round_trip_seconds
+        self.command_count = 0
+        self._scopes: dict[str, object] = {}
+        self._lock = threading.Lock()
+
+    def eval(self, _script: str, numkeys: int, *keys_and_args: str) -> list:
+        """Reserve a slot with the same rules as the server-side script."""
+        from flaskr.service.tts import rpm_gate
+
+        next_key, waiters_key, *_keys = keys_and_args[:numkeys]
+        now, interval, lookahead, deadline, _ttl, ticket, lease_until = keys_and_args[
+            numkeys:
+        ]
+        time.sleep(self.round_trip_seconds)
+        with self._lock:
+            self.command_count += 1
+            reservation = rpm_gate._book_slot(
+                self._scopes.setdefault(next_key, rpm_gate._SlotScope()),
+                lane=waiters_key,
+                now=float(now),
+                interval=float(interval),
+                lookahead=float(lookahead),
+                deadline=float(deadline),
+                ticket=ticket,
+                lease_until=float(lease_until),
+            )
+        return [
+            int(reservation.granted),
+            f"{reservation.scheduled_at:.6f}",
+            reservation.ticket,
+            reservation.queued_ahead,
+        ]
+
+
+class _CountingRedis:
+    """Count script calls made through a real Redis client."""
+
+    def __init__(self, client) -> None:
+        """Wrap ``client``."""
+        self._client = client
+        self.command_count = 0
+
+    def eval(self, *args: object) -> object:
+        """Forward one script call."""
+        self.command_count += 1
+        return self._client.eval(*args)
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse arguments for the RPM gate benchmark."""
+    parser = argparse.ArgumentParser(
+        description="Measure TTS RPM gate latency and lane fairness."
+    )
+    parser.add_argument("--rpm", type=float, default=1200)
+    parser.add_argument("--bulk-workers", type=int, default=4)
+    parser.add_argument("--standard-workers", type=int, default=1)
+    parser.add_argument("--priority-workers", type=int, default=1)
+    parser.add_argument("--requests-per-worker", type=int, default=10)
+    parser.add_argument("--max-wait-seconds", type=float, default=10.0)
+    parser.add_argument("--round-trip-ms", type=float, default=0.5)
+    parser.add_argument(
+        "--redis-url",
+        default="",
+        help="Local Redis to run against instead of the in-process stand-in",
+    )
+    return parser.parse_args()
+
+
+def _percentile(values: list[float], fraction: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+
+def main() -> int:
+    """Run the workload with and without lanes and print per-lane latency."""
+    args = parse_args()
+
+    from flaskr.service.tts import rpm_gate
+
+    workers = (
+        [rpm_gate.TTS_RPM_LANE_BULK] * args.bulk_workers
+        + [rpm_gate.TTS_RPM_LANE_STANDARD] * args.standard_workers
+        + [rpm_gate.TTS_RPM_LANE_PRIORITY] * args.priority_workers
+    )
+
+    def run(*, use_lanes: bool, run_index: int) -> tuple[dict, int, float]:
+        if args.redis_url:
+            import redis
+
+            client = _CountingRedis(redis.Redis.from_url(args.redis_url))
+        else:
+            client = RedisStandIn(round_trip_seconds=args.round_trip_ms / 1000)
+        rpm_gate._get_redis_client = lambda: client
+        samples: dict[str, list[tuple[float, float]]] = {}
+        timeouts: dict[str, int] = {}
+        samples_lock = threading.Lock()
+        # A fresh model per run keeps a real Redis scope from carrying over.
+        model = f"bench-{os.getpid()}-{run_index}"
+
+        def worker(lane: str) -> None:
+            gate_lane = lane if use_lanes else rpm_gate.TTS_RPM_LANE_STANDARD
+            for _ in range(args.requests_per_worker):
+                started = time.time()
+                try:
+                    result = rpm_gate.acquire_tts_rpm_slot(
+                        provider="bench",
+                        api_key="bench-key",
+                        rpm_limit=args.rpm,
+                        max_wait_seconds=args.max_wait_seconds,
+                        model=model,
+                        lane=gate_lane,
+                    )
+                except rpm_gate.TTSRpmQueueTimeoutError:
+                    with samples_lock:
+                        timeouts[lane] = timeouts.get(lane, 0) + 1
+                    continue
+                elapsed = time.time() - started
+                with samples_lock:
+                    samples.setdefault(lane, []).append(
+                        (elapsed, max(elapsed - result.waited_seconds, 0.0))
+                    )
+
+        threads = [threading.Thread(target=worker, args=(lane,)) for lane in workers]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        wall = time.perf_counter() - started
+        return (
+            {lane: (samples.get(lane, []), timeouts.get(lane, 0)) for lane in workers},
+            client.command_count,
+            wall,
+        )
+
+    original_client = rpm_gate._get_redis_client
+    try:
+        results = [
+            ("lanes", *run(use_lanes=True, run_index=0)),
+            ("fifo", *run(use_lanes=False, run_index=1)),
+        ]
+    finally:
+        rpm_gate._get_redis_client = original_client
+
+    print(
+        f"rpm: {args.rpm:g}  workers: bulk {args.bulk_workers} "
+        f"standard {args.standard_workers} priority {args.priority_workers}  "
+        f"backend: {'redis' if args.redis_url else 'stand-in'}"
+    )
+    for mode, by_lane, command_count, wall in results:
+        acquired = sum(len(lane_samples) for lane_samples, _ in by_lane.values())
+        print(
+            f"{mode:>5}: {wall * 1000:9.1f} ms  "
+            f"script calls/slot {command_count / max(acquired, 1):5.2f}"
+        )
+        for lane, (lane_samples, timeout_count) in by_lane.items():
+            waits = [elapsed for elapsed, _ in lane_samples]
+            overheads = [overhead for _, overhead in lane_samples]
+            print(
+                f"  {lane:>8}: slots {len(lane_samples):4d}  "
+                f"timeouts {timeout_count:3d}  "
+                f"wait p50 {_percentile(waits, 0.5) * 1000:8.1f} ms  "
+                f"p99 {_percentile(waits, 0.99) * 1000:8.1f} ms  "
+                f"gate overhead p50 {_percentile(overheads, 0.5) * 1000:6.2f} ms"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""Compare per-call rate queries with the in-memory usage rate index.
+
+Seeds a rate table with wildcard, provider and model rates (each with a few
+superseded historical windows), then prices ``--usages`` synthetic LLM usages
+spread over one day, three metrics each, the way settlement and daily
+aggregation call ``load_usage_rate``. The index path prices every usage; the
+legacy per-call query only prices ``--legacy-sample`` usages and is
+extrapolated to the full day. Both paths take the provider and model as
+recorded, skipping the LLM alias resolution they share, and must pick the
+same rates on the sample.
+
+Run from the ``src/api`` directory:
+
+    PYTHONPATH=. python scripts/bench_usage_rate_index.py
+    PYTHONPATH=. python scripts/bench_usage_rate_index.py --usages 100000 --database-uri "mysql+pymysql://root:pw@127.0.0.1/ai_shifu_bench"
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+
+os.environ.setdefault("SKIP_LOAD_DOTENV", "1")
+os.environ.setdefault("SKIP_APP_AUTOCREATE", "1")
+os.environ.setdefault("SKIP_DB_MIGRATIONS_FOR_TESTS", "1")
+
+_PROVIDERS = ("openai", "anthropic", "qwen", "deepseek")
+_MODELS_PER_PROVIDER = 6
+_HISTORY_WINDOWS = 4
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse arguments for the rate lookup benchmark."""
+    parser = argparse.ArgumentParser(
+        description="Compare per-call rate queries with the usage rate index."
+    )
+    parser.add_argument("--usages", type=int, default=1_000_000)
+    parser.add_argument("--legacy-sample", type=int, default=2000)
+    parser.add_argument(
+        "--database-uri",
+        default="sqlite:///:memory:",
+        help="Database to benchmark against; its tables are dropped and rebuilt",
+    )
+    return parser.parse_args()
+
+
+def main() -> int:
+    """Price one synthetic usage day through both lookup paths."""
+    args = parse_args()
+
+    import random
+    import time
+    from datetime import datetime, timedelta
+    from decimal import Decimal
+    from types import SimpleNamespace
+
+    from flask import Flask
+    from flaskr import dao
+    from flaskr.service.billing import rate_index
+    from flaskr.service.billing.consts import (
+        BILLING_METRIC_LLM_CACHE_TOKENS,
+        BILLING_METRIC_LLM_INPUT_TOKENS,
+        BILLING_METRIC_LLM_OUTPUT_TOKENS,
+        CREDIT_ROUNDING_MODE_CEIL,
+        CREDIT_USAGE_RATE_STATUS_ACTIVE,
+    )
+    from flaskr.service.billing.models import CreditUsageRate
+    from flaskr.service.metering.consts import (
+        BILL_USAGE_SCENE_PROD,
+        BILL_USAGE_TYPE_LLM,
+    )
+    from flaskr.util.datetime import NAIVE_DATETIME_MIN
+
+    metrics = (
+        BILLING_METRIC_LLM_INPUT_TOKENS,
+        BILLING_METRIC_LLM_CACHE_TOKENS,
+        BILLING_METRIC_LLM_OUTPUT_TOKENS,
+    )
+    app = Flask(__name__)
+    app.config.update(
+        SQLALCHEMY_DATABASE_URI=args.database_uri,
+        SQLALCHEMY_BINDS={
+            "ai_shifu_saas": args.database_uri,
+            "ai_shifu_admin": args.database_uri,
+        },
+        SQLALCHEMY_TRACK_MODIFICATIONS=False,
+        REDIS_KEY_PREFIX="bench",
+        TZ="UTC",
+    )
+    dao.db.init_app(app)
+
+    day = datetime(2026, 1, 15)
+    identities = [("*", "*")]
+    for provider in _PROVIDERS:
+        identities.append((provider, "*"))
+        identities.extend(
+            (provider, f"{provider}-model-{index}")
+            for index in range(_MODELS_PER_PROVIDER)
+        )
+
+    def seed() -> int:
+        dao.db.drop_all()
+        dao.db.create_all()
+        rows = []
+        for provider, model in identities:
+            for metric in metrics:
+                starts = [
+                    day - timedelta(days=30 * (_HISTORY_WINDOWS - window))
+                    for window in range(_HISTORY_WINDOWS)
+                ]
+                # The last window starts mid-day so lookups cross a boundary.
+                starts.append(day + timedelta(hours=12))
+                for window, start in enumerate(starts):
+                    rows.append(
+                        CreditUsageRate(
+                            rate_bid=f"{provider}-{model}-{metric}-{window}",
+                            usage_type=BILL_USAGE_TYPE_LLM,
+                            provider=provider,
+                            model=model,
+                            usage_scene=BILL_USAGE_SCENE_PROD,
+                            billing_metric=metric,
+                            unit_size=1000,
+                            credits_per_unit=Decimal(window + 1),
+                            rounding_mode=CREDIT_ROUNDING_MODE_CEIL,
+                            effective_from=start,
+                            effective_to=None,
+                            status=CREDIT_USAGE_RATE_STATUS_ACTIVE,
+                        )
+                    )
+        dao.db.session.add_all(rows)
+        dao.db.session.commit()
+        return len(rows)
+
+    def legacy_load_usage_rate(usage, billing_metric, settlement_at):
+        # The per-call query load_usage_rate ran before the index existed;
+        # both paths skip the shared LLM model alias resolution.
+        provider = usage.provider
+        model_candidates = [usage.model]
+        rows = (
+            CreditUsageRate.query.filter(
+                CreditUsageRate.deleted == 0,
+                CreditUsageRate.status == CREDIT_USAGE_RATE_STATUS_ACTIVE,
+            )
+            .filter(CreditUsageRate.usage_type == usage.usage_type)
+            .filter(CreditUsageRate.usage_scene == usage.usage_scene)
+            .filter(CreditUsageRate.billing_metric == billing_metric)
+            .order_by(CreditUsageRate.effective_from.desc(), CreditUsageRate.id.desc())
+            .all()
+        )
+        candidates = [
+            row
+            for row in rows
+            if row.effective_from <= settlement_at
+            and (row.effective_to is None or row.effective_to > settlement_at)
+            and row.provider in {provider, "*"}
+            and row.model in set(model_candidates).union({"*"})
+        ]
+        if not candidates:
+            return None
+        candidates.sort(
+            key=lambda row: (
+                row.provider == provider,
+                row.model in set(model_candidates),
+                row.effective_from or NAIVE_DATETIME_MIN,
+                int(row.id or 0),
+            ),
+            reverse=True,
+        )
+        return candidates[0]
+
+    rng = random.Random(7)  # noqa: S311 - reproducible workload, not crypto
+    usage_models = [
+        (provider, model) for provider, model in identities if model != "*"
+    ] + [("openai", "unpriced-model"), ("unknown", "unknown-model")]
+    usages = [
+        SimpleNamespace(
+            usage_type=BILL_USAGE_TYPE_LLM,
+            usage_scene=BILL_USAGE_SCENE_PROD,
+            provider=provider,
+            model=model,
+            created_at=day + timedelta(seconds=rng.randrange(86400)),
+        )
+        for provider, model in (rng.choice(usage_models) for _ in range(args.usages))
+    ]
+    sample = usages[: max(min(args.legacy_sample, len(usages)), 1)]
+
+    with app.app_context():
+        rate_count = seed()
+
+        begin = time.perf_counter()
+        legacy_bids = [
+            getattr(
+                legacy_load_usage_rate(usage, metric, usage.created_at),
+                "rate_bid",
+                None,
+            )
+            for usage in sample
+            for metric in metrics
+        ]
+        legacy_elapsed = time.perf_counter() - begin
+
+        rate_index.clear_usage_rate_index()
+        begin = time.perf_counter()
+        index_bids = []
+        for usage in usages:
+            for metric in metrics:
+                rate = rate_index.lookup_usage_rate(
+                    usage_type=usage.usage_type,
+                    usage_scene=usage.usage_scene,
+                    billing_metric=metric,
+                    provider=usage.provider,
+                    model_candidates=[usage.model],
+                    at=usage.created_at,
+                )
+                index_bids.append(rate.rate_bid if rate is not None else None)
+        index_elapsed = time.perf_counter() - begin
+        stats = rate_index.get_usage_rate_index_stats()
+
+        dao.db.session.remove()
+        dao.db.drop_all()
+
+    legacy_per_lookup = legacy_elapsed / len(legacy_bids)
+    index_per_lookup = index_elapsed / len(index_bids)
+    legacy_projected = legacy_per_lookup * len(index_bids)
+    print(
+        f"usages: {args.usages}  lookups: {len(index_bids)}  rates: {rate_count}  "
+        f"database: {args.database_uri.split('://')[0]}"
+    )
+    print(
+        f"{'per-call query':>16}: {legacy_per_lookup * 1e6:9.1f} us/lookup  "
+        f"projected day {legacy_projected:9.1f} s  (sample {len(sample)} usages)"
+    )
+    print(
+        f"{'rate index':>16}: {index_per_lookup * 1e6:9.1f} us/lookup  "
+        f"measured day {index_elapsed:9.1f} s  builds {stats.builds}"
+    )
+    print(f"{'speedup':>16}: {legacy_per_lookup / index_per_lookup:9.1f}x")
+    if legacy_bids != index_bids[: len(legacy_bids)]:
+        print("rate selection differs between the two paths", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""Compare per-task and batched usage settlement throughput for one creator.
+
+Seeds one hot creator with a wallet, a bucket, an LLM rate and ``--usages``
+billable usage records, then settles every usage twice on a fresh schema:
+once through ``settle_bill_usage`` (one lock, wallet load and commit per
+usage, as each ``billing.settle_usage`` task does) and once by queueing the
+usages and draining them through ``drain_creator_usage_settlements`` in
+batches of ``--batch-size``. Both runs must produce the same ledger totals.
+
+Run from the ``src/api`` directory:
+
+    PYTHONPATH=. python scripts/bench_usage_settlement_batch.py --usages 2000
+    PYTHONPATH=. python scripts/bench_usage_settlement_batch.py --database-uri "mysql+pymysql://root:pw@127.0.0.1/ai_shifu_bench"
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+
+os.environ.setdefault("SKIP_LOAD_DOTENV", "1")
+os.environ.setdefault("SKIP_APP_AUTOCREATE", "1")
+os.environ.setdefault("SKIP_DB_MIGRATIONS_FOR_TESTS", "1")
+
+_CREATOR_BID = "bench-creator"
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse arguments for the settlement throughput benchmark."""
+    parser = argparse.ArgumentParser(
+        description="Compare per-task and batched usage settlement throughput."
+    )
+    parser.add_argument("--usages", type=int, default=1000)
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument(
+        "--database-uri",
+        default="sqlite:///:memory:",
+        help="Database to benchmark against; its tables are dropped and rebuilt",
+    )
+    return parser.parse_args()
+
+
+def main() -> int:
+    """Run both settlement paths and print usages settled per second."""
+    args = parse_args()
+
+    import time
+    from datetime import datetime
+    from decimal import Decimal
+
+    from flask import Flask
+    from flaskr import dao
+    from flaskr.common.cache_provider import InMemoryCacheProvider
+    from flaskr.service.billing import settlement
+    from flaskr.service.billing.consts import (
+        BILLING_METRIC_LLM_INPUT_TOKENS,
+        CREDIT_BUCKET_CATEGORY_FREE,
+        CREDIT_BUCKET_STATUS_ACTIVE,
+        CREDIT_ROUNDING_MODE_CEIL,
+        CREDIT_USAGE_RATE_STATUS_ACTIVE,
+    )
+    from flaskr.service.billing.models import (
+        CreditLedgerEntry,
+        CreditUsageRate,
+        CreditWallet,
+        CreditWalletBucket,
+    )
+    from flaskr.service.metering.consts import (
+        BILL_USAGE_SCENE_PROD,
+        BILL_USAGE_TYPE_LLM,
+    )
+    from flaskr.service.metering.models import BillUsageRecord
+
+    app = Flask(__name__)
+    app.config.update(
+        SQLALCHEMY_DATABASE_URI=args.database_uri,
+        SQLALCHEMY_BINDS={
+            "ai_shifu_saas": args.database_uri,
+            "ai_shifu_admin": args.database_uri,
+        },
+        SQLALCHEMY_TRACK_MODIFICATIONS=False,
+        REDIS_KEY_PREFIX="bench",
+        BILL_USAGE_SETTLEMENT_BATCH_SIZE=args.batch_size,
+        TZ="UTC",
+    )
+    dao.db.init_app(app)
+    settlement.cache_provider = InMemoryCacheProvider()
+    # Every usage belongs to the hot creator; skip the shifu owner lookup.
+    settlement.resolve_usage_creator_bid = lambda _app, _usage: _CREATOR_BID
+
+    started_at = datetime(2026, 1, 1, 0, 0, 0)
+    usage_bids = [f"bench-usage-{index}" for index in range(args.usages)]
+
+    def seed() -> None:
+        dao.db.drop_all()
+        dao.db.create_all()
+        dao.db.session.add(
+            CreditWallet(
+                wallet_bid="bench-wallet",
+                creator_bid=_CREATOR_BID,
+                available_credits=Decimal(args.usages),
+                reserved_credits=Decimal(0),
+                lifetime_granted_credits=Decimal(args.usages),
+                lifetime_consumed_credits=Decimal(0),
+                last_settled_usage_id=0,
+                version=0,
+            )
+        )
+        dao.db.session.add(
+            CreditWalletBucket(
+                wallet_bucket_bid="bench-bucket",
+                wallet_bid="bench-wallet",
+                creator_bid=_CREATOR_BID,
+                bucket_category=CREDIT_BUCKET_CATEGORY_FREE,
+                source_type=0,
+                source_bid="bench-grant",
+                priority=10,
+                original_credits=Decimal(args.usages),
+                available_credits=Decimal(args.usages),
+                reserved_credits=Decimal(0),
+                consumed_credits=Decimal(0),
+                expired_credits=Decimal(0),
+                effective_from=started_at,
+                effective_to=None,
+                status=CREDIT_BUCKET_STATUS_ACTIVE,
+                metadata_json={},
+                created_at=started_at,
+                updated_at=started_at,
+            )
+        )
+        dao.db.session.add(
+            CreditUsageRate(
+                rate_bid="bench-rate",
+                usage_type=BILL_USAGE_TYPE_LLM,
+                provider="*",
+                model="*",
+                usage_scene=BILL_USAGE_SCENE_PROD,
+                billing_metric=BILLING_METRIC_LLM_INPUT_TOKENS,
+                unit_size=1000,
+                credits_per_unit=Decimal("1.0000000000"),
+                rounding_mode=CREDIT_ROUNDING_MODE_CEIL,
+                effective_from=started_at,
+                effective_to=None,
+                status=CREDIT_USAGE_RATE_STATUS_ACTIVE,
+            )
+        )
+        dao.db.session.add_all(
+            BillUsageRecord(
+                usage_bid=usage_bid,
+                parent_usage_bid="",
+                user_bid="bench-learner",
+                shifu_bid="bench-shifu",
+                outline_item_bid="",
+                progress_record_bid="",
+                generated_block_bid="",
+                audio_bid="",
+                request_id=f"req-{usage_bid}",
+                trace_id=f"trace-{usage_bid}",
+                usage_type=BILL_USAGE_TYPE_LLM,
+                record_level=0,
+                usage_scene=BILL_USAGE_SCENE_PROD,
+                provider="openai",
+                model="gpt-bench",
+                is_stream=1,
+                input=1000,
+                input_cache=0,
+                output=0,
+                total=1000,
+                word_count=0,
+                duration_ms=0,
+                latency_ms=0,
+                segment_index=0,
+                segment_count=0,
+                billable=1,
+                status=0,
+                error_message="",
+                extra={},
+                created_at=started_at,
+                updated_at=started_at,
+            )
+            for usage_bid in usage_bids
+        )
+        dao.db.session.commit()
+
+    def ledger_totals() -> tuple[int, Decimal]:
+        entries = CreditLedgerEntry.query.filter_by(creator_bid=_CREATOR_BID).all()
+        return len(entries), sum((entry.amount for entry in entries), Decimal(0))
+
+    def run_per_task() -> float:
+        begin = time.perf_counter()
+        for usage_bid in usage_bids:
+            settlement.settle_bill_usage(app, usage_bid=usage_bid)
+        return time.perf_counter() - begin
+
+    def run_batched() -> float:
+        queue = settlement._CreatorUsageSettlementQueue(app, creator_bid=_CREATOR_BID)
+        for usage_bid in usage_bids:
+            queue.push(usage_bid)
+        begin = time.perf_counter()
+        settlement.drain_creator_usage_settlements(app, creator_bid=_CREATOR_BID)
+        return time.perf_counter() - begin
+
+    results: list[tuple[str, float, tuple[int, Decimal]]] = []
+    with app.app_context():
+        for label, runner in (
+            ("per-task", run_per_task),
+            (f"batch({args.batch_size})", run_batched),
+        ):
+            seed()
+            elapsed = runner()
+            dao.db.session.remove()
+            results.append((label, elapsed, ledger_totals()))
+        dao.db.session.remove()
+        dao.db.drop_all()
+
+    print(f"usages: {args.usages}  database: {args.database_uri.split('://')[0]}")
+    baseline = results[0][1]
+    for label, elapsed, (entry_count, amount) in results:
+        rate = args.usages / elapsed if elapsed > 0 else float("inf")
+        print(
+            f"{label:>12}: {elapsed * 1000:9.1f} ms  {rate:9.1f} usages/s  "
+            f"speedup {baseline / elapsed:5.2f}x  "
+            f"ledger entries {entry_count} amount {amount}"
+        )
+    if results[0][2] != results[1][2]:
+        print("ledger totals differ between the two paths", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""Compare per-row and buffered usage metering writes for listen-mode lessons.
+
+Replays ``--lessons`` synthetic listen-mode lessons. Each lesson has
+``--blocks`` blocks, and each block records one LLM usage, ``--segments`` TTS
+segment rows and the TTS parent row the way the streaming request path does.
+The lessons run twice on a fresh schema: once with ``BILL_USAGE_WRITE_MODE``
+``direct`` (one commit per row) and once ``buffered``. Both runs must store
+the same number of rows and enqueue the same number of settlements.
+
+Run from the ``src/api`` directory:
+
+    PYTHONPATH=. python scripts/bench_usage_write_buffer.py
+    PYTHONPATH=. python scripts/bench_usage_write_buffer.py --lessons 50 --database-uri "mysql+pymysql://root:pw@127.0.0.1/ai_shifu_bench"
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+
+os.environ.setdefault("SKIP_LOAD_DOTENV", "1")
+os.environ.setdefault("SKIP_APP_AUTOCREATE", "1")
+os.environ.setdefault("SKIP_DB_MIGRATIONS_FOR_TESTS", "1")
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse arguments for the usage write benchmark."""
+    parser = argparse.ArgumentParser(
+        description="Compare per-row and buffered usage metering writes."
+    )
+    parser.add_argument("--lessons", type=int, default=20)
+    parser.add_argument("--blocks", type=int, default=12)
+    parser.add_argument("--segments", type=int, default=4)
+    parser.add_argument("--batch-size", type=int, default=50)
+    parser.add_argument("--flush-interval-ms", type=int, default=200)
+    parser.add_argument(
+        "--database-uri",
+        default="sqlite:///:memory:",
+        help="Database to benchmark against; its tables are dropped and rebuilt",
+    )
+    return parser.parse_args()
+
+
+def main() -> int:
+    """Record the same lessons through both write modes and print the costs."""
+    args = parse_args()
+
+    import shutil
+    import statistics
+    import tempfile
+    import time
+
+    from flask import Flask
+    from flaskr import dao
+    from flaskr.service.metering import recorder, usage_buffer
+    from flaskr.service.metering.consts import BILL_USAGE_SCENE_PROD
+    from flaskr.service.metering.models import BillUsageRecord
+    from flaskr.util.uuid import generate_id
+    from sqlalchemy import event
+
+    enqueued: list[str] = []
+    recorder._enqueue_usage_settlement = lambda _app, *, usage_bid: enqueued.append(
+        usage_bid
+    )
+    spill_dir = tempfile.mkdtemp(prefix="usage-spill-bench-")
+
+    def build_app(mode: str) -> Flask:
+        app = Flask(f"bench-{mode}")
+        app.config.update(
+            SQLALCHEMY_DATABASE_URI=args.database_uri,
+            SQLALCHEMY_BINDS={
+                "ai_shifu_saas": args.database_uri,
+                "ai_shifu_admin": args.database_uri,
+            },
+            SQLALCHEMY_TRACK_MODIFICATIONS=False,
+            TZ="UTC",
+            BILL_USAGE_WRITE_MODE=mode,
+            BILL_USAGE_WRITE_BATCH_SIZE=args.batch_size,
+            BILL_USAGE_WRITE_FLUSH_INTERVAL_MS=args.flush_interval_ms,
+            BILL_USAGE_WRITE_SPILL_DIR=spill_dir,
+        )
+        dao.db.init_app(app)
+        return app
+
+    def record_lesson(app: Flask, lesson: int, latencies: list[float]) -> None:
+        context = recorder.UsageContext(
+            user_bid=f"bench-learner-{lesson}",
+            shifu_bid="bench-shifu",
+            usage_scene=BILL_USAGE_SCENE_PROD,
+            billable=1,
+        )
+
+        def timed(fn, **kwargs: object) -> None:
+            begin = time.perf_counter()
+            fn(app, context, **kwargs)
+            latencies.append(time.perf_counter() - begin)
+
+        for _block in range(args.blocks):
+            timed(
+                recorder.record_llm_usage,
+                provider="openai",
+                model="gpt-bench",
+                is_stream=True,
+                input=800,
+                output=300,
+                total=1100,
+            )
+            parent_usage_bid = generate_id(app)
+            for segment_index in range(args.segments):
+                timed(
+                    recorder.record_tts_usage,
+                    provider="minimax",
+                    model="speech-bench",
+                    is_stream=True,
+                    input=60,
+                    output=60,
+                    total=60,
+                    word_count=60,
+                    duration_ms=4000,
+                    record_level=1,
+                    parent_usage_bid=parent_usage_bid,
+                    segment_index=segment_index,
+                )
+            timed(
+                recorder.record_tts_usage,
+                usage_bid=parent_usage_bid,
+                provider="minimax",
+                model="speech-bench",
+                is_stream=True,
+                input=60 * args.segments,
+                output=60 * args.segments,
+                total=60 * args.segments,
+                word_count=60 * args.segments,
+                duration_ms=4000 * args.segments,
+                segment_count=args.segments,
+            )
+
+    results = []
+    for mode in (
+        usage_buffer.USAGE_WRITE_MODE_DIRECT,
+        usage_buffer.USAGE_WRITE_MODE_BUFFERED,
+    ):
+        app = build_app(mode)
+        enqueued.clear()
+        with app.app_context():
+            dao.db.drop_all()
+            dao.db.create_all()
+            commits: list[object] = []
+            event.listen(dao.db.engine, "commit", commits.append)
+            latencies: list[float] = []
+            begin = time.perf_counter()
+            for lesson in range(args.lessons):
+                record_lesson(app, lesson, latencies)
+            usage_buffer.flush_usage_write_buffer(app)
+            elapsed = time.perf_counter() - begin
+            buffer = app.extensions.get("usage_write_buffer")
+            if buffer is not None:
+                buffer.close()
+            dao.db.session.remove()
+            rows = BillUsageRecord.query.count()
+            dao.db.session.remove()
+            dao.db.drop_all()
+        latencies.sort()
+        results.append(
+            (
+                mode,
+                elapsed,
+                len(commits),
+                statistics.median(latencies),
+                latencies[min(int(len(latencies) * 0.99), len(latencies) - 1)],
+                rows,
+                len(enqueued),
+            )
+        )
+    shutil.rmtree(spill_dir, ignore_errors=True)
+
+    print(
+        f"lessons: {args.lessons}  rows/lesson: "
+        f"{args.blocks * (args.segments + 2)}  "
+        f"database: {args.database_uri.split('://')[0]}"
+    )
+    for mode, elapsed, commit_count, p50, p99, rows, _settled in results:
+        print(
+            f"{mode:>9}: {elapsed * 1000:9.1f} ms  "
+            f"commits/lesson {commit_count / args.lessons:7.2f}  "
+            f"record p50 {p50 * 1e6:8.1f} us  p99 {p99 * 1e6:8.1f} us  "
+            f"rows {rows}"
+        )
+    if results[0][5:] != results[1][5:]:
+        print("stored rows or settlements differ between the modes", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
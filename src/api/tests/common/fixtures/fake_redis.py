@@ -1,17 +1,28 @@
 """Provide fake Redis support for common fixtures tests."""
 
+import threading
 import time
 from typing import Any
 
+from redis.exceptions import LockError
+
 
 class FakeRedisLock:
-    """Simulate Redis lock behavior for tests."""
+    """Simulate Redis lock behavior for tests.
+
+    Like redis-py, a ``thread_local`` lock keeps its token per thread, so
+    only the thread that acquired it can release it.
+    """
 
-    def __init__(self, locks: dict[str, bool], key: str) -> None:
+    def __init__(
+        self, locks: dict[str, bool], key: str, *, thread_local: bool = True
+    ) -> None:
         """Bind a shared lock registry and key with an unheld state."""
         self._locks = locks
         self._key = key
+        self._thread_local = thread_local
         self._held = False
+        self._owner: int | None = None
 
     def acquire(self, blocking: bool = True, blocking_timeout: int | None = None):
         _ = (blocking, blocking_timeout)
@@ -19,12 +30,17 @@ class FakeRedisLock:
             return False
         self._locks[self._key] = True
         self._held = True
+        self._owner = threading.get_ident()
         return True
 
     def release(self):
-        if self._held:
-            self._locks.pop(self._key, None)
-            self._held = False
+        if not self._held:
+            return
+        if self._thread_local and self._owner != threading.get_ident():
+            message = "Cannot release an unlocked lock"
+            raise LockError(message)
+        self._locks.pop(self._key, None)
+        self._held = False
 
 
 class FakeRedis:
@@ -63,6 +79,9 @@ class FakeRedis:
             return None
         return self._store.get(key)
 
+    def mget(self, keys):
+        return [self.get(key) for key in keys]
+
     def getex(self, key: str, ex: int | None = None, px: int | None = None):
         value = self.get(key)
         if value is None:
@@ -138,9 +157,10 @@ class FakeRedis:
         key: str,
         timeout: int | None = None,
         blocking_timeout: int | None = None,
+        thread_local: bool = True,
     ):
         _ = (timeout, blocking_timeout)
-        return FakeRedisLock(self._locks, key)
+        return FakeRedisLock(self._locks, key, thread_local=thread_local)
 
     def ping(self):
         return True
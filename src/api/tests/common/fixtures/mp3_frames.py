@@ -0,0 +1,46 @@
+"""Build synthetic MPEG audio streams for frame-level audio tests."""
+
+# MPEG-2 Layer III, 64 kbps, 24 kHz, mono: 192-byte frames of 576 samples (24 ms).
+MPEG2_24K_MONO_HEADER = b"\xff\xf3\x84\xc4"
+MPEG2_24K_FRAME_BYTES = 192
+MPEG2_24K_FRAME_MS = 24
+# MPEG-1 Layer III, 128 kbps, 48 kHz, mono: 384-byte frames of 1152 samples.
+MPEG1_48K_MONO_HEADER = b"\xff\xfb\x94\xc4"
+MPEG1_48K_FRAME_BYTES = 384
+
+
+def build_mp3(
+    frame_count: int,
+    *,
+    header: bytes = MPEG2_24K_MONO_HEADER,
+    frame_bytes: int = MPEG2_24K_FRAME_BYTES,
+    fill: int = 0,
+) -> bytes:
+    """Return ``frame_count`` silent frames sharing one header."""
+    frame = header + bytes([fill]) * (frame_bytes - len(header))
+    return frame * frame_count
+
+
+def build_info_frame(
+    *,
+    header: bytes = MPEG2_24K_MONO_HEADER,
+    frame_bytes: int = MPEG2_24K_FRAME_BYTES,
+    side_info_bytes: int = 9,
+) -> bytes:
+    """Return a Xing/Info metadata frame as encoders write it first."""
+    payload = bytes(side_info_bytes) + b"Info"
+    return header + payload + bytes(frame_bytes - len(header) - len(payload))
+
+
+def build_id3v2_tag(body: bytes = b"TIT2 lesson") -> bytes:
+    """Return an ID3v2.4 tag wrapping ``body``."""
+    size = len(body)
+    syncsafe = bytes(
+        [(size >> 21) & 0x7F, (size >> 14) & 0x7F, (size >> 7) & 0x7F, size & 0x7F]
+    )
+    return b"ID3\x04\x00\x00" + syncsafe + body
+
+
+def build_id3v1_tag() -> bytes:
+    """Return a 128-byte ID3v1 trailer."""
+    return b"TAG" + bytes(125)
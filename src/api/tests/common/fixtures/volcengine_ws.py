@@ -0,0 +1,235 @@
+"""Stand in for the Volcengine bidirectional TTS WebSocket server.
+
+``StandInWebSocketModule`` replaces the ``websocket`` client module. Each
+``create_connection`` returns a connection whose server side speaks the V3
+binary protocol: it answers StartConnection, runs sessions one after another
+and synthesizes ``b"audio:" + text``. The client end of a socket pair backs
+``sock`` so readiness probes see a connection the server has closed.
+"""
+
+from __future__ import annotations
+
+import json
+import socket
+import struct
+from collections import deque
+from types import SimpleNamespace
+from typing import Any
+
+START_CONNECTION = 1
+FINISH_CONNECTION = 2
+CONNECTION_STARTED = 50
+CONNECTION_FINISHED = 52
+START_SESSION = 100
+FINISH_SESSION = 102
+SESSION_STARTED = 150
+SESSION_FINISHED = 152
+SESSION_FAILED = 153
+TASK_REQUEST = 200
+TTS_SENTENCE_END = 351
+TTS_RESPONSE = 352
+TTS_SUBTITLE = 364
+
+_FULL_SERVER_RESPONSE = 0b1001
+_AUDIO_ONLY_RESPONSE = 0b1011
+_WITH_EVENT = 0b0100
+_JSON = 0b0001
+
+
+class StandInWebSocketError(Exception):
+    """Base error of the stand-in client module."""
+
+
+class StandInTimeoutError(StandInWebSocketError):
+    """No frame arrived before the receive timeout."""
+
+
+class StandInClosedError(StandInWebSocketError):
+    """The server side has closed the connection."""
+
+
+def encode_server_frame(
+    event: int,
+    *,
+    identifier: str | None = None,
+    payload: dict[str, Any] | None = None,
+    audio: bytes | None = None,
+) -> bytes:
+    """Encode a downstream frame as the Volcengine server sends it."""
+    message_type = _AUDIO_ONLY_RESPONSE if audio is not None else _FULL_SERVER_RESPONSE
+    serialization = 0 if audio is not None else _JSON
+    frame = bytes([0x11, (message_type << 4) | _WITH_EVENT, serialization << 4, 0])
+    frame += struct.pack(">i", event)
+    if identifier is not None:
+        encoded = identifier.encode("utf-8")
+        frame += struct.pack(">I", len(encoded)) + encoded
+    body = audio if audio is not None else json.dumps(payload or {}).encode("utf-8")
+    return frame + struct.pack(">I", len(body)) + body
+
+
+def decode_client_frame(frame: bytes) -> tuple[int, str | None, dict[str, Any]]:
+    """Return the event, session id and JSON payload of an upstream frame."""
+    event = struct.unpack(">i", frame[4:8])[0]
+    offset = 8
+    session_id = None
+    if event >= START_SESSION:
+        length = struct.unpack(">I", frame[offset : offset + 4])[0]
+        session_id = frame[offset + 4 : offset + 4 + length].decode("utf-8")
+        offset += 4 + length
+    size = struct.unpack(">I", frame[offset : offset + 4])[0]
+    body = frame[offset + 4 : offset + 4 + size]
+    return event, session_id, json.loads(body or b"{}")
+
+
+class StandInConnection:
+    """Client handle whose server side runs the bidirection protocol."""
+
+    def __init__(self, server: StandInWebSocketModule, url: str, header: dict) -> None:
+        """Open the socket pair and record the handshake headers."""
+        self.server = server
+        self.connection_id = f"conn-{len(server.connections)}"
+        self.url = url
+        self.header = dict(header)
+        self.sock, self._server_sock = socket.socketpair()
+        self.connected = True
+        self.server_closed = False
+        self.outbox: deque[bytes] = deque()
+        self.events: list[int] = []
+        self.texts: list[str] = []
+        self.start_session_payloads: list[dict[str, Any]] = []
+        self._session_started_delivered = False
+        self._text = ""
+
+    def settimeout(self, timeout: float) -> None:
+        """Accept the receive timeout; frames are queued, so it never waits."""
+        self.timeout = timeout
+
+    def send(self, frame: bytes, opcode: int | None = None) -> None:
+        """Handle one upstream frame the way the provider server would."""
+        _ = opcode
+        if not self.connected:
+            message = "socket is already closed."
+            raise StandInClosedError(message)
+        if self.server_closed:
+            # The write lands in the kernel buffer; the loss shows on recv.
+            return
+        event, session_id, payload = decode_client_frame(frame)
+        self.events.append(event)
+        if event == START_CONNECTION:
+            self.outbox.append(
+                encode_server_frame(CONNECTION_STARTED, identifier=self.connection_id)
+            )
+        elif event == START_SESSION:
+            self._session_started_delivered = False
+            self.start_session_payloads.append(payload)
+            if self.server.fail_next_session:
+                self.server.fail_next_session = False
+                self.outbox.append(
+                    encode_server_frame(
+                        SESSION_FAILED,
+                        identifier=session_id,
+                        payload={"error": "speaker not permitted"},
+                    )
+                )
+                return
+            self.outbox.append(
+                encode_server_frame(SESSION_STARTED, identifier=session_id)
+            )
+        elif event == TASK_REQUEST:
+            if not self._session_started_delivered:
+                message = "TaskRequest sent before SessionStarted was received"
+                raise AssertionError(message)
+            self._text += payload["req_params"]["text"]
+        elif event == FINISH_SESSION:
+            self._finish_session(session_id)
+        elif event == FINISH_CONNECTION:
+            self.outbox.append(encode_server_frame(CONNECTION_FINISHED, identifier=""))
+
+    def _finish_session(self, session_id: str | None) -> None:
+        text, self._text = self._text, ""
+        self.texts.append(text)
+        duration_ms = 100 * len(text)
+        audio_params = self.start_session_payloads[-1]["req_params"]["audio_params"]
+        self.outbox.append(
+            encode_server_frame(
+                TTS_RESPONSE, identifier=session_id, audio=b"audio:" + text.encode()
+            )
+        )
+        self.outbox.append(
+            encode_server_frame(
+                TTS_SENTENCE_END,
+                identifier=session_id,
+                payload={"res_params": {"duration_ms": duration_ms}},
+            )
+        )
+        if audio_params.get("enable_subtitle"):
+            self.outbox.append(
+                encode_server_frame(
+                    TTS_SUBTITLE,
+                    identifier=session_id,
+                    payload={
+                        "text": text,
+                        "words": [
+                            {
+                                "word": text,
+                                "start_time": 0,
+                                "end_time": duration_ms / 1000,
+                            }
+                        ],
+                    },
+                )
+            )
+        self.outbox.append(
+            encode_server_frame(
+                SESSION_FINISHED, identifier=session_id, payload={"usage": {}}
+            )
+        )
+
+    def recv(self) -> bytes:
+        """Return the next queued server frame."""
+        if self.server_closed or not self.connected:
+            message = "Connection to remote host was lost."
+            raise StandInClosedError(message)
+        if not self.outbox:
+            message = "timed out"
+            raise StandInTimeoutError(message)
+        frame = self.outbox.popleft()
+        if struct.unpack(">i", frame[4:8])[0] == SESSION_STARTED:
+            self._session_started_delivered = True
+        return frame
+
+    def drop(self, *, notify: bool = True) -> None:
+        """Close the server side; ``notify`` leaves a close frame to read."""
+        self.server_closed = True
+        if notify:
+            self._server_sock.sendall(b"\x88\x00")
+
+    def close(self, **kwargs: object) -> None:
+        """Close the client side."""
+        _ = kwargs
+        self.connected = False
+        self.sock.close()
+        self._server_sock.close()
+
+
+class StandInWebSocketModule:
+    """Replacement for the ``websocket`` module that records connections."""
+
+    ABNF = SimpleNamespace(OPCODE_BINARY=2)
+    WebSocketException = StandInWebSocketError
+    WebSocketTimeoutException = StandInTimeoutError
+    WebSocketConnectionClosedException = StandInClosedError
+
+    def __init__(self) -> None:
+        """Start without connections."""
+        self.connections: list[StandInConnection] = []
+        self.fail_next_session = False
+
+    def create_connection(
+        self, url: str, *, header: dict, timeout: float, **kwargs: object
+    ) -> StandInConnection:
+        """Open a stand-in connection as ``websocket.create_connection`` would."""
+        _ = (timeout, kwargs)
+        connection = StandInConnection(self, url, header)
+        self.connections.append(connection)
+        return connection
@@ -49,6 +49,7 @@ def test_create_celery_app_reuses_flask_config() -> None:
     assert celery_app.conf["timezone"] == "Asia/Shanghai"
     assert celery_app.flask_app is flask_app
     assert "billing.settle_usage" in celery_app.tasks
+    assert "billing.settle_usage_batch" in celery_app.tasks
     assert "billing.replay_usage_settlement" in celery_app.tasks
     assert "billing.expire_wallet_buckets" in celery_app.tasks
     assert "billing.expire_pending_orders" in celery_app.tasks
@@ -66,6 +67,7 @@ def test_create_celery_app_reuses_flask_config() -> None:
     assert "billing.finalize_daily_ledger_summary" in celery_app.tasks
     assert "billing.rebuild_daily_aggregates" in celery_app.tasks
     assert "billing.verify_domain_binding" in celery_app.tasks
+    assert "billing.verify_wallet_projections" in celery_app.tasks
 
     beat_schedule = celery_app.conf.beat_schedule
     assert beat_schedule["billing.dispatch_due_renewal_events.schedule"]["task"] == (
@@ -130,6 +132,14 @@ def test_create_celery_app_reuses_flask_config() -> None:
         minute="45",
         hour="1",
     )
+    assert beat_schedule["billing.verify_wallet_projections.schedule"]["kwargs"] == {
+        "repair": True
+    }
+    _assert_cron_schedule(
+        beat_schedule["billing.verify_wallet_projections.schedule"]["schedule"],
+        minute="40",
+        hour="3",
+    )
 
 
 def test_create_celery_app_runs_tasks_in_flask_app_context() -> None:
@@ -182,7 +192,7 @@ def test_create_celery_app_executes_billing_tasks_in_eager_mode(
     )
     monkeypatch.setattr(
         "flaskr.service.billing.tasks.aggregate_daily_usage_metrics",
-        lambda _app, *, stat_date="", creator_bid="", finalize=False: {
+        lambda _app, *, stat_date="", creator_bid="", finalize=False, **_kwargs: {
             "status": "finalized" if finalize else "aggregated",
             "stat_date": stat_date,
             "creator_bid": creator_bid or None,
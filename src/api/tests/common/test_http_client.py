@@ -0,0 +1,126 @@
+"""Verify pooled HTTP clients reuse sessions and retry within a budget."""
+
+from __future__ import annotations
+
+import flaskr.common.config as common_config
+import pytest
+import requests
+from flaskr.common import http_client
+from flaskr.common.http_client import (
+    PooledHTTPClient,
+    RetryBudget,
+    resolve_http_pool_size,
+)
+from urllib3.exceptions import MaxRetryError, NewConnectionError, ProtocolError
+
+_CONFIG_KEYS = (
+    "HTTP_CLIENT_POOL_SIZE",
+    "HTTP_CLIENT_POOL_SIZES",
+    "HTTP_CLIENT_RETRY_BUDGET_RATIO",
+)
+
+
+def _reset_config_cache() -> None:
+    for key in _CONFIG_KEYS:
+        common_config.__ENHANCED_CONFIG__._cache.pop(key, None)
+
+
+@pytest.fixture(autouse=True)
+def fresh_http_clients(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(
+        http_client, "_http_client_state", http_client._HTTPClientState()
+    )
+    _reset_config_cache()
+    yield
+    _reset_config_cache()
+
+
+class _FlakySession:
+    def __init__(self, failures: list[Exception]) -> None:
+        self.failures = list(failures)
+        self.calls = 0
+
+    def request(self, method: str, url: str, **kwargs: object):
+        _ = (method, url, kwargs)
+        self.calls += 1
+        if self.failures:
+            raise self.failures.pop(0)
+        return "ok"
+
+
+def _use_session(name: str, session: _FlakySession, budget: RetryBudget) -> None:
+    http_client._http_client_state.pid = http_client.os.getpid()
+    http_client._http_client_state.sessions[name] = http_client._PooledSession(
+        session=session, budget=budget, pool_size=1
+    )
+
+
+def test_clients_with_one_name_share_a_session_until_the_process_forks(
+    monkeypatch: pytest.MonkeyPatch,
+):
+    first = http_client._get_pooled_session("tts")
+    second = http_client._get_pooled_session("tts")
+    other = http_client._get_pooled_session("ask")
+
+    assert first is second
+    assert other is not first
+    adapter = first.session.get_adapter("https://api.example.com")
+    assert adapter._pool_maxsize == http_client.DEFAULT_HTTP_CLIENT_POOL_SIZE
+    assert adapter.max_retries.total == 0
+
+    monkeypatch.setattr(http_client.os, "getpid", lambda: -1)
+
+    assert http_client._get_pooled_session("tts") is not first
+
+
+def test_pool_size_falls_back_from_client_override_to_default(
+    monkeypatch: pytest.MonkeyPatch,
+):
+    monkeypatch.setenv("HTTP_CLIENT_POOL_SIZE", "4")
+    monkeypatch.setenv("HTTP_CLIENT_POOL_SIZES", '{"minimax": 32}')
+
+    assert resolve_http_pool_size("minimax") == 32
+    assert resolve_http_pool_size("baidu") == 4
+
+
+def _connect_error() -> requests.ConnectionError:
+    reason = NewConnectionError(None, "Connection refused")
+    return requests.ConnectionError(MaxRetryError(None, "/tts", reason))
+
+
+def test_connection_errors_are_retried_until_the_budget_runs_out():
+    session = _FlakySession([_connect_error()] * 2)
+    _use_session("tts", session, RetryBudget(ratio=0, initial_tokens=1))
+    client = PooledHTTPClient("tts")
+
+    with pytest.raises(requests.ConnectionError):
+        client.post("https://api.example.com/tts", json={})
+    assert session.calls == 2
+
+    assert client.post("https://api.example.com/tts", json={}) == "ok"
+    assert session.calls == 3
+
+
+def test_post_is_not_replayed_after_the_request_was_sent():
+    dropped = requests.ConnectionError(
+        ProtocolError("Connection aborted.", ConnectionResetError())
+    )
+    session = _FlakySession([dropped, dropped])
+    _use_session("tts", session, RetryBudget(ratio=1, initial_tokens=10))
+    client = PooledHTTPClient("tts")
+
+    with pytest.raises(requests.ConnectionError):
+        client.post("https://api.example.com/tts", json={})
+    assert session.calls == 1
+
+    assert client.get("https://api.example.com/voices") == "ok"
+    assert session.calls == 3
+
+
+def test_timeouts_are_never_retried():
+    session = _FlakySession([requests.ConnectTimeout("slow")])
+    _use_session("tts", session, RetryBudget(ratio=1, initial_tokens=10))
+
+    with pytest.raises(requests.ConnectTimeout):
+        PooledHTTPClient("tts").get("https://api.example.com/token")
+    assert session.calls == 1
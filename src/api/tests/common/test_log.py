@@ -19,7 +19,7 @@ def test_feishu_log_handler_does_not_reemit_webhook_failures(monkeypatch):
         calls.append((args, kwargs))
         return _FailingResponse()
 
-    monkeypatch.setattr(requests, "post", fake_post)
+    monkeypatch.setattr("flaskr.common.log._http_client.post", fake_post)
 
     handler = FeishuLogHandler("https://example.invalid/open-apis/bot/v2/hook/test")
     record = logging.LogRecord(
@@ -47,7 +47,7 @@ def test_feishu_log_handler_surfaces_delivery_failure_without_recursion(
         calls.append((args, kwargs))
         return _FailingResponse()
 
-    monkeypatch.setattr(requests, "post", fake_post)
+    monkeypatch.setattr("flaskr.common.log._http_client.post", fake_post)
 
     handler = FeishuLogHandler("https://example.invalid/open-apis/bot/v2/hook/test")
     handler.setFormatter(logging.Formatter("%(message)s"))
@@ -75,7 +75,7 @@ def test_feishu_log_handler_reentrancy_guard_blocks_nested_emit(monkeypatch):
         calls.append((args, kwargs))
         return type("Response", (), {"raise_for_status": lambda _self: None})()
 
-    monkeypatch.setattr(requests, "post", fake_post)
+    monkeypatch.setattr("flaskr.common.log._http_client.post", fake_post)
 
     handler = FeishuLogHandler("https://example.invalid/open-apis/bot/v2/hook/test")
     record = logging.LogRecord(
@@ -104,7 +104,7 @@ def test_feishu_log_handler_truncates_oversized_payload(monkeypatch):
         captured["timeout"] = timeout
         return type("Response", (), {"raise_for_status": lambda _self: None})()
 
-    monkeypatch.setattr(requests, "post", fake_post)
+    monkeypatch.setattr("flaskr.common.log._http_client.post", fake_post)
 
     handler = FeishuLogHandler("https://example.invalid/open-apis/bot/v2/hook/test")
     record = logging.LogRecord(
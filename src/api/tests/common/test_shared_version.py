@@ -0,0 +1,55 @@
+"""Verify the Redis version counters shared by per-process caches."""
+
+import pytest
+from flask import Flask
+from flaskr import dao
+from flaskr.common.shared_version import bump_shared_version, read_shared_version
+
+from tests.common.fixtures.fake_redis import FakeRedis
+
+
+class _BrokenRedis:
+    def get(self, _key):
+        message = "redis down"
+        raise ConnectionError(message)
+
+    def incr(self, _key):
+        message = "redis down"
+        raise ConnectionError(message)
+
+
+@pytest.fixture
+def app() -> Flask:
+    return Flask("shared-version")
+
+
+def test_missing_counter_reads_as_zero_and_bumps_increment(app, monkeypatch):
+    monkeypatch.setattr(dao._redis_state, "client", FakeRedis())
+
+    assert read_shared_version(app, "test:version", label="test cache") == "0"
+    bump_shared_version(app, "test:version", label="test cache")
+    bump_shared_version(app, "test:version", label="test cache")
+
+    assert read_shared_version(app, "test:version", label="test cache") == "2"
+
+
+def test_without_redis_reads_fail_open(app, monkeypatch):
+    monkeypatch.setattr(dao._redis_state, "client", None)
+
+    assert read_shared_version(app, "test:version", label="test cache") is None
+    bump_shared_version(app, "test:version", label="test cache")
+
+
+def test_redis_errors_fail_open_and_name_the_cache(app, monkeypatch, caplog):
+    monkeypatch.setattr(dao._redis_state, "client", _BrokenRedis())
+
+    assert read_shared_version(app, "test:version", label="test cache") is None
+    bump_shared_version(app, "test:version", label="test cache")
+
+    messages = [record.getMessage() for record in caplog.records]
+    assert any(
+        message.startswith("test cache version read failed") for message in messages
+    )
+    assert any(
+        message.startswith("test cache version bump failed") for message in messages
+    )
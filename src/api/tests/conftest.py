@@ -205,6 +205,30 @@ def mock_redis_client(monkeypatch, request):
     return fake_redis
 
 
+@pytest.fixture(autouse=True)
+def clear_published_struct_cache():
+    # Tests recreate published struct rows that can reuse ids across cases.
+    module = sys.modules.get("flaskr.service.shifu.published_struct_cache")
+    if module is not None:
+        module.clear_published_struct_cache()
+    yield
+    module = sys.modules.get("flaskr.service.shifu.published_struct_cache")
+    if module is not None:
+        module.clear_published_struct_cache()
+
+
+@pytest.fixture(autouse=True)
+def clear_usage_rate_index():
+    # Rate rows are reseeded per test database, often without a Redis version.
+    module = sys.modules.get("flaskr.service.billing.rate_index")
+    if module is not None:
+        module.clear_usage_rate_index()
+    yield
+    module = sys.modules.get("flaskr.service.billing.rate_index")
+    if module is not None:
+        module.clear_usage_rate_index()
+
+
 def _should_skip_llm_mock(request) -> bool:
     return request.node.get_closest_marker("no_mock_llm") is not None
 
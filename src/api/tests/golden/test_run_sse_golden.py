@@ -167,3 +167,43 @@ def test_run_ask_flow_golden(app, test_client, monkeypatch, golden_shifu):
     assert_or_update_golden(
         "run_ask_flow.sse.txt", normalize_sse_transcript(raw, IdNormalizer())
     )
+
+
+def _fold_elements(events: list[dict]) -> list[tuple[str, str, bool]]:
+    elements: dict[str, dict] = {}
+    for event in events:
+        content = event.get("content")
+        if event.get("type") != "element" or not isinstance(content, dict):
+            continue
+        if content.get("change_type") == "diff" and "content_offset" in content:
+            current = elements[content["element_bid"]]
+            assert len(current["content"]) == content["content_offset"]
+            content = {**content, "content": current["content"] + content["content"]}
+        elements[content["element_bid"]] = content
+    ordered = sorted(elements.values(), key=lambda item: item["element_index"])
+    return [
+        (item["element_type"], item["content"], item["is_final"]) for item in ordered
+    ]
+
+
+def test_run_element_delta_stream_reconstructs_snapshots(
+    app, test_client, monkeypatch, golden_shifu
+):
+    _prepare_user(app, monkeypatch, "golden-user-delta-full-0001")
+    full_raw = _run_lesson(
+        test_client, golden_shifu, {"input": None, "input_type": "start"}
+    )
+    _prepare_user(app, monkeypatch, "golden-user-delta-0001")
+    delta_raw = _run_lesson(
+        test_client,
+        golden_shifu,
+        {"input": None, "input_type": "start", "element_delta": True},
+    )
+
+    delta_events = parse_sse_events(delta_raw)
+    assert any(
+        isinstance(event.get("content"), dict)
+        and event["content"].get("change_type") == "diff"
+        for event in delta_events
+    )
+    assert _fold_elements(delta_events) == _fold_elements(parse_sse_events(full_raw))
@@ -0,0 +1,36 @@
+"""Keep the billing pipeline benchmark within its query budgets."""
+
+from __future__ import annotations
+
+from scripts.bench_billing_pipeline import (
+    OP_AGGREGATE_LEDGER_SUMMARY,
+    OP_AGGREGATE_USAGE_METRICS,
+    OP_DISPATCH_RENEWAL_EVENTS,
+    OP_EXPIRE_WALLET_BUCKETS,
+    OP_RUN_RENEWAL_EVENT,
+    OP_SETTLE_USAGE,
+    PipelineSeed,
+    build_bench_app,
+    find_budget_violations,
+    run_billing_pipeline,
+)
+
+
+def test_billing_pipeline_stays_within_query_budgets() -> None:
+    seed = PipelineSeed(creators=3, buckets=2, usages=2, renewal_creators=1)
+    app = build_bench_app("sqlite:///:memory:")
+
+    operations = run_billing_pipeline(app, seed)
+
+    units = {stats.name: stats.units for stats in operations}
+    assert units[OP_SETTLE_USAGE] == seed.creators * seed.usages
+    assert units[OP_DISPATCH_RENEWAL_EVENTS] == seed.renewal_creators
+    assert units[OP_RUN_RENEWAL_EVENT] == seed.renewal_creators
+    # Renewal expiry already closed the renewal creators' past-due buckets.
+    assert units[OP_EXPIRE_WALLET_BUCKETS] == (
+        (seed.creators - seed.renewal_creators) * seed.expiring_buckets_per_creator
+    )
+    assert units[OP_AGGREGATE_USAGE_METRICS] > 0
+    assert units[OP_AGGREGATE_LEDGER_SUMMARY] > 0
+    assert all(stats.query_count > 0 for stats in operations)
+    assert find_budget_violations(operations) == []
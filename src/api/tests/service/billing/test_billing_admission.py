@@ -8,13 +8,18 @@ from decimal import Decimal
 import pytest
 from flask import Flask
 from flaskr import dao
-from flaskr.service.billing.admission import admit_creator_usage
+from flaskr.service.billing import admission as admission_module
+from flaskr.service.billing.admission import (
+    admit_creator_usage,
+    resolve_creator_priority_class,
+)
 from flaskr.service.billing.consts import (
     BILLING_ENTITLEMENT_PRIORITY_CLASS_VIP,
     BILLING_ORDER_STATUS_PAID,
     BILLING_ORDER_TYPE_SUBSCRIPTION_START,
     BILLING_SUBSCRIPTION_STATUS_ACTIVE,
     BILLING_SUBSCRIPTION_STATUS_CANCELED,
+    CREDIT_BUCKET_CATEGORY_FREE,
     CREDIT_BUCKET_CATEGORY_SUBSCRIPTION,
     CREDIT_BUCKET_CATEGORY_TOPUP,
     CREDIT_BUCKET_STATUS_ACTIVE,
@@ -280,6 +285,11 @@ def test_admit_creator_usage_rejects_missing_credits(
         )
 
     assert exc_info.value.code == ERROR_CODE["server.billing.creditInsufficient"]
+    # TTS lane selection never raises; denied creators queue as standard.
+    assert (
+        resolve_creator_priority_class(billing_admission_app, shifu_bid="shifu-empty-1")
+        == "standard"
+    )
 
 
 def test_admit_creator_usage_skips_credit_checks_when_billing_disabled(
@@ -407,6 +417,12 @@ def test_admit_creator_usage_resolves_priority_class(
     )
 
     assert payload["priority_class"] == "vip"
+    assert (
+        resolve_creator_priority_class(
+            billing_admission_app, creator_bid="creator-priority-1"
+        )
+        == "vip"
+    )
 
 
 def test_admit_creator_usage_rejects_expired_topup_bucket_even_if_wallet_snapshot_positive(
@@ -571,3 +587,165 @@ def test_repair_subscription_cycle_mismatches_restores_admission_for_current_buc
 
     assert payload["allowed"] is True
     assert payload["creator_bid"] == "creator-repair-cycle-1"
+
+
+def test_admit_creator_usage_reuses_snapshot_until_balance_crosses_zero(
+    billing_admission_app: Flask,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    with billing_admission_app.app_context():
+        dao.db.session.add(
+            PublishedShifu(
+                shifu_bid="shifu-snapshot-1",
+                created_user_bid="creator-snapshot-1",
+            )
+        )
+        dao.db.session.add(_create_wallet("creator-snapshot-1", "10.0000000000"))
+        dao.db.session.add(_create_active_subscription("creator-snapshot-1"))
+        dao.db.session.add(
+            _create_bucket(
+                "creator-snapshot-1",
+                category=CREDIT_BUCKET_CATEGORY_TOPUP,
+                available_credits="10.0000000000",
+            )
+        )
+        dao.db.session.commit()
+
+    builds: list[str] = []
+    build_snapshot = admission_module._build_admission_snapshot
+
+    def _counting_build(app, creator_bid, *, shifu_bid):
+        builds.append(creator_bid)
+        return build_snapshot(app, creator_bid, shifu_bid=shifu_bid)
+
+    monkeypatch.setattr(admission_module, "_build_admission_snapshot", _counting_build)
+
+    def _admit():
+        return admit_creator_usage(
+            billing_admission_app,
+            shifu_bid="shifu-snapshot-1",
+            usage_scene=BILL_USAGE_SCENE_PREVIEW,
+        )
+
+    assert _admit()["wallet_available_credits"] == Decimal("10.0000000000")
+    assert _admit()["allowed"] is True
+    assert builds == ["creator-snapshot-1"]
+
+    with billing_admission_app.app_context():
+        bucket = CreditWalletBucket.query.filter_by(
+            creator_bid="creator-snapshot-1"
+        ).one()
+        bucket.available_credits = Decimal("4.0000000000")
+        dao.db.session.commit()
+
+    # A settlement that leaves the bucket funded keeps the snapshot.
+    assert _admit()["wallet_available_credits"] == Decimal("10.0000000000")
+    assert len(builds) == 1
+
+    with billing_admission_app.app_context():
+        bucket = CreditWalletBucket.query.filter_by(
+            creator_bid="creator-snapshot-1"
+        ).one()
+        bucket.available_credits = Decimal(0)
+        dao.db.session.commit()
+
+    with pytest.raises(AppError) as exc_info:
+        _admit()
+    assert exc_info.value.code == ERROR_CODE["server.billing.creditInsufficient"]
+    with pytest.raises(AppError):
+        _admit()
+    assert len(builds) == 2
+
+
+def test_admit_creator_usage_cached_denial_clears_after_grant(
+    billing_admission_app: Flask,
+) -> None:
+    with billing_admission_app.app_context():
+        dao.db.session.add(
+            PublishedShifu(
+                shifu_bid="shifu-snapshot-grant-1",
+                created_user_bid="creator-snapshot-grant-1",
+            )
+        )
+        dao.db.session.add(_create_wallet("creator-snapshot-grant-1", "0"))
+        dao.db.session.commit()
+
+    with pytest.raises(AppError) as exc_info:
+        admit_creator_usage(
+            billing_admission_app,
+            shifu_bid="shifu-snapshot-grant-1",
+            usage_scene=BILL_USAGE_SCENE_PREVIEW,
+        )
+    assert exc_info.value.code == ERROR_CODE["server.billing.creditInsufficient"]
+
+    with billing_admission_app.app_context():
+        dao.db.session.add(
+            _create_bucket(
+                "creator-snapshot-grant-1",
+                category=CREDIT_BUCKET_CATEGORY_FREE,
+                available_credits="3.0000000000",
+            )
+        )
+        dao.db.session.commit()
+
+    payload = admit_creator_usage(
+        billing_admission_app,
+        shifu_bid="shifu-snapshot-grant-1",
+        usage_scene=BILL_USAGE_SCENE_PREVIEW,
+    )
+
+    assert payload["allowed"] is True
+    assert payload["wallet_available_credits"] == Decimal("3.0000000000")
+
+
+def test_admit_creator_usage_never_serves_a_snapshot_built_before_a_commit(
+    billing_admission_app: Flask,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    with billing_admission_app.app_context():
+        dao.db.session.add(
+            PublishedShifu(
+                shifu_bid="shifu-snapshot-race-1",
+                created_user_bid="creator-snapshot-race-1",
+            )
+        )
+        dao.db.session.add(_create_wallet("creator-snapshot-race-1", "0"))
+        dao.db.session.commit()
+
+    builds: list[str] = []
+    build_snapshot = admission_module._build_admission_snapshot
+
+    def _build_then_grant(app, creator_bid, *, shifu_bid):
+        builds.append(creator_bid)
+        snapshot = build_snapshot(app, creator_bid, shifu_bid=shifu_bid)
+        if len(builds) == 1:
+            # A grant commits after this build read the rows but before its
+            # snapshot is written back.
+            dao.db.session.add(
+                _create_bucket(
+                    creator_bid,
+                    category=CREDIT_BUCKET_CATEGORY_FREE,
+                    available_credits="3.0000000000",
+                )
+            )
+            dao.db.session.commit()
+        return snapshot
+
+    monkeypatch.setattr(
+        admission_module, "_build_admission_snapshot", _build_then_grant
+    )
+
+    def _admit():
+        return admit_creator_usage(
+            billing_admission_app,
+            shifu_bid="shifu-snapshot-race-1",
+            usage_scene=BILL_USAGE_SCENE_PREVIEW,
+        )
+
+    with pytest.raises(AppError) as exc_info:
+        _admit()
+    assert exc_info.value.code == ERROR_CODE["server.billing.creditInsufficient"]
+
+    assert _admit()["wallet_available_credits"] == Decimal("3.0000000000")
+    assert _admit()["allowed"] is True
+    assert builds == ["creator-snapshot-race-1", "creator-snapshot-race-1"]
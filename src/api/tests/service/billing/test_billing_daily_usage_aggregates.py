@@ -154,7 +154,7 @@ def test_aggregate_daily_usage_metrics_respects_incremental_window_and_creator_s
         assert payload["creator_bid"] == "creator-agg-1"
         assert payload["usage_count"] == 1
         assert payload["row_count"] == 2
-        assert payload["window_ended_at"] == "2026-04-08T12:00:00"
+        assert payload["window_ended_at"] == "2026-04-08T11:55:00"
 
         creator_rows = (
             BillingDailyUsageMetric.query.filter(
@@ -498,6 +498,188 @@ def test_aggregate_daily_usage_metrics_keeps_zero_amount_usage_ledgers(
         assert rows[0].consumed_credits == Decimal(0)
 
 
+def test_incremental_aggregation_folds_usages_after_the_stored_watermark(
+    billing_daily_usage_app: Flask,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(
+        "flaskr.service.billing.daily_aggregates.resolve_usage_creator_bid",
+        lambda _app, _usage: "creator-agg-incremental",
+    )
+
+    with billing_daily_usage_app.app_context():
+        _add_llm_rates()
+        _add_usage(
+            usage_bid="usage-incremental-a",
+            shifu_bid="shifu-agg-1",
+            created_at=datetime(2026, 4, 8, 9, 0, 0),
+            input_tokens=100,
+            output_tokens=40,
+        )
+        _add_usage_ledger(
+            creator_bid="creator-agg-incremental",
+            usage_bid="usage-incremental-a",
+            metric_code=BILLING_METRIC_LLM_INPUT_TOKENS,
+            amount=Decimal("-1.0000000000"),
+            created_at=datetime(2026, 4, 8, 9, 1, 0),
+        )
+        dao.db.session.commit()
+
+        first = aggregate_daily_usage_metrics(
+            billing_daily_usage_app,
+            stat_date="2026-04-08",
+            incremental=True,
+            now=datetime(2026, 4, 8, 12, 0, 0),
+        )
+        assert "watermark" not in first.to_task_payload()
+
+        # Settled after the first run: the ledger entry lands after the
+        # watermark although its usage was already counted.
+        _add_usage_ledger(
+            creator_bid="creator-agg-incremental",
+            usage_bid="usage-incremental-a",
+            metric_code=BILLING_METRIC_LLM_OUTPUT_TOKENS,
+            amount=Decimal("-0.4000000000"),
+            created_at=datetime(2026, 4, 8, 12, 30, 0),
+        )
+        _add_usage(
+            usage_bid="usage-incremental-b",
+            shifu_bid="shifu-agg-1",
+            created_at=datetime(2026, 4, 8, 15, 0, 0),
+            input_tokens=50,
+            output_tokens=0,
+        )
+        _add_usage_ledger(
+            creator_bid="creator-agg-incremental",
+            usage_bid="usage-incremental-b",
+            metric_code=BILLING_METRIC_LLM_INPUT_TOKENS,
+            amount=Decimal("-0.5000000000"),
+            created_at=datetime(2026, 4, 8, 15, 1, 0),
+        )
+        dao.db.session.commit()
+
+        second = aggregate_daily_usage_metrics(
+            billing_daily_usage_app,
+            stat_date="2026-04-08",
+            incremental=True,
+            now=datetime(2026, 4, 8, 20, 0, 0),
+        )
+
+        assert second["watermark"] == "2026-04-08T11:55:00"
+        assert second["usage_count"] == 1
+        assert second["deleted_count"] == 0
+        assert second["row_count"] == 2
+        rows = (
+            BillingDailyUsageMetric.query.filter(
+                BillingDailyUsageMetric.stat_date == "2026-04-08",
+            )
+            .order_by(BillingDailyUsageMetric.billing_metric.asc())
+            .all()
+        )
+        incremental_totals = [
+            (
+                row.billing_metric,
+                int(row.raw_amount or 0),
+                int(row.record_count or 0),
+                str(row.consumed_credits),
+                row.window_ended_at.isoformat(),
+            )
+            for row in rows
+        ]
+        assert incremental_totals == [
+            (
+                BILLING_METRIC_LLM_INPUT_TOKENS,
+                150,
+                2,
+                "1.5000000000",
+                "2026-04-08T19:55:00",
+            ),
+            (
+                BILLING_METRIC_LLM_OUTPUT_TOKENS,
+                40,
+                1,
+                "0.4000000000",
+                "2026-04-08T19:55:00",
+            ),
+        ]
+
+        aggregate_daily_usage_metrics(
+            billing_daily_usage_app,
+            stat_date="2026-04-08",
+            now=datetime(2026, 4, 8, 20, 0, 0),
+        )
+        rebuilt_rows = (
+            BillingDailyUsageMetric.query.filter(
+                BillingDailyUsageMetric.stat_date == "2026-04-08",
+            )
+            .order_by(BillingDailyUsageMetric.billing_metric.asc())
+            .all()
+        )
+        assert [
+            (
+                row.billing_metric,
+                int(row.raw_amount or 0),
+                int(row.record_count or 0),
+                str(row.consumed_credits),
+                row.window_ended_at.isoformat(),
+            )
+            for row in rebuilt_rows
+        ] == incremental_totals
+
+
+def test_incremental_aggregation_folds_usages_committed_after_the_last_run(
+    billing_daily_usage_app: Flask,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(
+        "flaskr.service.billing.daily_aggregates.resolve_usage_creator_bid",
+        lambda _app, _usage: "creator-agg-late",
+    )
+
+    with billing_daily_usage_app.app_context():
+        _add_llm_rates()
+        _add_usage(
+            usage_bid="usage-late-a",
+            shifu_bid="shifu-agg-1",
+            created_at=datetime(2026, 4, 8, 9, 0, 0),
+            input_tokens=100,
+            output_tokens=0,
+        )
+        dao.db.session.commit()
+
+        first = aggregate_daily_usage_metrics(
+            billing_daily_usage_app,
+            stat_date="2026-04-08",
+            incremental=True,
+            now=datetime(2026, 4, 8, 12, 0, 0),
+        )
+        assert first["window_ended_at"] == "2026-04-08T11:55:00"
+
+        # Stamped two minutes before the first run but committed after it.
+        _add_usage(
+            usage_bid="usage-late-b",
+            shifu_bid="shifu-agg-1",
+            created_at=datetime(2026, 4, 8, 11, 58, 0),
+            input_tokens=30,
+            output_tokens=0,
+        )
+        dao.db.session.commit()
+
+        second = aggregate_daily_usage_metrics(
+            billing_daily_usage_app,
+            stat_date="2026-04-08",
+            incremental=True,
+            now=datetime(2026, 4, 8, 13, 0, 0),
+        )
+
+        assert second["watermark"] == "2026-04-08T11:55:00"
+        assert second["usage_count"] == 1
+        row = BillingDailyUsageMetric.query.filter(
+            BillingDailyUsageMetric.stat_date == "2026-04-08",
+        ).one()
+        assert (int(row.raw_amount or 0), int(row.record_count or 0)) == (130, 2)
+
+
 def _add_llm_rates() -> None:
     for metric_code in (
         BILLING_METRIC_LLM_INPUT_TOKENS,
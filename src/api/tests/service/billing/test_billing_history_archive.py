@@ -0,0 +1,233 @@
+"""Verify finalized usage and ledger days move to the archive tables."""
+
+from __future__ import annotations
+
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+from flask import Flask
+from flaskr import dao
+from flaskr.service.billing.consts import (
+    BILLING_METRIC_LLM_INPUT_TOKENS,
+    CREDIT_LEDGER_ENTRY_TYPE_GRANT,
+    CREDIT_SOURCE_TYPE_TOPUP,
+)
+from flaskr.service.billing.daily_aggregates import aggregate_daily_ledger_summary
+from flaskr.service.billing.history_archive import (
+    archive_billing_history,
+    resolve_history_archive_before,
+    resolve_history_models,
+)
+from flaskr.service.billing.models import (
+    BillingDailyLedgerSummary,
+    BillingDailyUsageMetric,
+    CreditLedgerEntry,
+    CreditLedgerEntryArchive,
+)
+from flaskr.service.metering.consts import BILL_USAGE_SCENE_PROD, BILL_USAGE_TYPE_LLM
+from flaskr.service.metering.models import BillUsageRecord, BillUsageRecordArchive
+
+_NOW = datetime(2026, 10, 1, 8, 0, 0)
+_OLD_DAY = datetime(2026, 3, 10, 9, 0, 0)
+_RECENT_DAY = datetime(2026, 9, 1, 9, 0, 0)
+
+
+@pytest.fixture
+def billing_history_app(monkeypatch: pytest.MonkeyPatch) -> Flask:
+    monkeypatch.setattr(
+        "flaskr.service.billing.history_archive.now_utc",
+        lambda: _NOW,
+    )
+    app = Flask(__name__)
+    app.testing = True
+    app.config.update(
+        SQLALCHEMY_DATABASE_URI="sqlite:///:memory:",
+        SQLALCHEMY_BINDS={
+            "ai_shifu_saas": "sqlite:///:memory:",
+            "ai_shifu_admin": "sqlite:///:memory:",
+        },
+        SQLALCHEMY_TRACK_MODIFICATIONS=False,
+        TZ="UTC",
+        BILL_HISTORY_HOT_RETENTION_DAYS=180,
+        BILL_HISTORY_ARCHIVE_BATCH_SIZE=1,
+    )
+    dao.db.init_app(app)
+    with app.app_context():
+        dao.db.create_all()
+        yield app
+        dao.db.session.remove()
+        dao.db.drop_all()
+
+
+def _seed_history() -> None:
+    for ledger_bid, created_at in (
+        ("ledger-old-1", _OLD_DAY),
+        ("ledger-old-2", _OLD_DAY),
+        ("ledger-recent", _RECENT_DAY),
+    ):
+        dao.db.session.add(
+            CreditLedgerEntry(
+                ledger_bid=ledger_bid,
+                creator_bid="creator-history-1",
+                wallet_bid="wallet-history-1",
+                wallet_bucket_bid="bucket-history-1",
+                entry_type=CREDIT_LEDGER_ENTRY_TYPE_GRANT,
+                source_type=CREDIT_SOURCE_TYPE_TOPUP,
+                source_bid=f"source-{ledger_bid}",
+                idempotency_key=f"idempotency-{ledger_bid}",
+                amount=Decimal("2.0000000000"),
+                balance_after=Decimal(0),
+                metadata_json={},
+                created_at=created_at,
+                updated_at=created_at,
+            )
+        )
+    for usage_bid, created_at in (
+        ("usage-old", _OLD_DAY),
+        ("usage-recent", _RECENT_DAY),
+    ):
+        dao.db.session.add(
+            BillUsageRecord(
+                usage_bid=usage_bid,
+                user_bid="user-history-1",
+                shifu_bid="shifu-history-1",
+                created_at=created_at,
+                updated_at=created_at,
+            )
+        )
+    # The nightly jobs have finalized every day up to yesterday.
+    finalized_window = {
+        "stat_date": "2026-09-30",
+        "creator_bid": "creator-history-1",
+        "window_started_at": datetime(2026, 9, 30, 0, 0, 0),
+        "window_ended_at": datetime(2026, 10, 1, 0, 0, 0),
+    }
+    dao.db.session.add(
+        BillingDailyLedgerSummary(
+            daily_ledger_summary_bid="summary-history-1",
+            entry_type=CREDIT_LEDGER_ENTRY_TYPE_GRANT,
+            source_type=CREDIT_SOURCE_TYPE_TOPUP,
+            amount=Decimal(0),
+            entry_count=0,
+            **finalized_window,
+        )
+    )
+    dao.db.session.add(
+        BillingDailyUsageMetric(
+            daily_usage_metric_bid="metric-history-1",
+            shifu_bid="shifu-history-1",
+            usage_scene=BILL_USAGE_SCENE_PROD,
+            usage_type=BILL_USAGE_TYPE_LLM,
+            provider="openai",
+            model="gpt-4o-mini",
+            billing_metric=BILLING_METRIC_LLM_INPUT_TOKENS,
+            raw_amount=0,
+            record_count=0,
+            consumed_credits=Decimal(0),
+            **finalized_window,
+        )
+    )
+    dao.db.session.commit()
+
+
+def test_archive_moves_days_past_retention_and_routes_reads(
+    billing_history_app: Flask,
+) -> None:
+    with billing_history_app.app_context():
+        _seed_history()
+
+        dry_run = archive_billing_history(billing_history_app)
+
+        assert dry_run["status"] == "dry_run"
+        assert dry_run["archive_before"] == "2026-04-04T00:00:00"
+        assert [table["candidate_count"] for table in dry_run["tables"]] == [1, 2]
+        assert CreditLedgerEntryArchive.query.count() == 0
+        assert resolve_history_models(
+            CreditLedgerEntry, started_at=_OLD_DAY, ended_at=_OLD_DAY
+        ) == (CreditLedgerEntry,)
+
+        result = archive_billing_history(billing_history_app, dry_run=False)
+
+        assert result["status"] == "archived"
+        assert [table["moved_count"] for table in result["tables"]] == [1, 2]
+        assert [table["batch_count"] for table in result["tables"]] == [1, 2]
+        assert BillUsageRecord.query.one().usage_bid == "usage-recent"
+        assert BillUsageRecordArchive.query.one().usage_bid == "usage-old"
+        assert CreditLedgerEntry.query.one().ledger_bid == "ledger-recent"
+        assert sorted(
+            row.ledger_bid for row in CreditLedgerEntryArchive.query.all()
+        ) == ["ledger-old-1", "ledger-old-2"]
+
+        assert resolve_history_models(
+            CreditLedgerEntry, started_at=_OLD_DAY, ended_at=_OLD_DAY
+        ) == (CreditLedgerEntryArchive,)
+        assert resolve_history_models(
+            CreditLedgerEntry, started_at=_RECENT_DAY, ended_at=_NOW
+        ) == (CreditLedgerEntry,)
+        assert resolve_history_models(CreditLedgerEntry) == (
+            CreditLedgerEntry,
+            CreditLedgerEntryArchive,
+        )
+
+        summary = aggregate_daily_ledger_summary(
+            billing_history_app,
+            stat_date="2026-03-10",
+            finalize=True,
+        )
+        assert summary["entry_count"] == 2
+
+        again = archive_billing_history(billing_history_app, dry_run=False)
+        assert [table["moved_count"] for table in again["tables"]] == [0, 0]
+
+
+def test_archive_waits_for_finalized_days(billing_history_app: Flask) -> None:
+    with billing_history_app.app_context():
+        dao.db.session.add(
+            CreditLedgerEntry(
+                ledger_bid="ledger-unfinalized",
+                creator_bid="creator-history-2",
+                entry_type=CREDIT_LEDGER_ENTRY_TYPE_GRANT,
+                source_type=CREDIT_SOURCE_TYPE_TOPUP,
+                amount=Decimal("1.0000000000"),
+                balance_after=Decimal(0),
+                created_at=_OLD_DAY,
+                updated_at=_OLD_DAY,
+            )
+        )
+        dao.db.session.commit()
+
+        result = archive_billing_history(billing_history_app, dry_run=False)
+
+        assert result["status"] == "not_finalized"
+        assert CreditLedgerEntry.query.count() == 1
+        assert CreditLedgerEntryArchive.query.count() == 0
+
+
+def test_archive_stops_before_an_earlier_day_that_is_not_finalized(
+    billing_history_app: Flask,
+) -> None:
+    with billing_history_app.app_context():
+        _seed_history()
+        # An interrupted run left 2026-03-10 with a partial summary window.
+        dao.db.session.add(
+            BillingDailyLedgerSummary(
+                daily_ledger_summary_bid="summary-history-partial",
+                stat_date="2026-03-10",
+                creator_bid="creator-history-1",
+                entry_type=CREDIT_LEDGER_ENTRY_TYPE_GRANT,
+                source_type=CREDIT_SOURCE_TYPE_TOPUP,
+                amount=Decimal(0),
+                entry_count=0,
+                window_started_at=datetime(2026, 3, 10, 0, 0, 0),
+                window_ended_at=datetime(2026, 3, 10, 12, 0, 0),
+            )
+        )
+        dao.db.session.commit()
+
+        archive_before, finalized_through = resolve_history_archive_before(
+            billing_history_app
+        )
+
+        assert archive_before is None
+        assert finalized_through is None
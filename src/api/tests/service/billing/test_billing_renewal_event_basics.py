@@ -36,7 +36,9 @@ from flaskr.service.billing.models import (
 from flaskr.service.billing.primitives import normalize_mysql_datetime
 from flaskr.service.billing.renewal import (
     claim_billing_renewal_event,
+    claim_due_renewal_events,
     run_billing_renewal_event,
+    run_claimed_renewal_event,
 )
 from flaskr.service.billing.subscriptions import (
     sync_subscription_lifecycle_events,
@@ -88,6 +90,63 @@ def test_claim_billing_renewal_event_persists_processing_state(
         assert event.attempt_count == 1
 
 
+def test_batch_claimed_event_is_not_run_after_stale_recovery_reclaims_it(
+    billing_renewal_app: Flask,
+) -> None:
+    with billing_renewal_app.app_context():
+        subscription = create_renewal_subscription("sub-batch-claim-1")
+        dao.db.session.add(subscription)
+        dao.db.session.add(
+            create_renewal_event(
+                "renewal-batch-claim-1",
+                subscription.subscription_bid,
+                subscription.creator_bid,
+                event_type=BILLING_RENEWAL_EVENT_TYPE_EXPIRE,
+            )
+        )
+        dao.db.session.commit()
+
+        claims = claim_due_renewal_events(
+            billing_renewal_app,
+            due_before=now_utc(),
+            limit=10,
+        )
+
+        assert [claim.renewal_event_bid for claim in claims] == [
+            "renewal-batch-claim-1"
+        ]
+        assert claims[0].attempt_count == 1
+        assert (
+            claim_due_renewal_events(
+                billing_renewal_app,
+                due_before=now_utc(),
+                limit=10,
+            )
+            == []
+        )
+
+        # Stale recovery released the claim and another worker took it over.
+        BillingRenewalEvent.query.filter_by(
+            renewal_event_bid="renewal-batch-claim-1"
+        ).update(
+            {
+                "status": BILLING_RENEWAL_EVENT_STATUS_PROCESSING,
+                "attempt_count": 2,
+            },
+            synchronize_session=False,
+        )
+        dao.db.session.commit()
+
+        result = run_claimed_renewal_event(billing_renewal_app, claims[0])
+
+        assert result.status == "lost_claim"
+        dao.db.session.expire_all()
+        stored_subscription = BillingSubscription.query.filter_by(
+            subscription_bid="sub-batch-claim-1"
+        ).one()
+        assert stored_subscription.status != BILLING_SUBSCRIPTION_STATUS_EXPIRED
+
+
 def test_run_billing_renewal_event_applies_cancel_effective(
     billing_renewal_app: Flask,
 ) -> None:
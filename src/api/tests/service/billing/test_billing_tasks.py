@@ -53,6 +53,7 @@ from flaskr.service.billing.tasks import (
     replay_usage_settlement_task,
     retry_failed_renewal_task,
     run_renewal_event_task,
+    scan_low_balance_notifications_task,
     send_low_balance_alert_task,
     settle_usage_task,
     verify_domain_binding_task,
@@ -166,11 +167,13 @@ def test_aggregate_daily_usage_metrics_task_calls_helper(
         stat_date: str = "",
         creator_bid: str = "",
         finalize: bool = False,
+        incremental: bool = False,
     ):
         captured["app"] = app
         captured["stat_date"] = stat_date
         captured["creator_bid"] = creator_bid
         captured["finalize"] = finalize
+        captured["incremental"] = incremental
         return {
             "status": "aggregated",
             "stat_date": stat_date,
@@ -194,6 +197,7 @@ def test_aggregate_daily_usage_metrics_task_calls_helper(
         "stat_date": "2026-04-08",
         "creator_bid": "creator-task-1",
         "finalize": True,
+        "incremental": False,
     }
     assert payload["status"] == "aggregated"
     assert payload["task_name"] == "billing.aggregate_daily_usage_metrics"
@@ -1171,6 +1175,48 @@ def test_send_low_balance_alert_task_preserves_legacy_name_and_delegates_scan(
     assert payload["task_name"] == "billing.send_low_balance_alert"
 
 
+def test_scan_low_balance_task_fans_out_one_task_per_creator_shard(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    fake_app = Flask(__name__)
+    fake_app.config["BILL_NOTIFICATION_SCAN_SHARD_COUNT"] = 3
+    _install_fake_app_module(monkeypatch, fake_app)
+    scanned: list[dict[str, object]] = []
+
+    def _fake_scan(_app, *, creator_bid="", shard=None):
+        scanned.append({"creator_bid": creator_bid, "shard": shard})
+        return {"status": "noop", "notifications": []}
+
+    monkeypatch.setattr(
+        "flaskr.service.billing.tasks._scan_low_balance_notifications",
+        _fake_scan,
+    )
+    dispatched: list[dict[str, object]] = []
+    monkeypatch.setattr(
+        scan_low_balance_notifications_task,
+        "apply_async",
+        lambda *, kwargs=None, **_options: dispatched.append(dict(kwargs or {})),
+    )
+
+    payload = scan_low_balance_notifications_task()
+
+    assert payload["status"] == "dispatched"
+    assert dispatched == [{"shard_index": 0}, {"shard_index": 1}, {"shard_index": 2}]
+    assert scanned == []
+
+    shard_payload = scan_low_balance_notifications_task(shard_index=2)
+
+    assert scanned[0]["creator_bid"] == ""
+    assert (scanned[0]["shard"].index, scanned[0]["shard"].count) == (2, 3)
+    assert shard_payload["shard_index"] == 2
+    assert shard_payload["task_name"] == "billing.scan_low_balance_notifications"
+
+    scan_low_balance_notifications_task(creator_bid="creator-targeted")
+
+    assert scanned[1] == {"creator_bid": "creator-targeted", "shard": None}
+    assert len(dispatched) == 3
+
+
 def test_dispatch_due_renewal_events_task_noops_when_disabled(
     billing_task_integration_app,
     monkeypatch: pytest.MonkeyPatch,
@@ -1527,6 +1573,89 @@ def test_dispatch_due_renewal_events_uses_dedicated_queue_when_enabled(
     ]
 
 
+def test_dispatch_due_renewal_events_runs_batch_claims_on_worker_pool(
+    billing_task_integration_app,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    _install_fake_app_module(monkeypatch, billing_task_integration_app)
+    monkeypatch.setattr(
+        "flaskr.service.billing.tasks.get_config",
+        lambda _key, _default="": json.dumps(
+            {
+                "enabled": 1,
+                "batch_size": 2,
+                "lookahead_minutes": 0,
+                "use_batch_claims": 1,
+                "worker_count": 2,
+            }
+        ),
+    )
+
+    now = now_utc()
+    with billing_task_integration_app.app_context():
+        dao.db.session.add_all(
+            [
+                BillingRenewalEvent(
+                    renewal_event_bid=renewal_event_bid,
+                    subscription_bid=f"subscription-{renewal_event_bid}",
+                    creator_bid="creator-batch-claims",
+                    event_type=BILLING_RENEWAL_EVENT_TYPE_EXPIRE,
+                    scheduled_at=scheduled_at,
+                    status=BILLING_RENEWAL_EVENT_STATUS_PENDING,
+                    attempt_count=0,
+                    last_error="",
+                    payload_json=None,
+                    processed_at=None,
+                )
+                for renewal_event_bid, scheduled_at in (
+                    ("renewal-batch-1", now - timedelta(minutes=3)),
+                    ("renewal-batch-2", now - timedelta(minutes=2)),
+                    ("renewal-batch-over-limit", now - timedelta(minutes=1)),
+                    ("renewal-batch-future", now + timedelta(minutes=5)),
+                )
+            ]
+        )
+        dao.db.session.commit()
+
+    def _unexpected_apply_async(**_kwargs: object) -> None:
+        message = "batch claims must not enqueue per-event tasks"
+        raise AssertionError(message)
+
+    monkeypatch.setattr(run_renewal_event_task, "apply_async", _unexpected_apply_async)
+
+    payload = dispatch_due_renewal_events_task()
+
+    assert payload["status"] == "processed"
+    assert payload["worker_count"] == 2
+    assert payload["claimed_count"] == 2
+    assert payload["renewal_event_bids"] == ["renewal-batch-1", "renewal-batch-2"]
+    # Neither subscription exists, so both events fail inside their workers.
+    assert payload["status_counts"] == {"failed": 2}
+    assert set(payload["latency_ms"]) == {
+        "claim",
+        "queue_wait_max",
+        "execute_p50",
+        "execute_max",
+        "total",
+    }
+    with billing_task_integration_app.app_context():
+        events = {
+            event.renewal_event_bid: event for event in BillingRenewalEvent.query.all()
+        }
+        assert events["renewal-batch-1"].status == BILLING_RENEWAL_EVENT_STATUS_FAILED
+        assert events["renewal-batch-1"].attempt_count == 1
+        assert events["renewal-batch-1"].last_error == "subscription_not_found"
+        assert events["renewal-batch-2"].status == BILLING_RENEWAL_EVENT_STATUS_FAILED
+        assert (
+            events["renewal-batch-over-limit"].status
+            == BILLING_RENEWAL_EVENT_STATUS_PENDING
+        )
+        assert (
+            events["renewal-batch-future"].status
+            == BILLING_RENEWAL_EVENT_STATUS_PENDING
+        )
+
+
 def test_billing_task_entrypoints_return_json_serializable_payloads(
     monkeypatch: pytest.MonkeyPatch,
 ) -> None:
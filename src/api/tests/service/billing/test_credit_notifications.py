@@ -32,6 +32,7 @@ from flaskr.service.billing.consts import (
     CREDIT_SOURCE_TYPE_USAGE,
 )
 from flaskr.service.billing.credit_notifications import (
+    CreatorScanShard,
     _is_quiet_hours,
     assert_creator_debug_allowed,
     deliver_credit_notification,
@@ -1735,6 +1736,77 @@ def test_expiring_scan_merges_same_creator_buckets(
         ]
 
 
+def test_scans_stream_every_page_and_merge_groups_across_page_boundaries(
+    credit_notifications_app: Flask,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    app = credit_notifications_app
+    app.config["BILL_NOTIFICATION_SCAN_PAGE_SIZE"] = 2
+    now = datetime(2026, 5, 21, 0, 0, 0)
+    creator_bids = [f"creator-page-{index}" for index in range(5)]
+    for index, creator_bid in enumerate(creator_bids):
+        _seed_creator(app, creator_bid=creator_bid, mobile=f"1380000010{index}")
+    _enable_policy(app)
+    monkeypatch.setattr(
+        "flaskr.service.billing.credit_notifications.enqueue_credit_notification",
+        lambda *_args, **_kwargs: {"enqueued": True},
+    )
+
+    with app.app_context():
+        for creator_bid in creator_bids:
+            _seed_wallet(creator_bid=creator_bid)
+            for suffix in ("a", "b", "c"):
+                _seed_bucket(
+                    creator_bid=creator_bid,
+                    wallet_bucket_bid=f"bucket-{creator_bid}-{suffix}",
+                    effective_to=now + timedelta(days=1, hours=2),
+                )
+        _seed_wallet(creator_bid="creator-page-rich", available_credits="50")
+        dao.db.session.commit()
+
+    expiring = scan_credit_expiring_notifications(app, now=now)
+    low_balance = scan_low_balance_notifications(app, now=now)
+
+    assert expiring["created_count"] == 5
+    assert low_balance["created_count"] == 5
+    with app.app_context():
+        merged_counts = [
+            record.metadata_json["merged_bucket_count"]
+            for record in NotificationRecord.query.filter_by(
+                notification_type=CREDIT_NOTIFICATION_TYPE_EXPIRING
+            ).all()
+        ]
+        assert merged_counts == [3, 3, 3, 3, 3]
+
+
+def test_scan_shards_partition_creators_without_overlap(
+    credit_notifications_app: Flask,
+) -> None:
+    app = credit_notifications_app
+    now = datetime(2026, 5, 21, 0, 0, 0)
+    creator_bids = {f"creator-shard-{index}" for index in range(8)}
+    for index, creator_bid in enumerate(sorted(creator_bids)):
+        _seed_creator(app, creator_bid=creator_bid, mobile=f"1380000020{index}")
+    _enable_policy(app)
+    with app.app_context():
+        for creator_bid in creator_bids:
+            _seed_wallet(creator_bid=creator_bid)
+        dao.db.session.commit()
+
+    scanned: list[set[str]] = []
+    for index in range(3):
+        shard = CreatorScanShard(index=index, count=3)
+        payload = scan_low_balance_notifications(
+            app, now=now, dry_run=True, shard=shard
+        )
+        owned = {item["creator_bid"] for item in payload["notifications"]}
+        assert all(shard.owns(creator_bid) for creator_bid in owned)
+        scanned.append(owned)
+
+    assert set().union(*scanned) == creator_bids
+    assert sum(len(owned) for owned in scanned) == len(creator_bids)
+
+
 def test_expiring_merge_suppresses_existing_bucket_level_record(
     credit_notifications_app: Flask,
 ) -> None:
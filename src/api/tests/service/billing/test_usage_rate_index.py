@@ -0,0 +1,164 @@
+"""Verify the process-wide credit usage rate index."""
+
+from datetime import datetime
+from decimal import Decimal
+from types import SimpleNamespace
+
+import pytest
+from flask import Flask
+from flaskr import dao
+from flaskr.service.billing import rate_index
+from flaskr.service.billing.charges import load_usage_rate
+from flaskr.service.billing.consts import (
+    BILLING_METRIC_LLM_OUTPUT_TOKENS,
+    CREDIT_ROUNDING_MODE_CEIL,
+    CREDIT_USAGE_RATE_STATUS_ACTIVE,
+    CREDIT_USAGE_RATE_STATUS_INACTIVE,
+)
+from flaskr.service.billing.models import CreditUsageRate
+from flaskr.service.metering.consts import BILL_USAGE_SCENE_PROD, BILL_USAGE_TYPE_LLM
+
+
+@pytest.fixture(scope="module")
+def rate_app():
+    app = Flask("usage-rate-index")
+    app.config.update(
+        SQLALCHEMY_DATABASE_URI="sqlite:///:memory:",
+        SQLALCHEMY_BINDS={
+            "ai_shifu_saas": "sqlite:///:memory:",
+            "ai_shifu_admin": "sqlite:///:memory:",
+        },
+        SQLALCHEMY_TRACK_MODIFICATIONS=False,
+        REDIS_KEY_PREFIX="test:",
+    )
+    dao.db.init_app(app)
+    with app.app_context():
+        dao.db.create_all()
+    return app
+
+
+@pytest.fixture
+def app_ctx(rate_app):
+    with rate_app.app_context():
+        dao.db.session.query(CreditUsageRate).delete()
+        dao.db.session.commit()
+        rate_index.clear_usage_rate_index()
+        yield rate_app
+        dao.db.session.remove()
+
+
+def _add_rate(
+    rate_bid: str,
+    *,
+    provider: str = "*",
+    model: str = "*",
+    credits_per_unit: str = "1",
+    effective_from: datetime = datetime(2026, 1, 1),
+    effective_to: datetime | None = None,
+    status: int = CREDIT_USAGE_RATE_STATUS_ACTIVE,
+) -> None:
+    dao.db.session.add(
+        CreditUsageRate(
+            rate_bid=rate_bid,
+            usage_type=BILL_USAGE_TYPE_LLM,
+            provider=provider,
+            model=model,
+            usage_scene=BILL_USAGE_SCENE_PROD,
+            billing_metric=BILLING_METRIC_LLM_OUTPUT_TOKENS,
+            unit_size=1000,
+            credits_per_unit=Decimal(credits_per_unit),
+            rounding_mode=CREDIT_ROUNDING_MODE_CEIL,
+            effective_from=effective_from,
+            effective_to=effective_to,
+            status=status,
+        )
+    )
+    dao.db.session.commit()
+
+
+def _lookup(at: datetime, *, provider: str = "openai", model: str = "gpt-x"):
+    usage = SimpleNamespace(
+        usage_type=BILL_USAGE_TYPE_LLM,
+        usage_scene=BILL_USAGE_SCENE_PROD,
+        provider=provider,
+        model=model,
+    )
+    return load_usage_rate(
+        usage=usage,
+        billing_metric=BILLING_METRIC_LLM_OUTPUT_TOKENS,
+        settlement_at=at,
+    )
+
+
+@pytest.mark.usefixtures("app_ctx")
+def test_lookup_prefers_specific_rates_effective_at_usage_time():
+    _add_rate("rate-default")
+    _add_rate("rate-provider", provider="openai", credits_per_unit="2")
+    _add_rate(
+        "rate-model-old",
+        provider="openai",
+        model="gpt-x",
+        credits_per_unit="3",
+        effective_to=datetime(2026, 3, 1),
+    )
+    _add_rate(
+        "rate-model-new",
+        provider="openai",
+        model="gpt-x",
+        credits_per_unit="4",
+        effective_from=datetime(2026, 3, 1),
+    )
+    _add_rate(
+        "rate-model-disabled",
+        provider="openai",
+        model="gpt-x",
+        credits_per_unit="9",
+        effective_from=datetime(2026, 4, 1),
+        status=CREDIT_USAGE_RATE_STATUS_INACTIVE,
+    )
+
+    assert _lookup(datetime(2026, 2, 1)).rate_bid == "rate-model-old"
+    assert _lookup(datetime(2026, 3, 1)).rate_bid == "rate-model-new"
+    assert _lookup(datetime(2026, 5, 1)).rate_bid == "rate-model-new"
+    assert _lookup(datetime(2026, 5, 1), model="gpt-y").rate_bid == "rate-provider"
+    assert _lookup(datetime(2026, 5, 1), provider="other").rate_bid == ("rate-default")
+    assert _lookup(datetime(2025, 12, 31)) is None
+    assert rate_index.get_usage_rate_index_stats().builds == 1
+
+
+@pytest.mark.usefixtures("app_ctx")
+def test_superseded_rate_without_end_falls_back_to_older_window():
+    _add_rate("rate-open", provider="openai", model="gpt-x", credits_per_unit="1")
+    _add_rate(
+        "rate-promo",
+        provider="openai",
+        model="gpt-x",
+        credits_per_unit="5",
+        effective_from=datetime(2026, 2, 1),
+        effective_to=datetime(2026, 2, 10),
+    )
+
+    assert _lookup(datetime(2026, 2, 5)).rate_bid == "rate-promo"
+    assert _lookup(datetime(2026, 2, 10)).rate_bid == "rate-open"
+
+
+@pytest.mark.usefixtures("app_ctx")
+def test_orm_writes_and_version_bumps_rebuild_the_index():
+    _add_rate("rate-a", credits_per_unit="1")
+    assert _lookup(datetime(2026, 2, 1)).credits_per_unit == Decimal(1)
+
+    row = CreditUsageRate.query.filter_by(rate_bid="rate-a").one()
+    row.credits_per_unit = Decimal(2)
+    dao.db.session.commit()
+    assert _lookup(datetime(2026, 2, 1)).credits_per_unit == Decimal(2)
+
+    # A write committed by another worker only moves the shared version.
+    dao.db.session.execute(
+        CreditUsageRate.__table__.update().values(credits_per_unit=Decimal(3))
+    )
+    dao.db.session.commit()
+    dao.get_redis_client().incr("test:billing:usage_rate_index_version")
+    rate_index._usage_rate_index_state.version_checked_at = 0.0
+
+    assert _lookup(datetime(2026, 2, 1)).credits_per_unit == Decimal(3)
+    assert rate_index.get_usage_rate_index_stats().builds == 3
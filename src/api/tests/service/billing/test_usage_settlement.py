@@ -9,6 +9,7 @@ from types import SimpleNamespace
 import pytest
 from flask import Flask
 from flaskr import dao
+from flaskr.common.cache_provider import InMemoryCacheProvider
 from flaskr.service.billing.charges import (
     build_usage_metric_charges,
     resolve_credit_multiplier_label,
@@ -39,8 +40,10 @@ from flaskr.service.billing.models import (
 )
 from flaskr.service.billing.settlement import (
     backfill_bill_usage_settlement,
+    enqueue_bill_usage_settlement,
     replay_bill_usage_settlement,
     settle_bill_usage,
+    settle_creator_usage_batch,
 )
 from flaskr.service.billing.wallets import persist_credit_wallet_snapshot
 from flaskr.service.metering.consts import (
@@ -1250,6 +1253,282 @@ def test_settle_usage_releases_creator_lock_on_error(
         assert lock.release_calls == 1
 
 
+def _seed_batch_settlement_creator(creator_bid: str, usage_count: int) -> None:
+    wallet = _create_wallet(creator_bid, "10.0000000000")
+    dao.db.session.add(wallet)
+    dao.db.session.add(
+        _create_bucket(
+            creator_bid=creator_bid,
+            wallet_bid=wallet.wallet_bid,
+            bucket_bid=f"bucket-{creator_bid}",
+            category=CREDIT_BUCKET_CATEGORY_FREE,
+            priority=10,
+            available_credits="10.0000000000",
+        )
+    )
+    dao.db.session.add(
+        _create_rate(
+            rate_bid=f"rate-{creator_bid}",
+            usage_type=BILL_USAGE_TYPE_LLM,
+            billing_metric=BILLING_METRIC_LLM_INPUT_TOKENS,
+            credits_per_unit="1.0000000000",
+        )
+    )
+    for index in range(usage_count):
+        dao.db.session.add(
+            _create_usage(
+                usage_bid=f"usage-{creator_bid}-{index}",
+                usage_type=BILL_USAGE_TYPE_LLM,
+                provider="openai",
+                model="gpt-test",
+                input_value=1000,
+                input_cache=0,
+                output=0,
+                total=1000,
+            )
+        )
+    dao.db.session.commit()
+
+
+def test_settle_creator_usage_batch_settles_once_per_usage(
+    billing_settlement_app: Flask, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(
+        "flaskr.service.billing.settlement.resolve_usage_creator_bid",
+        lambda _app, _usage: "creator-batch-1",
+    )
+
+    with billing_settlement_app.app_context():
+        _seed_batch_settlement_creator("creator-batch-1", 4)
+        first = settle_bill_usage(
+            billing_settlement_app, usage_bid="usage-creator-batch-1-0"
+        )
+
+        payload = settle_creator_usage_batch(
+            billing_settlement_app,
+            creator_bid="creator-batch-1",
+            usage_bids=[
+                "usage-creator-batch-1-0",
+                "usage-creator-batch-1-1",
+                "usage-creator-batch-1-2",
+                "usage-creator-batch-1-2",
+                "usage-creator-batch-1-3",
+                "usage-missing",
+            ],
+        )
+
+        wallet = CreditWallet.query.filter_by(creator_bid="creator-batch-1").one()
+        bucket = CreditWalletBucket.query.filter_by(
+            wallet_bucket_bid="bucket-creator-batch-1"
+        ).one()
+        entries = (
+            CreditLedgerEntry.query.filter_by(creator_bid="creator-batch-1")
+            .order_by(CreditLedgerEntry.id.asc())
+            .all()
+        )
+
+        assert first["status"] == "settled"
+        assert payload["status"] == "settled"
+        assert payload["processed_count"] == 5
+        assert payload["status_counts"] == {
+            "already_settled": 1,
+            "settled": 3,
+            "not_found": 1,
+        }
+        assert payload["consumed_credits"] == 3
+        assert [entry.source_bid for entry in entries] == [
+            "usage-creator-batch-1-0",
+            "usage-creator-batch-1-1",
+            "usage-creator-batch-1-2",
+            "usage-creator-batch-1-3",
+        ]
+        assert [entry.balance_after for entry in entries] == [
+            Decimal("9.0000000000"),
+            Decimal("8.0000000000"),
+            Decimal("7.0000000000"),
+            Decimal("6.0000000000"),
+        ]
+        assert bucket.available_credits == Decimal("6.0000000000")
+        assert bucket.consumed_credits == Decimal("4.0000000000")
+        assert wallet.available_credits == Decimal("6.0000000000")
+        assert wallet.lifetime_consumed_credits == Decimal("4.0000000000")
+        assert wallet.version == 2
+
+        replay = settle_creator_usage_batch(
+            billing_settlement_app,
+            creator_bid="creator-batch-1",
+            usage_bids=["usage-creator-batch-1-1", "usage-creator-batch-1-3"],
+        )
+
+        assert replay["status"] == "processed"
+        assert replay["status_counts"] == {"already_settled": 2}
+        assert (
+            CreditLedgerEntry.query.filter_by(creator_bid="creator-batch-1").count()
+            == 4
+        )
+
+
+def test_settle_creator_usage_batch_skips_insufficient_usage_only(
+    billing_settlement_app: Flask, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(
+        "flaskr.service.billing.settlement.resolve_usage_creator_bid",
+        lambda _app, usage: (
+            "creator-batch-other"
+            if usage.shifu_bid == "shifu-other"
+            else "creator-batch-2"
+        ),
+    )
+
+    with billing_settlement_app.app_context():
+        _seed_batch_settlement_creator("creator-batch-2", 2)
+        dao.db.session.add(
+            _create_usage(
+                usage_bid="usage-creator-batch-2-large",
+                usage_type=BILL_USAGE_TYPE_LLM,
+                provider="openai",
+                model="gpt-test",
+                input_value=20000,
+                input_cache=0,
+                output=0,
+                total=20000,
+            )
+        )
+        dao.db.session.add(
+            _create_usage(
+                usage_bid="usage-creator-batch-2-other",
+                usage_type=BILL_USAGE_TYPE_LLM,
+                provider="openai",
+                model="gpt-test",
+                input_value=1000,
+                input_cache=0,
+                output=0,
+                total=1000,
+                shifu_bid="shifu-other",
+            )
+        )
+        dao.db.session.commit()
+
+        payload = settle_creator_usage_batch(
+            billing_settlement_app,
+            creator_bid="creator-batch-2",
+            usage_bids=[
+                "usage-creator-batch-2-0",
+                "usage-creator-batch-2-large",
+                "usage-creator-batch-2-1",
+                "usage-creator-batch-2-other",
+            ],
+        )
+
+        wallet = CreditWallet.query.filter_by(creator_bid="creator-batch-2").one()
+
+        assert [item["status"] for item in payload["items"]] == [
+            "settled",
+            "insufficient",
+            "settled",
+            "creator_mismatch",
+        ]
+        assert wallet.available_credits == Decimal("8.0000000000")
+        assert (
+            CreditLedgerEntry.query.filter_by(creator_bid="creator-batch-2").count()
+            == 2
+        )
+
+
+def test_enqueue_bill_usage_settlement_drains_creator_queue(
+    billing_settlement_app: Flask, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    cache = InMemoryCacheProvider()
+    monkeypatch.setattr("flaskr.service.billing.settlement.cache_provider", cache)
+    monkeypatch.setattr(
+        "flaskr.service.billing.settlement.resolve_usage_creator_bid",
+        lambda _app, _usage: "creator-batch-3",
+    )
+    billing_settlement_app.config["REDIS_KEY_PREFIX"] = "billing-test"
+    billing_settlement_app.config["BILL_USAGE_SETTLEMENT_BATCH_SIZE"] = 2
+    lock_key = "billing-test:billing:settle_usage:creator-batch-3"
+
+    with billing_settlement_app.app_context():
+        _seed_batch_settlement_creator("creator-batch-3", 3)
+
+        held_lock = cache.lock(lock_key)
+        assert held_lock.acquire(blocking=False)
+        queued = [
+            enqueue_bill_usage_settlement(
+                billing_settlement_app,
+                usage_bid=f"usage-creator-batch-3-{index}",
+            )
+            for index in range(2)
+        ]
+        held_lock.release()
+
+        drained = enqueue_bill_usage_settlement(
+            billing_settlement_app,
+            usage_bid="usage-creator-batch-3-2",
+        )
+
+        assert [payload["status"] for payload in queued] == ["queued", "queued"]
+        assert drained["status"] == "settled"
+        assert drained["batch_count"] == 2
+        assert drained["status_counts"] == {"settled": 3}
+        assert (
+            CreditLedgerEntry.query.filter_by(creator_bid="creator-batch-3").count()
+            == 3
+        )
+        assert cache.get("billing-test:billing:settle_usage_queue:creator-batch-3:head")
+
+
+def test_drain_dead_letters_a_usage_that_keeps_failing(
+    billing_settlement_app: Flask, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    cache = InMemoryCacheProvider()
+    monkeypatch.setattr("flaskr.service.billing.settlement.cache_provider", cache)
+    monkeypatch.setattr(
+        "flaskr.service.billing.settlement.resolve_usage_creator_bid",
+        lambda _app, _usage: "creator-batch-4",
+    )
+
+    def _charges(usage, **kwargs: object):
+        if usage.usage_bid == "usage-creator-batch-4-1":
+            message = "corrupt usage row"
+            raise RuntimeError(message)
+        return build_usage_metric_charges(usage, **kwargs)
+
+    monkeypatch.setattr(
+        "flaskr.service.billing.settlement.build_usage_metric_charges", _charges
+    )
+    billing_settlement_app.config["REDIS_KEY_PREFIX"] = "billing-test"
+    billing_settlement_app.config["BILL_USAGE_SETTLEMENT_BATCH_SIZE"] = 3
+    lock_key = "billing-test:billing:settle_usage:creator-batch-4"
+    queue_key = "billing-test:billing:settle_usage_queue:creator-batch-4"
+
+    with billing_settlement_app.app_context():
+        _seed_batch_settlement_creator("creator-batch-4", 3)
+
+        held_lock = cache.lock(lock_key)
+        assert held_lock.acquire(blocking=False)
+        for index in range(2):
+            enqueue_bill_usage_settlement(
+                billing_settlement_app,
+                usage_bid=f"usage-creator-batch-4-{index}",
+            )
+        held_lock.release()
+
+        drained = enqueue_bill_usage_settlement(
+            billing_settlement_app,
+            usage_bid="usage-creator-batch-4-2",
+        )
+
+        assert drained["status"] == "settled"
+        assert drained["status_counts"] == {"settled": 2, "failed": 1}
+        assert (
+            CreditLedgerEntry.query.filter_by(creator_bid="creator-batch-4").count()
+            == 2
+        )
+        assert int(cache.get(f"{queue_key}:head")) == 3
+        assert cache.get(f"{queue_key}:dead:1") == b"usage-creator-batch-4-1"
+
+
 def test_persist_credit_wallet_snapshot_rejects_stale_version(
     billing_settlement_app: Flask,
 ) -> None:
@@ -0,0 +1,214 @@
+"""Verify wallet balance projections stay in step with bucket writes."""
+
+from __future__ import annotations
+
+from datetime import datetime
+from decimal import Decimal
+from typing import TYPE_CHECKING
+
+import pytest
+from flaskr import dao
+from flaskr.service.billing.consts import (
+    CREDIT_BUCKET_CATEGORY_FREE,
+    CREDIT_BUCKET_CATEGORY_TOPUP,
+    CREDIT_BUCKET_STATUS_ACTIVE,
+    CREDIT_SOURCE_TYPE_MANUAL,
+    CREDIT_SOURCE_TYPE_TOPUP,
+)
+from flaskr.service.billing.models import (
+    CreditWallet,
+    CreditWalletBucket,
+    CreditWalletProjection,
+)
+from flaskr.service.billing.wallet_projections import (
+    load_credit_wallet_balance,
+    verify_credit_wallet_projections,
+)
+
+if TYPE_CHECKING:
+    from flask import Flask
+
+pytest_plugins = ["tests.service.billing.wallet_lifecycle_app_fixture"]
+
+_NOW = datetime(2026, 4, 10, 0, 0, 0)
+
+
+@pytest.fixture(autouse=True)
+def _frozen_now(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(
+        "flaskr.service.billing.wallet_projections.now_utc",
+        lambda: _NOW,
+    )
+
+
+def _bucket(
+    wallet_bucket_bid: str,
+    *,
+    bucket_category: int,
+    source_type: int,
+    available: str,
+    effective_to: datetime | None = None,
+) -> CreditWalletBucket:
+    return CreditWalletBucket(
+        wallet_bucket_bid=wallet_bucket_bid,
+        wallet_bid="wallet-projection-1",
+        creator_bid="creator-projection-1",
+        bucket_category=bucket_category,
+        source_type=source_type,
+        source_bid=f"source-{wallet_bucket_bid}",
+        priority=10,
+        original_credits=Decimal(available),
+        available_credits=Decimal(available),
+        reserved_credits=Decimal(0),
+        consumed_credits=Decimal(0),
+        expired_credits=Decimal(0),
+        effective_from=datetime(2026, 4, 1, 0, 0, 0),
+        effective_to=effective_to,
+        status=CREDIT_BUCKET_STATUS_ACTIVE,
+        metadata_json={},
+    )
+
+
+def _seed_wallet() -> CreditWallet:
+    wallet = CreditWallet(
+        wallet_bid="wallet-projection-1",
+        creator_bid="creator-projection-1",
+        available_credits=Decimal(0),
+        reserved_credits=Decimal(0),
+        lifetime_granted_credits=Decimal(0),
+        lifetime_consumed_credits=Decimal(0),
+        last_settled_usage_id=0,
+        version=0,
+    )
+    dao.db.session.add(wallet)
+    dao.db.session.add_all(
+        [
+            _bucket(
+                "bucket-projection-manual",
+                bucket_category=CREDIT_BUCKET_CATEGORY_FREE,
+                source_type=CREDIT_SOURCE_TYPE_MANUAL,
+                available="5",
+                effective_to=datetime(2026, 5, 1, 0, 0, 0),
+            ),
+            # Top-up credits only count with an active subscription.
+            _bucket(
+                "bucket-projection-topup",
+                bucket_category=CREDIT_BUCKET_CATEGORY_TOPUP,
+                source_type=CREDIT_SOURCE_TYPE_TOPUP,
+                available="7",
+            ),
+        ]
+    )
+    dao.db.session.commit()
+    return wallet
+
+
+def _projection() -> CreditWalletProjection:
+    dao.db.session.expire_all()
+    return CreditWalletProjection.query.filter_by(
+        wallet_bid="wallet-projection-1"
+    ).one()
+
+
+def test_bucket_balance_updates_apply_deltas_to_the_projection(
+    billing_wallet_lifecycle_app: Flask,
+) -> None:
+    with billing_wallet_lifecycle_app.app_context():
+        wallet = _seed_wallet()
+
+        first = load_credit_wallet_balance(wallet, at=_NOW)
+        dao.db.session.commit()
+
+        assert first.refreshed is True
+        assert first.available_credits == Decimal("5.0000000000")
+        projection = _projection()
+        assert projection.valid_until == datetime(2026, 5, 1, 0, 0, 0)
+        version = projection.version
+
+        manual = CreditWalletBucket.query.filter_by(
+            wallet_bucket_bid="bucket-projection-manual"
+        ).one()
+        manual.available_credits = Decimal("3.5")
+        manual.reserved_credits = Decimal("0.5")
+        topup = CreditWalletBucket.query.filter_by(
+            wallet_bucket_bid="bucket-projection-topup"
+        ).one()
+        topup.available_credits = Decimal(6)
+        dao.db.session.commit()
+
+        projection = _projection()
+        assert projection.stale == 0
+        assert projection.version == version + 2
+        assert projection.available_credits == Decimal("3.5000000000")
+        assert projection.reserved_credits == Decimal("0.5000000000")
+
+        second = load_credit_wallet_balance(wallet, at=_NOW)
+        assert second.refreshed is False
+        assert second.available_credits == Decimal("3.5000000000")
+        assert second.reserved_credits == Decimal("0.5000000000")
+
+
+def test_new_buckets_mark_the_projection_stale_until_the_next_read(
+    billing_wallet_lifecycle_app: Flask,
+) -> None:
+    with billing_wallet_lifecycle_app.app_context():
+        wallet = _seed_wallet()
+        load_credit_wallet_balance(wallet, at=_NOW)
+        dao.db.session.commit()
+
+        dao.db.session.add(
+            _bucket(
+                "bucket-projection-manual-2",
+                bucket_category=CREDIT_BUCKET_CATEGORY_FREE,
+                source_type=CREDIT_SOURCE_TYPE_MANUAL,
+                available="2",
+            )
+        )
+        dao.db.session.commit()
+        assert _projection().stale == 1
+
+        balance = load_credit_wallet_balance(wallet, at=_NOW)
+        dao.db.session.commit()
+
+        assert balance.refreshed is True
+        assert balance.available_credits == Decimal("7.0000000000")
+        assert _projection().stale == 0
+
+
+def test_verify_wallet_projections_reports_and_repairs_drift(
+    billing_wallet_lifecycle_app: Flask,
+) -> None:
+    with billing_wallet_lifecycle_app.app_context():
+        wallet = _seed_wallet()
+        load_credit_wallet_balance(wallet, at=_NOW)
+        dao.db.session.commit()
+        CreditWalletProjection.query.filter_by(wallet_bid="wallet-projection-1").update(
+            {"available_credits": Decimal(42)}, synchronize_session=False
+        )
+        dao.db.session.commit()
+
+        report = verify_credit_wallet_projections(
+            billing_wallet_lifecycle_app,
+            creator_bid="creator-projection-1",
+        )
+
+        assert report["status"] == "drift"
+        assert report["wallet_count"] == 1
+        assert report["drifts"][0]["projected_available_credits"] == 42
+        assert report["drifts"][0]["available_credits"] == 5
+        assert report["drifts"][0]["repaired"] is False
+        assert _projection().available_credits == Decimal("42.0000000000")
+
+        repaired = verify_credit_wallet_projections(
+            billing_wallet_lifecycle_app,
+            creator_bid="creator-projection-1",
+            repair=True,
+        )
+
+        assert repaired["drift_count"] == 1
+        assert repaired["drifts"][0]["repaired"] is True
+        assert _projection().available_credits == Decimal("5.0000000000")
+        assert (
+            verify_credit_wallet_projections(billing_wallet_lifecycle_app)["status"]
+            == "consistent"
+        )
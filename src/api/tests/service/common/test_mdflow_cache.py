@@ -0,0 +1,106 @@
+"""Verify the shared parsed MarkdownFlow document cache."""
+
+import pytest
+from flaskr.service.common import mdflow_cache
+from markdown_flow import MarkdownFlow
+
+DOCUMENT = """Hello {{nickname}}.
+
+```python
+print("not a --- separator")
+```
+
+?[%{{choice}} A|B]
+
+---
+
+Goodbye.
+"""
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    mdflow_cache.clear_mdflow_cache()
+    yield
+    mdflow_cache.clear_mdflow_cache()
+
+
+def test_blocks_match_a_fresh_parse_and_count_hits():
+    expected = MarkdownFlow(DOCUMENT).get_all_blocks()
+
+    first = mdflow_cache.get_mdflow_blocks(DOCUMENT)
+    second = mdflow_cache.get_mdflow_blocks(DOCUMENT)
+
+    assert [(b.content, b.block_type, b.index) for b in first] == [
+        (b.content, b.block_type, b.index) for b in expected
+    ]
+    assert first is not second
+    stats = mdflow_cache.get_mdflow_cache_stats()
+    assert (stats.hits, stats.misses, stats.size) == (1, 1, 1)
+
+
+def test_parsed_copies_do_not_share_per_call_settings():
+    first = mdflow_cache.get_parsed_mdflow(DOCUMENT, output_language="English")
+    second = mdflow_cache.get_parsed_mdflow(DOCUMENT, output_language="Français")
+    first.set_prompt("document", "first prompt")
+
+    assert first is not second
+    assert first.get_output_language() == "English"
+    assert second.get_output_language() == "Français"
+    assert second._document_prompt is None
+    assert second.extract_variables() == MarkdownFlow(DOCUMENT).extract_variables()
+
+
+def test_callers_cannot_mutate_the_cached_parse():
+    expected = [
+        (block.content, block.variables)
+        for block in MarkdownFlow(DOCUMENT).get_all_blocks()
+    ]
+    parsed = mdflow_cache.get_parsed_mdflow(DOCUMENT)
+    parsed.get_all_blocks()[0].content = "changed"
+    parsed.get_all_blocks()[0].variables.append("leaked")
+    parsed._preprocessor.code_blocks.clear()
+    blocks = mdflow_cache.get_mdflow_blocks(DOCUMENT)
+    blocks[1].variables.append("leaked")
+
+    fresh = mdflow_cache.get_parsed_mdflow(DOCUMENT)
+
+    assert [
+        (block.content, block.variables) for block in fresh.get_all_blocks()
+    ] == expected
+    assert [
+        (block.content, block.variables)
+        for block in mdflow_cache.get_mdflow_blocks(DOCUMENT)
+    ] == expected
+    assert fresh._preprocessor.code_blocks
+
+
+def test_entries_are_keyed_per_factory():
+    class FakeMarkdownFlow:
+        def __init__(self, document: str) -> None:
+            self.document = document
+
+        def get_all_blocks(self):
+            return ["fake"]
+
+    real_blocks = mdflow_cache.get_mdflow_blocks(DOCUMENT)
+    fake_blocks = mdflow_cache.get_mdflow_blocks(DOCUMENT, factory=FakeMarkdownFlow)
+
+    assert fake_blocks == ["fake"]
+    assert real_blocks != fake_blocks
+
+
+def test_cache_evicts_least_recently_used(monkeypatch):
+    monkeypatch.setattr(mdflow_cache, "MDFLOW_CACHE_MAX_ENTRIES", 2)
+
+    mdflow_cache.get_mdflow_blocks("first")
+    mdflow_cache.get_mdflow_blocks("second")
+    mdflow_cache.get_mdflow_blocks("first")
+    mdflow_cache.get_mdflow_blocks("third")
+    mdflow_cache.get_mdflow_blocks("first")
+    mdflow_cache.get_mdflow_blocks("second")
+
+    stats = mdflow_cache.get_mdflow_cache_stats()
+    assert stats.size == 2
+    assert stats.hits == 2
+    assert stats.misses == 4
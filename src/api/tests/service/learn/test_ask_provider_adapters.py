@@ -69,7 +69,7 @@ def test_dify_adapter_streams_success_content(app, monkeypatch):
         )
 
     monkeypatch.setattr(
-        dify_adapter.requests,
+        dify_adapter._http_client,
         "post",
         _fake_post,
     )
@@ -118,7 +118,7 @@ def test_coze_adapter_timeout_raises_timeout_error(app, monkeypatch):
         message = "timeout"
         raise requests.Timeout(message)
 
-    monkeypatch.setattr(coze_adapter.requests, "post", _raise_timeout)
+    monkeypatch.setattr(coze_adapter._http_client, "post", _raise_timeout)
 
     with pytest.raises(module.AskProviderTimeoutError):
         list(
@@ -165,7 +165,7 @@ def test_coze_adapter_http_error_raises_provider_error(app, monkeypatch):
 
     http_error = requests.HTTPError("boom")
     monkeypatch.setattr(
-        coze_adapter.requests,
+        coze_adapter._http_client,
         "post",
         lambda *_args, **_kwargs: _FakeResponse(
             text="coze bad request",
@@ -219,7 +219,7 @@ def test_coze_workflow_adapter_streams_success_content(app, monkeypatch):
         )
 
     monkeypatch.setattr(
-        coze_workflow_adapter.requests,
+        coze_workflow_adapter._http_client,
         "post",
         _fake_post,
     )
@@ -268,7 +268,7 @@ def test_coze_workflow_adapter_nonzero_code_raises_provider_error(app, monkeypat
     )
 
     monkeypatch.setattr(
-        coze_workflow_adapter.requests,
+        coze_workflow_adapter._http_client,
         "post",
         lambda *_args, **_kwargs: _FakeResponse(
             json_data={
@@ -368,7 +368,7 @@ def test_coze_adapter_uses_default_base_url_when_missing(app, monkeypatch):
             ]
         )
 
-    monkeypatch.setattr(coze_adapter.requests, "post", _fake_post)
+    monkeypatch.setattr(coze_adapter._http_client, "post", _fake_post)
 
     chunks = list(
         adapter.stream_answer(
@@ -420,7 +420,7 @@ def test_volc_knowledge_adapter_streams_success_content(app, monkeypatch):
         )
 
     monkeypatch.setattr(
-        volc_knowledge_adapter.requests,
+        volc_knowledge_adapter._http_client,
         "request",
         _fake_request,
     )
@@ -514,7 +514,7 @@ def test_get_biji_knowledge_adapter_synthesizes_with_llm_context(app, monkeypatc
         )
 
     monkeypatch.setattr(
-        get_biji_knowledge_adapter.requests,
+        get_biji_knowledge_adapter._http_client,
         "post",
         _fake_post,
     )
@@ -580,7 +580,7 @@ def test_get_biji_knowledge_adapter_skips_results_without_title_or_content(
     adapter = module.GetBijiKnowledgeAskProviderAdapter()
 
     monkeypatch.setattr(
-        get_biji_knowledge_adapter.requests,
+        get_biji_knowledge_adapter._http_client,
         "post",
         lambda *_args, **_kwargs: _FakeResponse(
             json_data={
@@ -637,7 +637,7 @@ def test_get_biji_knowledge_adapter_empty_results_synthesizes_with_empty_context
     adapter = module.GetBijiKnowledgeAskProviderAdapter()
 
     monkeypatch.setattr(
-        get_biji_knowledge_adapter.requests,
+        get_biji_knowledge_adapter._http_client,
         "post",
         lambda *_args, **_kwargs: _FakeResponse(
             json_data={"success": True, "data": {"results": []}}
@@ -686,7 +686,7 @@ def test_get_biji_knowledge_adapter_without_runtime_emits_snippets(app, monkeypa
         }.get,
     )
     monkeypatch.setattr(
-        get_biji_knowledge_adapter.requests,
+        get_biji_knowledge_adapter._http_client,
         "post",
         lambda *_args, **_kwargs: _FakeResponse(
             json_data={
@@ -754,7 +754,7 @@ def test_get_biji_knowledge_adapter_timeout_raises_timeout_error(app, monkeypatc
         message = "timeout"
         raise requests.Timeout(message)
 
-    monkeypatch.setattr(get_biji_knowledge_adapter.requests, "post", _raise_timeout)
+    monkeypatch.setattr(get_biji_knowledge_adapter._http_client, "post", _raise_timeout)
 
     with pytest.raises(module.AskProviderTimeoutError):
         list(
@@ -779,7 +779,7 @@ def test_get_biji_knowledge_adapter_http_error_raises_provider_error(app, monkey
     http_error = requests.HTTPError("bad request")
 
     monkeypatch.setattr(
-        get_biji_knowledge_adapter.requests,
+        get_biji_knowledge_adapter._http_client,
         "post",
         lambda *_args, **_kwargs: _FakeResponse(
             text="get biji bad request",
@@ -814,7 +814,7 @@ def test_get_biji_knowledge_adapter_api_error_includes_message_and_reason(
     adapter = module.GetBijiKnowledgeAskProviderAdapter()
 
     monkeypatch.setattr(
-        get_biji_knowledge_adapter.requests,
+        get_biji_knowledge_adapter._http_client,
         "post",
         lambda *_args, **_kwargs: _FakeResponse(
             json_data={
@@ -870,7 +870,7 @@ def test_get_biji_knowledge_adapter_maps_business_errors_to_user_messages(
 
     for error_body, status_code, expected_fragment in cases:
         monkeypatch.setattr(
-            get_biji_knowledge_adapter.requests,
+            get_biji_knowledge_adapter._http_client,
             "post",
             lambda *_args, status_code=status_code, error_body=error_body, **_kwargs: (
                 _FakeResponse(
@@ -1147,6 +1147,9 @@ class MdflowContextCompatibilityTests(unittest.TestCase):
             def set_output_language(self, *_args: object, **_kwargs: object):
                 return self
 
+            def get_all_blocks(self):
+                return []
+
         with patch("flaskr.service.learn.context_v2.MarkdownFlow", FakeMarkdownFlow):
             context = MdflowContextV2(document="doc", visual_mode=False)
 
@@ -1164,6 +1167,9 @@ class MdflowContextCompatibilityTests(unittest.TestCase):
             def set_output_language(self, *_args: object, **_kwargs: object):
                 return self
 
+            def get_all_blocks(self):
+                return []
+
         with patch("flaskr.service.learn.context_v2.MarkdownFlow", FakeMarkdownFlow):
             context = MdflowContextV2(document="doc", visual_mode=False)
 
@@ -1179,6 +1185,9 @@ class MdflowContextCompatibilityTests(unittest.TestCase):
                 self.output_language = language
                 return self
 
+            def get_all_blocks(self):
+                return []
+
         with (
             patch("flaskr.service.learn.context_v2.MarkdownFlow", FakeMarkdownFlow),
             patch(
@@ -77,6 +77,7 @@ def test_context_v2_tts_processor_uses_runtime_minimax_voice_fallback(monkeypatc
             progress_record_bid="progress-context-runtime-voice-1"
         )
         ctx._user_info = SimpleNamespace(user_id="user-context-runtime-voice-1")
+        ctx._preview_mode = False
 
         processor = ctx._try_create_tts_processor("generated-context-runtime-voice-1")
 
@@ -84,3 +85,4 @@ def test_context_v2_tts_processor_uses_runtime_minimax_voice_fallback(monkeypatc
     assert captured_kwargs["voice_id"] == "male-qn-qingse"
     assert captured_kwargs["tts_provider"] == "minimax"
     assert captured_kwargs["tts_model"] == "speech-2.8-turbo"
+    assert captured_kwargs["rpm_lane"] is None
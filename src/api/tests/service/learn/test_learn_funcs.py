@@ -257,6 +257,12 @@ class LearnRecordLoadTests(unittest.TestCase):
             def set_visual_mode(self, *_args: object, **_kwargs: object):
                 pass
 
+            def set_llm_provider(self, *_args: object, **_kwargs: object):
+                pass
+
+            def set_prompt(self, *_args: object, **_kwargs: object):
+                pass
+
             def set_output_language(self, *_args: object, **_kwargs: object):
                 return self
 
@@ -385,6 +391,12 @@ class LearnRecordLoadTests(unittest.TestCase):
             def set_visual_mode(self, *_args: object, **_kwargs: object):
                 pass
 
+            def set_llm_provider(self, *_args: object, **_kwargs: object):
+                pass
+
+            def set_prompt(self, *_args: object, **_kwargs: object):
+                pass
+
             def set_output_language(self, *_args: object, **_kwargs: object):
                 return self
 
@@ -525,6 +537,12 @@ class LearnRecordLoadTests(unittest.TestCase):
             def set_visual_mode(self, *_args: object, **_kwargs: object):
                 pass
 
+            def set_llm_provider(self, *_args: object, **_kwargs: object):
+                pass
+
+            def set_prompt(self, *_args: object, **_kwargs: object):
+                pass
+
             def set_output_language(self, *_args: object, **_kwargs: object):
                 return self
 
@@ -655,6 +673,12 @@ class LearnRecordLoadTests(unittest.TestCase):
             def set_visual_mode(self, *_args: object, **_kwargs: object):
                 pass
 
+            def set_llm_provider(self, *_args: object, **_kwargs: object):
+                pass
+
+            def set_prompt(self, *_args: object, **_kwargs: object):
+                pass
+
             def set_output_language(self, *_args: object, **_kwargs: object):
                 return self
 
@@ -778,6 +802,12 @@ class LearnRecordLoadTests(unittest.TestCase):
             def set_visual_mode(self, *_args: object, **_kwargs: object):
                 pass
 
+            def set_llm_provider(self, *_args: object, **_kwargs: object):
+                pass
+
+            def set_prompt(self, *_args: object, **_kwargs: object):
+                pass
+
             def set_output_language(self, *_args: object, **_kwargs: object):
                 return self
 
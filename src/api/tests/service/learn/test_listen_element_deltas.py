@@ -0,0 +1,126 @@
+"""Verify streamed text patches are rewritten as appended-suffix deltas."""
+
+from flaskr.service.learn.learn_dtos import (
+    ElementChangeType,
+    ElementDTO,
+    ElementType,
+    RunElementSSEMessageDTO,
+)
+from flaskr.service.learn.listen_element_deltas import ElementDeltaTracker
+
+
+def _message(
+    content: str,
+    *,
+    element_bid: str = "element-1",
+    element_type: ElementType = ElementType.TEXT,
+    is_final: bool = False,
+) -> RunElementSSEMessageDTO:
+    return RunElementSSEMessageDTO(
+        type="element",
+        event_type="element",
+        generated_block_bid="block-1",
+        content=ElementDTO(
+            element_bid=element_bid,
+            generated_block_bid="block-1",
+            element_index=1,
+            role="teacher",
+            element_type=element_type,
+            element_type_code=213,
+            change_type=ElementChangeType.RENDER,
+            is_new=True,
+            is_final=is_final,
+            content_text=content,
+        ),
+    )
+
+
+def _apply_on_client(elements: dict[str, str], payload: dict) -> None:
+    """Mirror how a delta-aware client folds messages into its element map."""
+    element = payload["content"]
+    if element.get("change_type") == "diff":
+        current = elements[element["element_bid"]]
+        assert len(current.encode("utf-16-le")) // 2 == element["content_offset"]
+        elements[element["element_bid"]] = current + element["content"]
+    else:
+        elements[element["element_bid"]] = element["content"]
+
+
+def test_first_message_is_full_and_later_chunks_carry_suffixes():
+    tracker = ElementDeltaTracker()
+    first = _message("Hello ")
+
+    assert tracker.apply(first) is first
+    delta = tracker.apply(_message("Hello golden "))
+    final = tracker.apply(_message("Hello golden learner.", is_final=True))
+
+    assert delta["content"]["content"] == "golden "
+    assert delta["content"]["content_offset"] == 6
+    assert delta["content"]["change_type"] == "diff"
+    assert delta["content"]["is_new"] is False
+    assert delta["content"]["target_element_bid"] == "element-1"
+    assert final["content"]["content"] == "learner."
+    assert final["content"]["content_offset"] == 13
+    assert final["content"]["is_final"] is True
+    assert (tracker.full_messages, tracker.delta_messages) == (1, 2)
+
+
+def test_offsets_count_utf16_code_units():
+    tracker = ElementDeltaTracker()
+    elements: dict[str, str] = {}
+    snapshots = [
+        "讲解🎧",
+        "讲解🎧：光速",
+        "讲解🎧：光速 ≈ 3×10⁸ m/s 🚀",
+        "讲解🎧：光速 ≈ 3×10⁸ m/s 🚀。",
+    ]
+
+    for snapshot in snapshots:
+        payload = tracker.apply(_message(snapshot))
+        if isinstance(payload, RunElementSSEMessageDTO):
+            payload = payload.__json__()
+        _apply_on_client(elements, payload)
+
+    assert elements == {"element-1": snapshots[-1]}
+    last = tracker.apply(_message(snapshots[-1] + "!"))
+    assert last["content"]["content_offset"] == len(snapshots[-1]) + 2
+
+
+def test_rewritten_content_falls_back_to_a_full_snapshot():
+    tracker = ElementDeltaTracker()
+    tracker.apply(_message("Draft answer"))
+    rewrite = _message("Final answer")
+
+    assert tracker.apply(rewrite) is rewrite
+    delta = tracker.apply(_message("Final answer, extended"))
+    assert delta["content"]["content"] == ", extended"
+    assert delta["content"]["content_offset"] == len("Final answer")
+
+
+def test_non_text_elements_and_other_events_pass_through():
+    tracker = ElementDeltaTracker()
+    svg = _message("<svg>", element_type=ElementType.SVG)
+    tracker.apply(svg)
+    svg_patch = _message("<svg><text/>", element_type=ElementType.SVG)
+    done = RunElementSSEMessageDTO(type="done", event_type="done", content="")
+    heartbeat = {"type": "heartbeat"}
+
+    assert tracker.apply(svg_patch) is svg_patch
+    assert tracker.apply(done) is done
+    assert tracker.apply(heartbeat) is heartbeat
+
+
+def test_elements_are_tracked_independently_and_sources_stay_untouched():
+    tracker = ElementDeltaTracker()
+    tracker.apply(_message("A1", element_bid="a"))
+    tracker.apply(_message("B1", element_bid="b"))
+    source = _message("A1 A2", element_bid="a")
+
+    delta = tracker.apply(source)
+
+    assert delta["content"]["content"] == " A2"
+    assert source.content.content == "A1 A2"
+    assert "content_offset" not in source.__json__()["content"]
+    assert tracker.apply(_message("B1 B2", element_bid="b"))["content"]["content"] == (
+        " B2"
+    )
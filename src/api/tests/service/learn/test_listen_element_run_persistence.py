@@ -3,8 +3,14 @@
 import pytest
 from flaskr.dao import db
 from flaskr.service.learn import listen_element_run_persistence
+from flaskr.service.learn.learn_dtos import (
+    ElementChangeType,
+    ElementDTO,
+    ElementType,
+)
 from flaskr.service.learn.listen_elements import ListenElementRunAdapter
 from flaskr.service.learn.models import LearnGeneratedElement
+from sqlalchemy import event
 from sqlalchemy.exc import ResourceClosedError
 
 
@@ -299,3 +305,100 @@ def test_desync_forensics_logs_only_packet_header_not_payload():
     finally:
         left.close()
         right.close()
+
+
+def _text_element(element_bid: str, content: str, *, is_new: bool) -> ElementDTO:
+    return ElementDTO(
+        event_type="element",
+        element_bid=element_bid,
+        generated_block_bid="block-a",
+        element_index=0,
+        role="teacher",
+        element_type=ElementType.TEXT,
+        element_type_code=0,
+        change_type=ElementChangeType.RENDER,
+        is_renderable=True,
+        is_new=is_new,
+        is_marker=False,
+        is_navigable=1,
+        is_final=False,
+        content_text=content,
+        payload=None,
+    )
+
+
+def test_streamed_patches_are_written_in_one_flush(app):
+    with app.app_context():
+        LearnGeneratedElement.query.delete()
+        db.session.commit()
+
+        adapter = ListenElementRunAdapter(
+            app,
+            shifu_bid="shifu-a",
+            outline_bid="outline-a",
+            user_bid="user-a",
+            run_session_bid="run-a",
+        )
+        statements: list[str] = []
+        engine = db.session.get_bind()
+
+        def record_statement(*args: object) -> None:
+            verb = str(args[2]).split(None, 1)[0].upper()
+            if verb in {"INSERT", "UPDATE"}:
+                statements.append(verb)
+
+        event.listen(engine, "before_cursor_execute", record_statement)
+        try:
+            adapter._persist_element(_text_element("element-a", "He", is_new=True))
+            for content in ["Hel", "Hell", "Hello"]:
+                adapter._persist_element(
+                    _text_element("element-a", content, is_new=False)
+                )
+            assert adapter.get_element_write_stats().pending_rows == 4
+            assert statements == []
+
+            adapter.flush_element_writes()
+        finally:
+            event.remove(engine, "before_cursor_execute", record_statement)
+
+        rows = LearnGeneratedElement.query.order_by(
+            LearnGeneratedElement.id.asc()
+        ).all()
+        assert [row.content_text for row in rows] == ["He", "Hel", "Hell", "Hello"]
+        assert [row.sequence_number for row in rows] == [1, 2, 3, 4]
+        assert [row.status for row in rows] == [0, 0, 0, 1]
+        assert statements == ["INSERT"]
+        stats = adapter.get_element_write_stats()
+        assert (stats.flushes, stats.inserted_rows, stats.pending_rows) == (1, 4, 0)
+        assert stats.deactivated_rows == 3
+
+
+def test_flush_retires_rows_written_by_an_earlier_flush(app):
+    with app.app_context():
+        LearnGeneratedElement.query.delete()
+        db.session.commit()
+
+        adapter = ListenElementRunAdapter(
+            app,
+            shifu_bid="shifu-a",
+            outline_bid="outline-a",
+            user_bid="user-a",
+            run_session_bid="run-a",
+        )
+        adapter._persist_element(_text_element("element-a", "first", is_new=True))
+        adapter._persist_element(_text_element("element-b", "other", is_new=True))
+        adapter.flush_element_writes()
+
+        adapter._persist_element(_text_element("element-a", "second", is_new=False))
+        adapter.flush_element_writes()
+        adapter.flush_element_writes()
+
+        rows = LearnGeneratedElement.query.order_by(
+            LearnGeneratedElement.id.asc()
+        ).all()
+        assert [(row.content_text, row.status) for row in rows] == [
+            ("first", 0),
+            ("other", 1),
+            ("second", 1),
+        ]
+        assert adapter.get_element_write_stats().flushes == 2
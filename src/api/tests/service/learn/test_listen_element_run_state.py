@@ -0,0 +1,56 @@
+"""Verify streamed text accumulation in listen element run state."""
+
+from flaskr.service.learn.learn_dtos import ElementType
+from flaskr.service.learn.listen_element_run_state import (
+    BlockState,
+    StreamElementState,
+)
+
+
+def test_block_raw_content_joins_appended_chunks():
+    state = BlockState(generated_block_bid="block-1")
+
+    assert state.raw_content == ""
+    for chunk in ["Hello", "", " ", "world"]:
+        state.append_raw_content(chunk)
+
+    assert state.raw_content == "Hello world"
+    # Reading leaves the appended chunks alone.
+    assert state.raw_content_chunks == ["Hello", " ", "world"]
+    state.append_raw_content(".")
+    assert state.raw_content == "Hello world."
+    assert state.raw_content_chunks == ["Hello", " ", "world", "."]
+
+
+def test_block_raw_content_reads_join_only_new_chunks():
+    state = BlockState(generated_block_bid="block-1")
+    for chunk in ["a", "b"]:
+        state.append_raw_content(chunk)
+        assert state.raw_content.endswith(chunk)
+
+    # Chunks already read are not joined again: overwriting one in place
+    # does not show up, while a newly appended chunk does.
+    state.raw_content_chunks[0] = "x"
+    state.append_raw_content("c")
+
+    assert state.raw_content == "abc"
+    assert state == BlockState(
+        generated_block_bid="block-1", raw_content_chunks=["x", "b", "c"]
+    )
+
+
+def test_stream_element_content_text_accumulates_appended_chunks():
+    state = StreamElementState(
+        number=0,
+        element_bid="element-1",
+        element_index=0,
+        element_type=ElementType.TEXT,
+    )
+
+    snapshots = []
+    for chunk in ["你", "", "好", "!"]:
+        state.append_content(chunk)
+        snapshots.append(state.content_text)
+
+    assert snapshots == ["你", "你", "你好", "你好!"]
+    assert "你好" not in repr(state)
@@ -1423,6 +1423,12 @@ def test_listen_run_persists_content_block_before_element_rows(app):
             def set_visual_mode(self, *_args: object, **_kwargs: object):
                 pass
 
+            def set_llm_provider(self, *_args: object, **_kwargs: object):
+                pass
+
+            def set_prompt(self, *_args: object, **_kwargs: object):
+                pass
+
             def set_output_language(self, *_args: object, **_kwargs: object):
                 return self
 
@@ -1616,6 +1622,12 @@ def test_listen_run_emits_visual_before_blocking_tts_finalize(app):
             def set_visual_mode(self, *_args: object, **_kwargs: object):
                 pass
 
+            def set_llm_provider(self, *_args: object, **_kwargs: object):
+                pass
+
+            def set_prompt(self, *_args: object, **_kwargs: object):
+                pass
+
             def set_output_language(self, *_args: object, **_kwargs: object):
                 return self
 
@@ -2208,6 +2220,7 @@ def test_listen_element_adapter_retires_matching_active_rows_by_primary_key(app)
                 payload=None,
             )
         )
+        adapter.flush_element_writes()
 
         persisted_rows = (
             LearnGeneratedElement.query.filter(
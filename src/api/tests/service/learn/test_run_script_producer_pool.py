@@ -0,0 +1,107 @@
+"""Verify the shared run_script producer pool admission and accounting."""
+
+import threading
+
+import pytest
+from flask import Flask
+from flaskr.service.learn import run_script_producer_pool as pool_module
+
+
+@pytest.fixture(autouse=True)
+def pool_state(monkeypatch):
+    state = pool_module._ProducerPoolState()
+    monkeypatch.setattr(pool_module, "_producer_pool_state", state)
+    yield state
+    if state.executor is not None:
+        state.executor.shutdown(wait=True)
+
+
+def _make_app(pool_size: int) -> Flask:
+    app = Flask(__name__)
+    app.config["RUN_SCRIPT_PRODUCER_POOL_SIZE"] = pool_size
+    return app
+
+
+def test_pool_rejects_when_every_worker_is_busy():
+    app = _make_app(2)
+    release = threading.Event()
+
+    futures = [
+        pool_module.submit_run_script_producer(app, release.wait) for _ in range(2)
+    ]
+    rejected = pool_module.submit_run_script_producer(app, release.wait)
+
+    assert all(future is not None for future in futures)
+    assert rejected is None
+    stats = pool_module.get_run_script_producer_pool_stats()
+    assert stats.capacity == 2
+    assert stats.active == 2
+    assert stats.rejected == 1
+
+    release.set()
+    for future in futures:
+        future.result(timeout=5)
+
+
+def test_pool_frees_slot_when_producer_finishes():
+    app = _make_app(1)
+
+    first = pool_module.submit_run_script_producer(app, lambda: None)
+    first.result(timeout=5)
+    second = pool_module.submit_run_script_producer(app, lambda: None)
+
+    assert second is not None
+    second.result(timeout=5)
+
+
+def test_pool_frees_slot_when_producer_raises():
+    app = _make_app(1)
+
+    def failing_producer():
+        message = "boom"
+        raise RuntimeError(message)
+
+    first = pool_module.submit_run_script_producer(app, failing_producer)
+    with pytest.raises(RuntimeError):
+        first.result(timeout=5)
+
+    second = pool_module.submit_run_script_producer(app, lambda: None)
+    assert second is not None
+    second.result(timeout=5)
+
+
+def test_pool_reuses_threads_across_streams():
+    app = _make_app(2)
+    thread_names: set[str] = set()
+
+    def producer():
+        thread_names.add(threading.current_thread().name)
+
+    for _ in range(20):
+        future = pool_module.submit_run_script_producer(app, producer)
+        future.result(timeout=5)
+
+    assert len(thread_names) <= 2
+    assert all(name.startswith("run_script_stream_producer") for name in thread_names)
+
+
+def test_pool_is_rebuilt_after_fork(monkeypatch, pool_state):
+    app = _make_app(1)
+    pool_module.submit_run_script_producer(app, lambda: None).result(timeout=5)
+    parent_executor = pool_state.executor
+
+    monkeypatch.setattr(pool_module.os, "getpid", lambda: pool_state.pid + 1)
+    pool_module.submit_run_script_producer(app, lambda: None).result(timeout=5)
+
+    assert pool_state.executor is not parent_executor
+    parent_executor.shutdown(wait=True)
+
+
+def test_pool_size_falls_back_to_default_for_invalid_config():
+    app = _make_app(2)
+    app.config["RUN_SCRIPT_PRODUCER_POOL_SIZE"] = "invalid"
+
+    assert (
+        pool_module._get_pool_size(app)
+        == pool_module.DEFAULT_RUN_SCRIPT_PRODUCER_POOL_SIZE
+    )
@@ -0,0 +1,414 @@
+"""Verify resumable run streams and their cache-backed replay buffer."""
+
+import json
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+from flask import Flask
+from flaskr import dao
+from flaskr.common.cache_provider import (
+    InMemoryCacheProvider,
+    _DynamicRedisCacheProvider,
+)
+from flaskr.service.learn import run_stream_replay, runscript_v2
+from flaskr.service.learn.learn_dtos import (
+    GeneratedType,
+    RunElementSSEMessageDTO,
+    RunMarkdownFlowDTO,
+)
+from flaskr.service.learn.run_stream_replay import (
+    RunStreamReplayBuffer,
+    format_run_stream_event_id,
+    parse_run_stream_event_id,
+)
+
+from tests.common.fixtures.fake_redis import FakeRedis
+
+
+class _FakeElementAdapter:
+    def __init__(self, *_args: object, **_kwargs: object) -> None:
+        self._seq = 0
+
+    def process(self, events):
+        for event in events:
+            yield self.make_ephemeral_message(
+                event_type="element", content=event.content
+            )
+
+    def make_ephemeral_message(
+        self, *, event_type: str, content, is_terminal: bool | None = None
+    ) -> RunElementSSEMessageDTO:
+        self._seq += 1
+        return RunElementSSEMessageDTO(
+            type=event_type,
+            event_type=event_type,
+            content=content,
+            run_event_seq=self._seq,
+            is_terminal=is_terminal,
+        )
+
+
+class _FakeLock:
+    def __init__(self) -> None:
+        self.release_calls = 0
+
+    def acquire(self, blocking=True):
+        _ = blocking
+        return True
+
+    def release(self):
+        self.release_calls += 1
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    cache = InMemoryCacheProvider()
+    monkeypatch.setattr(run_stream_replay, "cache_provider", cache)
+    return cache
+
+
+@pytest.fixture
+def stream_app(cache, monkeypatch):
+    app = Flask(__name__)
+    app.config.update(
+        REDIS_KEY_PREFIX="test",
+        SSE_HEARTBEAT_INTERVAL=0,
+        RUN_STREAM_REPLAY_BUFFER_SIZE=8,
+        RUN_STREAM_RESUME_GRACE_SECONDS=5,
+    )
+    lock = _FakeLock()
+    app.extensions["test_lock"] = lock
+    monkeypatch.setattr(
+        runscript_v2,
+        "cache_provider",
+        SimpleNamespace(
+            lock=lambda *_args, **_kwargs: lock,
+            setex=cache.setex,
+            get=cache.get,
+            delete=cache.delete,
+        ),
+    )
+    monkeypatch.setattr(runscript_v2, "ListenElementRunAdapter", _FakeElementAdapter)
+    monkeypatch.setattr(
+        runscript_v2, "_ensure_healthy_db_connection", lambda _app: None
+    )
+    return app
+
+
+def _content(text: str) -> RunMarkdownFlowDTO:
+    return RunMarkdownFlowDTO(
+        outline_bid="outline-1",
+        generated_block_bid="generated-1",
+        type=GeneratedType.CONTENT,
+        content=text,
+    )
+
+
+def _frame_id(frame: str) -> str:
+    first_line, _, _ = frame.partition("\n")
+    assert first_line.startswith("id: ")
+    return first_line[len("id: ") :]
+
+
+def _frame_event(frame: str) -> dict:
+    _, _, data = frame.partition("\n")
+    assert data.startswith("data: ")
+    return json.loads(data[len("data: ") :])
+
+
+def _wait_until(predicate, timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "condition not met in time"
+        time.sleep(0.01)
+
+
+def test_event_ids_round_trip():
+    assert parse_run_stream_event_id(format_run_stream_event_id("abc", 12)) == (
+        "abc",
+        12,
+    )
+    for raw in (None, "", "abc", ":3", "abc:x", "abc:-1"):
+        assert parse_run_stream_event_id(raw) is None
+
+
+def test_buffer_replays_frames_after_an_event_id(stream_app):
+    buffer = RunStreamReplayBuffer.create(stream_app, user_bid="u", outline_bid="o")
+    tagged = [buffer.append(f"data: {index}\n\n") for index in range(1, 4)]
+
+    attached = RunStreamReplayBuffer.attach(
+        stream_app, user_bid="u", outline_bid="o", stream_id=buffer.stream_id
+    )
+    read = attached.read_after(1)
+
+    assert _frame_id(tagged[0]) == f"{buffer.stream_id}:1"
+    assert read.frames == tagged[1:]
+    assert (read.last_seq, read.complete, read.done) == (3, True, False)
+    buffer.close()
+    assert attached.read_after(3).done is True
+
+
+def test_buffer_is_scoped_to_its_user(stream_app):
+    buffer = RunStreamReplayBuffer.create(stream_app, user_bid="u", outline_bid="o")
+
+    assert (
+        RunStreamReplayBuffer.attach(
+            stream_app, user_bid="other", outline_bid="o", stream_id=buffer.stream_id
+        )
+        is None
+    )
+
+
+def test_append_writes_each_frame_once(stream_app, cache, monkeypatch):
+    buffer = RunStreamReplayBuffer.create(stream_app, user_bid="u", outline_bid="o")
+    writes: list[str] = []
+    original_setex = cache.setex
+
+    def counting_setex(key, time_in_seconds, value):
+        writes.append(key)
+        return original_setex(key, time_in_seconds, value)
+
+    monkeypatch.setattr(cache, "setex", counting_setex)
+    for index in range(1, 6):
+        buffer.append(f"data: {index}\n\n")
+
+    assert len(writes) == 5
+    assert all(":event:" in key for key in writes)
+    read = buffer.read_after(2)
+    assert (read.last_seq, read.complete) == (5, True)
+    assert len(read.frames) == 3
+
+
+def test_reading_after_an_unwritten_seq_is_incomplete(stream_app):
+    buffer = RunStreamReplayBuffer.create(stream_app, user_bid="u", outline_bid="o")
+    buffer.append("data: 1\n\n")
+
+    assert buffer.read_after(1).complete is True
+    assert buffer.read_after(7).complete is False
+
+
+def test_frames_overwritten_by_the_ring_make_the_read_incomplete(stream_app):
+    buffer = RunStreamReplayBuffer.create(stream_app, user_bid="u", outline_bid="o")
+    for index in range(1, 12):
+        buffer.append(f"data: {index}\n\n")
+
+    assert buffer.read_after(1).complete is False
+    read = buffer.read_after(4)
+    assert read.complete is True
+    assert len(read.frames) == 7
+
+
+def test_disconnected_resumable_run_keeps_generating_for_a_reconnect(
+    stream_app, monkeypatch
+):
+    produced: list[str] = []
+
+    def fake_run_script_inner(**_kwargs: object):
+        for text in ("one", "two", "three"):
+            produced.append(text)
+            yield _content(text)
+            time.sleep(0.01)
+
+    monkeypatch.setattr(runscript_v2, "run_script_inner", fake_run_script_inner)
+    with stream_app.app_context():
+        stream = runscript_v2.run_script(
+            app=stream_app,
+            shifu_bid="shifu-1",
+            outline_bid="outline-1",
+            user_bid="user-1",
+            resumable=True,
+        )
+        first = next(stream)
+        stream.close()
+
+        resumed = runscript_v2.resume_run_script(
+            stream_app, "outline-1", "user-1", _frame_id(first)
+        )
+        replayed = list(resumed)
+
+    assert produced == ["one", "two", "three"]
+    assert _frame_event(first)["content"] == "one"
+    # The follower yields untagged heartbeats while it waits for the drain.
+    events = [_frame_event(frame) for frame in replayed if frame.startswith("id: ")]
+    assert [event["content"] for event in events[:-1]] == ["two", "three"]
+    assert events[-1]["type"] == "done"
+    assert events[-1]["is_terminal"] is True
+    lock = stream_app.extensions["test_lock"]
+    _wait_until(lambda: lock.release_calls == 1)
+
+
+def test_disconnect_hands_the_detached_run_to_the_producer_pool(
+    stream_app, monkeypatch
+):
+    resume_generation = threading.Event()
+
+    def fake_run_script_inner(**_kwargs: object):
+        yield _content("one")
+        resume_generation.wait(5)
+        yield _content("two")
+
+    monkeypatch.setattr(runscript_v2, "run_script_inner", fake_run_script_inner)
+    lock = stream_app.extensions["test_lock"]
+    with stream_app.app_context():
+        stream = runscript_v2.run_script(
+            app=stream_app,
+            shifu_bid="shifu-1",
+            outline_bid="outline-1",
+            user_bid="user-1",
+            resumable=True,
+        )
+        first = next(stream)
+        # close() returns while the run is still generating: the drain does
+        # not run on the request worker.
+        stream.close()
+        assert lock.release_calls == 0
+
+        resume_generation.set()
+        _wait_until(lambda: lock.release_calls == 1)
+        stream_id, _ = parse_run_stream_event_id(_frame_id(first))
+        buffer = RunStreamReplayBuffer.attach(
+            stream_app, user_bid="user-1", outline_bid="outline-1", stream_id=stream_id
+        )
+        read = buffer.read_after(1)
+
+    assert read.done is True
+    assert [_frame_event(frame)["content"] for frame in read.frames] == ["two", ""]
+
+
+def test_detached_run_releases_a_thread_local_redis_lock(
+    stream_app, cache, monkeypatch
+):
+    fake_redis = FakeRedis()
+    monkeypatch.setattr(dao._redis_state, "client", fake_redis)
+    monkeypatch.setattr(
+        runscript_v2,
+        "cache_provider",
+        SimpleNamespace(
+            lock=_DynamicRedisCacheProvider().lock,
+            setex=cache.setex,
+            get=cache.get,
+            delete=cache.delete,
+        ),
+    )
+
+    def fake_run_script_inner(**_kwargs: object):
+        yield _content("one")
+        yield _content("two")
+
+    monkeypatch.setattr(runscript_v2, "run_script_inner", fake_run_script_inner)
+    lock_key = runscript_v2._get_run_script_lock_key(stream_app, "user-1", "outline-1")
+    with stream_app.app_context():
+        stream = runscript_v2.run_script(
+            app=stream_app,
+            shifu_bid="shifu-1",
+            outline_bid="outline-1",
+            user_bid="user-1",
+            resumable=True,
+        )
+        next(stream)
+        assert fake_redis.lock(lock_key).acquire(blocking=False) is False
+        stream.close()
+
+    # The drain releases the run lock from a producer pool thread.
+    _wait_until(lambda: fake_redis.lock(lock_key).acquire(blocking=False))
+
+
+def test_detached_run_stops_after_the_grace_period(stream_app, monkeypatch):
+    stream_app.config["RUN_STREAM_RESUME_GRACE_SECONDS"] = 0
+    produced: list[int] = []
+
+    def fake_run_script_inner(**_kwargs: object):
+        for index in range(1000):
+            produced.append(index)
+            yield _content(str(index))
+            time.sleep(0.005)
+
+    monkeypatch.setattr(runscript_v2, "run_script_inner", fake_run_script_inner)
+    with stream_app.app_context():
+        stream = runscript_v2.run_script(
+            app=stream_app,
+            shifu_bid="shifu-1",
+            outline_bid="outline-1",
+            user_bid="user-1",
+            resumable=True,
+        )
+        first = next(stream)
+        stream.close()
+        stream_id, _ = parse_run_stream_event_id(_frame_id(first))
+        buffer = RunStreamReplayBuffer.attach(
+            stream_app, user_bid="user-1", outline_bid="outline-1", stream_id=stream_id
+        )
+
+        _wait_until(lambda: buffer.read_after(0).done)
+    assert len(produced) < 1000
+
+
+def test_plain_runs_do_not_tag_frames(stream_app, monkeypatch):
+    def fake_run_script_inner(**_kwargs: object):
+        yield _content("one")
+
+    monkeypatch.setattr(runscript_v2, "run_script_inner", fake_run_script_inner)
+    with stream_app.app_context():
+        frames = list(
+            runscript_v2.run_script(
+                app=stream_app,
+                shifu_bid="shifu-1",
+                outline_bid="outline-1",
+                user_bid="user-1",
+            )
+        )
+
+    assert all(frame.startswith("data: ") for frame in frames)
+
+
+def test_resume_falls_back_when_the_stream_is_unknown(stream_app):
+    with stream_app.app_context():
+        assert runscript_v2.resume_run_script(stream_app, "o", "u", None) is None
+        assert runscript_v2.resume_run_script(stream_app, "o", "u", "missing:3") is None
+
+
+def test_run_route_replays_before_admission(monkeypatch, test_client):
+    monkeypatch.setattr(
+        "flaskr.route.user.validate_user",
+        lambda _app, _token: SimpleNamespace(
+            user_id="user-resume", is_creator=False, language="en-US"
+        ),
+        raising=False,
+    )
+    monkeypatch.setattr(
+        "flaskr.service.learn.routes.is_builtin_demo_shifu",
+        lambda _app, shifu_bid: shifu_bid == "builtin-demo-1",
+    )
+    monkeypatch.setattr(
+        "flaskr.service.learn.routes.admit_creator_usage",
+        lambda *_args, **_kwargs: (_ for _ in ()).throw(
+            AssertionError("resuming must not admit a new run")
+        ),
+    )
+    captured = {}
+
+    def fake_resume_run_script(_app, outline_bid, user_bid, last_event_id):
+        captured.update(
+            outline_bid=outline_bid, user_bid=user_bid, last_event_id=last_event_id
+        )
+        return iter(['id: stream-1:4\ndata: {"type": "done"}\n\n'])
+
+    monkeypatch.setattr(
+        "flaskr.service.learn.routes.resume_run_script", fake_resume_run_script
+    )
+
+    resp = test_client.put(
+        "/api/learn/shifu/builtin-demo-1/run/outline-1",
+        json={"input": None, "resumable": True},
+        headers={"Token": "test-token", "Last-Event-ID": "stream-1:3"},
+    )
+
+    assert resp.status_code == 200
+    assert "id: stream-1:4" in resp.get_data(as_text=True)
+    assert captured == {
+        "outline_bid": "outline-1",
+        "user_bid": "user-resume",
+        "last_event_id": "stream-1:3",
+    }
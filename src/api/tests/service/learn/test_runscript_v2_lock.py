@@ -1,6 +1,9 @@
 """Verify runscript v2 lock behavior."""
 
 import json
+import queue
+import threading
+import time
 from datetime import datetime, timedelta, timezone
 from types import SimpleNamespace
 
@@ -1003,10 +1006,8 @@ def test_run_script_inner_emits_audio_backfill_ready_after_final_commit(monkeypa
     assert ready_event.content.element_bids == ["element-1"]
 
 
-def test_run_script_inner_emits_audio_backfill_ready_after_break_commit(monkeypatch):
-    app = Flask(__name__)
-    sequence = []
-
+def _patch_run_script_inner_break(monkeypatch, sequence: list[str]) -> None:
+    """Run one content block through ``run_script_inner``, then BREAK."""
     monkeypatch.setattr(
         runscript_v2,
         "db",
@@ -1073,7 +1074,16 @@ def test_run_script_inner_emits_audio_backfill_ready_after_break_commit(monkeypa
 
     monkeypatch.setattr(runscript_v2, "RunScriptContextV2", FakeRunScriptContext)
 
+
+def test_run_script_inner_emits_audio_backfill_ready_after_break_commit(monkeypatch):
+    app = Flask(__name__)
+    sequence = []
+    _patch_run_script_inner_break(monkeypatch, sequence)
+
     class ElementAdapter:
+        def flush_element_writes(self) -> None:
+            sequence.append("flush")
+
         def process(self, events):
             for event in events:
                 if event.type == GeneratedType.CONTENT:
@@ -1111,13 +1121,33 @@ def test_run_script_inner_emits_audio_backfill_ready_after_break_commit(monkeypa
         if getattr(event, "type", "") == GeneratedType.AUDIO_BACKFILL_READY.value:
             sequence.append("ready")
 
-    assert sequence == ["commit", "ready"]
+    assert sequence == ["flush", "commit", "ready"]
     ready_event = emitted[-1]
     assert ready_event.type == GeneratedType.AUDIO_BACKFILL_READY.value
     assert ready_event.generated_block_bid == "generated-1"
     assert ready_event.content.element_bids == ["element-1"]
 
 
+def test_run_script_inner_commits_break_without_element_adapter(monkeypatch):
+    app = Flask(__name__)
+    sequence = []
+    _patch_run_script_inner_break(monkeypatch, sequence)
+
+    emitted = list(
+        runscript_v2.run_script_inner(
+            app=app,
+            user_bid="user-1",
+            shifu_bid="shifu-1",
+            outline_bid="outline-1",
+            user_input="hello",
+            input_type="text",
+        )
+    )
+
+    assert sequence == ["commit"]
+    assert [event.content for event in emitted] == ["hello"]
+
+
 def test_run_script_listen_keeps_interaction_after_block_done(monkeypatch):
     app = _make_test_app()
     _patch_fake_element_adapter(monkeypatch)
@@ -1498,3 +1528,102 @@ def test_run_script_propagates_explicit_language_to_producer(monkeypatch):
         )
 
         assert seen_languages == ["zh-CN"]
+
+
+def test_wait_for_stream_item_wakes_on_put_before_heartbeat_interval():
+    output_queue = queue.SimpleQueue()
+
+    def delayed_put():
+        time.sleep(0.05)
+        output_queue.put(("data", "chunk"))
+
+    threading.Thread(target=delayed_put, daemon=True).start()
+    started = time.perf_counter()
+    item = runscript_v2._wait_for_stream_item(output_queue, 5.0)
+    elapsed = time.perf_counter() - started
+
+    assert item == ("data", "chunk")
+    assert elapsed < 1.0
+
+
+def test_wait_for_stream_item_times_out_for_heartbeat():
+    output_queue = queue.SimpleQueue()
+
+    with pytest.raises(queue.Empty):
+        runscript_v2._wait_for_stream_item(output_queue, 0.01)
+
+
+def test_run_script_forwards_chunks_without_waiting_for_heartbeat(monkeypatch):
+    app = _make_test_app()
+    app.config["SSE_HEARTBEAT_INTERVAL"] = 5
+    _patch_fake_element_adapter(monkeypatch)
+    with app.app_context():
+        lock = FakeLock([True])
+        cache = FakeCacheProvider(lock)
+        monkeypatch.setattr(runscript_v2, "cache_provider", cache)
+
+        def fake_run_script_inner(**_kwargs: object):
+            for content in ("hello", "world"):
+                time.sleep(0.05)
+                yield RunMarkdownFlowDTO(
+                    outline_bid="outline-1",
+                    generated_block_bid="generated-1",
+                    type=GeneratedType.CONTENT,
+                    content=content,
+                )
+
+        monkeypatch.setattr(runscript_v2, "run_script_inner", fake_run_script_inner)
+
+        started = time.perf_counter()
+        chunks = list(
+            runscript_v2.run_script(
+                app=app,
+                shifu_bid="shifu-1",
+                outline_bid="outline-1",
+                user_bid="user-1",
+                user_input={"input": ["x"]},
+                input_type="normal",
+            )
+        )
+        elapsed = time.perf_counter() - started
+        events = _parse_sse_events(chunks)
+
+        assert [event["type"] for event in events] == ["element", "element", "done"]
+        assert elapsed < 2.0
+
+
+def test_run_script_returns_busy_when_producer_pool_is_full(monkeypatch):
+    app = _make_test_app()
+    _patch_fake_element_adapter(monkeypatch)
+    with app.app_context():
+        lock = FakeLock([True])
+        cache = FakeCacheProvider(lock)
+        monkeypatch.setattr(runscript_v2, "cache_provider", cache)
+        monkeypatch.setattr(
+            runscript_v2, "submit_run_script_producer", lambda *_args: None
+        )
+        monkeypatch.setattr(runscript_v2, "_", lambda key: f"translated:{key}")
+        inner_calls: list[object] = []
+        monkeypatch.setattr(
+            runscript_v2,
+            "run_script_inner",
+            lambda **kwargs: inner_calls.append(kwargs),
+        )
+
+        chunks = list(
+            runscript_v2.run_script(
+                app=app,
+                shifu_bid="shifu-1",
+                outline_bid="outline-1",
+                user_bid="user-1",
+                user_input={"input": ["x"]},
+                input_type="normal",
+            )
+        )
+        events = _parse_sse_events(chunks)
+
+        assert inner_calls == []
+        assert [event["type"] for event in events] == ["error", "done"]
+        assert events[0]["content"] == "translated:server.learn.streamCapacityBusy"
+        assert events[-1]["is_terminal"] is True
+        assert lock.release_calls == 1
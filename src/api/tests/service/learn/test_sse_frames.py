@@ -0,0 +1,169 @@
+"""Verify SSE frame encoding stays byte-compatible with the legacy output."""
+
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from flask import Flask
+from flaskr.service.learn import sse_frames
+from flaskr.service.learn.learn_dtos import (
+    AudioCompleteDTO,
+    AudioSegmentDTO,
+    ElementAudioDTO,
+    ElementChangeType,
+    ElementDTO,
+    ElementPayloadDTO,
+    ElementType,
+    RunElementSSEMessageDTO,
+    VariableUpdateDTO,
+)
+from flaskr.util.datetime import to_utc_iso
+
+
+def _legacy_fmt(o: object) -> object:
+    if isinstance(o, datetime):
+        return to_utc_iso(o)
+    return o.__json__()
+
+
+def _legacy_frame(payload: object) -> str:
+    return (
+        "data: "
+        + json.dumps(payload, default=_legacy_fmt, ensure_ascii=False)
+        + b"\n\n".decode("utf-8")
+    )
+
+
+def _element_message(content: str, *, is_new: bool) -> RunElementSSEMessageDTO:
+    element = ElementDTO(
+        event_type="element",
+        element_bid="element-1",
+        generated_block_bid="block-1",
+        element_index=2,
+        role="teacher",
+        element_type=ElementType.TEXT,
+        element_type_code=213,
+        change_type=ElementChangeType.RENDER,
+        target_element_bid=None if is_new else "element-1",
+        is_renderable=True,
+        is_new=is_new,
+        is_marker=False,
+        sequence_number=7,
+        is_speakable=True,
+        audio_url="",
+        audio_segments=[
+            {
+                "segment_index": 0,
+                "audio_data": "AAAA",
+                "duration_ms": 120,
+                "is_final": False,
+            }
+        ],
+        is_navigable=1,
+        is_final=not is_new,
+        content_text=content,
+        payload=ElementPayloadDTO(
+            audio=ElementAudioDTO(
+                audio_url="https://example.com/a.mp3",
+                audio_bid="audio-1",
+                duration_ms=1200,
+            ),
+            previous_visuals=[],
+        ),
+        run_session_bid="run-1",
+        run_event_seq=11,
+    )
+    return RunElementSSEMessageDTO(
+        type="element",
+        event_type="element",
+        generated_block_bid="block-1",
+        run_session_bid="run-1",
+        run_event_seq=11,
+        content=element,
+    )
+
+
+PAYLOADS = [
+    _element_message('讲解：光速 ≈ 3×10⁸ m/s, "quoted"\n', is_new=True),
+    _element_message("Final text with emoji 🎧 and <svg/>", is_new=False),
+    RunElementSSEMessageDTO(
+        type="done",
+        event_type="done",
+        run_session_bid="run-1",
+        run_event_seq=12,
+        is_terminal=True,
+        content="",
+    ),
+    RunElementSSEMessageDTO(
+        type="audio_segment",
+        event_type="audio_segment",
+        generated_block_bid="block-1",
+        content=AudioSegmentDTO(
+            segment_index=3,
+            audio_data="UklGRg==",
+            duration_ms=480,
+            av_contract={"visual_boundaries": [], "speakable_segments": []},
+        ),
+    ),
+    RunElementSSEMessageDTO(
+        type="audio_complete",
+        event_type="audio_complete",
+        content=AudioCompleteDTO(
+            audio_url="https://example.com/b.mp3",
+            audio_bid="audio-2",
+            duration_ms=2400,
+        ),
+    ),
+    RunElementSSEMessageDTO(
+        type="variable_update",
+        event_type="variable_update",
+        content=VariableUpdateDTO(variable_name="nickname", variable_value="小明"),
+    ),
+    {"type": "heartbeat"},
+    {
+        "created_at": datetime(
+            2026, 6, 30, 19, 57, 3, tzinfo=timezone(timedelta(hours=8))
+        )
+    },
+    "plain string",
+]
+
+
+@pytest.mark.parametrize("payload", PAYLOADS)
+def test_default_encoder_is_byte_identical_to_legacy_frames(payload):
+    assert sse_frames.encode_sse_frame(payload) == _legacy_frame(payload)
+
+
+@pytest.mark.skipif(sse_frames.orjson is None, reason="orjson not installed")
+@pytest.mark.parametrize("payload", PAYLOADS)
+def test_orjson_encoder_frames_decode_to_the_same_value(payload):
+    encoder = sse_frames.SSEFrameEncoder(sse_frames.SSE_JSON_BACKEND_ORJSON)
+
+    frame = encoder.encode(payload)
+
+    assert frame.startswith("data: ")
+    assert frame.endswith("\n\n")
+    assert json.loads(frame[len("data: ") :]) == json.loads(
+        _legacy_frame(payload)[len("data: ") :]
+    )
+
+
+@pytest.mark.skipif(sse_frames.orjson is None, reason="orjson not installed")
+def test_orjson_encoder_falls_back_for_unsupported_values():
+    encoder = sse_frames.SSEFrameEncoder(sse_frames.SSE_JSON_BACKEND_ORJSON)
+    payload = {"big": 2**70}
+
+    assert encoder.encode(payload) == _legacy_frame(payload)
+
+
+def test_encoder_is_selected_from_app_config():
+    app = Flask(__name__)
+
+    assert sse_frames.get_sse_frame_encoder(app).backend == "json"
+    app.config["SSE_JSON_BACKEND"] = "unknown"
+    assert sse_frames.get_sse_frame_encoder(app).backend == "json"
+    app.config["SSE_JSON_BACKEND"] = " ORJSON "
+    expected = "orjson" if sse_frames.orjson is not None else "json"
+    encoder = sse_frames.get_sse_frame_encoder(app)
+    assert encoder.backend == expected
+    assert sse_frames.get_sse_frame_encoder(app) is encoder
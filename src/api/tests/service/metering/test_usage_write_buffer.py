@@ -0,0 +1,247 @@
+"""Verify buffered usage writes commit in batches and survive DB outages."""
+
+import shutil
+
+import pytest
+from flask import Flask
+from flaskr import dao
+from flaskr.service.metering import UsageContext, record_llm_usage, record_tts_usage
+from flaskr.service.metering.consts import BILL_USAGE_SCENE_PROD
+from flaskr.service.metering.models import BillUsageRecord
+from flaskr.service.metering.usage_buffer import flush_usage_write_buffer
+from flaskr.util.uuid import generate_id
+
+
+@pytest.fixture
+def buffered_app(tmp_path):
+    app = Flask(__name__)
+    app.testing = True
+    app.config.update(
+        SQLALCHEMY_DATABASE_URI="sqlite:///:memory:",
+        SQLALCHEMY_BINDS={
+            "ai_shifu_saas": "sqlite:///:memory:",
+            "ai_shifu_admin": "sqlite:///:memory:",
+        },
+        SQLALCHEMY_TRACK_MODIFICATIONS=False,
+        TZ="UTC",
+        BILL_USAGE_WRITE_MODE="buffered",
+        # Tests flush explicitly; keep the background thread idle.
+        BILL_USAGE_WRITE_BATCH_SIZE=1000,
+        BILL_USAGE_WRITE_FLUSH_INTERVAL_MS=60_000,
+        BILL_USAGE_WRITE_SPILL_DIR=str(tmp_path / "spill"),
+    )
+    dao.db.init_app(app)
+    with app.app_context():
+        dao.db.create_all()
+        yield app
+        buffer = app.extensions.get("usage_write_buffer")
+        if buffer is not None:
+            buffer.close()
+        dao.db.session.remove()
+        dao.db.drop_all()
+
+
+@pytest.fixture
+def enqueued(monkeypatch: pytest.MonkeyPatch) -> list[str]:
+    captured: list[str] = []
+    monkeypatch.setattr(
+        "flaskr.service.metering.recorder._enqueue_usage_settlement",
+        lambda _app, *, usage_bid: captured.append(usage_bid),
+    )
+    return captured
+
+
+def _record_lesson_step(app: Flask) -> tuple[str, str]:
+    context = UsageContext(
+        user_bid="user-buffer-1",
+        shifu_bid="shifu-buffer-1",
+        usage_scene=BILL_USAGE_SCENE_PROD,
+        billable=1,
+    )
+    llm_usage_bid = record_llm_usage(
+        app,
+        context,
+        provider="openai",
+        model="gpt-test",
+        is_stream=True,
+        input=10,
+        output=20,
+        total=30,
+    )
+    parent_usage_bid = generate_id(app)
+    for segment_index in range(3):
+        record_tts_usage(
+            app,
+            context,
+            provider="minimax",
+            model="speech-01",
+            is_stream=True,
+            input=5,
+            output=5,
+            total=5,
+            word_count=5,
+            duration_ms=500,
+            record_level=1,
+            parent_usage_bid=parent_usage_bid,
+            segment_index=segment_index,
+        )
+    record_tts_usage(
+        app,
+        context,
+        usage_bid=parent_usage_bid,
+        provider="minimax",
+        model="speech-01",
+        is_stream=True,
+        input=15,
+        output=15,
+        total=15,
+        word_count=15,
+        duration_ms=1500,
+        segment_count=3,
+    )
+    return llm_usage_bid, parent_usage_bid
+
+
+def test_buffered_usage_commits_once_then_enqueues_settlement(
+    buffered_app: Flask,
+    enqueued: list[str],
+) -> None:
+    llm_usage_bid, parent_usage_bid = _record_lesson_step(buffered_app)
+
+    assert BillUsageRecord.query.count() == 0
+    assert enqueued == []
+
+    assert flush_usage_write_buffer(buffered_app) == 5
+
+    assert BillUsageRecord.query.count() == 5
+    assert enqueued == [llm_usage_bid, parent_usage_bid]
+    stats = buffered_app.extensions["usage_write_buffer"].stats
+    assert stats.commits == 1
+    assert stats.committed == 5
+    parent = BillUsageRecord.query.filter_by(usage_bid=parent_usage_bid).one()
+    assert parent.segment_count == 3
+    assert parent.created_at is not None
+
+
+def test_failed_commit_spills_and_replays_without_duplicates(
+    buffered_app: Flask,
+    enqueued: list[str],
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path,
+) -> None:
+    llm_usage_bid, parent_usage_bid = _record_lesson_step(buffered_app)
+    buffer = buffered_app.extensions["usage_write_buffer"]
+    commit_rows = buffer._commit
+    database = {"reachable": False}
+    monkeypatch.setattr(
+        buffer,
+        "_commit",
+        lambda rows: database["reachable"] and commit_rows(rows),
+    )
+
+    assert flush_usage_write_buffer(buffered_app) == 0
+
+    spill_files = list((tmp_path / "spill").glob("*.jsonl"))
+    assert len(spill_files) == 1
+    assert buffer.stats.spilled == 5
+    assert enqueued == []
+    backup = tmp_path / "backup.jsonl"
+    shutil.copy(spill_files[0], backup)
+
+    database["reachable"] = True
+    # Replays back off after a spill.
+    assert flush_usage_write_buffer(buffered_app) == 0
+    buffer._spill_checked_at = None
+    assert flush_usage_write_buffer(buffered_app) == 5
+
+    assert BillUsageRecord.query.count() == 5
+    assert enqueued == [llm_usage_bid, parent_usage_bid]
+    assert list((tmp_path / "spill").iterdir()) == []
+
+    # A spill file replayed twice (e.g. after a crash) stores nothing new.
+    shutil.copy(backup, spill_files[0])
+    buffer._spill_checked_at = None
+    assert flush_usage_write_buffer(buffered_app) == 0
+    assert BillUsageRecord.query.count() == 5
+    assert enqueued == [llm_usage_bid, parent_usage_bid]
+
+
+def test_failed_replay_quarantines_the_file_and_continues(
+    buffered_app: Flask,
+    enqueued: list[str],
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path,
+) -> None:
+    poison_llm_bid, _ = _record_lesson_step(buffered_app)
+    buffer = buffered_app.extensions["usage_write_buffer"]
+    commit_rows = buffer._commit
+    database = {"reachable": False}
+
+    def commit_unless_poison(rows):
+        if not database["reachable"]:
+            return False
+        if any(row["usage_bid"] == poison_llm_bid for row in rows):
+            return False
+        return commit_rows(rows)
+
+    monkeypatch.setattr(buffer, "_commit", commit_unless_poison)
+    assert flush_usage_write_buffer(buffered_app) == 0
+    llm_usage_bid, parent_usage_bid = _record_lesson_step(buffered_app)
+    assert flush_usage_write_buffer(buffered_app) == 0
+    assert len(list((tmp_path / "spill").glob("*.jsonl"))) == 2
+
+    database["reachable"] = True
+    buffer._spill_checked_at = None
+    assert flush_usage_write_buffer(buffered_app) == 5
+
+    assert enqueued == [llm_usage_bid, parent_usage_bid]
+    assert list((tmp_path / "spill").glob("*.jsonl")) == []
+    assert len(list((tmp_path / "spill" / "quarantine").glob("*.jsonl"))) == 1
+
+
+def test_replay_during_an_outage_leaves_spill_files_in_place(
+    buffered_app: Flask,
+    enqueued: list[str],
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path,
+) -> None:
+    _record_lesson_step(buffered_app)
+    buffer = buffered_app.extensions["usage_write_buffer"]
+    monkeypatch.setattr(buffer, "_commit", lambda _rows: False)
+    assert flush_usage_write_buffer(buffered_app) == 0
+    _record_lesson_step(buffered_app)
+    assert flush_usage_write_buffer(buffered_app) == 0
+    spill_files = sorted((tmp_path / "spill").iterdir())
+    assert len(spill_files) == 2
+
+    buffer._spill_checked_at = None
+    assert flush_usage_write_buffer(buffered_app) == 0
+
+    assert sorted((tmp_path / "spill").iterdir()) == spill_files
+    assert enqueued == []
+
+
+def test_unserializable_row_does_not_drop_the_spilled_batch(
+    buffered_app: Flask,
+    enqueued: list[str],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    llm_usage_bid, parent_usage_bid = _record_lesson_step(buffered_app)
+    buffer = buffered_app.extensions["usage_write_buffer"]
+    buffer._pending[0].values["extra"] = {1, 2}
+    commit_rows = buffer._commit
+    database = {"reachable": False}
+    monkeypatch.setattr(
+        buffer,
+        "_commit",
+        lambda rows: database["reachable"] and commit_rows(rows),
+    )
+
+    assert flush_usage_write_buffer(buffered_app) == 0
+    assert buffer.stats.spilled == 4
+
+    database["reachable"] = True
+    buffer._spill_checked_at = None
+    assert flush_usage_write_buffer(buffered_app) == 4
+    assert enqueued == [parent_usage_bid]
+    assert BillUsageRecord.query.filter_by(usage_bid=llm_usage_bid).count() == 0
@@ -0,0 +1,151 @@
+"""Verify the versioned published shifu struct cache."""
+
+import pytest
+from flask import Flask
+from flaskr import dao
+from flaskr.service.shifu import published_struct_cache
+from flaskr.service.shifu.models import LogPublishedStruct
+from flaskr.service.shifu.shifu_history_manager import HistoryItem
+from flaskr.service.shifu.shifu_struct_manager import get_shifu_struct
+
+SHIFU_BID = "shifu-cache-1"
+
+
+@pytest.fixture(scope="module")
+def struct_app():
+    app = Flask("published-struct-cache")
+    app.config.update(
+        SQLALCHEMY_DATABASE_URI="sqlite:///:memory:",
+        SQLALCHEMY_BINDS={
+            "ai_shifu_saas": "sqlite:///:memory:",
+            "ai_shifu_admin": "sqlite:///:memory:",
+        },
+        SQLALCHEMY_TRACK_MODIFICATIONS=False,
+        REDIS_KEY_PREFIX="test:",
+    )
+    dao.db.init_app(app)
+    with app.app_context():
+        dao.db.create_all()
+    return app
+
+
+@pytest.fixture
+def app_ctx(struct_app):
+    with struct_app.app_context():
+        dao.db.session.query(LogPublishedStruct).delete()
+        dao.db.session.commit()
+        yield struct_app
+        dao.db.session.remove()
+
+
+@pytest.fixture
+def counters(monkeypatch):
+    calls = {"id_queries": 0, "decodes": 0}
+    original_query = published_struct_cache._query_latest_struct_id
+    original_from_json = HistoryItem.from_json.__func__
+
+    def counting_query(shifu_bid: str, active_only: bool) -> int | None:
+        calls["id_queries"] += 1
+        return original_query(shifu_bid, active_only)
+
+    def counting_from_json(cls, json):
+        calls["decodes"] += 1
+        return original_from_json(cls, json)
+
+    monkeypatch.setattr(
+        published_struct_cache, "_query_latest_struct_id", counting_query
+    )
+    monkeypatch.setattr(HistoryItem, "from_json", classmethod(counting_from_json))
+    return calls
+
+
+def _publish(app: Flask, title_bid: str) -> None:
+    struct = HistoryItem(
+        bid=SHIFU_BID,
+        id=1,
+        type="shifu",
+        children=[HistoryItem(bid=title_bid, id=10, type="outline", children=[])],
+    )
+    dao.db.session.add(
+        LogPublishedStruct(
+            struct_bid=f"struct-{title_bid}",
+            shifu_bid=SHIFU_BID,
+            struct=struct.to_json(),
+        )
+    )
+    dao.db.session.commit()
+    published_struct_cache.invalidate_published_struct(app, SHIFU_BID)
+
+
+def test_repeated_lookups_skip_query_and_decode(app_ctx, counters):
+    _publish(app_ctx, "outline-a")
+
+    first = published_struct_cache.get_published_struct(app_ctx, SHIFU_BID)
+    second = published_struct_cache.get_published_struct(app_ctx, SHIFU_BID)
+
+    assert first is second
+    assert first.children[0].bid == "outline-a"
+    assert counters == {"id_queries": 1, "decodes": 1}
+
+
+def test_publish_invalidates_remembered_struct(app_ctx, counters):
+    _publish(app_ctx, "outline-a")
+    published_struct_cache.get_published_struct(app_ctx, SHIFU_BID)
+
+    _publish(app_ctx, "outline-b")
+    struct = published_struct_cache.get_published_struct(app_ctx, SHIFU_BID)
+
+    assert struct.children[0].bid == "outline-b"
+    assert counters == {"id_queries": 2, "decodes": 2}
+
+
+def test_version_bump_from_another_worker_is_observed(app_ctx):
+    _publish(app_ctx, "outline-a")
+    published_struct_cache.get_published_struct(app_ctx, SHIFU_BID)
+
+    # Simulate a publish handled by a different process: the row is added and
+    # only the shared Redis version moves, this process's pointer is untouched.
+    struct = HistoryItem(
+        bid=SHIFU_BID,
+        id=1,
+        type="shifu",
+        children=[HistoryItem(bid="outline-c", id=10, type="outline")],
+    )
+    dao.db.session.add(
+        LogPublishedStruct(
+            struct_bid="struct-outline-c",
+            shifu_bid=SHIFU_BID,
+            struct=struct.to_json(),
+        )
+    )
+    dao.db.session.commit()
+    dao.get_redis_client().incr(f"test:shifu:published_struct_version:{SHIFU_BID}")
+
+    refreshed = published_struct_cache.get_published_struct(app_ctx, SHIFU_BID)
+
+    assert refreshed.children[0].bid == "outline-c"
+
+
+def test_without_redis_latest_row_is_resolved_but_decode_is_cached(
+    app_ctx, counters, monkeypatch
+):
+    monkeypatch.setattr(dao._redis_state, "client", None)
+    _publish(app_ctx, "outline-a")
+
+    first = published_struct_cache.get_published_struct(app_ctx, SHIFU_BID)
+    second = published_struct_cache.get_published_struct(app_ctx, SHIFU_BID)
+
+    assert first is second
+    assert counters == {"id_queries": 2, "decodes": 1}
+
+
+def test_get_shifu_struct_serves_published_struct_from_cache(app_ctx, counters):
+    _publish(app_ctx, "outline-a")
+
+    get_shifu_struct(app_ctx, SHIFU_BID)
+    struct = get_shifu_struct(app_ctx, SHIFU_BID)
+
+    assert struct.children[0].bid == "outline-a"
+    assert counters["decodes"] == 1
+    stats = published_struct_cache.get_published_struct_cache_stats()
+    assert (stats.hits, stats.misses, stats.size) == (1, 1, 1)
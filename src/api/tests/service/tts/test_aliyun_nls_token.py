@@ -15,10 +15,10 @@ def test_get_aliyun_nls_token_uses_override_when_configured(monkeypatch):
 
     def fake_get(*args: object, **kwargs: object):
         _ = (args, kwargs)
-        message = "requests.get should not be called when override token exists"
+        message = "token fetch should not be called when override token exists"
         raise AssertionError(message)
 
-    monkeypatch.setattr(requests, "get", fake_get)
+    monkeypatch.setattr("flaskr.api.tts.aliyun_nls_token._http_client.get", fake_get)
 
     assert get_aliyun_nls_token() == "override-token"
 
@@ -54,7 +54,7 @@ def test_get_aliyun_nls_token_fetches_and_caches(monkeypatch):
         captured["timeout"] = timeout
         return DummyResponse()
 
-    monkeypatch.setattr(requests, "get", fake_get)
+    monkeypatch.setattr("flaskr.api.tts.aliyun_nls_token._http_client.get", fake_get)
 
     token1 = get_aliyun_nls_token()
     token2 = get_aliyun_nls_token()
@@ -102,7 +102,7 @@ def test_get_aliyun_nls_token_refresh_falls_back_to_cached_token(monkeypatch):
         message = "network down"
         raise requests.RequestException(message)
 
-    monkeypatch.setattr(requests, "get", fake_get)
+    monkeypatch.setattr("flaskr.api.tts.aliyun_nls_token._http_client.get", fake_get)
 
     assert get_aliyun_nls_token() == "cached-token"
     assert captured["calls"] == 1
@@ -141,7 +141,7 @@ def test_aliyun_provider_synthesize_uses_dynamic_token(monkeypatch):
         captured["timeout"] = timeout
         return DummyResponse()
 
-    monkeypatch.setattr(requests, "post", fake_post)
+    monkeypatch.setattr("flaskr.api.tts.aliyun_provider._http_client.post", fake_post)
 
     provider = AliyunTTSProvider()
     result = provider.synthesize("Hello")
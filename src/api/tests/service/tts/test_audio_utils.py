@@ -6,6 +6,14 @@ from typing import ClassVar
 import pytest
 from flaskr.service.tts import audio_utils
 
+from tests.common.fixtures.mp3_frames import (
+    MPEG1_48K_FRAME_BYTES,
+    MPEG1_48K_MONO_HEADER,
+    MPEG2_24K_FRAME_MS,
+    build_info_frame,
+    build_mp3,
+)
+
 
 class _FakeSegment:
     append_crossfades: ClassVar[list[int]] = []
@@ -61,6 +69,13 @@ class _PartiallyBrokenAudioSegment:
         return _FakeSegment(int(payload.decode("utf-8")))
 
 
+class _ConstantDurationAudioSegment:
+    @staticmethod
+    def from_mp3(segment_io: io.BytesIO) -> "_FakeSegment":
+        _ = segment_io
+        return _FakeSegment(100)
+
+
 class _RecordingAudioSegment:
     from_file_formats: ClassVar[list[str]] = []
 
@@ -175,3 +190,32 @@ def test_export_audio_range_does_not_return_invalid_bytes_after_decode_failure(
 
     assert output == b""
     assert duration_ms == 0
+
+
+def test_mp3_concat_duration_and_range_work_without_pydub(monkeypatch):
+    monkeypatch.setattr(audio_utils, "PYDUB_AVAILABLE", False)
+    segments = [build_info_frame() + build_mp3(10), build_mp3(15)]
+
+    joined = audio_utils.concat_audio_mp3(segments)
+    piece, piece_duration_ms = audio_utils.export_audio_range_best_effort(
+        joined, start_ms=100, end_ms=300
+    )
+
+    assert joined == build_mp3(25)
+    assert audio_utils.get_audio_duration_ms(joined) == 25 * MPEG2_24K_FRAME_MS
+    assert audio_utils.concat_audio_best_effort(segments) == joined
+    assert piece == build_mp3(8)
+    assert piece_duration_ms == 8 * MPEG2_24K_FRAME_MS
+
+
+def test_concat_audio_mp3_reencodes_mismatched_mp3_formats(monkeypatch):
+    monkeypatch.setattr(
+        audio_utils, "AudioSegment", _ConstantDurationAudioSegment, raising=False
+    )
+    monkeypatch.setattr(audio_utils, "PYDUB_AVAILABLE", True)
+    segments = [
+        build_mp3(10),
+        build_mp3(5, header=MPEG1_48K_MONO_HEADER, frame_bytes=MPEG1_48K_FRAME_BYTES),
+    ]
+
+    assert audio_utils.concat_audio_mp3(segments) == b"duration=200"
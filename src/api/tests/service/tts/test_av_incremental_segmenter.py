@@ -0,0 +1,138 @@
+"""Verify the incremental AV segmentation contract matches full rebuilds."""
+
+import random
+
+import pytest
+from flaskr.service.tts import pipeline
+from flaskr.service.tts.pipeline import (
+    IncrementalAVSegmenter,
+    build_av_segmentation_contract,
+)
+
+CORPUS = [
+    "Hello.",
+    "## Why this matters\n\nThe explanation continues.",
+    (
+        "Before.\n\n"
+        '<svg width="800" height="600" xmlns="http://www.w3.org/2000/svg">'
+        "<text>Hello</text>"
+        "</svg>\n\n"
+        "After."
+    ),
+    "A.\n\n<svg><text>1</text></svg>\n\nB.\n\n<svg><text>2</text></svg>\n\nC.",
+    'Hello <img src="https://example.com/a.png" /> world.',
+    "Hello ![alt](https://example.com/a.png) world.",
+    "Before.\n```\n<svg>inside fence</svg>\n```\nAfter.",
+    "Intro.\n```mermaid\ngraph TD; A-->B\n```\nOutro.\n```diff\n- a\n+ b\n```\n",
+    "Before.\n\n| a | b |\n|---|---|\n| 1 | 2 |\n\nAfter.",
+    "Before.\n<table><tr><td>1</td></tr></table>\nAfter.",
+    'Before.\n<video src="https://example.com/a.mp4"></video>\nAfter.',
+    'Before.\n<iframe src="https://example.com/v"></iframe>\nAfter.',
+    (
+        '=== <iframe src="https://example.com/v"></iframe> ===\n\n'
+        "Hello.\n\n"
+        "<svg><text>hi</text></svg>\n\n"
+        "After."
+    ),
+    "Before.\n<div><div>visual</div></div>\nAfter.",
+    "Before.\n<div><h3>Title</h3><p>Story.</p></div>\nAfter.",
+    "Before.\n<div>tail at end</div>",
+    "Before.\n<script>var a = 1;</script>\n<p>x</p>\nAfter.",
+    "Energy $$E = mc^2$$ and more.\n\nCost is $5!\n",
+    "Look! ![unfinished alt\n\n<svg></svg>\nlater ](x) done.\n",
+    "Open $$ formula\n<svg></svg>\nstill open $$ closed.\n",
+    "Intro.\n"
+    '<svg width="10" height="10"></svg>\n'
+    "After svg.\n"
+    "| a | b |\n|---|---|\n| 1 | 2 |\n"
+    "After table.",
+    "a < b and c | d\n<svg></svg> | x |\n| y |\nEnd.",
+]
+
+_SOUP = [
+    "Hello world. ",
+    "Great! ",
+    "a < b ",
+    "x | y ",
+    "\n",
+    "\n\n",
+    "![alt](http://x/a.png)",
+    "![",
+    "](",
+    ")",
+    "$$",
+    "```",
+    "```mermaid\n",
+    "code\n",
+    "<svg width='1'>",
+    "</svg>",
+    "<iframe src='v'>",
+    "</iframe>",
+    " ===",
+    "<table>",
+    "</table>",
+    "<img src='a'",
+    ">",
+    "<div>",
+    "</div>",
+    "<script>",
+    "</script>",
+    "<p>",
+    "</p>",
+    "| a | b |",
+    "|---|---|",
+    "Text",
+]
+
+
+def _assert_matches_full_rebuild(raw: str, chunk_size: int) -> None:
+    segmenter = IncrementalAVSegmenter("block-1")
+    for offset in range(0, len(raw), chunk_size):
+        contract = segmenter.append(raw[offset : offset + chunk_size])
+        expected = build_av_segmentation_contract(raw[: offset + chunk_size], "block-1")
+        assert contract == expected, raw[: offset + chunk_size]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 64])
+@pytest.mark.parametrize("raw", CORPUS)
+def test_incremental_contract_matches_full_rebuild(raw, chunk_size):
+    _assert_matches_full_rebuild(raw, chunk_size)
+
+
+def test_incremental_contract_matches_full_rebuild_on_random_markup():
+    rng = random.Random(20240601)  # noqa: S311 - reproducible fuzz corpus
+    for _ in range(300):
+        raw = "".join(rng.choice(_SOUP) for _ in range(rng.randint(1, 40)))
+        _assert_matches_full_rebuild(raw, rng.choice([1, 2, 5, 13]))
+
+
+def test_empty_chunks_keep_the_current_contract():
+    segmenter = IncrementalAVSegmenter("block-1")
+    contract = segmenter.append("Before.\n<svg></svg>\n")
+
+    assert segmenter.append("") is contract
+    assert segmenter.raw == "Before.\n<svg></svg>\n"
+
+
+def test_each_chunk_only_rescans_the_pending_tail(monkeypatch):
+    scanned_lengths: list[int] = []
+    original = pipeline._find_next_av_boundary
+
+    def recording_find_next_av_boundary(raw: str, **kwargs: bool):
+        scanned_lengths.append(len(raw))
+        return original(raw, **kwargs)
+
+    monkeypatch.setattr(
+        pipeline, "_find_next_av_boundary", recording_find_next_av_boundary
+    )
+    paragraph = "Speakable sentence, with a comparison a < b. " * 4 + "\n\n"
+    visual = "<svg><text>chart</text></svg>\n\n| a | b |\n|---|---|\n\n"
+    raw = (paragraph * 3 + visual) * 40
+
+    segmenter = IncrementalAVSegmenter("block-1")
+    for offset in range(0, len(raw), 8):
+        segmenter.append(raw[offset : offset + 8])
+
+    assert len(raw) > 20000
+    assert max(scanned_lengths) < 1000
+    assert segmenter.contract == build_av_segmentation_contract(raw, "block-1")
@@ -101,7 +101,7 @@ def test_minimax_http_streaming_parses_audio_and_final_subtitles(monkeypatch):
             ]
         )
 
-    monkeypatch.setattr("flaskr.api.tts.minimax_provider.requests.post", _fake_post)
+    monkeypatch.setattr("flaskr.api.tts.minimax_provider._http_client.post", _fake_post)
 
     chunks = list(
         MinimaxTTSProvider().stream_synthesize(
@@ -166,7 +166,7 @@ def test_minimax_synthesize_splits_word_count_and_usage_characters(monkeypatch):
             }
         )
 
-    monkeypatch.setattr("flaskr.api.tts.minimax_provider.requests.post", _fake_post)
+    monkeypatch.setattr("flaskr.api.tts.minimax_provider._http_client.post", _fake_post)
 
     result = MinimaxTTSProvider().synthesize(
         text="今天是不是很开心呀(laughs)，当然了！",
@@ -194,7 +194,7 @@ def test_minimax_http_streaming_raises_on_business_error(monkeypatch):
         lambda **_kwargs: None,
     )
     monkeypatch.setattr(
-        "flaskr.api.tts.minimax_provider.requests.post",
+        "flaskr.api.tts.minimax_provider._http_client.post",
         lambda *_args, **_kwargs: _FakeResponse(
             [
                 _sse_line(
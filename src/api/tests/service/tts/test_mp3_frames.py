@@ -0,0 +1,82 @@
+"""Verify decode-free MP3 frame parsing, joining and slicing."""
+
+from flaskr.service.tts.mp3_frames import concat_mp3_frames, parse_mp3_frames
+
+from tests.common.fixtures.mp3_frames import (
+    MPEG1_48K_FRAME_BYTES,
+    MPEG1_48K_MONO_HEADER,
+    MPEG2_24K_FRAME_BYTES,
+    MPEG2_24K_FRAME_MS,
+    build_id3v1_tag,
+    build_id3v2_tag,
+    build_info_frame,
+    build_mp3,
+)
+
+
+def test_parse_counts_audio_frames_and_skips_tags_and_info_frame():
+    audio = build_mp3(50)
+    data = build_id3v2_tag() + build_info_frame() + audio + build_id3v1_tag()
+
+    stream = parse_mp3_frames(data)
+
+    assert stream is not None
+    assert stream.format.sample_rate == 24000
+    assert stream.format.channels == 1
+    assert len(stream.frames) == 50
+    assert stream.duration_ms == 50 * MPEG2_24K_FRAME_MS
+    assert stream.to_bytes() == audio
+
+
+def test_parse_rejects_non_mpeg_audio():
+    assert parse_mp3_frames(b"") is None
+    assert parse_mp3_frames(b"100") is None
+    assert parse_mp3_frames(b"RIFF" + bytes(2000)) is None
+
+
+def test_parse_keeps_complete_frames_of_a_truncated_stream():
+    data = build_mp3(10)[: -MPEG2_24K_FRAME_BYTES // 2]
+
+    stream = parse_mp3_frames(data)
+
+    assert stream is not None
+    assert len(stream.frames) == 9
+
+
+def test_parse_resyncs_after_a_short_burst_of_junk():
+    data = build_mp3(20) + b"\x00\xff\x01junk" + build_mp3(20)
+
+    stream = parse_mp3_frames(data)
+
+    assert stream is not None
+    assert len(stream.frames) == 40
+
+
+def test_concat_joins_same_format_streams_and_refuses_mismatched_ones():
+    first = parse_mp3_frames(build_info_frame() + build_mp3(3))
+    second = parse_mp3_frames(build_id3v2_tag() + build_mp3(4))
+    other = parse_mp3_frames(
+        build_mp3(4, header=MPEG1_48K_MONO_HEADER, frame_bytes=MPEG1_48K_FRAME_BYTES)
+    )
+
+    joined = concat_mp3_frames([first, second])
+
+    assert joined == build_mp3(7)
+    assert parse_mp3_frames(joined).duration_ms == 7 * MPEG2_24K_FRAME_MS
+    assert concat_mp3_frames([first, other]) is None
+
+
+def test_slices_partition_the_stream_by_frame_start_time():
+    stream = parse_mp3_frames(build_mp3(50))
+
+    pieces = [
+        stream.slice_ms(0, 100),
+        stream.slice_ms(100, 250),
+        stream.slice_ms(250, None),
+    ]
+
+    # Frames start every 24 ms: 0..96, 120..240, 264..1176.
+    assert [duration for _, duration in pieces] == [120, 144, 936]
+    assert b"".join(audio for audio, _ in pieces) == build_mp3(50)
+    assert stream.slice_ms(300, 300) == (b"", 0)
+    assert stream.slice_ms(5000, None) == (b"", 0)
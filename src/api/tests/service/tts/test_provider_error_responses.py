@@ -1,7 +1,6 @@
 """Error-branch tests for the Baidu and Aliyun TTS HTTP responses."""
 
 import pytest
-import requests
 from flaskr.api.tts import aliyun_provider as aliyun_mod
 from flaskr.api.tts import baidu_provider as baidu_mod
 from flaskr.api.tts.aliyun_provider import AliyunTTSProvider
@@ -40,7 +39,7 @@ def aliyun(monkeypatch):
 
 def test_baidu_reports_the_json_error_payload(baidu, monkeypatch):
     monkeypatch.setattr(
-        requests,
+        baidu_mod._http_client,
         "post",
         lambda *_args, **_kwargs: _Response({"err_no": 502, "err_msg": "bad"}, "{}"),
     )
@@ -51,7 +50,7 @@ def test_baidu_reports_the_json_error_payload(baidu, monkeypatch):
 
 def test_baidu_reports_the_raw_body_when_json_is_malformed(baidu, monkeypatch):
     monkeypatch.setattr(
-        requests,
+        baidu_mod._http_client,
         "post",
         lambda *_args, **_kwargs: _Response(None, "<html>oops</html>"),
     )
@@ -62,7 +61,7 @@ def test_baidu_reports_the_raw_body_when_json_is_malformed(baidu, monkeypatch):
 
 def test_aliyun_reports_the_json_error_payload(aliyun, monkeypatch):
     monkeypatch.setattr(
-        requests,
+        aliyun_mod._http_client,
         "post",
         lambda *_args, **_kwargs: _Response(
             {"status": 40000000, "message": "denied", "task_id": "t-1"},
@@ -79,7 +78,7 @@ def test_aliyun_reports_the_json_error_payload(aliyun, monkeypatch):
 
 def test_aliyun_reports_the_raw_body_when_json_is_malformed(aliyun, monkeypatch):
     monkeypatch.setattr(
-        requests,
+        aliyun_mod._http_client,
         "post",
         lambda *_args, **_kwargs: _Response(None, "<html>oops</html>"),
     )
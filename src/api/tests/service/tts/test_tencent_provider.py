@@ -237,7 +237,7 @@ def test_tencent_provider_stream_synthesize_parses_sse_audio_and_alignments(
             ]
         )
 
-    monkeypatch.setattr(tencent_provider.requests, "post", fake_post)
+    monkeypatch.setattr(tencent_provider._http_client, "post", fake_post)
 
     chunks = list(
         tencent_provider.TencentTTSProvider().stream_synthesize(
@@ -319,7 +319,7 @@ def test_tencent_provider_synthesize_collects_audio_and_sentence_subtitles(
             ]
         )
 
-    monkeypatch.setattr(tencent_provider.requests, "post", fake_post)
+    monkeypatch.setattr(tencent_provider._http_client, "post", fake_post)
 
     def concat_audio(segments: list[bytes], output_format: str = "mp3") -> bytes:
         del output_format
@@ -389,7 +389,7 @@ def test_tencent_provider_raises_sanitized_error_on_sse_error(monkeypatch):
             ]
         )
 
-    monkeypatch.setattr(tencent_provider.requests, "post", fake_post)
+    monkeypatch.setattr(tencent_provider._http_client, "post", fake_post)
 
     with pytest.raises(
         ValueError,
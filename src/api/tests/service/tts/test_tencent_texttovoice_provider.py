@@ -187,7 +187,7 @@ def test_synthesize_builds_payload_and_concatenates_segments(monkeypatch):
             }
         )
 
-    monkeypatch.setattr(module.requests, "post", _fake_post)
+    monkeypatch.setattr(module._http_client, "post", _fake_post)
 
     def concat_audio(segments: list[bytes], output_format: str = "mp3") -> bytes:
         del output_format
@@ -231,7 +231,7 @@ def test_synthesize_raises_on_api_error_with_code(monkeypatch):
 
     _patch_credentials(monkeypatch)
     monkeypatch.setattr(
-        module.requests,
+        module._http_client,
         "post",
         lambda *_args, **_kwargs: _FakeResponse(
             {
@@ -261,7 +261,7 @@ def test_synthesize_raises_on_empty_audio(monkeypatch):
 
     _patch_credentials(monkeypatch)
     monkeypatch.setattr(
-        module.requests,
+        module._http_client,
         "post",
         lambda *_args, **_kwargs: _FakeResponse(
             {"Response": {"Audio": "", "RequestId": "req-empty"}}
@@ -0,0 +1,184 @@
+"""Verify repeated syntheses are served from the content-addressed audio cache."""
+
+from __future__ import annotations
+
+import itertools
+from datetime import datetime, timedelta
+
+import flaskr.common.config as common_config
+import pytest
+from flask import Flask
+from flaskr import dao
+from flaskr.api.tts.base import AudioSettings, TTSResult, VoiceSettings
+from flaskr.service.common.storage import get_local_storage_path
+from flaskr.service.tts import audio_cache
+from flaskr.service.tts.audio_cache import (
+    build_tts_audio_cache_key,
+    evict_tts_audio_cache,
+    synthesize_with_audio_cache,
+)
+from flaskr.service.tts.models import TTSAudioCacheEntry
+
+
+class _CountingProvider:
+    provider_name = "fake"
+
+    def __init__(self) -> None:
+        self.calls: list[str] = []
+
+    def get_default_voice_settings(self) -> VoiceSettings:
+        return VoiceSettings(voice_id="voice-1")
+
+    def get_default_audio_settings(self) -> AudioSettings:
+        return AudioSettings()
+
+    def synthesize(self, *, text, voice_settings, audio_settings, model):
+        _ = (voice_settings, audio_settings, model)
+        self.calls.append(text)
+        return TTSResult(
+            audio_data=text.encode("utf-8") * 10,
+            duration_ms=1200,
+            sample_rate=24000,
+            format="mp3",
+            word_count=2,
+            usage_characters=len(text),
+            subtitle_cues=[{"text": text, "start_ms": 0, "end_ms": 1200}],
+        )
+
+
+@pytest.fixture
+def cache_app(monkeypatch: pytest.MonkeyPatch, tmp_path) -> Flask:
+    ticks = itertools.count()
+    monkeypatch.setattr(
+        "flaskr.service.tts.audio_cache.now_utc",
+        lambda: datetime(2026, 10, 1) + timedelta(seconds=next(ticks)),
+    )
+    monkeypatch.setattr(audio_cache, "_size_estimate", audio_cache._CacheSizeEstimate())
+    monkeypatch.setenv("STORAGE_PROVIDER", "local")
+    monkeypatch.setenv("LOCAL_STORAGE_ROOT", str(tmp_path))
+    for key in ("STORAGE_PROVIDER", "LOCAL_STORAGE_ROOT"):
+        common_config.__ENHANCED_CONFIG__._cache.pop(key, None)
+
+    app = Flask(__name__)
+    app.testing = True
+    app.config.update(
+        SQLALCHEMY_DATABASE_URI="sqlite:///:memory:",
+        SQLALCHEMY_BINDS={
+            "ai_shifu_saas": "sqlite:///:memory:",
+            "ai_shifu_admin": "sqlite:///:memory:",
+        },
+        SQLALCHEMY_TRACK_MODIFICATIONS=False,
+        TZ="UTC",
+        TTS_AUDIO_CACHE_MAX_BYTES=1024,
+    )
+    dao.db.init_app(app)
+    with app.app_context():
+        dao.db.create_all()
+        yield app
+        dao.db.session.remove()
+        dao.db.drop_all()
+
+
+def _synthesize(app: Flask, provider: _CountingProvider, text: str) -> TTSResult:
+    return synthesize_with_audio_cache(
+        app,
+        provider,
+        text=text,
+        voice_settings=VoiceSettings(voice_id="voice-1"),
+        audio_settings=None,
+        model="speech-1",
+    )
+
+
+def test_repeated_synthesis_is_served_from_cache(cache_app: Flask) -> None:
+    provider = _CountingProvider()
+
+    first = _synthesize(cache_app, provider, "Hello  world")
+    second = _synthesize(cache_app, provider, "Hello world")
+
+    assert provider.calls == ["Hello  world"]
+    assert second.audio_data == first.audio_data
+    assert second.duration_ms == 1200
+    assert second.usage_characters == first.usage_characters
+    assert second.subtitle_cues == first.subtitle_cues
+    entry = TTSAudioCacheEntry.query.one()
+    assert entry.hit_count == 1
+    assert entry.size_bytes == len(first.audio_data)
+
+    _synthesize(cache_app, provider, "Hello there")
+    assert provider.calls == ["Hello  world", "Hello there"]
+
+
+def test_cache_key_covers_voice_and_audio_settings() -> None:
+    def key(**voice_overrides: object) -> str:
+        return build_tts_audio_cache_key(
+            text="Hello",
+            provider_name="minimax",
+            model="speech-1",
+            voice_settings=VoiceSettings(**{"voice_id": "v", **voice_overrides}),
+            audio_settings=AudioSettings(),
+        )
+
+    assert key() == key()
+    assert key(speed=1.2) != key()
+    assert key(emotion="happy") != key()
+    assert key(voice_id="other") != key()
+
+
+def test_eviction_drops_least_recently_hit_entries(cache_app: Flask) -> None:
+    provider = _CountingProvider()
+    for text in ("a" * 30, "b" * 30, "c" * 30):
+        _synthesize(cache_app, provider, text)
+    # Hitting the oldest entry moves it to the back of the eviction order.
+    _synthesize(cache_app, provider, "a" * 30)
+    victim = TTSAudioCacheEntry.query.order_by(TTSAudioCacheEntry.id.asc())[1]
+    victim_path = get_local_storage_path("default", victim.storage_object_key)
+    assert victim_path.read_bytes() == b"b" * 300
+
+    evicted = evict_tts_audio_cache(max_bytes=700)
+
+    assert evicted == 1
+    assert victim_path.exists() is False
+    remaining = {entry.cache_key for entry in TTSAudioCacheEntry.query.all()}
+    assert victim.cache_key not in remaining
+    assert len(remaining) == 2
+    assert len(provider.calls) == 3
+
+
+def test_losing_concurrent_store_keeps_the_winners_object(cache_app: Flask) -> None:
+    provider = _CountingProvider()
+    result = _synthesize(cache_app, provider, "Hello")
+    winner = TTSAudioCacheEntry.query.one()
+
+    stored = audio_cache._store_result(
+        cache_app,
+        winner.cache_key,
+        result,
+        provider_name="fake",
+        model="speech-1",
+        voice_id="voice-1",
+    )
+
+    assert stored is False
+    winner_path = get_local_storage_path("default", winner.storage_object_key)
+    assert winner_path.read_bytes() == result.audio_data
+    assert [path.name for path in winner_path.parent.iterdir()] == [winner_path.name]
+
+
+def test_stores_only_resum_the_index_once_the_running_total_crosses_the_budget(
+    cache_app: Flask, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    evictions: list[int] = []
+
+    def counting_evict(*, max_bytes: int) -> int:
+        evictions.append(TTSAudioCacheEntry.query.count())
+        return evict_tts_audio_cache(max_bytes=max_bytes)
+
+    monkeypatch.setattr(audio_cache, "evict_tts_audio_cache", counting_evict)
+    provider = _CountingProvider()
+    for text in ("a" * 30, "b" * 30, "c" * 30, "d" * 30):
+        _synthesize(cache_app, provider, text)
+
+    # The first store syncs the running total; the fourth pushes it past 1024.
+    assert evictions == [1, 4]
+    assert sum(entry.size_bytes for entry in TTSAudioCacheEntry.query.all()) <= 1024
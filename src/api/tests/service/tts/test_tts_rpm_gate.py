@@ -4,36 +4,37 @@ import pytest
 from flaskr.service.tts import rpm_gate
 
 
-class _FakeRedisLock:
-    def __init__(self) -> None:
-        self.released = False
-
-    def acquire(self, blocking=True, blocking_timeout=None):
-        _ = blocking, blocking_timeout
-        return True
-
-    def release(self):
-        self.released = True
-
-
 class _FakeRedis:
-    def __init__(self) -> None:
-        self.values = {}
-        self.locks = []
-
-    def get(self, key):
-        return self.values.get(key)
-
-    def set(self, key, value, ex=None):
-        _ = ex
-        self.values[key] = str(value).encode("utf-8")
-        return True
+    """Run the slot reservation script the way Redis would, atomically."""
 
-    def lock(self, key, timeout=None, blocking_timeout=None):
-        _ = key, timeout, blocking_timeout
-        lock = _FakeRedisLock()
-        self.locks.append(lock)
-        return lock
+    def __init__(self) -> None:
+        self.scopes = {}
+        self.eval_calls = 0
+
+    def eval(self, script, numkeys, *keys_and_args: object):
+        assert script == rpm_gate._RESERVE_SLOT_SCRIPT
+        assert numkeys == 4
+        self.eval_calls += 1
+        next_key, waiters_key, *_keys = keys_and_args[:numkeys]
+        now, interval, lookahead, deadline, _ttl, ticket, lease_until = keys_and_args[
+            numkeys:
+        ]
+        reservation = rpm_gate._book_slot(
+            self.scopes.setdefault(next_key, rpm_gate._SlotScope()),
+            lane=waiters_key,
+            now=float(now),
+            interval=float(interval),
+            lookahead=float(lookahead),
+            deadline=float(deadline),
+            ticket=ticket,
+            lease_until=float(lease_until),
+        )
+        return [
+            int(reservation.granted),
+            f"{reservation.scheduled_at:.6f}".encode(),
+            reservation.ticket.encode(),
+            reservation.queued_ahead,
+        ]
 
 
 def _clock(start=1000.0):
@@ -218,3 +219,132 @@ def test_rpm_gate_falls_back_to_process_local_when_redis_unavailable(monkeypatch
 
     assert first.waited_seconds == 0
     assert second.waited_seconds == pytest.approx(1.0)
+
+
+def test_rpm_gate_reserves_uncontended_slot_in_one_round_trip(monkeypatch):
+    fake_redis = _FakeRedis()
+    monkeypatch.setattr(rpm_gate, "_get_redis_client", lambda: fake_redis)
+    now_fn, sleep_fn = _clock()
+
+    result = rpm_gate.acquire_tts_rpm_slot(
+        provider="minimax",
+        api_key="api-key-a",
+        rpm_limit=60,
+        max_wait_seconds=10,
+        now_fn=now_fn,
+        sleep_fn=sleep_fn,
+    )
+
+    assert result.waited_seconds == 0
+    assert fake_redis.eval_calls == 1
+
+
+def test_rpm_gate_priority_lane_overtakes_waiting_bulk_request(monkeypatch):
+    fake_redis = _FakeRedis()
+    monkeypatch.setattr(rpm_gate, "_get_redis_client", lambda: fake_redis)
+    now_fn, sleep_fn = _clock()
+    priority_results = []
+
+    def _acquire(lane, sleep):
+        return rpm_gate.acquire_tts_rpm_slot(
+            provider="minimax",
+            api_key="api-key-a",
+            rpm_limit=60,
+            max_wait_seconds=10,
+            lane=lane,
+            now_fn=now_fn,
+            sleep_fn=sleep,
+        )
+
+    def _sleep_then_admit_priority(seconds):
+        # A live segment arrives while the bulk request waits for its slot.
+        if not priority_results:
+            priority_results.append(_acquire(rpm_gate.TTS_RPM_LANE_PRIORITY, sleep_fn))
+        sleep_fn(seconds)
+
+    _acquire(rpm_gate.TTS_RPM_LANE_BULK, sleep_fn)
+    bulk = _acquire(rpm_gate.TTS_RPM_LANE_BULK, _sleep_then_admit_priority)
+
+    assert priority_results[0].scheduled_at == pytest.approx(1001.0)
+    assert bulk.scheduled_at == pytest.approx(1002.0)
+    assert bulk.waited_seconds == pytest.approx(2.0)
+
+
+def _poll_bulk_slot(ticket, *, now, deadline=1010.0, lease_until=None):
+    return rpm_gate._reserve_redis_slot(
+        scope_key="minimax:queue",
+        lane=rpm_gate.TTS_RPM_LANE_BULK,
+        now=now,
+        interval=1.0,
+        lookahead=rpm_gate._SLOT_EPSILON_SECONDS,
+        deadline=deadline,
+        max_wait_seconds=10,
+        ticket=ticket,
+        lease_until=deadline + 5 if lease_until is None else lease_until,
+    )
+
+
+def test_rpm_gate_serves_a_lane_in_arrival_order(monkeypatch):
+    fake_redis = _FakeRedis()
+    monkeypatch.setattr(rpm_gate, "_get_redis_client", lambda: fake_redis)
+    assert _poll_bulk_slot("", now=1000.0).granted is True
+
+    first = _poll_bulk_slot("", now=1000.0)
+    second = _poll_bulk_slot("", now=1000.0)
+    assert (first.granted, first.queued_ahead) == (False, 0)
+    assert (second.granted, second.queued_ahead) == (False, 1)
+    assert second.scheduled_at == pytest.approx(1002.0)
+
+    # The later waiter polls first once the slot is due and still waits.
+    assert _poll_bulk_slot(second.ticket, now=1001.0).granted is False
+    granted_first = _poll_bulk_slot(first.ticket, now=1001.0)
+    assert granted_first.granted is True
+    assert granted_first.scheduled_at == pytest.approx(1001.0)
+    granted_second = _poll_bulk_slot(second.ticket, now=1002.0)
+    assert granted_second.granted is True
+    assert granted_second.scheduled_at == pytest.approx(1002.0)
+
+
+def test_rpm_gate_skips_queued_waiters_whose_lease_lapsed(monkeypatch):
+    fake_redis = _FakeRedis()
+    monkeypatch.setattr(rpm_gate, "_get_redis_client", lambda: fake_redis)
+    assert _poll_bulk_slot("", now=1000.0).granted is True
+    # This waiter never polls again, e.g. its worker died.
+    _poll_bulk_slot("", now=1000.0, lease_until=1000.5)
+    waiting = _poll_bulk_slot("", now=1000.0)
+    assert waiting.queued_ahead == 1
+
+    granted = _poll_bulk_slot(waiting.ticket, now=1001.0)
+
+    assert granted.granted is True
+    assert granted.scheduled_at == pytest.approx(1001.0)
+
+
+def test_rpm_gate_waiter_that_times_out_leaves_the_queue(monkeypatch):
+    fake_redis = _FakeRedis()
+    monkeypatch.setattr(rpm_gate, "_get_redis_client", lambda: fake_redis)
+    assert _poll_bulk_slot("", now=1000.0).granted is True
+    impatient = _poll_bulk_slot("", now=1000.0, deadline=1000.5)
+    assert impatient.granted is False
+    assert impatient.scheduled_at > 1000.5
+
+    waiting = _poll_bulk_slot("", now=1000.0)
+
+    assert waiting.queued_ahead == 0
+    assert _poll_bulk_slot(waiting.ticket, now=1001.0).granted is True
+
+
+@pytest.mark.parametrize(
+    ("priority_class", "live", "expected"),
+    [
+        ("vip", True, rpm_gate.TTS_RPM_LANE_PRIORITY),
+        ("priority", True, rpm_gate.TTS_RPM_LANE_PRIORITY),
+        ("standard", True, rpm_gate.TTS_RPM_LANE_STANDARD),
+        ("vip", False, rpm_gate.TTS_RPM_LANE_BULK),
+    ],
+)
+def test_resolve_tts_rpm_lane(priority_class, live, expected):
+    assert (
+        rpm_gate.resolve_tts_rpm_lane(priority_class=priority_class, live=live)
+        == expected
+    )
@@ -3,7 +3,6 @@
 import base64
 from typing import ClassVar
 
-import requests
 from flaskr.api.tts.base import AudioSettings, VoiceSettings
 from flaskr.api.tts.volcengine_http_provider import (
     VOLCENGINE_HTTP_TTS_URL,
@@ -48,7 +47,9 @@ def test_volcengine_http_synthesize_success(monkeypatch):
         captured["timeout"] = timeout
         return DummyResponse()
 
-    monkeypatch.setattr(requests, "post", fake_post)
+    monkeypatch.setattr(
+        "flaskr.api.tts.volcengine_http_provider._http_client.post", fake_post
+    )
 
     provider = VolcengineHttpTTSProvider()
     voice_settings = VoiceSettings(
@@ -113,7 +114,9 @@ def test_volcengine_http_legacy_resource_id_overrides_default_cluster(monkeypatc
         captured["timeout"] = timeout
         return DummyResponse()
 
-    monkeypatch.setattr(requests, "post", fake_post)
+    monkeypatch.setattr(
+        "flaskr.api.tts.volcengine_http_provider._http_client.post", fake_post
+    )
 
     provider = VolcengineHttpTTSProvider()
     provider.synthesize("Hello world", model=None)
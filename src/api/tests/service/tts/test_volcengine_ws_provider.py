@@ -1,9 +1,18 @@
 """Verify volcengine WebSocket provider behavior."""
 
-import threading
-from types import SimpleNamespace
+import os
 
-from flaskr.api.tts import volcengine_provider
+import pytest
+from flaskr.api.tts import volcengine_connection, volcengine_provider
+
+from tests.common.fixtures.volcengine_ws import (
+    FINISH_CONNECTION,
+    FINISH_SESSION,
+    START_CONNECTION,
+    START_SESSION,
+    TASK_REQUEST,
+    StandInWebSocketModule,
+)
 
 
 def test_volcengine_ws_get_credentials_prefers_volcengine_tts_keys(monkeypatch):
@@ -45,172 +54,144 @@ def test_volcengine_ws_is_configured_uses_volcengine_tts_keys(monkeypatch):
     assert provider.is_configured() is True
 
 
-def test_volcengine_ws_waits_for_session_started_before_task_request(monkeypatch):
+@pytest.fixture
+def stand_in(monkeypatch):
     monkeypatch.setenv("VOLCENGINE_TTS_APP_KEY", "test-app")
     monkeypatch.setenv("VOLCENGINE_TTS_ACCESS_KEY", "test-access")
+    module = StandInWebSocketModule()
+    monkeypatch.setattr(volcengine_connection, "websocket", module)
     monkeypatch.setattr(volcengine_provider, "WEBSOCKET_AVAILABLE", True)
+    _install_manager(monkeypatch, pool_size=4)
+    return module
+
 
-    captured = {}
-
-    class FakeProtocol:
-        def encode_start_connection(self):
-            return b"start_connection"
-
-        def encode_start_session(self, **kwargs: object):
-            captured["start_session_kwargs"] = kwargs
-            return b"start_session"
-
-        def encode_task_request(self, session_id, text):
-            _ = (session_id, text)
-            return b"task_request"
-
-        def encode_finish_session(self, session_id):
-            _ = session_id
-            return b"finish_session"
-
-        def encode_finish_connection(self):
-            return b"finish_connection"
-
-        def decode_frame(self, message):
-            if message == b"connection_started":
-                return SimpleNamespace(
-                    event=volcengine_provider.Event.CONNECTION_STARTED,
-                    message_type=None,
-                    connection_id="conn",
-                    session_id=None,
-                    payload=None,
-                    error_code=None,
-                )
-            if message == b"session_started":
-                return SimpleNamespace(
-                    event=volcengine_provider.Event.SESSION_STARTED,
-                    message_type=None,
-                    connection_id=None,
-                    session_id="session",
-                    payload=None,
-                    error_code=None,
-                )
-            if message == b"tts_response":
-                return SimpleNamespace(
-                    event=volcengine_provider.Event.TTS_RESPONSE,
-                    message_type=None,
-                    connection_id=None,
-                    session_id="session",
-                    payload=b"audio-bytes",
-                    error_code=None,
-                )
-            if message == b"sentence_end":
-                return SimpleNamespace(
-                    event=volcengine_provider.Event.TTS_SENTENCE_END,
-                    message_type=None,
-                    connection_id=None,
-                    session_id="session",
-                    payload={"res_params": {"duration_ms": 456}},
-                    error_code=None,
-                )
-            if message == b"subtitle":
-                return SimpleNamespace(
-                    event=volcengine_provider.Event.TTS_SUBTITLE,
-                    message_type=None,
-                    connection_id=None,
-                    session_id="session",
-                    payload={
-                        "text": "hello",
-                        "words": [
-                            {"word": "he", "start_time": "0", "end_time": "0.2"},
-                            {"word": "llo", "start_time": "0.2", "end_time": "0.456"},
-                        ],
-                    },
-                    error_code=None,
-                )
-            if message == b"session_finished":
-                return SimpleNamespace(
-                    event=volcengine_provider.Event.SESSION_FINISHED,
-                    message_type=None,
-                    connection_id=None,
-                    session_id="session",
-                    payload={},
-                    error_code=None,
-                )
-            error_message = f"unexpected frame: {message!r}"
-            raise AssertionError(error_message)
-
-    class FakeWebSocketApp:
-        def __init__(
-            self, url, header, on_message, on_error, on_close, on_open
-        ) -> None:
-            _ = (url, header, on_error)
-            self.on_message = on_message
-            self.on_close = on_close
-            self.on_open = on_open
-            self.sent = []
-            self.session_started_sent = False
-            captured["ws"] = self
-
-        def run_forever(self, **kwargs: object):
-            _ = kwargs
-            self.on_open(self)
-
-        def send(self, frame, opcode=None):
-            _ = opcode
-            self.sent.append(frame)
-            if frame == b"start_connection":
-                self.on_message(self, b"connection_started")
-                return
-            if frame == b"start_session":
-                timer = threading.Timer(0.15, self._emit_session_started)
-                timer.daemon = True
-                timer.start()
-                return
-            if frame == b"task_request":
-                assert self.session_started_sent is True
-                return
-            if frame == b"finish_session":
-                self.on_message(self, b"tts_response")
-                self.on_message(self, b"sentence_end")
-                self.on_message(self, b"subtitle")
-                self.on_message(self, b"session_finished")
-
-        def _emit_session_started(self):
-            self.session_started_sent = True
-            self.on_message(self, b"session_started")
-
-        def close(self):
-            self.on_close(self, None, None)
-
-    fake_websocket = SimpleNamespace(
-        ABNF=SimpleNamespace(OPCODE_BINARY=2),
-        WebSocketApp=FakeWebSocketApp,
+def _install_manager(monkeypatch, *, pool_size, idle_seconds=50):
+    manager = volcengine_connection.VolcengineConnectionManager(
+        pool_size=pool_size, idle_seconds=idle_seconds
     )
+    monkeypatch.setattr(
+        volcengine_connection,
+        "_manager_state",
+        volcengine_connection._ConnectionManagerState(pid=os.getpid(), manager=manager),
+    )
+    return manager
 
-    monkeypatch.setattr(volcengine_provider, "VolcengineProtocol", FakeProtocol)
-    monkeypatch.setattr(volcengine_provider, "websocket", fake_websocket)
 
+def _synthesize(text, *, model="seed-tts-2.0", voice_id="zh_female_vv_uranus_bigtts"):
     provider = volcengine_provider.VolcengineTTSProvider()
-    result = provider.synthesize(
-        "hello",
-        voice_settings=volcengine_provider.VoiceSettings(
-            voice_id="zh_female_vv_uranus_bigtts"
-        ),
-        model="seed-tts-2.0",
+    return provider.synthesize(
+        text,
+        voice_settings=volcengine_provider.VoiceSettings(voice_id=voice_id),
+        model=model,
     )
 
-    assert result.audio_data == b"audio-bytes"
-    assert result.duration_ms == 456
-    assert captured["start_session_kwargs"]["enable_timestamp"] is False
-    assert captured["start_session_kwargs"]["enable_subtitle"] is True
-    assert result.subtitle_cues == [
-        {
-            "text": "hello",
-            "start_ms": 0,
-            "end_ms": 456,
-            "segment_index": 0,
-        }
+
+def test_volcengine_ws_runs_sessions_over_one_warm_connection(stand_in):
+    first = _synthesize("hello")
+    second = _synthesize("world!")
+
+    assert len(stand_in.connections) == 1
+    connection = stand_in.connections[0]
+    assert connection.events == [
+        START_CONNECTION,
+        START_SESSION,
+        TASK_REQUEST,
+        FINISH_SESSION,
+        START_SESSION,
+        TASK_REQUEST,
+        FINISH_SESSION,
     ]
-    assert captured["ws"].sent == [
-        b"start_connection",
-        b"start_session",
-        b"task_request",
-        b"finish_session",
-        b"finish_connection",
+    assert connection.texts == ["hello", "world!"]
+    assert connection.header["X-Api-Resource-Id"] == "seed-tts-2.0"
+    audio_params = connection.start_session_payloads[0]["req_params"]["audio_params"]
+    assert audio_params["enable_subtitle"] is True
+    assert "enable_timestamp" not in audio_params
+
+    assert first.audio_data == b"audio:hello"
+    assert first.duration_ms == 500
+    assert first.subtitle_cues == [
+        {"text": "hello", "start_ms": 0, "end_ms": 500, "segment_index": 0}
+    ]
+    assert second.audio_data == b"audio:world!"
+    assert second.duration_ms == 600
+
+
+def test_volcengine_ws_keeps_separate_connections_per_resource_id(stand_in):
+    _synthesize("one", model="seed-tts-2.0")
+    _synthesize(
+        "two", model="seed-tts-1.0", voice_id="zh_female_shuangkuaisisi_moon_bigtts"
+    )
+    _synthesize("three", model="seed-tts-2.0")
+
+    assert [c.header["X-Api-Resource-Id"] for c in stand_in.connections] == [
+        "seed-tts-2.0",
+        "seed-tts-1.0",
     ]
+    assert stand_in.connections[0].texts == ["one", "three"]
+    assert stand_in.connections[1].texts == ["two"]
+
+
+def test_volcengine_ws_replaces_idle_connection_closed_by_server(stand_in):
+    _synthesize("first")
+    stand_in.connections[0].drop()
+
+    result = _synthesize("second")
+
+    assert result.audio_data == b"audio:second"
+    assert len(stand_in.connections) == 2
+    assert stand_in.connections[0].connected is False
+    assert stand_in.connections[1].texts == ["second"]
+
+
+def test_volcengine_ws_reconnects_when_warm_connection_breaks_before_start(
+    stand_in,
+):
+    _synthesize("first")
+    # The loss only shows once the next session reads from the socket.
+    stand_in.connections[0].drop(notify=False)
+
+    result = _synthesize("second")
+
+    assert result.audio_data == b"audio:second"
+    assert len(stand_in.connections) == 2
+    assert stand_in.connections[0].texts == ["first"]
+    assert stand_in.connections[1].texts == ["second"]
+
+
+def test_volcengine_ws_discards_connection_after_failed_session(stand_in):
+    stand_in.fail_next_session = True
+
+    with pytest.raises(ValueError, match="Session failed"):
+        _synthesize("rejected")
+
+    assert stand_in.connections[0].connected is False
+    assert FINISH_CONNECTION not in stand_in.connections[0].events
+
+    result = _synthesize("accepted")
+
+    assert result.audio_data == b"audio:accepted"
+    assert len(stand_in.connections) == 2
+
+
+def test_volcengine_ws_closes_idle_connections_past_idle_window(stand_in):
+    _synthesize("first")
+    manager = volcengine_connection.get_volcengine_connection_manager()
+    (idle,) = manager._idle.values()
+    idle[0].last_used_at -= manager.idle_seconds + 1
+
+    _synthesize("second")
+
+    assert len(stand_in.connections) == 2
+    assert stand_in.connections[0].connected is False
+
+
+def test_volcengine_ws_pool_size_zero_closes_after_each_session(stand_in, monkeypatch):
+    _install_manager(monkeypatch, pool_size=0)
+
+    _synthesize("first")
+    _synthesize("second")
+
+    assert len(stand_in.connections) == 2
+    for connection in stand_in.connections:
+        assert connection.connected is False
+        assert connection.events[-1] == FINISH_CONNECTION
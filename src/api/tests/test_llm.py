@@ -1786,3 +1786,14 @@ def test_stream_retry_noop_when_exception_types_unavailable(monkeypatch, app):
         _collect_retry_stream(app)
 
     assert calls["count"] == 1
+
+
+def test_response_log_preview_is_bounded():
+    short = "short answer"
+    long_text = "x" * (llm._RESPONSE_LOG_PREVIEW_LENGTH + 42)
+
+    assert llm._preview_response_for_log(short) == short
+    preview = llm._preview_response_for_log(long_text)
+    assert preview.startswith("x" * llm._RESPONSE_LOG_PREVIEW_LENGTH)
+    assert preview.endswith("... [42 more chars]")
+    assert len(preview) < len(long_text)
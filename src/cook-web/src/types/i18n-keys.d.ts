@@ -3535,6 +3535,7 @@ export type I18nKey =
   | 'server.learn.llmStreamInterrupted'
   | 'server.learn.nextChapterButton'
   | 'server.learn.outputInProgress'
+  | 'server.learn.streamCapacityBusy'
   | 'server.learn.ttsRateLimited'
   | 'server.llm.modelNotSupported'
   | 'server.llm.requestFailed'